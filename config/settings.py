@@ -23,6 +23,38 @@ class Settings(BaseSettings):
         openai_api_key (Optional[str]): OpenAI API key if using OpenAI.
         vector_db_url (str): Vector database connection URL.
         postgres_url (Optional[str]): PostgreSQL connection URL for metadata.
+        scan_checkpoint_path (str): SQLite file for resumable scan workflow checkpoints.
+        scan_trace_dir (Optional[str]): Directory for OTLP JSON scan traces (disabled if unset).
+        scan_cpu_workers (Optional[int]): Threads for CPU-bound stages of async scans (CPU count if unset).
+        scan_io_workers (int): Threads for blocking I/O stages of async scans.
+        scan_cache_ttl_seconds (int): How long a completed scan is reused for the same commits.
+        scan_cache_max_entries (int): Maximum number of cached scan results.
+        scan_stage_cache (Optional[str]): Backend for per-stage memoization ("memory" or "sqlite", disabled if unset).
+        scan_stage_cache_path (str): SQLite file for the "sqlite" stage cache backend.
+        scan_streaming (bool): Stream files through parse, static analysis and LLM review instead of stage barriers.
+        scan_stream_queue_size (int): Files buffered between two streaming stages.
+        scan_stream_cpu_workers (Optional[int]): Workers per CPU-bound streaming stage (CPU count if unset).
+        scan_stream_llm_workers (int): Workers for per-file LLM review in streaming scans.
+        scan_timeout_seconds (Optional[int]): Default time budget of a scan (no deadline if unset).
+        batch_scan_concurrency (int): Repositories a batch scan runs at a time, each on a warm worker; batch requests cannot ask for more.
+        scan_monorepo_partitioning (bool): Scan the packages of a monorepo as parallel sub-scans with a merged report.
+        scan_partition_workers (int): Partitions of a monorepo scanned at a time.
+        scan_quota_max_seconds (Optional[int]): Largest estimated scan duration accepted (unlimited if unset).
+        scan_quota_max_llm_tokens (Optional[int]): Largest estimated LLM token use accepted (unlimited if unset).
+        scan_quota_policy (str): What happens to a scan over quota ("reject" or "downscope").
+        repository_mirror_dir (Optional[str]): Directory of bare repository mirrors reused across scans (temporary clones if unset).
+        repository_mirror_checkout (bool): Walk a worktree checkout of mirrored repositories instead of reading their object database.
+        repository_partial_clone (bool): Make temporary clones blobless and sparse, downloading only the supported source files.
+        repository_blob_cache_mb (int): Memory for recently read blobs of mirrored repositories.
+        scan_exclude_globs (list): Extra gitignore-style patterns of files left out of project scans.
+        scan_exclude_vendored (bool): Leave vendored dependencies and generated code out of project scans.
+        scan_exclusion_count_limit (int): Files looked at when counting an excluded directory of a checkout for the exclusion report.
+        scan_read_workers (int): Threads reading checked out files in parallel.
+        pr_diff_max_file_kb (int): Longest patch kept per file of a PR diff (0 for no limit).
+        repository_sync_batch_size (int): Cached repositories an auto-sync run syncs at most.
+        repository_sync_concurrency (int): Repositories an auto-sync run syncs at a time.
+        repository_sync_per_host (int): Repositories of one git host an auto-sync run syncs at a time.
+        repository_sync_jitter_seconds (float): Longest random delay before each sync of an auto-sync run.
     """
     
     # Application settings
@@ -46,6 +78,38 @@ class Settings(BaseSettings):
     # Database settings
     vector_db_url: str = "sqlite:///./vector_db.sqlite"
     postgres_url: Optional[str] = None
+    scan_checkpoint_path: str = "./scan_checkpoints.sqlite"
+    scan_trace_dir: Optional[str] = None
+    scan_cpu_workers: Optional[int] = None
+    scan_io_workers: int = 32
+    scan_cache_ttl_seconds: int = 86400
+    scan_cache_max_entries: int = 1024
+    scan_stage_cache: Optional[str] = None
+    scan_stage_cache_path: str = "./scan_stage_cache.sqlite"
+    scan_streaming: bool = False
+    scan_stream_queue_size: int = 64
+    scan_stream_cpu_workers: Optional[int] = None
+    scan_stream_llm_workers: int = 4
+    scan_timeout_seconds: Optional[int] = 3600
+    batch_scan_concurrency: int = 4
+    scan_monorepo_partitioning: bool = False
+    scan_partition_workers: int = 4
+    scan_quota_max_seconds: Optional[int] = None
+    scan_quota_max_llm_tokens: Optional[int] = None
+    scan_quota_policy: str = "reject"  # reject, downscope
+    repository_mirror_dir: Optional[str] = None
+    repository_mirror_checkout: bool = False
+    repository_partial_clone: bool = False
+    repository_blob_cache_mb: int = 64
+    scan_exclude_globs: list = []
+    scan_exclude_vendored: bool = True
+    scan_exclusion_count_limit: int = 10000
+    scan_read_workers: int = 8
+    pr_diff_max_file_kb: int = 256
+    repository_sync_batch_size: int = 1000
+    repository_sync_concurrency: int = 16
+    repository_sync_per_host: int = 4
+    repository_sync_jitter_seconds: float = 2.0
     
     # Analysis settings
     max_file_size_mb: int = 10
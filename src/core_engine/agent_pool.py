@@ -0,0 +1,266 @@
+"""
+Agent pool for the AI Code Review System.
+
+This module implements a long-lived registry of agent instances. Constructing
+an agent reloads Tree-sitter grammars, recompiles queries and re-initializes
+LLM providers, so doing it inside every LangGraph node on every scan is
+wasteful. An AgentPool is owned by the process (or a worker), injected into
+the workflow via ``compile_graph(agent_pool=...)`` and keeps that warm state
+alive across scans until it is explicitly closed. Scans running
+concurrently in one process check out pools of their own from an
+AgentPoolSet.
+"""
+
+import importlib
+import logging
+import threading
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+# Agent types known to the pool, mapped to "module:ClassName" import paths.
+# Classes are imported lazily so that the pool does not pull in heavy
+# dependencies for agents that are never requested.
+DEFAULT_AGENT_FACTORIES: Dict[str, str] = {
+    "code_fetcher": "src.core_engine.agents.code_fetcher_agent:CodeFetcherAgent",
+    "ast_parser": "src.core_engine.agents.ast_parsing_agent:ASTParsingAgent",
+    "static_analyzer": "src.core_engine.agents.static_analysis_agent:StaticAnalysisAgent",
+    "impact_analyzer": "src.core_engine.agents.impact_analysis.impact_analysis_agent:ImpactAnalysisAgent",
+    "llm_orchestrator": "src.core_engine.agents.llm_orchestrator_agent:LLMOrchestratorAgent",
+    "project_scanner": "src.core_engine.agents.project_scanning_agent:ProjectScanningAgent",
+    "reporting": "src.core_engine.agents.reporting_agent:ReportingAgent",
+    "risk_predictor": "src.core_engine.risk_predictor:RiskPredictor",
+}
+
+
+def _import_factory(import_path: str) -> Callable[..., Any]:
+    """
+    Resolve a "module:ClassName" import path to the class object.
+
+    Args:
+        import_path (str): Import path in "module:attribute" form
+
+    Returns:
+        Callable[..., Any]: The agent class
+    """
+    module_name, attr_name = import_path.split(":", 1)
+    module = importlib.import_module(module_name)
+    return getattr(module, attr_name)
+
+
+class AgentPool:
+    """
+    Registry of warm, reusable agent instances with an explicit lifecycle.
+
+    Agents are created on first request and cached by agent type and
+    constructor arguments, so ``get("llm_orchestrator", llm_provider="mock")``
+    and ``get("llm_orchestrator", llm_provider="openai")`` yield separate
+    instances. Agents are not assumed to be thread-safe: use one pool per
+    worker thread or process when scans run concurrently.
+    """
+
+    def __init__(self, factories: Optional[Dict[str, Any]] = None):
+        """
+        Initialize the AgentPool.
+
+        Args:
+            factories (Optional[Dict[str, Any]]): Extra or overriding agent factories,
+                either callables or "module:ClassName" import paths
+        """
+        self._factories: Dict[str, Any] = dict(DEFAULT_AGENT_FACTORIES)
+        if factories:
+            self._factories.update(factories)
+
+        self._agents: Dict[Tuple[str, Tuple], Any] = {}
+        self._lock = threading.RLock()
+        self._closed = False
+        self.stats = {"created": 0, "reused": 0}
+
+        logger.info(f"AgentPool initialized with agent types: {sorted(self._factories)}")
+
+    def register(self, agent_type: str, factory: Any) -> None:
+        """
+        Register or replace the factory for an agent type.
+
+        Args:
+            agent_type (str): Name used to request the agent
+            factory (Any): Callable or "module:ClassName" import path
+        """
+        with self._lock:
+            self._factories[agent_type] = factory
+
+    def _make_key(self, agent_type: str, init_kwargs: Dict[str, Any], slot: str = "") -> Tuple[str, Tuple]:
+        """Build the cache key for an agent type, its constructor arguments and slot."""
+        return agent_type, (slot,) + tuple(sorted((k, repr(v)) for k, v in init_kwargs.items()))
+
+    def get(self, agent_type: str, *, slot: str = "", **init_kwargs: Any) -> Any:
+        """
+        Get a warm agent instance, creating it on first use.
+
+        Args:
+            agent_type (str): Registered agent type (e.g. "ast_parser")
+            slot (str): Name of a separate instance for a user that runs
+                concurrently with the others in one scan (e.g. a graph branch)
+            **init_kwargs: Constructor arguments for the agent
+
+        Returns:
+            Any: The pooled agent instance
+
+        Raises:
+            RuntimeError: If the pool has been closed
+            KeyError: If the agent type is unknown
+        """
+        if self._closed:
+            raise RuntimeError("AgentPool is closed")
+
+        key = self._make_key(agent_type, init_kwargs, slot)
+
+        with self._lock:
+            agent = self._agents.get(key)
+            if agent is not None:
+                self.stats["reused"] += 1
+                return agent
+
+            if agent_type not in self._factories:
+                raise KeyError(f"Unknown agent type: {agent_type}")
+
+            factory = self._factories[agent_type]
+            if isinstance(factory, str):
+                factory = _import_factory(factory)
+
+            logger.info(f"AgentPool creating {agent_type} agent")
+            agent = factory(**init_kwargs)
+            self._agents[key] = agent
+            self.stats["created"] += 1
+            return agent
+
+    def warm_up(self, *agent_types: str) -> None:
+        """
+        Eagerly create agents so the first scan does not pay start-up costs.
+
+        Args:
+            *agent_types (str): Agent types to create (defaults to all registered types)
+        """
+        for agent_type in agent_types or tuple(self._factories):
+            try:
+                self.get(agent_type)
+            except Exception as e:
+                logger.warning(f"Failed to warm up {agent_type} agent: {str(e)}")
+
+    def close(self) -> None:
+        """Release all pooled agents, calling their ``close()`` hooks if present."""
+        with self._lock:
+            for (agent_type, _), agent in self._agents.items():
+                close_hook = getattr(agent, "close", None)
+                if callable(close_hook):
+                    try:
+                        close_hook()
+                    except Exception as e:
+                        logger.warning(f"Error closing {agent_type} agent: {str(e)}")
+            self._agents.clear()
+            self._closed = True
+
+        logger.info("AgentPool closed")
+
+    def __len__(self) -> int:
+        return len(self._agents)
+
+    def __enter__(self) -> "AgentPool":
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb) -> None:
+        self.close()
+
+
+def acquire_agent(
+    agent_pool: Optional[AgentPool],
+    agent_type: str,
+    factory: Callable[..., Any],
+    *,
+    slot: str = "",
+    **init_kwargs: Any
+) -> Any:
+    """
+    Get an agent from the pool, or build a throwaway one without a pool.
+
+    Args:
+        agent_pool (Optional[AgentPool]): Pool injected into the workflow, if any
+        agent_type (str): Registered agent type
+        factory (Callable[..., Any]): Agent class used when no pool is available
+        slot (str): Pool slot of an agent used concurrently with the default one
+        **init_kwargs: Constructor arguments for the agent
+
+    Returns:
+        Any: Agent instance
+    """
+    if agent_pool is not None:
+        return agent_pool.get(agent_type, slot=slot, **init_kwargs)
+    return factory(**init_kwargs)
+
+
+class AgentPoolSet:
+    """
+    Pools of warm agents checked out by scans running concurrently in a process.
+
+    Agents are not thread-safe, so concurrent scans never share a pool: each
+    scan checks out a pool of its own and returns it when it ends, so the
+    next scan finds its agents warm. Pools are created on demand, so there
+    are as many as the most scans that ran at once; at most ``max_idle``
+    returned pools are kept, the others are closed.
+    """
+
+    def __init__(self, max_idle: int = 4):
+        """
+        Initialize the AgentPoolSet.
+
+        Args:
+            max_idle (int): Returned pools kept for later scans
+        """
+        self.max_idle = max_idle
+        self._idle: List[AgentPool] = []
+        self._lock = threading.Lock()
+        self._closed = False
+        self.stats = {"created": 0, "reused": 0}
+
+    @contextmanager
+    def checkout(self) -> Iterator[AgentPool]:
+        """
+        Check out a pool for one scan, returning it when the scan ends.
+
+        Yields:
+            AgentPool: Pool used by no other scan until it is returned
+
+        Raises:
+            RuntimeError: If the set has been closed
+        """
+        with self._lock:
+            if self._closed:
+                raise RuntimeError("AgentPoolSet is closed")
+            if self._idle:
+                agent_pool = self._idle.pop()
+                self.stats["reused"] += 1
+            else:
+                agent_pool = None
+                self.stats["created"] += 1
+        if agent_pool is None:
+            agent_pool = AgentPool()
+
+        try:
+            yield agent_pool
+        finally:
+            with self._lock:
+                keep = not self._closed and len(self._idle) < self.max_idle
+                if keep:
+                    self._idle.append(agent_pool)
+            if not keep:
+                agent_pool.close()
+
+    def close(self) -> None:
+        """Close the idle pools; pools still checked out are closed when returned."""
+        with self._lock:
+            idle, self._idle = self._idle, []
+            self._closed = True
+        for agent_pool in idle:
+            agent_pool.close()
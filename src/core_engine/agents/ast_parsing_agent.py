@@ -27,6 +27,7 @@ except ImportError:
     Parser = None
     Node = None
 
+from ..content_keys import git_blob_id
 from ..knowledge_graph_builder import KnowledgeGraphBuilder
 
 # Configure logging
@@ -142,7 +143,7 @@ class ASTParsingAgent:
     
     def _calculate_file_hash(self, file_path: str) -> Optional[str]:
         """
-        Calculate SHA-256 hash of file content.
+        Calculate the content key (git blob id) of a file.
         
         Args:
             file_path (str): Path to the file
@@ -153,7 +154,7 @@ class ASTParsingAgent:
         try:
             with open(file_path, 'rb') as f:
                 content = f.read()
-                return hashlib.sha256(content).hexdigest()
+                return git_blob_id(content)
         except Exception as e:
             logger.error(f"Error calculating hash for {file_path}: {str(e)}")
             return None
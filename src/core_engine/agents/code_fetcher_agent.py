@@ -6,9 +6,12 @@ from Git repositories, including PR diffs and full project files.
 """
 
 import os
+import posixpath
 import tempfile
 import shutil
-from typing import Dict, Optional
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Iterator, List, Mapping, Optional, Tuple, Union
 from pathlib import Path
 import logging
 
@@ -16,10 +19,30 @@ import git
 from git import Repo, GitCommandError
 
 from config.settings import settings
+from ..cancellation import check_cancelled, remaining_seconds
+from ..content_keys import worktree_blob_ids
+from ..diff_model import ChangeSet, parse_unified_diff
+from ..file_filters import (
+    HEADER_BYTES, REASON_TOO_LARGE, REASON_TRUNCATED, RULE_FILES, FileFilter, record_exclusion
+)
+from ..git_diff import iter_file_patches, list_changes, merge_base
+from ..monorepo import PACKAGE_MANIFESTS, is_package_manifest
+from ..project_files import LazyProjectFiles, ProjectFileEntry
+from ..repository_mirror import BlobReader, FileVersion, MirrorStore, TreeEntry, get_mirror_store, is_commit_sha
 
 # Configure logging
 logger = logging.getLogger(__name__)
 
+# Commits of history fetched with the two sides of a PR, then deepened by
+PR_FETCH_DEPTH = 50
+
+# Deepening rounds before the full history of a PR's branches is fetched
+PR_DEEPEN_ATTEMPTS = 4
+
+# Local refs the two sides of a PR are fetched into
+PR_TARGET_REF = "refs/pr/target"
+PR_SOURCE_REF = "refs/pr/source"
+
 
 class CodeFetcherAgent:
     """
@@ -30,6 +53,12 @@ class CodeFetcherAgent:
     - Fetching PR diffs between branches
     - Retrieving project files for analysis
     - Managing temporary directories for Git operations
+    
+    When ``settings.repository_mirror_dir`` is set, repositories are kept as
+    persistent bare mirrors updated incrementally instead of being cloned
+    for every request. Otherwise ``settings.repository_partial_clone`` makes
+    the temporary clones blobless and sparse, so only the supported source
+    files of the checked out revision are downloaded.
     """
     
     def __init__(self):
@@ -75,16 +104,64 @@ class CodeFetcherAgent:
         Returns:
             bool: True if file should be processed
         """
+        languages = tuple(self.supported_languages)
+        if getattr(self, '_extension_languages', None) != languages:
+            # Rebuilt only when the configured languages change
+            self._extension_set = frozenset(self._get_supported_file_extensions())
+            self._extension_languages = languages
+        
         file_ext = Path(file_path).suffix.lower()
-        return file_ext in self._get_supported_file_extensions()
+        return file_ext in self._extension_set
     
-    def _clone_repository(self, repo_url: str, target_dir: str) -> Repo:
+    def _mirror_store(self) -> Optional[MirrorStore]:
+        """
+        Get the persistent mirror store, if enabled.
+        
+        Returns:
+            Optional[MirrorStore]: Mirror store, or None to clone into temporary directories
+        """
+        return get_mirror_store()
+    
+    def _sparse_checkout_patterns(self) -> List[str]:
+        """
+        Get the sparse checkout patterns of the files a scan reads.
+        
+        Returns:
+            List[str]: Patterns for the supported extensions, package manifests
+                and the ``.gitignore``/``.gitattributes`` files the filters read
+        """
+        patterns = [f"*{ext}" for ext in self._get_supported_file_extensions()]
+        patterns.extend(PACKAGE_MANIFESTS)
+        patterns.extend(RULE_FILES)
+        return patterns
+    
+    def _configure_sparse_checkout(self, repo: Repo) -> None:
+        """
+        Restrict checkouts of a clone to the files a scan reads.
+        
+        Args:
+            repo (Repo): Clone that has not been checked out yet
+        """
+        repo.git.config('core.sparseCheckout', 'true')
+        sparse_file = os.path.join(repo.git_dir, 'info', 'sparse-checkout')
+        os.makedirs(os.path.dirname(sparse_file), exist_ok=True)
+        with open(sparse_file, 'w', encoding='utf-8') as f:
+            f.write('\n'.join(self._sparse_checkout_patterns()) + '\n')
+    
+    def _clone_repository(self, repo_url: str, target_dir: str, partial: Optional[bool] = None) -> Repo:
         """
         Clone a Git repository to a temporary directory.
         
+        Partial clones download commits and trees only; blobs are fetched on
+        demand, and checkouts are limited to the supported source files and
+        package manifests, so binary assets and old file versions are never
+        transferred. The server must allow object filters (most hosts do).
+        
         Args:
             repo_url (str): URL of the Git repository
             target_dir (str): Directory to clone into
+            partial (Optional[bool]): Make a blobless, sparse clone
+                (``settings.repository_partial_clone`` if None)
             
         Returns:
             Repo: GitPython Repo object
@@ -93,18 +170,32 @@ class CodeFetcherAgent:
             GitCommandError: If cloning fails
             Exception: For other Git-related errors
         """
+        # A clone cannot be interrupted midway; the scan stops before or after it
+        check_cancelled()
+        
+        if partial is None:
+            partial = getattr(settings, 'repository_partial_clone', False)
+        
         try:
-            logger.info(f"Cloning repository {repo_url} to {target_dir}")
+            logger.info(f"Cloning repository {repo_url} to {target_dir}{' (partial)' if partial else ''}")
+            
+            # Don't use depth=1 as we need to access different branches
+            multi_options = ['--no-single-branch']
+            if partial:
+                multi_options += ['--filter=blob:none', '--no-checkout']
             
-            # Clone with depth=1 for faster cloning, but fetch all branches
             repo = Repo.clone_from(
                 repo_url, 
                 target_dir,
-                # Don't use depth=1 as we need to access different branches
-                multi_options=['--no-single-branch']
+                multi_options=multi_options
             )
             
+            if partial:
+                # The first checkout fetches the blobs matching the sparse patterns
+                self._configure_sparse_checkout(repo)
+            
             logger.info(f"Successfully cloned repository to {target_dir}")
+            check_cancelled()
             return repo
             
         except GitCommandError as e:
@@ -145,12 +236,175 @@ class CodeFetcherAgent:
             logger.error(f"Failed to checkout branch {branch_name}: {str(e)}")
             raise
     
+    def resolve_revision(self, repo_url: str, revision: str) -> str:
+        """
+        Resolve a branch, tag or ref to a commit SHA without cloning.
+        
+        Args:
+            repo_url (str): URL of the Git repository
+            revision (str): Branch name, tag, full ref or commit SHA
+            
+        Returns:
+            str: 40 character commit SHA
+            
+        Raises:
+            ValueError: If the revision does not exist in the remote
+            GitCommandError: If the remote cannot be queried
+        """
+        if len(revision) == 40 and all(c in "0123456789abcdef" for c in revision.lower()):
+            return revision.lower()
+        
+        candidates = [revision] if revision.startswith("refs/") else [
+            f"refs/heads/{revision}", f"refs/tags/{revision}", revision
+        ]
+        # Peeled entries are only listed when asked for explicitly
+        patterns = candidates + [f"{candidate}^{{}}" for candidate in candidates]
+        output = git.cmd.Git().ls_remote(repo_url, *patterns)
+        
+        refs = {}
+        for line in output.splitlines():
+            sha, _, ref = line.partition("\t")
+            refs[ref] = sha
+        
+        for candidate in candidates:
+            # Annotated tags resolve to the tagged commit through the peeled entry
+            sha = refs.get(f"{candidate}^{{}}") or refs.get(candidate)
+            if sha:
+                return sha
+        
+        raise ValueError(f"Revision {revision} not found in {repo_url}")
+    
+    def _remote_ref(self, revision: str) -> str:
+        """
+        Get the remote ref a branch name, ref or commit is fetched from.
+        
+        Args:
+            revision (str): Branch name (optionally ``origin/`` prefixed), full ref or commit SHA
+            
+        Returns:
+            str: Source side of a fetch refspec
+        """
+        if is_commit_sha(revision) or revision.startswith('refs/'):
+            return revision
+        if revision.startswith('origin/'):
+            revision = revision[len('origin/'):]
+        return f"refs/heads/{revision}"
+    
+    def _fetch_pr_refs(
+        self,
+        repo_url: str,
+        target_dir: str,
+        target_branch: str,
+        source_branch: str
+    ) -> Tuple[Repo, str, str]:
+        """
+        Fetch the two sides of a PR and the history down to their merge base.
+        
+        Only the target and source refs are fetched, first ``PR_FETCH_DEPTH``
+        commits deep; the history is deepened until the merge base is reachable,
+        and fetched in full as a last resort.
+        
+        Args:
+            repo_url (str): URL of the Git repository
+            target_dir (str): Empty directory for the repository
+            target_branch (str): Target branch, ref or commit
+            source_branch (str): Source branch, ref or commit
+            
+        Returns:
+            Tuple[Repo, str, str]: Repository, merge base SHA and source SHA
+            
+        Raises:
+            GitCommandError: If a ref cannot be fetched
+            ValueError: If the branches have no common history
+        """
+        check_cancelled()
+        repo = Repo.init(target_dir)
+        refspecs = [
+            f"+{self._remote_ref(target_branch)}:{PR_TARGET_REF}",
+            f"+{self._remote_ref(source_branch)}:{PR_SOURCE_REF}"
+        ]
+        
+        def fetch(*options: str) -> None:
+            # git is killed if the fetch outlasts the scan's time budget
+            repo.git.fetch(repo_url, *refspecs, '--no-tags', *options, kill_after_timeout=remaining_seconds())
+            check_cancelled()
+        
+        depth = PR_FETCH_DEPTH
+        fetch(f"--depth={depth}")
+        base = merge_base(repo, PR_TARGET_REF, PR_SOURCE_REF)
+        for _ in range(PR_DEEPEN_ATTEMPTS):
+            if base is not None or not os.path.exists(os.path.join(repo.git_dir, 'shallow')):
+                break
+            logger.debug(f"Merge base not within {depth} commits, deepening")
+            fetch(f"--deepen={depth}")
+            depth *= 2
+            base = merge_base(repo, PR_TARGET_REF, PR_SOURCE_REF)
+        if base is None and os.path.exists(os.path.join(repo.git_dir, 'shallow')):
+            fetch('--unshallow')
+            base = merge_base(repo, PR_TARGET_REF, PR_SOURCE_REF)
+        if base is None:
+            raise ValueError(f"{target_branch} and {source_branch} have no common history")
+        
+        return repo, base, repo.git.rev_parse(PR_SOURCE_REF).strip()
+    
+    def _pr_patches(
+        self,
+        repo: Repo,
+        base: str,
+        head: str,
+        exclusions: Optional[Dict[str, Dict[str, int]]] = None
+    ) -> Iterator[str]:
+        """
+        Stream the patches of the changed files a review reads.
+        
+        The changed files are listed first; unsupported, vendored, generated
+        and oversized files are left out before git generates any patch text,
+        and patches longer than ``settings.pr_diff_max_file_kb`` are cut at a
+        hunk boundary.
+        
+        Args:
+            repo (Repo): Repository holding both commits
+            base (str): Merge base of the PR
+            head (str): Source commit of the PR
+            exclusions (Optional[Dict[str, Dict[str, int]]]): Filled with the
+                excluded files and bytes per reason, if given
+            
+        Yields:
+            str: Unified diff of one file
+        """
+        file_filter = self._file_filter()
+        max_size = getattr(settings, 'max_file_size_mb', 10) * 1024 * 1024
+        max_patch_bytes = int(getattr(settings, 'pr_diff_max_file_kb', 0) or 0) * 1024
+        
+        selected = []
+        for entry in list_changes(repo, base, head):
+            if not self._is_supported_file(entry.path) and not is_package_manifest(entry.path):
+                continue
+            size = int(repo.git.get_object_header(entry.blob_id)[2])
+            reason = file_filter.path_reason(entry.path)
+            if reason is None and size > max_size:
+                logger.warning(f"Skipping large file {entry.path} ({size} bytes)")
+                reason = REASON_TOO_LARGE
+            if reason is not None:
+                record_exclusion(exclusions, reason, size)
+                continue
+            selected.append(entry)
+        
+        logger.info(f"Diffing {len(selected)} changed files")
+        for patch in iter_file_patches(repo, base, head, selected, max_patch_bytes):
+            check_cancelled()
+            if patch.truncated:
+                logger.warning(f"Truncated diff of {patch.path} ({patch.omitted_bytes} bytes left out)")
+                record_exclusion(exclusions, REASON_TRUNCATED, patch.omitted_bytes)
+            yield patch.text
+    
     def get_pr_diff(
         self, 
         repo_url: str, 
         pr_id: int, 
         target_branch: str = "main", 
-        source_branch: str = None
+        source_branch: str = None,
+        exclusions: Optional[Dict[str, Dict[str, int]]] = None
     ) -> str:
         """
         Get the diff for a Pull Request between two branches.
@@ -160,9 +414,49 @@ class CodeFetcherAgent:
             pr_id (int): Pull request ID (for logging/tracking)
             target_branch (str): Target branch (usually main/master)
             source_branch (str): Source branch (PR branch)
+            exclusions (Optional[Dict[str, Dict[str, int]]]): Filled with the
+                changed files left out and patch bytes truncated per reason, if given
             
         Returns:
-            str: Git diff content between the branches
+            str: Git diff of the supported files changed since the merge base
+            
+        Raises:
+            Exception: If unable to fetch PR diff
+        """
+        diff_output = "".join(self.iter_pr_diff(repo_url, pr_id, target_branch, source_branch, exclusions))
+        
+        if not diff_output:
+            logger.warning(f"No differences found between {target_branch} and {source_branch}")
+            return f"# No differences found between {target_branch} and {source_branch}\n"
+        
+        logger.info(f"Successfully generated diff for PR #{pr_id}")
+        return diff_output
+    
+    def iter_pr_diff(
+        self, 
+        repo_url: str, 
+        pr_id: int, 
+        target_branch: str = "main", 
+        source_branch: str = None,
+        exclusions: Optional[Dict[str, Dict[str, int]]] = None
+    ) -> Iterator[str]:
+        """
+        Yield the diff of a Pull Request one file at a time.
+        
+        Without a mirror store, only the two branches and their history down
+        to the merge base are fetched into a temporary repository, which is
+        removed once the iterator is exhausted or closed.
+        
+        Args:
+            repo_url (str): URL of the Git repository
+            pr_id (int): Pull request ID (for logging/tracking)
+            target_branch (str): Target branch (usually main/master)
+            source_branch (str): Source branch (PR branch)
+            exclusions (Optional[Dict[str, Dict[str, int]]]): Filled with the
+                changed files left out and patch bytes truncated per reason, if given
+            
+        Yields:
+            str: Unified diff of one changed file
             
         Raises:
             Exception: If unable to fetch PR diff
@@ -173,44 +467,33 @@ class CodeFetcherAgent:
             logger.info(f"Fetching PR #{pr_id} diff from {repo_url}")
             logger.info(f"Target branch: {target_branch}, Source branch: {source_branch}")
             
+            mirror_store = self._mirror_store()
+            if mirror_store is not None:
+                if not source_branch:
+                    raise ValueError(f"Source branch must be provided for PR #{pr_id}")
+                
+                repo = mirror_store.sync(repo_url, [target_branch, source_branch])
+                target_sha = mirror_store.resolve(repo, target_branch)
+                source_sha = mirror_store.resolve(repo, source_branch)
+                if target_sha is None or source_sha is None:
+                    raise ValueError(f"{target_branch} or {source_branch} not found in {repo_url}")
+                base = merge_base(repo, target_sha, source_sha)
+                if base is None:
+                    raise ValueError(f"{target_branch} and {source_branch} have no common history")
+                
+                yield from self._pr_patches(repo, base, source_sha, exclusions)
+                return
+            
             # Create temporary directory
             temp_dir = tempfile.mkdtemp(prefix=f"aicode_pr_{pr_id}_")
             
-            # Clone repository
-            repo = self._clone_repository(repo_url, temp_dir)
-            
             # If source_branch is not provided, try to infer from PR
             # For now, we'll require it to be provided
             if not source_branch:
                 raise ValueError(f"Source branch must be provided for PR #{pr_id}")
             
-            # Fetch all remote branches to ensure we have both branches
-            repo.remotes.origin.fetch()
-            
-            # Checkout target branch first
-            self._checkout_branch(repo, target_branch)
-            
-            # Get diff between target and source branch
-            try:
-                # Use git diff to compare branches
-                diff_output = repo.git.diff(f"origin/{target_branch}...origin/{source_branch}")
-                
-                if not diff_output:
-                    logger.warning(f"No differences found between {target_branch} and {source_branch}")
-                    return f"# No differences found between {target_branch} and {source_branch}\n"
-                
-                logger.info(f"Successfully generated diff for PR #{pr_id}")
-                return diff_output
-                
-            except GitCommandError as e:
-                logger.error(f"Failed to generate diff: {str(e)}")
-                # Fallback: try different diff approach
-                try:
-                    diff_output = repo.git.diff(f"{target_branch}..{source_branch}")
-                    return diff_output
-                except GitCommandError as e2:
-                    logger.error(f"Fallback diff also failed: {str(e2)}")
-                    raise Exception(f"Unable to generate diff for PR #{pr_id}: {str(e)}")
+            repo, base, source_sha = self._fetch_pr_refs(repo_url, temp_dir, target_branch, source_branch)
+            yield from self._pr_patches(repo, base, source_sha, exclusions)
             
         except Exception as e:
             logger.error(f"Error fetching PR #{pr_id} diff: {str(e)}")
@@ -228,17 +511,82 @@ class CodeFetcherAgent:
     def get_project_files(
         self, 
         repo_url: str, 
-        branch_or_commit: str = "main"
-    ) -> Dict[str, str]:
+        branch_or_commit: str = "main",
+        manifests: Optional[Dict[str, str]] = None,
+        lazy: bool = False,
+        exclusions: Optional[Dict[str, Dict[str, int]]] = None,
+        content_keys: Optional[Dict[str, str]] = None
+    ) -> Mapping[str, str]:
         """
         Get all supported project files from a repository.
         
         Args:
             repo_url (str): URL of the Git repository
             branch_or_commit (str): Branch name or commit hash to checkout
+            manifests (Optional[Dict[str, str]]): Filled with the package manifests
+                found in the tree (path -> content), if given
+            lazy (bool): Only record the files and read each one when it is
+                accessed, instead of reading them all into a dict
+            exclusions (Optional[Dict[str, Dict[str, int]]]): Filled with the
+                ``files`` and ``bytes`` left out per reason, if given
+            content_keys (Optional[Dict[str, str]]): Filled with the git blob id
+                of each returned file, the key of its contents in the scan caches,
+                if given
             
         Returns:
-            Dict[str, str]: Dictionary mapping file paths to their content
+            Mapping[str, str]: Dictionary mapping file paths to their content, or a
+                LazyProjectFiles mapping if ``lazy`` is set
+            
+        Raises:
+            Exception: If unable to fetch project files
+        """
+        if lazy:
+            project_files = self._lazy_project_files(
+                repo_url, branch_or_commit, manifests, exclusions, content_keys
+            )
+        else:
+            project_files = dict(self.iter_project_files(
+                repo_url, branch_or_commit, manifests=manifests, exclusions=exclusions,
+                content_keys=content_keys
+            ))
+        
+        logger.info(f"Successfully collected {len(project_files)} project files")
+        
+        if not project_files:
+            logger.warning("No supported files found in the repository")
+        
+        return project_files
+    
+    def iter_project_files(
+        self, 
+        repo_url: str, 
+        branch_or_commit: str = "main",
+        manifests: Optional[Dict[str, str]] = None,
+        exclusions: Optional[Dict[str, Dict[str, int]]] = None,
+        content_keys: Optional[Dict[str, str]] = None
+    ) -> Iterator[Tuple[str, str]]:
+        """
+        Yield supported project files one at a time as they are read.
+        
+        The clone is removed once the iterator is exhausted or closed, so
+        callers can start processing the first files while the rest of the
+        working tree is still being walked.
+        
+        Args:
+            repo_url (str): URL of the Git repository
+            branch_or_commit (str): Branch name or commit hash to checkout
+            manifests (Optional[Dict[str, str]]): Filled with the package manifests
+                (``pyproject.toml``, ``package.json``, ...) found in the tree, which
+                mark the package boundaries of a monorepo
+            exclusions (Optional[Dict[str, Dict[str, int]]]): Filled with the
+                ``files`` and ``bytes`` left out per reason (ignored, vendored,
+                generated, too large), if given
+            content_keys (Optional[Dict[str, str]]): Filled with the git blob id
+                of each yielded file as it is yielded, the key of its contents in
+                the scan caches, if given
+            
+        Yields:
+            Tuple[str, str]: File path relative to the repository root and its content
             
         Raises:
             Exception: If unable to fetch project files
@@ -248,6 +596,18 @@ class CodeFetcherAgent:
         try:
             logger.info(f"Fetching project files from {repo_url} at {branch_or_commit}")
             
+            mirror_store = self._mirror_store()
+            if mirror_store is not None and getattr(settings, 'repository_mirror_checkout', False):
+                # The worktree is removed when the walk finishes or the iterator is closed
+                with mirror_store.worktree(repo_url, branch_or_commit) as worktree_dir:
+                    yield from self._walk_checkout(worktree_dir, manifests, exclusions, content_keys)
+                return
+            if mirror_store is not None:
+                yield from self._read_tree(
+                    mirror_store, repo_url, branch_or_commit, manifests, exclusions, content_keys
+                )
+                return
+            
             # Create temporary directory
             temp_dir = tempfile.mkdtemp(prefix="aicode_project_")
             
@@ -257,96 +617,634 @@ class CodeFetcherAgent:
             # Checkout specified branch or commit
             self._checkout_branch(repo, branch_or_commit)
             
-            # Collect all supported files
-            project_files = {}
-            supported_extensions = self._get_supported_file_extensions()
+            yield from self._walk_checkout(temp_dir, manifests, exclusions, content_keys)
+            
+        except Exception as e:
+            logger.error(f"Error fetching project files: {str(e)}")
+            raise Exception(f"Failed to fetch project files: {str(e)}")
+            
+        finally:
+            # Clean up temporary directory
+            if temp_dir and os.path.exists(temp_dir):
+                try:
+                    shutil.rmtree(temp_dir)
+                    logger.debug(f"Cleaned up temporary directory: {temp_dir}")
+                except Exception as e:
+                    logger.warning(f"Failed to clean up temporary directory {temp_dir}: {str(e)}")
             
-            logger.info(f"Scanning for files with extensions: {supported_extensions}")
+            if exclusions:
+                summary = ", ".join(
+                    f"{reason}: {counts['files']} files ({counts['bytes']} bytes)"
+                    for reason, counts in sorted(exclusions.items())
+                )
+                logger.info(f"Excluded from the scan: {summary}")
+    
+    def _file_filter(self) -> FileFilter:
+        """
+        Create the exclusion rules for one repository fetch.
+        
+        Returns:
+            FileFilter: Filter with the configured exclude globs
+        """
+        return FileFilter(
+            exclude_globs=getattr(settings, 'scan_exclude_globs', None) or (),
+            detect_vendored=getattr(settings, 'scan_exclude_vendored', True)
+        )
+    
+    def _excluded_directory(
+        self,
+        directory: str,
+        rel_dir: str,
+        reason: str,
+        exclusions: Optional[Dict[str, Dict[str, int]]]
+    ) -> None:
+        """
+        Count the supported files of a directory that is not walked.
+        
+        Excluded directories such as ``node_modules/`` can hold far more files
+        than the scanned code, so counting stops after
+        ``settings.scan_exclusion_count_limit`` files and the report then holds
+        a lower bound for the directory.
+        
+        Args:
+            directory (str): Absolute directory path
+            rel_dir (str): Directory relative to the repository root
+            reason (str): Exclusion reason
+            exclusions (Optional[Dict[str, Dict[str, int]]]): Exclusion report
+        """
+        if exclusions is None:
+            return
+        logger.debug(f"Skipping {reason} directory {rel_dir}")
+        remaining = max(0, int(getattr(settings, 'scan_exclusion_count_limit', 10000)))
+        for root, _, files in os.walk(directory):
+            check_cancelled()
+            for file in files[:remaining]:
+                if self._is_supported_file(file):
+                    try:
+                        record_exclusion(exclusions, reason, os.path.getsize(os.path.join(root, file)))
+                    except OSError:
+                        continue
+            remaining -= len(files)
+            if remaining <= 0:
+                logger.debug(f"Stopped counting files of {reason} directory {rel_dir}")
+                return
+    
+    def _checkout_entries(
+        self,
+        checkout_dir: str,
+        manifests: Optional[Dict[str, str]] = None,
+        file_filter: Optional[FileFilter] = None,
+        exclusions: Optional[Dict[str, Dict[str, int]]] = None
+    ) -> Iterator[Tuple[str, str, int]]:
+        """
+        Yield the supported files and package manifests of a working tree without reading them.
+        
+        ``.gitignore`` and ``.gitattributes`` files are added to the filter as
+        the walk reaches them, and excluded directories are not descended into.
+        
+        Args:
+            checkout_dir (str): Root of the working tree
+            manifests (Optional[Dict[str, str]]): Package manifests are included if given
+            file_filter (Optional[FileFilter]): Exclusion rules of the repository
+            exclusions (Optional[Dict[str, Dict[str, int]]]): Filled with the
+                excluded files and bytes per reason, if given
+            
+        Yields:
+            Tuple[str, str, int]: Path relative to the working tree, absolute path and size
+        """
+        supported_extensions = self._get_supported_file_extensions()
+        max_size = getattr(settings, 'max_file_size_mb', 10) * 1024 * 1024
+        
+        logger.info(f"Scanning for files with extensions: {supported_extensions}")
+        
+        # Walk through all files in the repository
+        for root, dirs, files in os.walk(checkout_dir):
+            rel_dir = os.path.relpath(root, checkout_dir).replace(os.sep, '/')
+            rel_dir = '' if rel_dir == '.' else rel_dir
+            
+            # Skip .git directory and other hidden directories
+            dirs[:] = [d for d in dirs if not d.startswith('.')]
+            
+            if file_filter is not None:
+                for rule_file in RULE_FILES:
+                    if rule_file not in files:
+                        continue
+                    try:
+                        with open(os.path.join(root, rule_file), 'r', encoding='utf-8', errors='ignore') as f:
+                            file_filter.add_rule_file(rel_dir, rule_file, f.read())
+                    except OSError as e:
+                        logger.warning(f"Failed to read {rel_dir}/{rule_file}: {str(e)}")
+                
+                kept_dirs = []
+                for d in dirs:
+                    rel_subdir = f"{rel_dir}/{d}" if rel_dir else d
+                    reason = file_filter.directory_reason(rel_subdir)
+                    if reason is None:
+                        kept_dirs.append(d)
+                    else:
+                        self._excluded_directory(os.path.join(root, d), rel_subdir, reason, exclusions)
+                dirs[:] = kept_dirs
             
-            # Walk through all files in the repository
-            for root, dirs, files in os.walk(temp_dir):
-                # Skip .git directory and other hidden directories
-                dirs[:] = [d for d in dirs if not d.startswith('.')]
+            for file in files:
+                check_cancelled()
+                file_path = os.path.join(root, file)
                 
-                for file in files:
-                    file_path = os.path.join(root, file)
-                    
-                    # Get relative path from repo root
-                    rel_path = os.path.relpath(file_path, temp_dir)
-                    
-                    # Skip if not a supported file type
+                # Get relative path from repo root
+                rel_path = os.path.relpath(file_path, checkout_dir)
+                
+                is_manifest = manifests is not None and is_package_manifest(rel_path)
+                
+                # Skip if not a supported file type
+                if not self._is_supported_file(rel_path) and not is_manifest:
+                    continue
+                
+                # Skip files that are too large
+                try:
+                    file_size = os.path.getsize(file_path)
+                except Exception as e:
+                    logger.warning(f"Failed to read file {rel_path}: {str(e)}")
+                    continue
+                
+                reason = file_filter.path_reason(rel_path.replace(os.sep, '/')) if file_filter is not None else None
+                if reason is None and file_size > max_size:
+                    logger.warning(f"Skipping large file {rel_path} ({file_size} bytes)")
+                    reason = REASON_TOO_LARGE
+                if reason is not None:
+                    record_exclusion(exclusions, reason, file_size)
+                    continue
+                
+                yield rel_path, file_path, file_size
+    
+    def _walk_checkout(
+        self,
+        checkout_dir: str,
+        manifests: Optional[Dict[str, str]] = None,
+        exclusions: Optional[Dict[str, Dict[str, int]]] = None,
+        content_keys: Optional[Dict[str, str]] = None
+    ) -> Iterator[Tuple[str, str]]:
+        """
+        Yield the supported files of a checked out working tree.
+        
+        Files are read by a pool of ``settings.scan_read_workers`` threads a
+        bounded number of files ahead of the consumer, and yielded in walk order.
+        
+        Args:
+            checkout_dir (str): Root of the working tree
+            manifests (Optional[Dict[str, str]]): Filled with the package manifests
+                found in the tree, if given
+            exclusions (Optional[Dict[str, Dict[str, int]]]): Filled with the
+                excluded files and bytes per reason, if given
+            content_keys (Optional[Dict[str, str]]): Filled with the blob id of
+                each yielded file from the checkout's index, if given
+            
+        Yields:
+            Tuple[str, str]: File path relative to the working tree and its content
+        """
+        file_filter = self._file_filter()
+        # The index already has the blob id of every checked out file
+        blob_ids = worktree_blob_ids(checkout_dir) if content_keys is not None else {}
+        workers = max(1, int(getattr(settings, 'scan_read_workers', 8)))
+        
+        def read_file(entry: Tuple[str, str, int]) -> Tuple[Tuple[str, str, int], Optional[str]]:
+            rel_path, file_path, _ = entry
+            try:
+                with open(file_path, 'r', encoding='utf-8', errors='ignore') as f:
+                    return entry, f.read()
+            except Exception as e:
+                logger.warning(f"Failed to read file {rel_path}: {str(e)}")
+                return entry, None
+        
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="aicode-read") as executor:
+            pending: deque = deque()
+            entries = self._checkout_entries(checkout_dir, manifests, file_filter, exclusions)
+            
+            while True:
+                # Keep a bounded window of reads in flight
+                for entry in entries:
+                    pending.append(executor.submit(read_file, entry))
+                    if len(pending) >= workers * 2:
+                        break
+                if not pending:
+                    break
+                
+                (rel_path, _, file_size), content = pending.popleft().result()
+                if content is None:
+                    continue
+                
+                if manifests is not None and is_package_manifest(rel_path):
+                    manifests[rel_path] = content
                     if not self._is_supported_file(rel_path):
                         continue
-                    
-                    # Skip files that are too large
-                    try:
-                        file_size = os.path.getsize(file_path)
-                        max_size = getattr(settings, 'max_file_size_mb', 10) * 1024 * 1024
-                        
-                        if file_size > max_size:
-                            logger.warning(f"Skipping large file {rel_path} ({file_size} bytes)")
-                            continue
-                        
-                        # Read file content
-                        with open(file_path, 'r', encoding='utf-8', errors='ignore') as f:
-                            content = f.read()
-                            project_files[rel_path] = content
-                            
-                        logger.debug(f"Added file: {rel_path} ({len(content)} characters)")
-                        
-                    except Exception as e:
-                        logger.warning(f"Failed to read file {rel_path}: {str(e)}")
+                
+                reason = file_filter.content_reason(rel_path, content[:HEADER_BYTES])
+                if reason is not None:
+                    record_exclusion(exclusions, reason, file_size)
+                    continue
+                
+                blob_id = blob_ids.get(rel_path.replace(os.sep, '/'))
+                if blob_id is not None:
+                    content_keys[rel_path] = blob_id
+                
+                logger.debug(f"Added file: {rel_path} ({len(content)} characters)")
+                yield rel_path, content
+    
+    def _is_wanted_tree_entry(
+        self,
+        entry: TreeEntry,
+        manifests: Optional[Dict[str, str]],
+        max_size: int,
+        file_filter: Optional[FileFilter] = None,
+        exclusions: Optional[Dict[str, Dict[str, int]]] = None
+    ) -> bool:
+        """
+        Apply the working tree walk's filters to a listed tree entry.
+        
+        Args:
+            entry (TreeEntry): File listed in a commit's tree
+            manifests (Optional[Dict[str, str]]): Package manifests are wanted if given
+            max_size (int): Largest file size read, in bytes
+            file_filter (Optional[FileFilter]): Exclusion rules of the repository
+            exclusions (Optional[Dict[str, Dict[str, int]]]): Filled with the
+                excluded files and bytes per reason, if given
+            
+        Returns:
+            bool: True if the file should be read
+        """
+        # Hidden directories are skipped like in a working tree walk
+        if any(part.startswith('.') for part in entry.path.split('/')[:-1]):
+            return False
+        is_manifest = manifests is not None and is_package_manifest(entry.path)
+        if not self._is_supported_file(entry.path) and not is_manifest:
+            return False
+        
+        reason = file_filter.path_reason(entry.path) if file_filter is not None else None
+        if reason is None and entry.size > max_size:
+            logger.warning(f"Skipping large file {entry.path} ({entry.size} bytes)")
+            reason = REASON_TOO_LARGE
+        if reason is not None:
+            record_exclusion(exclusions, reason, entry.size)
+            return False
+        return True
+    
+    def _select_tree(
+        self,
+        mirror_store: MirrorStore,
+        repo_url: str,
+        revision: str,
+        manifests: Optional[Dict[str, str]] = None,
+        exclusions: Optional[Dict[str, Dict[str, int]]] = None
+    ) -> Tuple[List[TreeEntry], BlobReader]:
+        """
+        List the files of a mirrored revision that pass the scan filters.
+        
+        The tree's ``.gitignore`` and ``.gitattributes`` files are read first,
+        outermost first, so every file is matched against all of its rules.
+        
+        Args:
+            mirror_store (MirrorStore): Mirror store holding the repository
+            repo_url (str): URL of the Git repository
+            revision (str): Branch name or commit hash
+            manifests (Optional[Dict[str, str]]): Package manifests are selected if given
+            exclusions (Optional[Dict[str, Dict[str, int]]]): Filled with the
+                excluded files and bytes per reason, if given
+            
+        Returns:
+            Tuple[List[TreeEntry], BlobReader]: Selected files and a reader for their blobs
+            
+        Raises:
+            ValueError: If the revision does not exist
+        """
+        repo = mirror_store.sync(repo_url, [revision])
+        sha = mirror_store.resolve(repo, revision)
+        if sha is None:
+            raise ValueError(f"Revision {revision} not found in {repo_url}")
+        
+        tree = mirror_store.list_tree(repo, sha)
+        reader = mirror_store.open_blob_reader(repo)
+        file_filter = self._file_filter()
+        max_size = getattr(settings, 'max_file_size_mb', 10) * 1024 * 1024
+        
+        rule_files = [
+            entry for entry in tree
+            if posixpath.basename(entry.path) in RULE_FILES
+            and not any(part.startswith('.') for part in entry.path.split('/')[:-1])
+        ]
+        for entry in sorted(rule_files, key=lambda entry: entry.path.count('/')):
+            file_filter.add_rule_file(
+                posixpath.dirname(entry.path),
+                posixpath.basename(entry.path),
+                reader.read(entry.oid).decode('utf-8', errors='ignore')
+            )
+        
+        selected = [
+            entry for entry in tree
+            if self._is_wanted_tree_entry(entry, manifests, max_size, file_filter, exclusions)
+        ]
+        return selected, reader
+    
+    def _read_tree(
+        self,
+        mirror_store: MirrorStore,
+        repo_url: str,
+        revision: str,
+        manifests: Optional[Dict[str, str]] = None,
+        exclusions: Optional[Dict[str, Dict[str, int]]] = None,
+        content_keys: Optional[Dict[str, str]] = None
+    ) -> Iterator[Tuple[str, str]]:
+        """
+        Yield the supported files of a revision straight from a mirror's objects.
+        
+        Applies the same filters as ``_walk_checkout``, but on the listed tree,
+        so unsupported, excluded and oversized files are never read.
+        
+        Args:
+            mirror_store (MirrorStore): Mirror store holding the repository
+            repo_url (str): URL of the Git repository
+            revision (str): Branch name or commit hash
+            manifests (Optional[Dict[str, str]]): Filled with the package manifests
+                found in the tree, if given
+            exclusions (Optional[Dict[str, Dict[str, int]]]): Filled with the
+                excluded files and bytes per reason, if given
+            content_keys (Optional[Dict[str, str]]): Filled with the blob id of
+                each yielded file, if given
+            
+        Yields:
+            Tuple[str, str]: File path relative to the repository root and its content
+        """
+        entries, reader = self._select_tree(mirror_store, repo_url, revision, manifests, exclusions)
+        file_filter = self._file_filter()
+        
+        try:
+            for entry in entries:
+                check_cancelled()
+                content = reader.read(entry.oid).decode('utf-8', errors='ignore')
+                
+                if manifests is not None and is_package_manifest(entry.path):
+                    manifests[entry.path] = content
+                    if not self._is_supported_file(entry.path):
                         continue
+                
+                reason = file_filter.content_reason(entry.path, content[:HEADER_BYTES])
+                if reason is not None:
+                    record_exclusion(exclusions, reason, entry.size)
+                    continue
+                
+                if content_keys is not None:
+                    content_keys[entry.path] = entry.oid
+                
+                logger.debug(f"Added file: {entry.path} ({len(content)} characters)")
+                yield entry.path, content
+        finally:
+            reader.close()
+    
+    def _lazy_project_files(
+        self,
+        repo_url: str,
+        branch_or_commit: str,
+        manifests: Optional[Dict[str, str]] = None,
+        exclusions: Optional[Dict[str, Dict[str, int]]] = None,
+        content_keys: Optional[Dict[str, str]] = None
+    ) -> LazyProjectFiles:
+        """
+        Record the supported project files of a revision without reading them.
+        
+        Mirrored repositories are listed from the object database and read
+        blob by blob; otherwise the temporary clone is kept until the mapping
+        is closed and its files are read through memory maps. Package
+        manifests are small and read right away. Generated files are only
+        recognized by their path in mirrored repositories, since checking
+        their content would mean reading every blob up front.
+        
+        Args:
+            repo_url (str): URL of the Git repository
+            branch_or_commit (str): Branch name or commit hash
+            manifests (Optional[Dict[str, str]]): Filled with the package manifests
+                found in the tree, if given
+            exclusions (Optional[Dict[str, Dict[str, int]]]): Filled with the
+                excluded files and bytes per reason, if given
+            content_keys (Optional[Dict[str, str]]): Filled with the blob id of
+                each recorded file, if given
+            
+        Returns:
+            LazyProjectFiles: Mapping of file path to content, read on access
+            
+        Raises:
+            Exception: If unable to fetch project files
+        """
+        temp_dir = None
+        
+        try:
+            logger.info(f"Listing project files of {repo_url} at {branch_or_commit}")
+            entries: Dict[str, ProjectFileEntry] = {}
+            
+            mirror_store = self._mirror_store()
+            if mirror_store is not None:
+                selected, reader = self._select_tree(
+                    mirror_store, repo_url, branch_or_commit, manifests, exclusions
+                )
+                for entry in selected:
+                    if manifests is not None and is_package_manifest(entry.path):
+                        manifests[entry.path] = reader.read(entry.oid).decode('utf-8', errors='ignore')
+                        if not self._is_supported_file(entry.path):
+                            continue
+                    entries[entry.path] = ProjectFileEntry(path=entry.path, size=entry.size, blob_id=entry.oid)
+                    if content_keys is not None:
+                        content_keys[entry.path] = entry.oid
+                
+                return LazyProjectFiles(
+                    entries, lambda entry: reader.read(entry.blob_id).decode('utf-8', errors='ignore')
+                )
+            
+            # Create temporary directory, owned by the returned mapping
+            temp_dir = tempfile.mkdtemp(prefix="aicode_project_")
             
-            logger.info(f"Successfully collected {len(project_files)} project files")
+            repo = self._clone_repository(repo_url, temp_dir)
+            self._checkout_branch(repo, branch_or_commit)
             
-            if not project_files:
-                logger.warning("No supported files found in the repository")
+            file_filter = self._file_filter()
+            blob_ids = worktree_blob_ids(temp_dir) if content_keys is not None else {}
+            for rel_path, file_path, file_size in self._checkout_entries(temp_dir, manifests, file_filter, exclusions):
+                if manifests is not None and is_package_manifest(rel_path):
+                    with open(file_path, 'r', encoding='utf-8', errors='ignore') as f:
+                        manifests[rel_path] = f.read()
+                    if not self._is_supported_file(rel_path):
+                        continue
+                
+                # Only the first bytes are read to recognize generated files
+                with open(file_path, 'r', encoding='utf-8', errors='ignore') as f:
+                    reason = file_filter.content_reason(rel_path, f.read(HEADER_BYTES))
+                if reason is not None:
+                    record_exclusion(exclusions, reason, file_size)
+                    continue
+                
+                blob_id = blob_ids.get(rel_path.replace(os.sep, '/'))
+                entries[rel_path] = ProjectFileEntry(
+                    path=rel_path, size=file_size, blob_id=blob_id, location=file_path
+                )
+                if blob_id is not None:
+                    content_keys[rel_path] = blob_id
             
-            return project_files
+            return LazyProjectFiles.from_checkout(entries, cleanup_dir=temp_dir)
             
         except Exception as e:
             logger.error(f"Error fetching project files: {str(e)}")
+            if temp_dir and os.path.exists(temp_dir):
+                shutil.rmtree(temp_dir, ignore_errors=True)
             raise Exception(f"Failed to fetch project files: {str(e)}")
+    
+    def parse_diff(self, diff_content: str) -> ChangeSet:
+        """
+        Parse a git diff into a ChangeSet.
+        
+        Args:
+            diff_content (str): Git diff content
+            
+        Returns:
+            ChangeSet: Changed files with status, paths and hunks
+        """
+        return parse_unified_diff(diff_content)
+    
+    def get_changed_files_from_diff(self, diff_content: Union[str, ChangeSet]) -> list:
+        """
+        Extract list of changed files from a git diff.
+        
+        Args:
+            diff_content (Union[str, ChangeSet]): Git diff content, or a ChangeSet
+                already parsed from it
+            
+        Returns:
+            list: List of file paths that were changed
+        """
+        changed_files = []
+        
+        try:
+            change_set = diff_content if isinstance(diff_content, ChangeSet) else self.parse_diff(diff_content)
+            
+            for file_path in change_set.paths():
+                if self._is_supported_file(file_path):
+                    changed_files.append(file_path)
+                    
+        except Exception as e:
+            logger.warning(f"Failed to parse changed files from diff: {str(e)}")
+        
+        return changed_files
+    
+    def get_files_at_revision(
+        self,
+        repo_url: str,
+        file_paths: List[str],
+        revision: str
+    ) -> Dict[str, str]:
+        """
+        Get contents of several files at a revision with a single clone.
+        
+        Args:
+            repo_url (str): URL of the Git repository
+            file_paths (List[str]): Repository-relative file paths
+            revision (str): Branch name, tag or commit hash
+            
+        Returns:
+            Dict[str, str]: Mapping of file path to content for files that exist
+        """
+        temp_dir = None
+        contents = {}
+        
+        if not file_paths:
+            return contents
+        
+        try:
+            logger.info(f"Fetching {len(file_paths)} files at revision {revision}")
+            
+            mirror_store = self._mirror_store()
+            if mirror_store is not None:
+                contents = mirror_store.read_files(repo_url, file_paths, revision)
+                logger.info(f"Retrieved {len(contents)}/{len(file_paths)} files at revision {revision}")
+                return contents
+            
+            # Create temporary directory
+            temp_dir = tempfile.mkdtemp(prefix="aicode_files_")
+            
+            # Clone repository and read blobs straight from the object database
+            repo = self._clone_repository(repo_url, temp_dir)
+            
+            for ref in (f"origin/{revision}", revision):
+                try:
+                    commit = repo.commit(ref)
+                    break
+                except Exception:
+                    commit = None
+            
+            if commit is None:
+                logger.warning(f"Revision {revision} not found in {repo_url}")
+                return contents
+            
+            for file_path in file_paths:
+                try:
+                    blob = commit.tree / file_path
+                    contents[file_path] = blob.data_stream.read().decode('utf-8', errors='ignore')
+                except KeyError:
+                    logger.debug(f"File {file_path} not found at revision {revision}")
+            
+            logger.info(f"Retrieved {len(contents)}/{len(file_paths)} files at revision {revision}")
+            return contents
+            
+        except Exception as e:
+            logger.error(f"Error fetching files at revision {revision}: {str(e)}")
+            return contents
             
         finally:
             # Clean up temporary directory
             if temp_dir and os.path.exists(temp_dir):
                 try:
                     shutil.rmtree(temp_dir)
-                    logger.debug(f"Cleaned up temporary directory: {temp_dir}")
                 except Exception as e:
                     logger.warning(f"Failed to clean up temporary directory {temp_dir}: {str(e)}")
     
-    def get_changed_files_from_diff(self, diff_content: str) -> list:
+    def get_files_at_commits(
+        self,
+        repo_url: str,
+        requests: List[Tuple[str, str]]
+    ) -> Dict[Tuple[str, str], FileVersion]:
         """
-        Extract list of changed files from a git diff.
+        Get contents and blob ids of files at several commits in one pass.
+        
+        All revisions are read through a single git session against the
+        repository mirror, with recently read blobs served from memory.
+        Without a mirror store, one temporary mirror serves the whole batch.
         
         Args:
-            diff_content (str): Git diff content
+            repo_url (str): URL of the Git repository
+            requests (List[Tuple[str, str]]): (file path, commit hash or branch) pairs
             
         Returns:
-            list: List of file paths that were changed
+            Dict[Tuple[str, str], FileVersion]: Versions by (file path, revision)
+                for the files that exist
         """
-        changed_files = []
+        temp_dir = None
         
         try:
-            lines = diff_content.split('\n')
-            
-            for line in lines:
-                # Look for diff headers that indicate file changes
-                if line.startswith('diff --git'):
-                    # Extract file path from "diff --git a/path b/path"
-                    parts = line.split()
-                    if len(parts) >= 4:
-                        file_path = parts[3][2:]  # Remove "b/" prefix
-                        if self._is_supported_file(file_path):
-                            changed_files.append(file_path)
-                            
+            logger.info(f"Fetching {len(requests)} file versions from {repo_url}")
+            
+            mirror_store = self._mirror_store()
+            if mirror_store is None:
+                temp_dir = tempfile.mkdtemp(prefix="aicode_versions_")
+                mirror_store = MirrorStore(temp_dir)
+            
+            versions = mirror_store.read_versions(repo_url, requests)
+            logger.info(f"Retrieved {len(versions)}/{len(requests)} file versions")
+            return versions
+            
         except Exception as e:
-            logger.warning(f"Failed to parse changed files from diff: {str(e)}")
-        
-        return list(set(changed_files))  # Remove duplicates
+            logger.error(f"Error fetching file versions from {repo_url}: {str(e)}")
+            return {}
+            
+        finally:
+            # Clean up temporary directory
+            if temp_dir and os.path.exists(temp_dir):
+                try:
+                    shutil.rmtree(temp_dir)
+                except Exception as e:
+                    logger.warning(f"Failed to clean up temporary directory {temp_dir}: {str(e)}")
     
     def get_file_content_at_commit(
         self, 
@@ -370,6 +1268,16 @@ class CodeFetcherAgent:
         try:
             logger.info(f"Fetching {file_path} at commit {commit_hash}")
             
+            mirror_store = self._mirror_store()
+            if mirror_store is not None:
+                version = mirror_store.read_versions(repo_url, [(file_path, commit_hash)]).get((file_path, commit_hash))
+                if version is None:
+                    logger.warning(f"File {file_path} not found at commit {commit_hash}")
+                    return None
+                
+                logger.info(f"Successfully retrieved {file_path} ({len(version.content)} characters)")
+                return version.content
+            
             # Create temporary directory
             temp_dir = tempfile.mkdtemp(prefix="aicode_file_")
             
@@ -3,8 +3,8 @@ ImpactAnalysisAgent cho hệ thống AI Code Reviewer.
 
 Agent này chịu trách nhiệm phân tích tác động của thay đổi mã nguồn (diff), xác định các thành phần bị ảnh hưởng dựa trên dependency graph, và lan truyền tác động (propagation).
 """
-import re
 from typing import Set, List
+from ...diff_model import parse_unified_diff
 from .models import ImpactAnalysisInput, ImpactAnalysisResult, ImpactedEntity
 
 class ImpactAnalysisAgent:
@@ -25,15 +25,8 @@ class ImpactAnalysisAgent:
         Returns:
             Set[str]: Tên file bị thay đổi
         """
-        changed_files = set()
-        for line in diff.splitlines():
-            if line.startswith('diff --git'):
-                parts = line.split(' ')
-                if len(parts) >= 3:
-                    # diff --git a/foo.py b/foo.py
-                    file_b = parts[3][2:] if parts[3].startswith('b/') else parts[3]
-                    changed_files.add(file_b)
-        return changed_files
+        # Dùng chung parser với orchestrator thay vì tách diff lại lần nữa
+        return set(parse_unified_diff(diff).paths())
 
     def _propagate_impact(self, changed: Set[str], dependency_graph: dict) -> List[ImpactedEntity]:
         """
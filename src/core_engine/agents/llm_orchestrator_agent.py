@@ -6,6 +6,7 @@ interactions with Large Language Models (LLMs) for semantic code analysis.
 Supports mock LLM behavior, OpenAI GPT models, and Google Gemini models.
 """
 
+import asyncio
 import logging
 import json
 import os
@@ -22,11 +23,15 @@ try:
 except ImportError:
     ChatGoogleGenerativeAI = None
 
+from ..cancellation import REASON_DEADLINE, ScanCancelled, budget_exhausted, check_cancelled, remaining_seconds
 from .rag_context_agent import RAGContextAgent
 
 # Configure logging
 logger = logging.getLogger(__name__)
 
+# Maximum number of concurrent LLM requests per analysis in the async API
+DEFAULT_LLM_CONCURRENCY = 4
+
 
 class LLMOrchestratorAgent:
     """
@@ -413,6 +418,8 @@ Recommend providing code samples for detailed analysis.
         Returns:
             str: LLM response with analysis
         """
+        check_cancelled()
+        
         try:
             # Get RAG context if enabled
             rag_context = None
@@ -482,25 +489,76 @@ Recommend providing code samples for detailed analysis.
                 except Exception as e:
                     logger.warning(f"Failed to build RAG knowledge base: {str(e)}")
             
-            # Analyze each file
-            analyses = []
-            for file_path, code in code_files.items():
-                file_findings = [f for f in (static_findings or []) 
-                               if f.get('file_path') == file_path]
+            # Analyze files with findings first; once most of the scan's time
+            # budget is used, files without findings are no longer reviewed
+            analyses = {}
+            skipped = []
+            for file_path in self._by_review_priority(code_files, static_findings):
+                file_findings = self._file_findings(static_findings, file_path)
+                if not file_findings and budget_exhausted():
+                    skipped.append(file_path)
+                    continue
                 
-                analysis = self.invoke_llm(
+                analyses[file_path] = self.invoke_llm(
                     prompt=f"Analyze code file: {file_path}",
-                    code_snippet=code,
+                    code_snippet=code_files[file_path],
                     static_findings=file_findings
                 )
-                analyses.append(f"# Analysis for {file_path}\n\n{analysis}")
             
-            return "\n\n".join(analyses)
+            return self._join_file_analyses(code_files, analyses, skipped)
             
         except Exception as e:
             logger.error(f"Error analyzing code files: {str(e)}")
             return f"Error analyzing code files: {str(e)}"
     
+    @staticmethod
+    def _file_findings(static_findings: Optional[List[Dict]], file_path: str) -> List[Dict]:
+        """Static findings reported for a single file."""
+        return [f for f in (static_findings or [])
+                if f.get('file_path', f.get('file')) == file_path]
+    
+    def _by_review_priority(self, code_files: Dict[str, str],
+                            static_findings: Optional[List[Dict]]) -> List[str]:
+        """
+        Order files for LLM review: files with the most static findings first.
+        
+        Args:
+            code_files (Dict[str, str]): Dictionary mapping file paths to code content
+            static_findings (List[Dict]): Static analysis findings (optional)
+            
+        Returns:
+            List[str]: File paths in review order (input order among equals)
+        """
+        counts = {}
+        for finding in static_findings or []:
+            file_path = finding.get('file_path', finding.get('file'))
+            counts[file_path] = counts.get(file_path, 0) + 1
+        return sorted(code_files, key=lambda file_path: -counts.get(file_path, 0))
+    
+    @staticmethod
+    def _join_file_analyses(code_files: Dict[str, str], analyses: Dict[str, str],
+                            skipped: List[str]) -> str:
+        """
+        Combine per-file analyses in input order, noting files that were skipped.
+        
+        Args:
+            code_files (Dict[str, str]): Analyzed files, in report order
+            analyses (Dict[str, str]): LLM analysis per file path
+            skipped (List[str]): Files not reviewed because of the scan's time budget
+            
+        Returns:
+            str: Combined analysis
+        """
+        sections = [f"# Analysis for {file_path}\n\n{analyses[file_path]}"
+                    for file_path in code_files if file_path in analyses]
+        if skipped:
+            logger.warning(f"Skipped LLM review of {len(skipped)} files without findings (time budget)")
+            sections.append(
+                f"# Skipped files\n\nLLM review of {len(skipped)} files without static analysis "
+                f"findings was skipped to stay within the scan's time budget."
+            )
+        return "\n\n".join(sections)
+    
     def analyze_pr_diff(self, pr_diff: str, static_findings: List[Dict] = None) -> str:
         """
         Analyze a Pull Request diff.
@@ -519,6 +577,142 @@ Recommend providing code samples for detailed analysis.
         
         return self.invoke_llm(prompt, pr_diff, static_findings)
     
+    async def ainvoke_llm(self, prompt: str, code_snippet: str = None,
+                          static_findings: List[Dict] = None) -> str:
+        """
+        Async variant of ``invoke_llm``.
+        
+        Uses the provider's native async client, so the event loop is never
+        blocked on the HTTP call. Vector store lookups for RAG context are
+        blocking and run in a worker thread.
+        
+        Args:
+            prompt (str): Base prompt or analysis request
+            code_snippet (str): Code to analyze (optional)
+            static_findings (List[Dict]): Static analysis findings (optional)
+            
+        Returns:
+            str: LLM response with analysis
+        """
+        check_cancelled()
+        
+        try:
+            rag_context = None
+            if self.use_rag and code_snippet:
+                try:
+                    rag_context = await asyncio.to_thread(self.rag_agent.query_knowledge_base, code_snippet)
+                except Exception as e:
+                    logger.warning(f"Failed to get RAG context: {str(e)}")
+            
+            full_prompt = self._construct_analysis_prompt(
+                prompt=prompt,
+                code_snippet=code_snippet,
+                static_findings=static_findings,
+                rag_context=rag_context
+            )
+            
+            if self.llm_provider == 'mock':
+                return self._generate_mock_response(
+                    prompt=prompt,
+                    code_snippet=code_snippet,
+                    static_findings=static_findings,
+                    rag_context=rag_context
+                )
+            
+            if self.llm_instance is None:
+                logger.error(f"LLM instance not initialized for provider: {self.llm_provider}")
+                return f"Error: LLM instance not available for provider {self.llm_provider}"
+            
+            try:
+                # The request is abandoned when the scan runs out of time
+                response = await asyncio.wait_for(
+                    self.llm_instance.ainvoke(full_prompt), timeout=remaining_seconds()
+                )
+                
+                if hasattr(response, 'content'):
+                    return response.content
+                else:
+                    return str(response)
+                    
+            except asyncio.TimeoutError:
+                raise ScanCancelled(REASON_DEADLINE)
+            except Exception as e:
+                logger.error(f"Error calling {self.llm_provider} API: {str(e)}")
+                return f"Error calling {self.llm_provider} API: {str(e)}"
+            
+        except Exception as e:
+            logger.error(f"Error invoking LLM: {str(e)}")
+            return f"Error analyzing code: {str(e)}"
+    
+    async def aanalyze_code_with_context(self, code_files: Dict[str, str],
+                                         static_findings: List[Dict] = None,
+                                         max_concurrency: int = DEFAULT_LLM_CONCURRENCY) -> str:
+        """
+        Async variant of ``analyze_code_with_context``.
+        
+        Files are analyzed concurrently, with at most ``max_concurrency``
+        requests in flight; the result keeps the input file order.
+        
+        Args:
+            code_files (Dict[str, str]): Dictionary mapping file paths to code content
+            static_findings (List[Dict]): Static analysis findings (optional)
+            max_concurrency (int): Maximum number of concurrent LLM requests
+            
+        Returns:
+            str: LLM analysis of the code files
+        """
+        try:
+            if self.use_rag:
+                try:
+                    await asyncio.to_thread(self.rag_agent.build_knowledge_base, code_files)
+                except Exception as e:
+                    logger.warning(f"Failed to build RAG knowledge base: {str(e)}")
+            
+            findings = list(static_findings or [])
+            semaphore = asyncio.Semaphore(max(1, max_concurrency))
+            analyses = {}
+            skipped = []
+            
+            async def analyze_file(file_path: str) -> None:
+                file_findings = self._file_findings(findings, file_path)
+                async with semaphore:
+                    if not file_findings and budget_exhausted():
+                        skipped.append(file_path)
+                        return
+                    analyses[file_path] = await self.ainvoke_llm(
+                        prompt=f"Analyze code file: {file_path}",
+                        code_snippet=code_files[file_path],
+                        static_findings=file_findings
+                    )
+            
+            # Requests start in priority order, so files with findings go first
+            await asyncio.gather(
+                *(analyze_file(file_path) for file_path in self._by_review_priority(code_files, findings))
+            )
+            return self._join_file_analyses(code_files, analyses, skipped)
+            
+        except Exception as e:
+            logger.error(f"Error analyzing code files: {str(e)}")
+            return f"Error analyzing code files: {str(e)}"
+    
+    async def aanalyze_pr_diff(self, pr_diff: str, static_findings: List[Dict] = None) -> str:
+        """
+        Async variant of ``analyze_pr_diff``.
+        
+        Args:
+            pr_diff (str): PR diff content
+            static_findings (List[Dict]): Static analysis findings for the PR
+            
+        Returns:
+            str: LLM analysis of the PR changes
+        """
+        logger.info("Analyzing PR diff with LLM")
+        
+        prompt = ("Please analyze the following Pull Request diff and provide insights on "
+                 "the changes, potential issues, and recommendations:")
+        
+        return await self.ainvoke_llm(prompt, pr_diff, static_findings)
+    
     def get_provider_info(self) -> Dict[str, Any]:
         """
         Get information about the current LLM provider configuration.
@@ -382,7 +382,9 @@ Directory summaries:
     def scan_entire_project(
         self, 
         code_files: Dict[str, str],
-        static_findings: Optional[List[Dict]] = None
+        static_findings: Optional[List[Dict]] = None,
+        complexity_metrics: Optional[Dict[str, Any]] = None,
+        knowledge_base_ready: bool = False
     ) -> Dict[str, Any]:
         """
         Perform comprehensive project-level scanning and analysis.
@@ -390,6 +392,9 @@ Directory summaries:
         Args:
             code_files (Dict[str, str]): Dictionary mapping file paths to code content
             static_findings (Optional[List[Dict]]): Static analysis findings
+            complexity_metrics (Optional[Dict[str, Any]]): Metrics already calculated
+                by the workflow; calculated here when not provided
+            knowledge_base_ready (bool): Whether the RAG knowledge base was already built
             
         Returns:
             Dict[str, Any]: Comprehensive project analysis report
@@ -398,13 +403,15 @@ Directory summaries:
         
         try:
             # Calculate project complexity metrics using RiskPredictor
-            complexity_metrics = self.risk_predictor.calculate_code_metrics(code_files)
+            if complexity_metrics is None:
+                complexity_metrics = self.risk_predictor.calculate_code_metrics(code_files)
             logger.info(f"Project metrics: {complexity_metrics['total_files']} files, "
                        f"{complexity_metrics['total_lines']} lines")
             
             # Build RAG knowledge base for project-wide context
-            logger.info("Building RAG knowledge base")
-            self.rag_agent.build_knowledge_base(code_files)
+            if not knowledge_base_ready:
+                logger.info("Building RAG knowledge base")
+                self.rag_agent.build_knowledge_base(code_files)
             
             # Determine if hierarchical summarization is needed
             use_hierarchical = len(code_files) > self.max_files_for_direct_analysis
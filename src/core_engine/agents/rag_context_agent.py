@@ -25,6 +25,7 @@ from pydantic import BaseModel
 
 import logging
 
+from ..cancellation import check_cancelled
 from .knowledge_graph.neo4j_client import Neo4jClient
 from .knowledge_graph.schema import CodeNode, CodeEdge, CodeGraph
 
@@ -142,6 +143,8 @@ class RAGContextAgent:
         """
         try:
             for file_path, code in code_files.items():
+                check_cancelled()
+                
                 # Split code into chunks
                 chunks = self._chunk_code(code, file_path)
                 
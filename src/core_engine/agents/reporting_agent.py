@@ -7,11 +7,12 @@ data structure and Markdown formatting for comprehensive code review reports.
 """
 
 import logging
-from typing import Dict, List, Optional, Any
+from typing import Dict, Iterator, List, Optional, Any, Set
 from datetime import datetime
 import json
 
 from ..diagramming_engine import DiagrammingEngine
+from ..findings_stream import FindingsStream
 
 # Configure logging
 logger = logging.getLogger(__name__)
@@ -45,15 +46,19 @@ class ReportingAgent:
         logger.info("ReportingAgent initialized with diagram generation support")
     
     def generate_report_data(self, static_findings: List[Dict], llm_insights: str, 
-                           scan_details: Dict, code_files: Optional[Dict[str, Any]] = None) -> Dict:
+                           scan_details: Dict, code_files: Optional[Dict[str, Any]] = None,
+                           diagrams: Optional[List[Dict[str, Any]]] = None) -> Dict:
         """
         Generate structured report data from analysis results.
         
         Args:
             static_findings (List[Dict]): Static analysis findings from StaticAnalysisAgent
+                (or a FindingsStream, which is iterated lazily)
             llm_insights (str): LLM analysis insights from LLMOrchestratorAgent
             scan_details (Dict): Scan metadata (repo URL, PR ID, etc.)
             code_files (Optional[Dict[str, Any]]): AST data for diagram generation
+            diagrams (Optional[List[Dict[str, Any]]]): Diagrams already extracted by the
+                workflow; when given, diagram generation is skipped
             
         Returns:
             Dict: Structured report data ready for formatting
@@ -84,8 +89,9 @@ class ReportingAgent:
             # Process LLM insights
             llm_review = self._process_llm_insights(llm_insights)
             
-            # Generate class diagrams if code files provided
-            diagrams = self._generate_diagrams(code_files, static_findings)
+            # Generate class diagrams if code files provided and not extracted upstream
+            if diagrams is None:
+                diagrams = self._generate_diagrams(code_files, static_findings)
             
             # Construct structured report data
             report_data = {
@@ -112,6 +118,10 @@ class ReportingAgent:
                 }
             }
             
+            # Per-stage timing recorded by the workflow's tracing spans
+            if scan_details.get("trace"):
+                report_data["metadata"]["trace"] = scan_details["trace"]
+            
             logger.info(f"Generated report data with {total_findings} findings")
             return report_data
             
@@ -781,10 +791,62 @@ Please check the logs for more details and try again.
         
         return diagrams
     
+    def iter_json(self, report_data: Dict) -> Iterator[str]:
+        """
+        Encode report data as JSON in chunks.
+        
+        The output matches ``json.dumps(report_data, indent=2)``, but a spilled
+        FindingsStream is written one finding at a time as it is read from disk
+        instead of being loaded into a list first.
+        
+        Args:
+            report_data (Dict): Report data to encode
+            
+        Returns:
+            Iterator[str]: Consecutive chunks of the JSON document
+        """
+        encoder = json.JSONEncoder(ensure_ascii=False)
+        return self._iter_json(report_data, encoder, 0, set())
+    
+    def _iter_json(self, obj: Any, encoder: json.JSONEncoder, level: int, seen: Set[int]) -> Iterator[str]:
+        """Encode one value of the report at the given indentation level."""
+        if not isinstance(obj, (dict, list, tuple, FindingsStream)):
+            yield encoder.encode(obj)
+            return
+        
+        if id(obj) in seen:
+            raise ValueError("Circular reference detected")
+        seen.add(id(obj))
+        
+        is_dict = isinstance(obj, dict)
+        items = obj.items() if is_dict else ((None, value) for value in obj)
+        indent = "\n" + "  " * (level + 1)
+        separator = ""
+        yield "{" if is_dict else "["
+        for key, value in items:
+            yield separator + indent
+            separator = ","
+            if is_dict:
+                yield encoder.encode(self._json_key(key)) + ": "
+            yield from self._iter_json(value, encoder, level + 1, seen)
+        if separator:
+            yield "\n" + "  " * level
+        yield "}" if is_dict else "]"
+        
+        seen.discard(id(obj))
+    
+    def _json_key(self, key: Any) -> str:
+        """Convert a dictionary key to a JSON object key like the json module does."""
+        if isinstance(key, str):
+            return key
+        if key is None or isinstance(key, (bool, int, float)):
+            return json.dumps(key)
+        raise TypeError(f"keys must be str, int, float, bool or None, not {type(key).__name__}")
+    
     def export_json(self, report_data: Dict) -> str:
         """Export report data as JSON string."""
         try:
-            return json.dumps(report_data, indent=2, ensure_ascii=False)
+            return "".join(self.iter_json(report_data))
         except Exception as e:
             logger.error(f"Error exporting JSON: {str(e)}")
             return json.dumps({"error": str(e)}, indent=2) 
\ No newline at end of file
@@ -10,6 +10,8 @@ import logging
 from typing import Dict, List, Optional, Any, Tuple
 import os
 
+from ..cancellation import check_cancelled
+
 try:
     import tree_sitter
     from tree_sitter import Language, Parser, Node
@@ -868,6 +870,7 @@ class StaticAnalysisAgent:
         ]
         
         for rule_method in rule_methods:
+            check_cancelled()
             try:
                 rule_findings = rule_method(ast_node)
                 findings.extend(rule_findings)
@@ -1090,6 +1093,7 @@ class StaticAnalysisAgent:
         ]
         
         for rule_method in rule_methods:
+            check_cancelled()
             try:
                 rule_findings = rule_method(ast_node)
                 findings.extend(rule_findings)
@@ -1348,6 +1352,7 @@ class StaticAnalysisAgent:
         ]
         
         for rule_method in rule_methods:
+            check_cancelled()
             try:
                 rule_findings = rule_method(ast_node)
                 findings.extend(rule_findings)
@@ -1543,6 +1548,7 @@ class StaticAnalysisAgent:
         ]
         
         for rule_method in rule_methods:
+            check_cancelled()
             try:
                 rule_findings = rule_method(ast_node)
                 findings.extend(rule_findings)
@@ -1872,6 +1878,7 @@ class StaticAnalysisAgent:
         ]
         
         for rule_method in rule_methods:
+            check_cancelled()
             try:
                 rule_findings = rule_method(ast_node)
                 findings.extend(rule_findings)
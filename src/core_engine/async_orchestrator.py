@@ -0,0 +1,309 @@
+"""
+Asyncio execution of the scan workflow for AI Code Review System.
+
+This module provides async variants of the orchestrator nodes so a scan can be
+driven from an event loop (e.g. the FastAPI process) without blocking it:
+
+- LLM calls use the providers' native async clients.
+- Blocking I/O without an async client (git via GitPython, the vector store)
+  runs on a dedicated I/O thread pool.
+- CPU-bound stages (parsing, static rules, metrics, diagrams, reporting) run
+  on a separate, CPU-sized thread pool so they cannot starve I/O stages.
+
+The graph structure and the node logic are shared with the synchronous
+workflow in ``orchestrator``; only the way each node is executed differs.
+"""
+
+import asyncio
+import contextvars
+import logging
+import os
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from typing import Any, Callable, Dict, Optional
+
+from langgraph.checkpoint.base import BaseCheckpointSaver
+from langgraph.graph.graph import CompiledGraph
+
+from .agent_pool import AgentPool, acquire_agent
+from .orchestrator import (
+    LLM_PROVIDER,
+    STAGED_NODES,
+    GraphState,
+    _llm_analysis_result,
+    _llm_analysis_request,
+    _llm_cache_key,
+    _is_resume_point,
+    _renew_time_budget,
+    build_workflow,
+    create_initial_state,
+    diagram_extraction_node,
+    fetch_code_node,
+    handle_error_node,
+    impact_analysis_node,
+    join_analysis_node,
+    knowledge_base_node,
+    parse_code_node,
+    project_scanning_node,
+    reporting_node,
+    risk_metrics_node,
+    start_scan,
+    static_analysis_node,
+    stream_files_node
+)
+from .stage_cache import get_stage_cache
+from .tracing import trace_span
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+EXECUTOR_CPU = "cpu"
+EXECUTOR_IO = "io"
+
+_executors: Dict[str, ThreadPoolExecutor] = {}
+
+
+def get_executor(kind: str) -> ThreadPoolExecutor:
+    """
+    Get the shared thread pool for a kind of work.
+
+    Args:
+        kind (str): "cpu" for CPU-bound stages, "io" for blocking I/O
+
+    Returns:
+        ThreadPoolExecutor: Pool sized from ``scan_cpu_workers`` / ``scan_io_workers``
+    """
+    if kind not in _executors:
+        from config.settings import settings
+
+        if kind == EXECUTOR_CPU:
+            max_workers = settings.scan_cpu_workers or os.cpu_count() or 1
+        else:
+            max_workers = settings.scan_io_workers
+        _executors[kind] = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix=f"scan-{kind}")
+    return _executors[kind]
+
+
+def shutdown_executors(wait: bool = True) -> None:
+    """
+    Shut down the shared thread pools (e.g. on application shutdown).
+
+    Args:
+        wait (bool): Wait for running stages to finish
+    """
+    for executor in _executors.values():
+        executor.shutdown(wait=wait)
+    _executors.clear()
+
+
+async def run_in_executor(kind: str, fn: Callable[..., Any], *args: Any, **kwargs: Any) -> Any:
+    """
+    Run a blocking function on a shared pool without blocking the event loop.
+
+    The caller's context is copied into the worker thread, so tracing spans
+    opened inside ``fn`` nest under the caller's span.
+
+    Args:
+        kind (str): "cpu" or "io"
+        fn (Callable[..., Any]): Blocking function
+        *args: Positional arguments for ``fn``
+        **kwargs: Keyword arguments for ``fn``
+
+    Returns:
+        Any: Return value of ``fn``
+    """
+    loop = asyncio.get_running_loop()
+    context = contextvars.copy_context()
+    return await loop.run_in_executor(get_executor(kind), partial(context.run, fn, *args, **kwargs))
+
+
+def _offloaded(kind: str, node_fn: Callable[..., Dict[str, Any]]) -> Callable[..., Any]:
+    """Build an async node that runs a synchronous node on a shared pool."""
+    async def node(state: GraphState, agent_pool: Optional[AgentPool] = None) -> Dict[str, Any]:
+        return await run_in_executor(kind, node_fn, state, agent_pool=agent_pool)
+
+    node.__name__ = f"a{node_fn.__name__}"
+    node.__doc__ = f"Async variant of ``{node_fn.__name__}`` running on the {kind} pool."
+    return node
+
+
+# Git clones and fetches (GitPython has no async API)
+afetch_code_node = _offloaded(EXECUTOR_IO, fetch_code_node)
+# Streaming pipeline (waits on its own worker threads and on git)
+astream_files_node = _offloaded(EXECUTOR_IO, stream_files_node)
+# Vector store writes
+aknowledge_base_node = _offloaded(EXECUTOR_IO, knowledge_base_node)
+# CPU-bound stages
+aparse_code_node = _offloaded(EXECUTOR_CPU, parse_code_node)
+astatic_analysis_node = _offloaded(EXECUTOR_CPU, static_analysis_node)
+aimpact_analysis_node = _offloaded(EXECUTOR_CPU, impact_analysis_node)
+arisk_metrics_node = _offloaded(EXECUTOR_CPU, risk_metrics_node)
+adiagram_extraction_node = _offloaded(EXECUTOR_CPU, diagram_extraction_node)
+aproject_scanning_node = _offloaded(EXECUTOR_CPU, project_scanning_node)
+areporting_node = _offloaded(EXECUTOR_CPU, reporting_node)
+
+
+async def allm_analysis_node(state: GraphState, agent_pool: Optional[AgentPool] = None) -> Dict[str, Any]:
+    """
+    Async variant of ``llm_analysis_node`` using the LLM provider's async client.
+
+    Args:
+        state (GraphState): Current workflow state
+        agent_pool (Optional[AgentPool]): Pool of warm agents shared across scans
+
+    Returns:
+        Dict[str, Any]: Updated state with LLM insights
+    """
+    logger.info("Performing LLM analysis")
+
+    try:
+        from src.core_engine.agents.llm_orchestrator_agent import LLMOrchestratorAgent
+
+        if not state.get("parsed_asts") and not state.get("project_code") and not state.get("pr_diff"):
+            return {
+                "error_message": "No code available for LLM analysis",
+                "current_step": "error"
+            }
+
+        llm_orchestrator = acquire_agent(agent_pool, "llm_orchestrator", LLMOrchestratorAgent, llm_provider=LLM_PROVIDER)
+
+        method, kwargs = _llm_analysis_request(state)
+        stage_cache = get_stage_cache()
+        cache_key = _llm_cache_key(llm_orchestrator, method, kwargs) if stage_cache else None
+        llm_insights = stage_cache.get("llm_analysis", cache_key) if stage_cache else None
+        
+        if llm_insights is None:
+            with trace_span(f"llm.{method}") as span:
+                llm_insights = await getattr(llm_orchestrator, f"a{method}")(**kwargs)
+                span.set_count("files", len(kwargs.get("code_files") or {}))
+            if stage_cache:
+                stage_cache.put("llm_analysis", cache_key, llm_insights)
+
+        return _llm_analysis_result(state, llm_orchestrator, llm_insights)
+
+    except Exception as e:
+        logger.error(f"Error in allm_analysis_node: {str(e)}")
+        return {
+            "error_message": f"Failed to perform LLM analysis: {str(e)}",
+            "current_step": "error"
+        }
+
+
+def compile_async_graph(
+    agent_pool: Optional[AgentPool] = None,
+    checkpointer: Optional[BaseCheckpointSaver] = None,
+    streaming: bool = False
+) -> CompiledGraph:
+    """
+    Compile the workflow with async nodes; run it with ``ainvoke``.
+
+    Args:
+        agent_pool (Optional[AgentPool]): Pool of warm agents injected into every node
+        checkpointer (Optional[BaseCheckpointSaver]): Saver that persists the state
+            after every step (must implement the async saver API)
+        streaming (bool): Stream files through parsing, static analysis and
+            per-file LLM review instead of running those stages one after another
+
+    Returns:
+        CompiledGraph: Compiled LangGraph application
+    """
+    logger.info("Compiling async LangGraph workflow")
+
+    def bind(node_fn):
+        return partial(node_fn, agent_pool=agent_pool)
+
+    nodes = {
+        "start_scan": start_scan,
+        "fetch_code": bind(afetch_code_node),
+        "parse_code": bind(aparse_code_node),
+        "static_analysis": bind(astatic_analysis_node),
+        "impact_analysis": bind(aimpact_analysis_node),
+        "risk_metrics": bind(arisk_metrics_node),
+        "knowledge_base": bind(aknowledge_base_node),
+        "diagram_extraction": bind(adiagram_extraction_node),
+        "join_analysis": join_analysis_node,
+        "llm_analysis": bind(allm_analysis_node),
+        "project_scanning": bind(aproject_scanning_node),
+        "reporting": bind(areporting_node),
+        "handle_error": handle_error_node
+    }
+    if streaming:
+        for node_name in STAGED_NODES:
+            del nodes[node_name]
+        nodes["stream_files"] = bind(astream_files_node)
+
+    return build_workflow(nodes).compile(checkpointer=checkpointer)
+
+
+async def run_scan_async(
+    scan_request_data: dict,
+    agent_pool: Optional[AgentPool] = None,
+    checkpointer: Optional[BaseCheckpointSaver] = None,
+    scan_id: Optional[str] = None,
+    streaming: bool = False
+) -> Dict[str, Any]:
+    """
+    Run a complete scan on the current event loop.
+
+    Args:
+        scan_request_data (dict): Scan request parameters (repo_url, pr_id, branches, ...)
+        agent_pool (Optional[AgentPool]): Pool of warm agents shared across scans
+        checkpointer (Optional[BaseCheckpointSaver]): Saver for resumable checkpoints
+        scan_id (Optional[str]): Scan ID that keys the checkpoints (required with a checkpointer)
+        streaming (bool): Run the scan in streaming mode
+
+    Returns:
+        Dict[str, Any]: Final workflow state
+    """
+    from .checkpointing import get_scan_config
+
+    app = compile_async_graph(agent_pool=agent_pool, checkpointer=checkpointer, streaming=streaming)
+    config = get_scan_config(scan_id) if scan_id else None
+    return await app.ainvoke(create_initial_state(scan_request_data), config)
+
+
+async def resume_scan_async(
+    scan_id: str,
+    checkpointer: Optional[BaseCheckpointSaver] = None,
+    agent_pool: Optional[AgentPool] = None,
+    streaming: bool = False
+) -> Dict[str, Any]:
+    """
+    Resume a checkpointed scan on the current event loop (see ``resume_scan``).
+
+    Args:
+        scan_id (str): Scan ID the checkpoints are keyed by
+        checkpointer (Optional[BaseCheckpointSaver]): Saver holding the checkpoints
+            (defaults to the global SQLite checkpointer)
+        agent_pool (Optional[AgentPool]): Pool of warm agents shared across scans
+        streaming (bool): Whether the scan was started in streaming mode
+
+    Returns:
+        Dict[str, Any]: Final workflow state
+
+    Raises:
+        ValueError: If no checkpoint exists for the scan
+    """
+    from .checkpointing import get_checkpointer, get_scan_config
+
+    app = compile_async_graph(
+        agent_pool=agent_pool, checkpointer=checkpointer or get_checkpointer(), streaming=streaming
+    )
+    resume_point = None
+    async for snapshot in app.aget_state_history(get_scan_config(scan_id)):
+        if _is_resume_point(snapshot):
+            resume_point = snapshot
+            break
+
+    if resume_point is None:
+        raise ValueError(f"No checkpoint found for scan {scan_id}")
+
+    if not resume_point.next:
+        logger.info(f"Scan {scan_id} already completed, nothing to resume")
+        return resume_point.values
+
+    # A resumed scan gets a fresh time budget of the original length
+    _renew_time_budget(resume_point.values)
+
+    logger.info(f"Resuming scan {scan_id} at {list(resume_point.next)}")
+    return await app.ainvoke(None, resume_point.config)
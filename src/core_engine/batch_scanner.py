@@ -0,0 +1,336 @@
+"""
+Multi-repository batch scanning for AI Code Review System.
+
+This module schedules scans of many repositories over a fixed set of warm
+workers. Every worker owns an AgentPool (agents are not thread-safe) and a
+workflow compiled once against it, so Tree-sitter grammars, compiled static
+analysis rules and the RAG embedding model are loaded once per worker rather
+than once per repository. The content store and the stage cache are process
+wide and therefore shared by all workers of a batch.
+
+The module doubles as a command line entry point::
+
+    python -m src.core_engine.batch_scanner repos.txt --concurrency 4 --output batch.json
+"""
+
+import argparse
+import json
+import logging
+import queue
+import sys
+import threading
+import time
+from typing import Any, Callable, Dict, Iterable, List, Optional
+
+from .agent_pool import AgentPool
+from .cancellation import CancellationToken, activate, register_token, release_token
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+# Agents created before a worker takes its first repository
+WARM_AGENT_TYPES = ("code_fetcher", "ast_parser", "static_analyzer", "project_scanner", "reporting")
+
+# Concurrency used when neither the caller nor the settings choose one
+DEFAULT_BATCH_CONCURRENCY = 4
+
+
+def parse_target(spec: str) -> Dict[str, Any]:
+    """
+    Parse a command line target into scan request data.
+
+    ``URL`` and ``URL@branch`` request a project scan, ``URL#123`` a scan of
+    pull request 123.
+
+    Args:
+        spec (str): Target specification
+
+    Returns:
+        Dict[str, Any]: Scan request data for ``create_initial_state``
+
+    Raises:
+        ValueError: If the specification has no repository URL or an invalid PR ID
+    """
+    spec = spec.strip()
+    if "#" in spec:
+        repo_url, pr_id = spec.rsplit("#", 1)
+        if not pr_id.isdigit():
+            raise ValueError(f"Invalid pull request ID in batch target: {spec}")
+        target = {"repo_url": repo_url, "pr_id": int(pr_id), "scan_type": "pr"}
+    else:
+        # Only an "@" in the path separates the branch; "user@host" comes before it
+        repo_url, branch = spec, None
+        scheme_end = spec.find("://")
+        path_start = spec.find("/", scheme_end + 3) if scheme_end >= 0 else spec.find(":")
+        separator = spec.find("@", max(path_start, 0))
+        if separator > 0:
+            repo_url, branch = spec[:separator], spec[separator + 1:]
+        target = {"repo_url": repo_url, "scan_type": "project"}
+        if branch:
+            target["branch"] = branch
+
+    if not target["repo_url"]:
+        raise ValueError(f"Batch target without repository URL: {spec}")
+    return target
+
+
+class BatchScanner:
+    """
+    Runs scans of many repositories over a bounded pool of warm workers.
+
+    At most ``max_concurrency`` repositories are scanned at a time. Each
+    repository gets its own cancellation token and time budget; a failing
+    repository is recorded in the batch result and does not stop the batch.
+    """
+
+    def __init__(
+        self,
+        max_concurrency: Optional[int] = None,
+        streaming: bool = False,
+        timeout_seconds: Optional[int] = None,
+        warm_agent_types: Iterable[str] = WARM_AGENT_TYPES
+    ):
+        """
+        Initialize the BatchScanner.
+
+        Args:
+            max_concurrency (Optional[int]): Number of workers (``settings.batch_scan_concurrency`` if unset)
+            streaming (bool): Run every scan in streaming mode
+            timeout_seconds (Optional[int]): Time budget per repository unless a target sets its own
+                (``settings.scan_timeout_seconds`` if unset)
+            warm_agent_types (Iterable[str]): Agents each worker creates before its first scan
+        """
+        if max_concurrency is None or timeout_seconds is None:
+            from config.settings import settings
+
+            max_concurrency = max_concurrency or settings.batch_scan_concurrency
+            timeout_seconds = timeout_seconds or settings.scan_timeout_seconds
+
+        self.max_concurrency = max(1, max_concurrency or DEFAULT_BATCH_CONCURRENCY)
+        self.streaming = streaming
+        self.timeout_seconds = timeout_seconds
+        self.warm_agent_types = tuple(warm_agent_types)
+        self._stop = threading.Event()
+        self._active_tokens: Dict[str, CancellationToken] = {}
+        self._tokens_lock = threading.Lock()
+
+    def cancel(self) -> None:
+        """Stop the batch: running scans are cancelled and queued repositories are skipped."""
+        self._stop.set()
+        with self._tokens_lock:
+            for token in self._active_tokens.values():
+                token.cancel()
+
+    def run(
+        self,
+        targets: Iterable[Dict[str, Any]],
+        on_result: Optional[Callable[[Dict[str, Any]], None]] = None
+    ) -> Dict[str, Any]:
+        """
+        Scan all targets and wait for the batch to finish.
+
+        Args:
+            targets (Iterable[Dict[str, Any]]): Scan request data per repository
+                (``repo_url`` plus ``branch`` or ``pr_id`` and optional ``timeout_seconds``)
+            on_result (Optional[Callable[[Dict[str, Any]], None]]): Called from the worker
+                thread with each repository's result as soon as it is available
+
+        Returns:
+            Dict[str, Any]: ``results`` per repository in input order and the batch ``summary``
+        """
+        targets = list(targets)
+        results: List[Optional[Dict[str, Any]]] = [None] * len(targets)
+        pending: "queue.Queue[int]" = queue.Queue()
+        for index in range(len(targets)):
+            pending.put(index)
+
+        worker_count = min(self.max_concurrency, len(targets)) or 1
+        worker_stats: List[Dict[str, int]] = [{} for _ in range(worker_count)]
+        started = time.perf_counter()
+        logger.info(f"Starting batch scan of {len(targets)} repositories with {worker_count} workers")
+
+        threads = [
+            threading.Thread(
+                target=self._work,
+                args=(worker_index, targets, pending, results, worker_stats, on_result),
+                name=f"batch-scan-{worker_index}",
+                daemon=True
+            )
+            for worker_index in range(worker_count)
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        # Targets never taken because the batch was cancelled
+        for index, result in enumerate(results):
+            if result is None:
+                results[index] = self._result(targets[index], "skipped", 0.0, error_message="Batch was cancelled")
+
+        summary = self._summarize(results, time.perf_counter() - started, worker_count, worker_stats)
+        logger.info(
+            f"Batch scan finished: {summary['completed']}/{summary['total']} completed "
+            f"in {summary['wall_seconds']}s ({summary['repos_per_hour']} repos/hour)"
+        )
+        return {"results": results, "summary": summary}
+
+    def _work(
+        self,
+        worker_index: int,
+        targets: List[Dict[str, Any]],
+        pending: "queue.Queue[int]",
+        results: List[Optional[Dict[str, Any]]],
+        worker_stats: List[Dict[str, int]],
+        on_result: Optional[Callable[[Dict[str, Any]], None]]
+    ) -> None:
+        """Scan targets from the queue with one warm agent pool until the queue is empty."""
+        from .orchestrator import compile_graph
+
+        with AgentPool() as agent_pool:
+            agent_pool.warm_up(*self.warm_agent_types)
+            app = compile_graph(agent_pool=agent_pool, streaming=self.streaming)
+
+            while not self._stop.is_set():
+                try:
+                    index = pending.get_nowait()
+                except queue.Empty:
+                    break
+
+                results[index] = self._scan(app, targets[index])
+                if on_result is not None:
+                    try:
+                        on_result(results[index])
+                    except Exception as e:
+                        logger.warning(f"Batch result callback failed: {str(e)}")
+
+            worker_stats[worker_index] = dict(agent_pool.stats)
+
+    def _scan(self, app: Any, target: Dict[str, Any]) -> Dict[str, Any]:
+        """Scan a single repository with the worker's compiled workflow."""
+        from .content_store import open_content_store
+        from .orchestrator import create_initial_state
+
+        token = register_token(CancellationToken.with_timeout(target.get("timeout_seconds") or self.timeout_seconds))
+        with self._tokens_lock:
+            self._active_tokens[token.token_id] = token
+
+        started = time.perf_counter()
+        try:
+            with activate(token):
+                final_state = app.invoke(create_initial_state(target))
+        except Exception as e:
+            logger.error(f"Batch scan of {target.get('repo_url')} failed: {str(e)}")
+            return self._result(target, "failed", time.perf_counter() - started, error_message=str(e))
+        finally:
+            with self._tokens_lock:
+                self._active_tokens.pop(token.token_id, None)
+            release_token(token.token_id)
+
+        # File contents are only needed while the scan runs
+        if final_state.get("content_store_root"):
+            open_content_store(final_state["content_store_root"]).cleanup()
+
+        duration = time.perf_counter() - started
+        if final_state.get("current_step") != "completed":
+            return self._result(
+                target, "failed", duration,
+                error_message=final_state.get("error_message") or "Scan workflow did not complete"
+            )
+
+        summary = final_state.get("static_analysis_summary") or {}
+        return self._result(
+            target, "completed", duration,
+            findings_count=summary.get("total_findings", 0),
+            report=final_state.get("report_data")
+        )
+
+    @staticmethod
+    def _result(target: Dict[str, Any], status: str, duration: float, **details: Any) -> Dict[str, Any]:
+        """Build the batch result entry of one repository."""
+        return {
+            "repo_url": target.get("repo_url"),
+            "branch": target.get("branch"),
+            "pr_id": target.get("pr_id"),
+            "status": status,
+            "duration_seconds": round(duration, 3),
+            "findings_count": details.get("findings_count", 0),
+            "error_message": details.get("error_message"),
+            "report": details.get("report")
+        }
+
+    @staticmethod
+    def _summarize(
+        results: List[Dict[str, Any]],
+        wall_seconds: float,
+        worker_count: int,
+        worker_stats: List[Dict[str, int]]
+    ) -> Dict[str, Any]:
+        """Aggregate per-repository results into the batch summary."""
+        completed = [r for r in results if r["status"] == "completed"]
+        scanned = [r for r in results if r["status"] != "skipped"]
+        return {
+            "total": len(results),
+            "completed": len(completed),
+            "failed": sum(1 for r in results if r["status"] == "failed"),
+            "skipped": sum(1 for r in results if r["status"] == "skipped"),
+            "total_findings": sum(r["findings_count"] for r in completed),
+            "workers": worker_count,
+            "wall_seconds": round(wall_seconds, 3),
+            "mean_scan_seconds": round(sum(r["duration_seconds"] for r in scanned) / len(scanned), 3) if scanned else 0.0,
+            "repos_per_hour": round(len(completed) * 3600 / wall_seconds, 1) if wall_seconds > 0 else 0.0,
+            "agents_created": sum(stats.get("created", 0) for stats in worker_stats),
+            "agents_reused": sum(stats.get("reused", 0) for stats in worker_stats)
+        }
+
+
+def _read_targets(paths: List[str]) -> List[Dict[str, Any]]:
+    """Read target specifications from files ("-" for stdin), one per line."""
+    targets = []
+    for path in paths:
+        if path == "-":
+            lines = sys.stdin.readlines()
+        else:
+            with open(path, encoding="utf-8") as f:
+                lines = f.readlines()
+        for line in lines:
+            line = line.strip()
+            if line and not line.startswith("#"):
+                targets.append(parse_target(line))
+    return targets
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """
+    Command line entry point for batch scans.
+
+    Args:
+        argv (Optional[List[str]]): Arguments (``sys.argv[1:]`` if None)
+
+    Returns:
+        int: Exit code, 1 if any repository failed
+    """
+    parser = argparse.ArgumentParser(description="Scan many repositories with a shared pool of warm workers.")
+    parser.add_argument("targets", nargs="+", help="Files listing URL, URL@branch or URL#pr_id per line ('-' for stdin)")
+    parser.add_argument("-c", "--concurrency", type=int, default=None, help="Repositories scanned at a time")
+    parser.add_argument("--timeout", type=int, default=None, help="Time budget per repository in seconds")
+    parser.add_argument("--streaming", action="store_true", help="Stream files through the analysis stages")
+    parser.add_argument("-o", "--output", default=None, help="Write per-repository results and the summary as JSON")
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO)
+    scanner = BatchScanner(max_concurrency=args.concurrency, streaming=args.streaming, timeout_seconds=args.timeout)
+    batch = scanner.run(_read_targets(args.targets))
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(batch, f, indent=2, default=str)
+
+    for result in batch["results"]:
+        print(f"{result['status']:<10} {result['duration_seconds']:>9.1f}s  {result['repo_url']}")
+    print(json.dumps(batch["summary"], indent=2))
+    return 1 if batch["summary"]["failed"] else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
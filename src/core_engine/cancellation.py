@@ -0,0 +1,280 @@
+"""
+Cooperative cancellation and time budgets for scan workflows.
+
+A scan carries a CancellationToken with an optional deadline. The token is
+cancelled explicitly (e.g. when a queued scan is cancelled through the API)
+or implicitly once its deadline passes. Long-running loops in the agents
+(cloning and walking repositories, parsing, static rules, LLM calls and RAG
+builds) call ``check_cancelled()`` between units of work, and optional work
+such as LLM review of low-priority files is skipped once most of the budget
+is used (``budget_exhausted()``).
+
+The workflow state only carries the token's plain description (ID, start and
+deadline). Live tokens are kept in a process-wide registry and made current
+for each node through a context variable, the same way tracing spans are, so
+agents can check the token without it being passed through every call.
+"""
+
+import contextvars
+import logging
+import threading
+import time
+import uuid
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, Optional
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+# Fraction of the time budget after which optional work is skipped
+DEFAULT_DEGRADE_THRESHOLD = 0.8
+
+REASON_CANCELLED = "cancelled"
+REASON_DEADLINE = "deadline_exceeded"
+
+_current_token: contextvars.ContextVar[Optional["CancellationToken"]] = contextvars.ContextVar(
+    "aicode_cancellation_token", default=None
+)
+
+
+class ScanCancelled(BaseException):
+    """
+    Raised when a scan was cancelled or ran past its deadline.
+
+    Derives from BaseException (like ``asyncio.CancelledError``) so that the
+    many ``except Exception`` handlers that keep a scan going after a single
+    file or rule fails do not swallow it; the node wrapper turns it into a
+    workflow error.
+    """
+
+    def __init__(self, reason: str = REASON_CANCELLED):
+        self.reason = reason
+        super().__init__(
+            "Scan exceeded its time budget" if reason == REASON_DEADLINE else "Scan was cancelled"
+        )
+
+
+class CancellationToken:
+    """
+    Cancellation flag plus optional deadline for a single scan.
+
+    Tokens are thread-safe: they are cancelled from the API's event loop and
+    checked from worker threads.
+    """
+
+    def __init__(
+        self,
+        token_id: Optional[str] = None,
+        deadline: Optional[float] = None,
+        started_at: Optional[float] = None
+    ):
+        """
+        Initialize the CancellationToken.
+
+        Args:
+            token_id (Optional[str]): Registry ID (a new ID if omitted)
+            deadline (Optional[float]): Unix time after which the scan is over budget
+            started_at (Optional[float]): Unix time the budget started (now if omitted)
+        """
+        self.token_id = token_id or uuid.uuid4().hex
+        self.started_at = started_at if started_at is not None else time.time()
+        self.deadline = deadline
+        self._cancelled = threading.Event()
+
+    @classmethod
+    def with_timeout(cls, timeout_seconds: Optional[float], token_id: Optional[str] = None) -> "CancellationToken":
+        """
+        Create a token whose deadline is ``timeout_seconds`` from now.
+
+        Args:
+            timeout_seconds (Optional[float]): Time budget; no deadline if None or 0
+            token_id (Optional[str]): Registry ID
+
+        Returns:
+            CancellationToken: The new token
+        """
+        started_at = time.time()
+        deadline = started_at + timeout_seconds if timeout_seconds else None
+        return cls(token_id=token_id, deadline=deadline, started_at=started_at)
+
+    def renew(self, timeout_seconds: Optional[float]) -> None:
+        """
+        Restart the time budget from now, keeping the cancellation flag.
+
+        Args:
+            timeout_seconds (Optional[float]): New time budget; no deadline if None or 0
+        """
+        self.started_at = time.time()
+        self.deadline = self.started_at + timeout_seconds if timeout_seconds else None
+
+    def cancel(self) -> None:
+        """Cancel the scan; running stages stop at their next check."""
+        if not self._cancelled.is_set():
+            logger.info(f"Cancelling scan token {self.token_id}")
+        self._cancelled.set()
+
+    @property
+    def reason(self) -> Optional[str]:
+        """Why the scan must stop, or None while it may continue."""
+        if self._cancelled.is_set():
+            return REASON_CANCELLED
+        if self.deadline is not None and time.time() >= self.deadline:
+            return REASON_DEADLINE
+        return None
+
+    @property
+    def is_cancelled(self) -> bool:
+        """Whether the scan was cancelled or its deadline has passed."""
+        return self.reason is not None
+
+    def remaining(self) -> Optional[float]:
+        """Seconds left until the deadline (never negative), or None without a deadline."""
+        if self.deadline is None:
+            return None
+        return max(0.0, self.deadline - time.time())
+
+    def budget_used(self) -> float:
+        """Fraction of the time budget used so far (0.0 without a deadline)."""
+        if self.deadline is None:
+            return 0.0
+        budget = self.deadline - self.started_at
+        if budget <= 0:
+            return 1.0
+        return min(1.0, (time.time() - self.started_at) / budget)
+
+    def check(self) -> None:
+        """
+        Stop the current stage if the scan must end.
+
+        Raises:
+            ScanCancelled: If the token was cancelled or the deadline has passed
+        """
+        reason = self.reason
+        if reason is not None:
+            raise ScanCancelled(reason)
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Plain description of the token for the workflow state."""
+        return {"token_id": self.token_id, "started_at": self.started_at, "deadline": self.deadline}
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "CancellationToken":
+        """Rebuild a token (without its cancellation flag) from ``to_dict`` output."""
+        return cls(token_id=data.get("token_id"), deadline=data.get("deadline"), started_at=data.get("started_at"))
+
+
+# Live tokens by ID, shared by all scans in this process
+_tokens: Dict[str, CancellationToken] = {}
+_tokens_lock = threading.Lock()
+
+
+def register_token(token: CancellationToken) -> CancellationToken:
+    """
+    Make a token resolvable by its ID.
+
+    Args:
+        token (CancellationToken): Token to register
+
+    Returns:
+        CancellationToken: The registered token
+    """
+    with _tokens_lock:
+        _tokens[token.token_id] = token
+    return token
+
+
+def release_token(token_id: str) -> None:
+    """
+    Forget a token once its scan is over.
+
+    Args:
+        token_id (str): ID of the token
+    """
+    with _tokens_lock:
+        _tokens.pop(token_id, None)
+
+
+def resolve_token(data: Optional[Dict[str, Any]]) -> Optional[CancellationToken]:
+    """
+    Get the live token described in the workflow state.
+
+    A token that is no longer registered (e.g. after a scan is resumed in a
+    new process) is rebuilt from its description, which keeps the deadline
+    in force.
+
+    Args:
+        data (Optional[Dict[str, Any]]): Token description from the state
+
+    Returns:
+        Optional[CancellationToken]: The token, or None if the scan has none
+    """
+    if not data:
+        return None
+    with _tokens_lock:
+        token = _tokens.get(data.get("token_id"))
+        if token is None:
+            token = _tokens[data.get("token_id")] = CancellationToken.from_dict(data)
+        return token
+
+
+def current_token() -> Optional[CancellationToken]:
+    """Get the token of the scan running in the current context."""
+    return _current_token.get()
+
+
+@contextmanager
+def activate(token: Optional[CancellationToken]) -> Iterator[Optional[CancellationToken]]:
+    """
+    Make a token current for the duration of the block.
+
+    Args:
+        token (Optional[CancellationToken]): Token of the running scan
+
+    Yields:
+        Optional[CancellationToken]: The activated token
+    """
+    reset = _current_token.set(token)
+    try:
+        yield token
+    finally:
+        _current_token.reset(reset)
+
+
+def check_cancelled() -> None:
+    """
+    Stop the current stage if the running scan was cancelled or is out of time.
+
+    Does nothing outside of a scan.
+
+    Raises:
+        ScanCancelled: If the current token was cancelled or its deadline has passed
+    """
+    token = _current_token.get()
+    if token is not None:
+        token.check()
+
+
+def is_cancelled() -> bool:
+    """Whether the running scan was cancelled or is out of time."""
+    token = _current_token.get()
+    return token is not None and token.is_cancelled
+
+
+def remaining_seconds() -> Optional[float]:
+    """Seconds left in the running scan's budget, or None without a deadline."""
+    token = _current_token.get()
+    return token.remaining() if token is not None else None
+
+
+def budget_exhausted(threshold: float = DEFAULT_DEGRADE_THRESHOLD) -> bool:
+    """
+    Whether the running scan has used enough of its budget to skip optional work.
+
+    Args:
+        threshold (float): Fraction of the time budget
+
+    Returns:
+        bool: True once the threshold is reached; always False without a deadline
+    """
+    token = _current_token.get()
+    return token is not None and token.deadline is not None and token.budget_used() >= threshold
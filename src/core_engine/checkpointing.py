@@ -0,0 +1,469 @@
+"""
+Scan workflow checkpointing for AI Code Review System.
+
+This module implements a SQLite-backed LangGraph checkpointer so that the
+workflow state is persisted after every node, keyed by scan ID (the LangGraph
+thread ID). A scan that fails in a late stage, or whose worker is killed, can
+then be resumed from the last completed node instead of re-cloning and
+re-parsing the repository.
+
+Tree-sitter syntax trees are not serializable and are deliberately left out of
+checkpoints; nodes re-derive them from the file contents kept in the state.
+"""
+
+import asyncio
+import logging
+import os
+import random
+import sqlite3
+import threading
+from typing import Any, AsyncIterator, Dict, Iterator, Optional, Sequence, Tuple
+
+from langchain_core.runnables import RunnableConfig
+from langgraph.checkpoint.base import (
+    WRITES_IDX_MAP,
+    BaseCheckpointSaver,
+    ChannelVersions,
+    Checkpoint,
+    CheckpointMetadata,
+    CheckpointTuple,
+    get_checkpoint_id,
+    get_checkpoint_metadata,
+)
+from langgraph.checkpoint.serde.jsonplus import JsonPlusSerializer
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+# Keys holding live tree-sitter objects that must never be persisted
+NON_SERIALIZABLE_KEYS = frozenset({"ast_node"})
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS checkpoints (
+    thread_id TEXT NOT NULL,
+    checkpoint_ns TEXT NOT NULL DEFAULT '',
+    checkpoint_id TEXT NOT NULL,
+    parent_checkpoint_id TEXT,
+    type TEXT,
+    checkpoint BLOB,
+    metadata_type TEXT,
+    metadata BLOB,
+    PRIMARY KEY (thread_id, checkpoint_ns, checkpoint_id)
+);
+CREATE TABLE IF NOT EXISTS writes (
+    thread_id TEXT NOT NULL,
+    checkpoint_ns TEXT NOT NULL DEFAULT '',
+    checkpoint_id TEXT NOT NULL,
+    task_id TEXT NOT NULL,
+    idx INTEGER NOT NULL,
+    channel TEXT NOT NULL,
+    type TEXT,
+    value BLOB,
+    task_path TEXT NOT NULL DEFAULT '',
+    PRIMARY KEY (thread_id, checkpoint_ns, checkpoint_id, task_id, idx)
+);
+"""
+
+
+def strip_non_serializable(value: Any) -> Any:
+    """
+    Return a copy of a state value without live syntax tree objects.
+
+    Args:
+        value (Any): Channel value or pending write
+
+    Returns:
+        Any: The value with ``ast_node`` entries removed from nested dictionaries
+    """
+    if isinstance(value, dict):
+        return {
+            key: strip_non_serializable(item)
+            for key, item in value.items()
+            if key not in NON_SERIALIZABLE_KEYS
+        }
+    if isinstance(value, list):
+        return [strip_non_serializable(item) for item in value]
+    return value
+
+
+class CheckpointSerializer(JsonPlusSerializer):
+    """LangGraph serializer that drops tree-sitter trees before encoding."""
+
+    def dumps_typed(self, obj: Any) -> Tuple[str, bytes]:
+        return super().dumps_typed(strip_non_serializable(obj))
+
+
+class SQLiteCheckpointSaver(BaseCheckpointSaver[str]):
+    """
+    LangGraph checkpointer that stores scan checkpoints in a local SQLite file.
+
+    Each scan is a LangGraph thread (``thread_id`` = scan ID). A checkpoint is
+    written after every super-step and the writes of individual nodes are
+    stored as they complete, so parallel branches that finished before a crash
+    are not re-run on resume.
+    """
+
+    def __init__(self, db_path: str = ":memory:"):
+        """
+        Initialize the SQLiteCheckpointSaver.
+
+        Args:
+            db_path (str): Path to the SQLite database file (":memory:" for tests)
+        """
+        super().__init__(serde=CheckpointSerializer())
+        self.db_path = db_path
+
+        if db_path != ":memory:":
+            os.makedirs(os.path.dirname(os.path.abspath(db_path)), exist_ok=True)
+
+        # Graph nodes run in worker threads, so share one connection under a lock
+        self._conn = sqlite3.connect(db_path, check_same_thread=False)
+        self._conn.executescript(_SCHEMA)
+        self._lock = threading.Lock()
+
+        logger.info(f"SQLiteCheckpointSaver initialized at {db_path}")
+
+    def close(self) -> None:
+        """Close the database connection."""
+        with self._lock:
+            self._conn.close()
+
+    def __enter__(self) -> "SQLiteCheckpointSaver":
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb) -> None:
+        self.close()
+
+    def _make_tuple(
+        self,
+        thread_id: str,
+        checkpoint_ns: str,
+        row: Tuple[Any, ...]
+    ) -> CheckpointTuple:
+        """Build a CheckpointTuple from a checkpoints row and its pending writes."""
+        checkpoint_id, parent_checkpoint_id, type_, checkpoint, metadata_type, metadata = row
+
+        with self._lock:
+            writes = self._conn.execute(
+                "SELECT task_id, channel, type, value FROM writes "
+                "WHERE thread_id = ? AND checkpoint_ns = ? AND checkpoint_id = ? "
+                "ORDER BY task_id, idx",
+                (thread_id, checkpoint_ns, checkpoint_id)
+            ).fetchall()
+
+        return CheckpointTuple(
+            config={
+                "configurable": {
+                    "thread_id": thread_id,
+                    "checkpoint_ns": checkpoint_ns,
+                    "checkpoint_id": checkpoint_id,
+                }
+            },
+            checkpoint=self.serde.loads_typed((type_, checkpoint)),
+            metadata=self.serde.loads_typed((metadata_type, metadata)),
+            parent_config=(
+                {
+                    "configurable": {
+                        "thread_id": thread_id,
+                        "checkpoint_ns": checkpoint_ns,
+                        "checkpoint_id": parent_checkpoint_id,
+                    }
+                }
+                if parent_checkpoint_id
+                else None
+            ),
+            pending_writes=[
+                (task_id, channel, self.serde.loads_typed((value_type, value)))
+                for task_id, channel, value_type, value in writes
+            ],
+        )
+
+    def get_tuple(self, config: RunnableConfig) -> Optional[CheckpointTuple]:
+        """
+        Get a checkpoint by ID, or the latest checkpoint of a scan.
+
+        Args:
+            config (RunnableConfig): Config with ``thread_id`` and optional ``checkpoint_id``
+
+        Returns:
+            Optional[CheckpointTuple]: The checkpoint, or None if the scan has none
+        """
+        thread_id = config["configurable"]["thread_id"]
+        checkpoint_ns = config["configurable"].get("checkpoint_ns", "")
+        columns = "checkpoint_id, parent_checkpoint_id, type, checkpoint, metadata_type, metadata"
+
+        with self._lock:
+            if checkpoint_id := get_checkpoint_id(config):
+                row = self._conn.execute(
+                    f"SELECT {columns} FROM checkpoints "
+                    "WHERE thread_id = ? AND checkpoint_ns = ? AND checkpoint_id = ?",
+                    (thread_id, checkpoint_ns, checkpoint_id)
+                ).fetchone()
+            else:
+                row = self._conn.execute(
+                    f"SELECT {columns} FROM checkpoints "
+                    "WHERE thread_id = ? AND checkpoint_ns = ? "
+                    "ORDER BY checkpoint_id DESC LIMIT 1",
+                    (thread_id, checkpoint_ns)
+                ).fetchone()
+
+        if row is None:
+            return None
+        return self._make_tuple(thread_id, checkpoint_ns, row)
+
+    def list(
+        self,
+        config: Optional[RunnableConfig],
+        *,
+        filter: Optional[Dict[str, Any]] = None,
+        before: Optional[RunnableConfig] = None,
+        limit: Optional[int] = None,
+    ) -> Iterator[CheckpointTuple]:
+        """
+        List checkpoints, newest first.
+
+        Args:
+            config (Optional[RunnableConfig]): Config selecting the scan (all scans if None)
+            filter (Optional[Dict[str, Any]]): Metadata values that must match
+            before (Optional[RunnableConfig]): Only list checkpoints older than this one
+            limit (Optional[int]): Maximum number of checkpoints to return
+
+        Yields:
+            CheckpointTuple: Matching checkpoints
+        """
+        query = (
+            "SELECT thread_id, checkpoint_ns, checkpoint_id, parent_checkpoint_id, "
+            "type, checkpoint, metadata_type, metadata FROM checkpoints"
+        )
+        clauses, params = [], []
+        if config:
+            clauses.append("thread_id = ?")
+            params.append(config["configurable"]["thread_id"])
+            if config["configurable"].get("checkpoint_ns") is not None:
+                clauses.append("checkpoint_ns = ?")
+                params.append(config["configurable"]["checkpoint_ns"])
+            if checkpoint_id := get_checkpoint_id(config):
+                clauses.append("checkpoint_id = ?")
+                params.append(checkpoint_id)
+        if before and (before_id := get_checkpoint_id(before)):
+            clauses.append("checkpoint_id < ?")
+            params.append(before_id)
+        if clauses:
+            query += " WHERE " + " AND ".join(clauses)
+        query += " ORDER BY checkpoint_id DESC"
+
+        with self._lock:
+            rows = self._conn.execute(query, params).fetchall()
+
+        for thread_id, checkpoint_ns, *row in rows:
+            checkpoint_tuple = self._make_tuple(thread_id, checkpoint_ns, tuple(row))
+            if filter and not all(
+                checkpoint_tuple.metadata.get(key) == value for key, value in filter.items()
+            ):
+                continue
+            if limit is not None:
+                if limit <= 0:
+                    break
+                limit -= 1
+            yield checkpoint_tuple
+
+    def put(
+        self,
+        config: RunnableConfig,
+        checkpoint: Checkpoint,
+        metadata: CheckpointMetadata,
+        new_versions: ChannelVersions,
+    ) -> RunnableConfig:
+        """
+        Store a checkpoint.
+
+        Args:
+            config (RunnableConfig): Config of the parent checkpoint
+            checkpoint (Checkpoint): Checkpoint to store
+            metadata (CheckpointMetadata): Checkpoint metadata
+            new_versions (ChannelVersions): Channel versions written in this step
+
+        Returns:
+            RunnableConfig: Config pointing at the stored checkpoint
+        """
+        thread_id = config["configurable"]["thread_id"]
+        checkpoint_ns = config["configurable"].get("checkpoint_ns", "")
+        type_, serialized_checkpoint = self.serde.dumps_typed(checkpoint)
+        metadata_type, serialized_metadata = self.serde.dumps_typed(
+            get_checkpoint_metadata(config, metadata)
+        )
+
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO checkpoints "
+                "(thread_id, checkpoint_ns, checkpoint_id, parent_checkpoint_id, "
+                "type, checkpoint, metadata_type, metadata) VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                (
+                    thread_id,
+                    checkpoint_ns,
+                    checkpoint["id"],
+                    config["configurable"].get("checkpoint_id"),
+                    type_,
+                    serialized_checkpoint,
+                    metadata_type,
+                    serialized_metadata,
+                )
+            )
+
+        return {
+            "configurable": {
+                "thread_id": thread_id,
+                "checkpoint_ns": checkpoint_ns,
+                "checkpoint_id": checkpoint["id"],
+            }
+        }
+
+    def put_writes(
+        self,
+        config: RunnableConfig,
+        writes: Sequence[Tuple[str, Any]],
+        task_id: str,
+        task_path: str = "",
+    ) -> None:
+        """
+        Store the writes of a finished node linked to a checkpoint.
+
+        Args:
+            config (RunnableConfig): Config of the checkpoint the node ran from
+            writes (Sequence[Tuple[str, Any]]): (channel, value) pairs
+            task_id (str): Identifier of the task that produced the writes
+            task_path (str): Path of the task that produced the writes
+        """
+        thread_id = config["configurable"]["thread_id"]
+        checkpoint_ns = config["configurable"].get("checkpoint_ns", "")
+        checkpoint_id = config["configurable"]["checkpoint_id"]
+
+        # Special channels (errors, interrupts) replace earlier values
+        replace = all(channel in WRITES_IDX_MAP for channel, _ in writes)
+        statement = "INSERT OR REPLACE" if replace else "INSERT OR IGNORE"
+
+        rows = []
+        for idx, (channel, value) in enumerate(writes):
+            type_, serialized_value = self.serde.dumps_typed(value)
+            rows.append((
+                thread_id,
+                checkpoint_ns,
+                checkpoint_id,
+                task_id,
+                WRITES_IDX_MAP.get(channel, idx),
+                channel,
+                type_,
+                serialized_value,
+                task_path,
+            ))
+
+        with self._lock, self._conn:
+            self._conn.executemany(
+                f"{statement} INTO writes "
+                "(thread_id, checkpoint_ns, checkpoint_id, task_id, idx, channel, type, value, task_path) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                rows
+            )
+
+    def delete_thread(self, thread_id: str) -> None:
+        """
+        Delete all checkpoints of a scan.
+
+        Args:
+            thread_id (str): Scan ID
+        """
+        with self._lock, self._conn:
+            self._conn.execute("DELETE FROM checkpoints WHERE thread_id = ?", (thread_id,))
+            self._conn.execute("DELETE FROM writes WHERE thread_id = ?", (thread_id,))
+
+    # Async API: SQLite calls are blocking, so they run in worker threads and
+    # never stall the event loop driving an async scan
+
+    async def aget_tuple(self, config: RunnableConfig) -> Optional[CheckpointTuple]:
+        """Async variant of ``get_tuple``."""
+        return await asyncio.to_thread(self.get_tuple, config)
+
+    async def alist(
+        self,
+        config: Optional[RunnableConfig],
+        *,
+        filter: Optional[Dict[str, Any]] = None,
+        before: Optional[RunnableConfig] = None,
+        limit: Optional[int] = None,
+    ) -> AsyncIterator[CheckpointTuple]:
+        """Async variant of ``list``."""
+        items = await asyncio.to_thread(
+            lambda: list(self.list(config, filter=filter, before=before, limit=limit))
+        )
+        for item in items:
+            yield item
+
+    async def aput(
+        self,
+        config: RunnableConfig,
+        checkpoint: Checkpoint,
+        metadata: CheckpointMetadata,
+        new_versions: ChannelVersions,
+    ) -> RunnableConfig:
+        """Async variant of ``put``."""
+        return await asyncio.to_thread(self.put, config, checkpoint, metadata, new_versions)
+
+    async def aput_writes(
+        self,
+        config: RunnableConfig,
+        writes: Sequence[Tuple[str, Any]],
+        task_id: str,
+        task_path: str = "",
+    ) -> None:
+        """Async variant of ``put_writes``."""
+        await asyncio.to_thread(self.put_writes, config, writes, task_id, task_path)
+
+    async def adelete_thread(self, thread_id: str) -> None:
+        """Async variant of ``delete_thread``."""
+        await asyncio.to_thread(self.delete_thread, thread_id)
+
+    def get_next_version(self, current: Optional[str], channel: None) -> str:
+        # Zero-padded so versions sort as strings; random suffix as in InMemorySaver
+        if current is None:
+            current_v = 0
+        elif isinstance(current, int):
+            current_v = current
+        else:
+            current_v = int(current.split(".")[0])
+        return f"{current_v + 1:032}.{random.random():016}"
+
+
+def get_scan_config(scan_id: str) -> RunnableConfig:
+    """
+    Build the LangGraph config that keys checkpoints by scan ID.
+
+    Args:
+        scan_id (str): Scan identifier
+
+    Returns:
+        RunnableConfig: Config with the scan ID as thread ID
+    """
+    return {"configurable": {"thread_id": scan_id}}
+
+
+# Global checkpointer instance
+_checkpointer: Optional[SQLiteCheckpointSaver] = None
+
+
+def get_checkpointer(db_path: Optional[str] = None) -> SQLiteCheckpointSaver:
+    """
+    Get the process-wide scan checkpointer.
+
+    Args:
+        db_path (Optional[str]): Database path (defaults to settings.scan_checkpoint_path)
+
+    Returns:
+        SQLiteCheckpointSaver: Global checkpointer
+    """
+    global _checkpointer
+    if _checkpointer is None:
+        if db_path is None:
+            from config.settings import settings
+            db_path = settings.scan_checkpoint_path
+        _checkpointer = SQLiteCheckpointSaver(db_path)
+    return _checkpointer
@@ -0,0 +1,137 @@
+"""
+Content keys shared by the scan caches.
+
+Every per-file cache of the core engine (parse outputs, static analysis
+findings, diagrams, project scan reports, the scan content store and the
+AST parser's disk cache) identifies a file's contents by its git blob id.
+Scans of git repositories get these ids from the tree listing or the index
+of the checkout, so no file has to be hashed to key a cache; contents from
+elsewhere (PR post-images, uploaded files) are hashed the way git hashes a
+blob, so both routes give the same key for the same bytes.
+"""
+
+import hashlib
+import logging
+import re
+from typing import Dict, Mapping, Optional, Union
+
+from git import GitCommandError, InvalidGitRepositoryError, NoSuchPathError, Repo
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+# SHA-1 and SHA-256 object ids
+_BLOB_ID_PATTERN = re.compile(r"^(?:[0-9a-f]{40}|[0-9a-f]{64})$")
+
+
+def git_blob_id(content: Union[str, bytes]) -> str:
+    """
+    Hash contents the way git hashes a blob (``git hash-object``).
+
+    Args:
+        content (Union[str, bytes]): File contents (text is hashed as UTF-8)
+
+    Returns:
+        str: Hex SHA-1 blob id
+    """
+    if isinstance(content, str):
+        content = content.encode("utf-8", errors="surrogateescape")
+    digest = hashlib.sha1(b"blob %d\0" % len(content))
+    digest.update(content)
+    return digest.hexdigest()
+
+
+class ContentKey(str):
+    """
+    Identity of a file's contents: the git blob id of its bytes.
+
+    A ``str`` subclass, so keys go into fingerprints, JSON and checkpoints
+    as plain strings.
+    """
+
+    __slots__ = ()
+
+    @classmethod
+    def for_content(cls, content: Union[str, bytes]) -> "ContentKey":
+        """
+        Key contents whose blob id is not known.
+
+        Args:
+            content (Union[str, bytes]): File contents
+
+        Returns:
+            ContentKey: Blob id computed from the contents
+        """
+        return cls(git_blob_id(content))
+
+    @classmethod
+    def for_blob(cls, blob_id: str) -> "ContentKey":
+        """
+        Key contents by a blob id listed by git.
+
+        Args:
+            blob_id (str): Full hex object id
+
+        Returns:
+            ContentKey: The blob id as a key
+
+        Raises:
+            ValueError: If the id is not a full hex object id
+        """
+        if not _BLOB_ID_PATTERN.match(blob_id):
+            raise ValueError(f"Not a git object id: {blob_id!r}")
+        return cls(blob_id)
+
+    @classmethod
+    def for_file(
+        cls,
+        path: str,
+        content: Union[str, bytes],
+        known: Optional[Mapping[str, str]] = None
+    ) -> "ContentKey":
+        """
+        Key a file, hashing its contents only if its blob id is not known.
+
+        Args:
+            path (str): File path relative to the repository root
+            content (Union[str, bytes]): File contents
+            known (Optional[Mapping[str, str]]): Blob ids by path, from the fetcher
+
+        Returns:
+            ContentKey: Key of the file's contents
+        """
+        blob_id = known.get(path) if known else None
+        return cls(blob_id) if blob_id else cls.for_content(content)
+
+
+def worktree_blob_ids(checkout_dir: str) -> Dict[str, str]:
+    """
+    Get the blob ids of the unmodified files of a checkout from its index.
+
+    Files changed in the working tree since they were checked out are left
+    out, so every returned id matches the file on disk.
+
+    Args:
+        checkout_dir (str): Root of a git working tree
+
+    Returns:
+        Dict[str, str]: Blob id by ``/`` separated path, empty if the
+            directory is not a git working tree
+    """
+    try:
+        repo = Repo(checkout_dir)
+        staged = repo.git.ls_files("-s", "-z")
+        modified = set(filter(None, repo.git.ls_files("-m", "-z").split("\0")))
+    except (GitCommandError, InvalidGitRepositoryError, NoSuchPathError) as e:
+        logger.debug(f"No blob ids for {checkout_dir}: {str(e)}")
+        return {}
+
+    blob_ids = {}
+    for record in staged.split("\0"):
+        meta, _, path = record.partition("\t")
+        if not path or path in modified:
+            continue
+        mode, blob_id, _ = meta.split(" ", 2)
+        if mode.startswith("10"):
+            blob_ids[path] = blob_id
+    return blob_ids
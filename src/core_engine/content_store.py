@@ -0,0 +1,292 @@
+"""
+Scan-scoped content store for AI Code Review System.
+
+This module implements an append-only blob store that keeps file contents and
+structural info out of the LangGraph state. Blobs live in a single file per
+scan and are read through a memory map, so the operating system pages file
+text in and out instead of every stage holding its own copy of the repository.
+The state only carries small, serializable handles (BlobMapping) that behave
+like read-only dictionaries, which keeps it cheap to checkpoint and to pass
+between stages or processes.
+
+Live tree-sitter trees cannot be serialized; the store keeps a bounded,
+in-process LRU cache of them so stages can share trees without putting them
+in the state.
+"""
+
+import json
+import logging
+import mmap
+import os
+import shutil
+import tempfile
+import threading
+from collections import OrderedDict
+from collections.abc import Mapping
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterator, List, Optional, Tuple, Union
+
+from .content_keys import git_blob_id
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+# Number of live syntax trees kept per scan before the least recently used are dropped
+DEFAULT_MAX_CACHED_TREES = 1024
+
+BLOB_FILE_NAME = "blobs.bin"
+
+CODEC_TEXT = "text"
+CODEC_JSON = "json"
+
+
+class ContentStore:
+    """
+    Append-only, memory-mapped blob store for a single scan.
+
+    Blobs are deduplicated by content key and addressed by ``(offset, length)``
+    references into the blob file. Writes append to the file; reads go through
+    a memory map that is extended when the file grows.
+    """
+
+    def __init__(self, root: Optional[str] = None, max_cached_trees: int = DEFAULT_MAX_CACHED_TREES):
+        """
+        Initialize the ContentStore.
+
+        Args:
+            root (Optional[str]): Store directory; a new temporary directory if omitted.
+                An existing store directory is reopened.
+            max_cached_trees (int): Maximum number of live syntax trees kept in memory
+        """
+        self.root = root or tempfile.mkdtemp(prefix="aicode_scan_")
+        os.makedirs(self.root, exist_ok=True)
+        self.blob_path = os.path.join(self.root, BLOB_FILE_NAME)
+        self.max_cached_trees = max_cached_trees
+
+        self._lock = threading.RLock()
+        self._file = open(self.blob_path, "ab+")
+        self._size = self._file.seek(0, os.SEEK_END)
+        self._mmap: Optional[mmap.mmap] = None
+        self._mapped_size = 0
+        self._digests: Dict[str, Tuple[int, int]] = {}
+        self._trees: "OrderedDict[str, Any]" = OrderedDict()
+
+        logger.debug(f"ContentStore opened at {self.root}")
+
+    @property
+    def size(self) -> int:
+        """Total size of the blob file in bytes."""
+        return self._size
+
+    def put(self, data: Union[str, bytes], key: Optional[str] = None) -> Tuple[int, int]:
+        """
+        Append a blob to the store.
+
+        Args:
+            data (Union[str, bytes]): Blob contents (text is stored as UTF-8)
+            key (Optional[str]): Content key of the data if already known, which
+                saves hashing it
+
+        Returns:
+            Tuple[int, int]: ``(offset, length)`` reference to the blob
+        """
+        if isinstance(data, str):
+            data = data.encode("utf-8", errors="surrogatepass")
+
+        digest = key or git_blob_id(data)
+        with self._lock:
+            ref = self._digests.get(digest)
+            if ref is not None:
+                return ref
+
+            offset = self._size
+            self._file.seek(0, os.SEEK_END)
+            self._file.write(data)
+            self._size += len(data)
+            ref = (offset, len(data))
+            self._digests[digest] = ref
+            return ref
+
+    def get(self, ref: Union[Tuple[int, int], List[int]]) -> bytes:
+        """
+        Read a blob.
+
+        Args:
+            ref (Union[Tuple[int, int], List[int]]): ``(offset, length)`` reference
+
+        Returns:
+            bytes: Blob contents
+        """
+        offset, length = ref
+        if length == 0:
+            return b""
+
+        with self._lock:
+            if offset + length > self._mapped_size:
+                self._remap()
+            return self._mmap[offset:offset + length]
+
+    def _remap(self) -> None:
+        """Map the blob file again after it has grown."""
+        self._file.flush()
+        if self._mmap is not None:
+            self._mmap.close()
+        self._mmap = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        self._mapped_size = len(self._mmap)
+
+    def get_text(self, ref: Union[Tuple[int, int], List[int]]) -> str:
+        """Read a text blob."""
+        return self.get(ref).decode("utf-8", errors="surrogatepass")
+
+    def store_files(self, files: Mapping, keys: Optional[Mapping[str, str]] = None) -> "BlobMapping":
+        """
+        Store file contents and get a mapping handle for them.
+
+        Args:
+            files (Mapping): Mapping of file path to text content
+            keys (Optional[Mapping[str, str]]): Content keys of the files by path, if known
+
+        Returns:
+            BlobMapping: Read-only mapping of file path to content backed by this store
+        """
+        keys = keys or {}
+        index = {path: list(self.put(content, keys.get(path))) for path, content in files.items()}
+        return BlobMapping(root=self.root, index=index, codec=CODEC_TEXT)
+
+    def store_documents(self, documents: Mapping) -> "BlobMapping":
+        """
+        Store JSON-serializable documents (e.g. structural info) compactly.
+
+        Args:
+            documents (Mapping): Mapping of key to JSON-serializable value
+
+        Returns:
+            BlobMapping: Read-only mapping of key to decoded document
+        """
+        index = {key: list(self.put_document(value)) for key, value in documents.items()}
+        return BlobMapping(root=self.root, index=index, codec=CODEC_JSON)
+
+    def put_document(self, document: Any) -> Tuple[int, int]:
+        """
+        Append a JSON-serializable document to the store.
+
+        Args:
+            document (Any): JSON-serializable value
+
+        Returns:
+            Tuple[int, int]: ``(offset, length)`` reference to the encoded document
+        """
+        return self.put(json.dumps(document, separators=(",", ":"), default=str))
+
+    def cache_tree(self, key: str, tree: Any) -> None:
+        """
+        Keep a live syntax tree in the bounded in-memory cache.
+
+        Args:
+            key (str): File path the tree was parsed from
+            tree (Any): Tree-sitter node
+        """
+        with self._lock:
+            self._trees[key] = tree
+            self._trees.move_to_end(key)
+            while len(self._trees) > self.max_cached_trees:
+                self._trees.popitem(last=False)
+
+    def get_tree(self, key: str) -> Optional[Any]:
+        """
+        Get a cached syntax tree.
+
+        Args:
+            key (str): File path the tree was parsed from
+
+        Returns:
+            Optional[Any]: The tree, or None if it was never cached or was evicted
+        """
+        with self._lock:
+            tree = self._trees.get(key)
+            if tree is not None:
+                self._trees.move_to_end(key)
+            return tree
+
+    def close(self) -> None:
+        """Close the blob file and drop cached trees."""
+        with self._lock:
+            if self._mmap is not None:
+                self._mmap.close()
+                self._mmap = None
+                self._mapped_size = 0
+            if not self._file.closed:
+                self._file.close()
+            self._trees.clear()
+
+    def cleanup(self) -> None:
+        """Close the store and delete its directory."""
+        self.close()
+        _stores.pop(self.root, None)
+        shutil.rmtree(self.root, ignore_errors=True)
+        logger.debug(f"ContentStore removed at {self.root}")
+
+
+@dataclass(eq=False)
+class BlobMapping(Mapping):
+    """
+    Serializable, read-only mapping whose values live in a ContentStore.
+
+    Only the store location and the ``key -> (offset, length)`` index are held
+    in memory; values are decoded from the memory-mapped blob file on access.
+
+    Attributes:
+        root (str): Directory of the backing ContentStore
+        index (Dict[str, List[int]]): Blob reference per key
+        codec (str): "text" for file contents, "json" for documents
+    """
+    root: str
+    index: Dict[str, List[int]] = field(default_factory=dict)
+    codec: str = CODEC_TEXT
+
+    def __getitem__(self, key: str) -> Any:
+        ref = self.index[key]
+        store = open_content_store(self.root)
+        if self.codec == CODEC_JSON:
+            return json.loads(store.get(ref))
+        return store.get_text(ref)
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self.index)
+
+    def __len__(self) -> int:
+        return len(self.index)
+
+    def __contains__(self, key: object) -> bool:
+        return key in self.index
+
+    def __repr__(self) -> str:
+        return f"BlobMapping(root={self.root!r}, keys={len(self.index)}, codec={self.codec!r})"
+
+    @property
+    def total_bytes(self) -> int:
+        """Total stored size of all values in bytes."""
+        return sum(length for _, length in self.index.values())
+
+
+# Open stores by directory, shared by all handles in this process
+_stores: Dict[str, ContentStore] = {}
+_stores_lock = threading.Lock()
+
+
+def open_content_store(root: Optional[str] = None) -> ContentStore:
+    """
+    Get the open ContentStore for a directory, opening it if needed.
+
+    Args:
+        root (Optional[str]): Store directory; a new scan store is created if omitted
+
+    Returns:
+        ContentStore: The store instance shared within this process
+    """
+    with _stores_lock:
+        if root is not None and root in _stores:
+            return _stores[root]
+        store = ContentStore(root)
+        _stores[store.root] = store
+        return store
@@ -0,0 +1,430 @@
+"""
+Unified diff model for AI Code Review System.
+
+This module implements a single streaming parser for git/unified diffs and the
+ChangeSet model it produces. A ChangeSet lists every changed file with its
+status, old and new paths and hunks (with line ranges), so the fetcher, the
+orchestrator and impact analysis can share one parse of the PR diff instead of
+each re-splitting a potentially multi-megabyte string.
+"""
+
+import io
+import logging
+import re
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Union
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+# File change statuses
+STATUS_ADDED = "added"
+STATUS_DELETED = "deleted"
+STATUS_MODIFIED = "modified"
+STATUS_RENAMED = "renamed"
+STATUS_COPIED = "copied"
+
+DEV_NULL = "/dev/null"
+
+_HUNK_HEADER_RE = re.compile(r"^@@ -(\d+)(?:,(\d+))? \+(\d+)(?:,(\d+))? @@ ?(.*)$")
+_GIT_HEADER_RE = re.compile(r"^diff --git (\"?a/.*?\"?) (\"?b/.*\"?)$")
+
+
+def _strip_path_prefix(path: Optional[str]) -> Optional[str]:
+    """
+    Normalize a path from a diff header.
+
+    Removes quoting, timestamps and the ``a/`` / ``b/`` prefixes, and maps
+    ``/dev/null`` to None.
+
+    Args:
+        path (Optional[str]): Raw path from a ``diff --git``, ``---`` or ``+++`` line
+
+    Returns:
+        Optional[str]: Repository-relative path, or None for /dev/null
+    """
+    if path is None:
+        return None
+
+    # "--- a/file.py\t2024-01-01 00:00:00" style headers carry a timestamp
+    path = path.split("\t", 1)[0].strip()
+    if len(path) >= 2 and path[0] == '"' and path[-1] == '"':
+        path = path[1:-1]
+
+    if not path or path == DEV_NULL:
+        return None
+    if path.startswith(("a/", "b/")):
+        return path[2:]
+    return path
+
+
+@dataclass
+class DiffHunk:
+    """
+    A single hunk of a file diff.
+
+    Attributes:
+        old_start (int): First line of the hunk in the pre-image
+        old_count (int): Number of pre-image lines covered by the hunk
+        new_start (int): First line of the hunk in the post-image
+        new_count (int): Number of post-image lines covered by the hunk
+        section (str): Optional section heading after the ``@@`` markers
+        lines (List[str]): Hunk body lines, including their ``+``/``-``/`` `` prefix
+    """
+    old_start: int
+    old_count: int
+    new_start: int
+    new_count: int
+    section: str = ""
+    lines: List[str] = field(default_factory=list)
+
+    @property
+    def old_end(self) -> int:
+        """Last pre-image line covered by the hunk."""
+        return self.old_start + max(self.old_count, 1) - 1
+
+    @property
+    def new_end(self) -> int:
+        """Last post-image line covered by the hunk."""
+        return self.new_start + max(self.new_count, 1) - 1
+
+    @property
+    def additions(self) -> int:
+        return sum(1 for line in self.lines if line.startswith("+"))
+
+    @property
+    def deletions(self) -> int:
+        return sum(1 for line in self.lines if line.startswith("-"))
+
+    def added_line_numbers(self) -> List[int]:
+        """
+        Get post-image line numbers of lines added by this hunk.
+
+        Returns:
+            List[int]: 1-based line numbers in the new file
+        """
+        added = []
+        line_no = self.new_start
+        for line in self.lines:
+            if line.startswith("+"):
+                added.append(line_no)
+                line_no += 1
+            elif line.startswith(" ") or line == "":
+                line_no += 1
+        return added
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "old_start": self.old_start,
+            "old_count": self.old_count,
+            "new_start": self.new_start,
+            "new_count": self.new_count,
+            "section": self.section,
+            "lines": list(self.lines)
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "DiffHunk":
+        return cls(**data)
+
+
+@dataclass
+class FileChange:
+    """
+    Changes to a single file in a diff.
+
+    Attributes:
+        old_path (Optional[str]): Path before the change (None for added files)
+        new_path (Optional[str]): Path after the change (None for deleted files)
+        status (str): One of added, deleted, modified, renamed or copied
+        hunks (List[DiffHunk]): Hunks of the file diff
+        is_binary (bool): Whether git reported the file as binary
+        new_content (Optional[str]): Full post-image contents, when fetched
+    """
+    old_path: Optional[str]
+    new_path: Optional[str]
+    status: str = STATUS_MODIFIED
+    hunks: List[DiffHunk] = field(default_factory=list)
+    is_binary: bool = False
+    new_content: Optional[str] = None
+
+    @property
+    def path(self) -> str:
+        """Path that identifies the file (the new path unless it was deleted)."""
+        return self.new_path or self.old_path or ""
+
+    @property
+    def additions(self) -> int:
+        return sum(hunk.additions for hunk in self.hunks)
+
+    @property
+    def deletions(self) -> int:
+        return sum(hunk.deletions for hunk in self.hunks)
+
+    def added_line_numbers(self) -> List[int]:
+        """
+        Get post-image line numbers of all added lines.
+
+        Returns:
+            List[int]: 1-based line numbers in the new file
+        """
+        added = []
+        for hunk in self.hunks:
+            added.extend(hunk.added_line_numbers())
+        return added
+
+    def post_image(self) -> Optional[str]:
+        """
+        Get the full contents of the file after the change.
+
+        Uses fetched contents when available. Added files can be rebuilt from
+        the diff alone; for other files only partial hunks are known, so None is
+        returned rather than a fragment that would not parse.
+
+        Returns:
+            Optional[str]: Post-image contents, or None if unknown
+        """
+        if self.new_content is not None:
+            return self.new_content
+        if self.status != STATUS_ADDED or self.is_binary or not self.hunks:
+            return None
+
+        content_lines = []
+        missing_newline = False
+        for hunk in self.hunks:
+            for line in hunk.lines:
+                if line.startswith("+"):
+                    content_lines.append(line[1:])
+                    missing_newline = False
+                elif line.startswith("\\"):
+                    missing_newline = True
+
+        content = "\n".join(content_lines)
+        return content if missing_newline else content + "\n"
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "old_path": self.old_path,
+            "new_path": self.new_path,
+            "status": self.status,
+            "hunks": [hunk.to_dict() for hunk in self.hunks],
+            "is_binary": self.is_binary,
+            "new_content": self.new_content
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "FileChange":
+        return cls(
+            old_path=data.get("old_path"),
+            new_path=data.get("new_path"),
+            status=data.get("status", STATUS_MODIFIED),
+            hunks=[DiffHunk.from_dict(hunk) for hunk in data.get("hunks", [])],
+            is_binary=data.get("is_binary", False),
+            new_content=data.get("new_content")
+        )
+
+
+@dataclass
+class ChangeSet:
+    """
+    All file changes of a diff, in diff order.
+
+    Attributes:
+        files (List[FileChange]): Changed files
+    """
+    files: List[FileChange] = field(default_factory=list)
+
+    def __iter__(self) -> Iterator[FileChange]:
+        return iter(self.files)
+
+    def __len__(self) -> int:
+        return len(self.files)
+
+    def __bool__(self) -> bool:
+        return bool(self.files)
+
+    def get(self, path: str) -> Optional[FileChange]:
+        """
+        Find the change for a file by its new or old path.
+
+        Args:
+            path (str): Repository-relative file path
+
+        Returns:
+            Optional[FileChange]: The file change, or None if the file did not change
+        """
+        for file_change in self.files:
+            if path in (file_change.new_path, file_change.old_path):
+                return file_change
+        return None
+
+    def paths(self, include_deleted: bool = True) -> List[str]:
+        """
+        Get the paths of changed files without duplicates, in diff order.
+
+        Args:
+            include_deleted (bool): Whether to include deleted files
+
+        Returns:
+            List[str]: Changed file paths
+        """
+        seen = set()
+        paths = []
+        for file_change in self.files:
+            if not include_deleted and file_change.status == STATUS_DELETED:
+                continue
+            if file_change.path and file_change.path not in seen:
+                seen.add(file_change.path)
+                paths.append(file_change.path)
+        return paths
+
+    def summary(self) -> Dict[str, Any]:
+        """
+        Get counters describing the change set.
+
+        Returns:
+            Dict[str, Any]: File counts per status and total added/deleted lines
+        """
+        status_counts: Dict[str, int] = {}
+        for file_change in self.files:
+            status_counts[file_change.status] = status_counts.get(file_change.status, 0) + 1
+        return {
+            "files_changed": len(self.files),
+            "status_counts": status_counts,
+            "additions": sum(f.additions for f in self.files),
+            "deletions": sum(f.deletions for f in self.files)
+        }
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {"files": [file_change.to_dict() for file_change in self.files]}
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "ChangeSet":
+        return cls(files=[FileChange.from_dict(f) for f in data.get("files", [])])
+
+
+def _iter_lines(diff: Union[str, Iterable[str]]) -> Iterator[str]:
+    """Yield diff lines without their line terminators."""
+    source = io.StringIO(diff) if isinstance(diff, str) else diff
+    for line in source:
+        yield line.rstrip("\n")
+
+
+def parse_unified_diff(diff: Union[str, Iterable[str]]) -> ChangeSet:
+    """
+    Parse a git or plain unified diff into a ChangeSet in a single pass.
+
+    The diff is consumed line by line, so an open file or a generator of lines
+    can be passed instead of a string. Hunk bodies are delimited by the line
+    counts in their ``@@`` headers, which keeps lines such as ``--- foo`` inside
+    a hunk from being mistaken for file headers. Malformed or truncated input
+    never raises; anything that cannot be attributed to a file is ignored.
+
+    Args:
+        diff (Union[str, Iterable[str]]): Diff text or an iterable of diff lines
+
+    Returns:
+        ChangeSet: Parsed file changes
+    """
+    files: List[FileChange] = []
+    current: Optional[FileChange] = None
+    hunk: Optional[DiffHunk] = None
+    old_remaining = new_remaining = 0
+
+    if not diff:
+        return ChangeSet()
+
+    for line in _iter_lines(diff):
+        # Inside a hunk body: consume lines until the header counts are used up
+        if hunk is not None and (old_remaining > 0 or new_remaining > 0):
+            if line.startswith("+"):
+                new_remaining -= 1
+            elif line.startswith("-"):
+                old_remaining -= 1
+            elif line.startswith(" ") or line == "":
+                old_remaining -= 1
+                new_remaining -= 1
+            elif line.startswith("\\"):
+                pass
+            else:
+                # Truncated hunk; fall through and treat the line as a header
+                hunk = None
+            if hunk is not None:
+                hunk.lines.append(line)
+                continue
+
+        # "\ No newline at end of file" right after the last hunk line
+        if hunk is not None and line.startswith("\\"):
+            hunk.lines.append(line)
+            continue
+
+        if line.startswith("diff --git "):
+            hunk = None
+            match = _GIT_HEADER_RE.match(line)
+            if match:
+                old_path, new_path = _strip_path_prefix(match.group(1)), _strip_path_prefix(match.group(2))
+            else:
+                parts = line.split()
+                old_path = _strip_path_prefix(parts[2]) if len(parts) > 2 else None
+                new_path = _strip_path_prefix(parts[3]) if len(parts) > 3 else old_path
+            current = FileChange(old_path=old_path, new_path=new_path)
+            files.append(current)
+            continue
+
+        header = _HUNK_HEADER_RE.match(line)
+        if header:
+            if current is None:
+                continue
+            old_count = int(header.group(2)) if header.group(2) is not None else 1
+            new_count = int(header.group(4)) if header.group(4) is not None else 1
+            hunk = DiffHunk(
+                old_start=int(header.group(1)),
+                old_count=old_count,
+                new_start=int(header.group(3)),
+                new_count=new_count,
+                section=header.group(5) or ""
+            )
+            current.hunks.append(hunk)
+            old_remaining, new_remaining = old_count, new_count
+            continue
+
+        hunk = None
+
+        if line.startswith("--- "):
+            # Plain unified diffs have no "diff --git" line; "---" starts the file
+            if current is None or current.hunks:
+                current = FileChange(old_path=None, new_path=None)
+                files.append(current)
+            current.old_path = _strip_path_prefix(line[4:])
+            if current.old_path is None:
+                current.status = STATUS_ADDED
+        elif line.startswith("+++ ") and current is not None:
+            current.new_path = _strip_path_prefix(line[4:])
+            if current.new_path is None:
+                current.status = STATUS_DELETED
+        elif current is None:
+            continue
+        elif line.startswith("new file mode"):
+            current.status = STATUS_ADDED
+            current.old_path = None
+        elif line.startswith("deleted file mode"):
+            current.status = STATUS_DELETED
+            current.new_path = None
+        elif line.startswith("rename from "):
+            current.status = STATUS_RENAMED
+            current.old_path = line[len("rename from "):]
+        elif line.startswith("rename to "):
+            current.status = STATUS_RENAMED
+            current.new_path = line[len("rename to "):]
+        elif line.startswith("copy from "):
+            current.status = STATUS_COPIED
+            current.old_path = line[len("copy from "):]
+        elif line.startswith("copy to "):
+            current.status = STATUS_COPIED
+            current.new_path = line[len("copy to "):]
+        elif line.startswith("Binary files ") or line.startswith("GIT binary patch"):
+            current.is_binary = True
+
+    change_set = ChangeSet(files=files)
+    logger.debug(f"Parsed diff with {len(change_set)} changed files")
+    return change_set
@@ -0,0 +1,437 @@
+"""
+File exclusion rules for project scans.
+
+Decides which repository files are worth scanning. Files are excluded when
+they match the repository's ``.gitignore`` files or configured exclude
+globs, when they are vendored dependencies (``node_modules/``, ``vendor/``,
+minified bundles, ...), or when they are generated code, recognized by
+their path (protobuf stubs, build outputs, ...) or by linguist-style
+markers and minification in their first bytes. The repository's
+``.gitattributes`` files can mark further files ``linguist-vendored`` or
+``linguist-generated``, or unmark the built-in ones.
+
+Patterns use ``.gitignore`` syntax: ``*`` and ``?`` do not cross ``/``,
+``**`` does, a trailing ``/`` only matches directories, a pattern with a
+leading or inner ``/`` is anchored to its directory, and ``!`` re-includes.
+"""
+
+import posixpath
+import re
+from dataclasses import dataclass
+from typing import Dict, Iterable, List, Optional, Pattern
+
+REASON_IGNORED = "ignored"
+REASON_VENDORED = "vendored"
+REASON_GENERATED = "generated"
+REASON_TOO_LARGE = "too_large"
+REASON_TRUNCATED = "truncated"
+
+# Third-party code checked into repositories (after GitHub linguist's vendor list)
+VENDORED_PATTERNS = (
+    "node_modules/",
+    "bower_components/",
+    "jspm_packages/",
+    "vendor/",
+    "vendors/",
+    "third_party/",
+    "third-party/",
+    "3rdparty/",
+    "Pods/",
+    "Carthage/",
+    "site-packages/",
+    "*.min.js",
+    "*.min.css",
+    "jquery*.js"
+)
+
+# Build outputs and code generator output recognizable by path
+GENERATED_PATTERNS = (
+    "build/",
+    "dist/",
+    "target/",
+    "generated/",
+    "__pycache__/",
+    "*_pb2.py",
+    "*_pb2_grpc.py",
+    "*.pb.dart",
+    "*.pbenum.dart",
+    "*.pbgrpc.dart",
+    "*.pbjson.dart",
+    "*.g.dart",
+    "*.freezed.dart",
+    "*.bundle.js",
+    "*.chunk.js",
+    "R.java",
+    "BuildConfig.java"
+)
+
+# Markers generators write near the top of their output
+GENERATED_MARKERS = (
+    "@generated",
+    "DO NOT EDIT",
+    "Code generated by",
+    "Generated by the protocol buffer compiler",
+    "<auto-generated",
+    "This file is automatically generated",
+    "AUTO-GENERATED FILE",
+    "Autogenerated by"
+)
+
+# Bytes of a file inspected for markers and minification
+HEADER_BYTES = 2048
+
+# Average line length above which JavaScript is considered minified (as in linguist)
+MINIFIED_LINE_LENGTH = 110
+
+_MINIFIABLE_EXTENSIONS = (".js", ".mjs", ".cjs", ".css")
+
+# Git attributes that mark files as vendored or generated (as in linguist)
+ATTRIBUTE_VENDORED = "linguist-vendored"
+ATTRIBUTE_GENERATED = "linguist-generated"
+
+# Repository files holding exclusion rules for their directory
+GITIGNORE_FILE = ".gitignore"
+GITATTRIBUTES_FILE = ".gitattributes"
+RULE_FILES = (GITIGNORE_FILE, GITATTRIBUTES_FILE)
+
+
+def _translate(pattern: str) -> str:
+    """Translate the body of a gitignore pattern into a regular expression."""
+    regex = ""
+    i = 0
+    while i < len(pattern):
+        char = pattern[i]
+        if pattern.startswith("**/", i):
+            regex += "(?:.*/)?"
+            i += 3
+            continue
+        if pattern.startswith("**", i):
+            regex += ".*"
+            i += 2
+            continue
+        if char == "*":
+            regex += "[^/]*"
+        elif char == "?":
+            regex += "[^/]"
+        elif char == "[":
+            end = pattern.find("]", i + 1)
+            if end == -1:
+                regex += re.escape(char)
+            else:
+                body = pattern[i + 1:end]
+                if body.startswith("!"):
+                    body = "^" + body[1:]
+                regex += f"[{body}]"
+                i = end
+        elif char == "\\" and i + 1 < len(pattern):
+            i += 1
+            regex += re.escape(pattern[i])
+        else:
+            regex += re.escape(char)
+        i += 1
+    return regex
+
+
+@dataclass
+class IgnoreRule:
+    """A compiled gitignore pattern."""
+    base: str
+    regex: Pattern
+    negated: bool
+    directory_only: bool
+
+
+def compile_rule(pattern: str, base: str = "") -> Optional[IgnoreRule]:
+    """
+    Compile one gitignore line.
+
+    Args:
+        pattern (str): Line of a ``.gitignore`` file or an exclude glob
+        base (str): Directory of the ``.gitignore`` file, relative to the repository root
+
+    Returns:
+        Optional[IgnoreRule]: Compiled rule, or None for blank lines and comments
+    """
+    pattern = pattern.rstrip("\n\r")
+    if not pattern.endswith("\\ "):
+        pattern = pattern.rstrip(" ")
+    if not pattern or pattern.startswith("#"):
+        return None
+
+    negated = pattern.startswith("!")
+    if negated:
+        pattern = pattern[1:]
+    elif pattern.startswith("\\"):
+        pattern = pattern[1:]
+
+    directory_only = pattern.endswith("/")
+    pattern = pattern.rstrip("/")
+    if not pattern:
+        return None
+
+    anchored = "/" in pattern
+    pattern = pattern.lstrip("/")
+    prefix = "^" if anchored else "^(?:.*/)?"
+    return IgnoreRule(
+        base=base.strip("/"),
+        regex=re.compile(prefix + _translate(pattern) + "$"),
+        negated=negated,
+        directory_only=directory_only
+    )
+
+
+class IgnoreRules:
+    """
+    Ordered gitignore rules; the last matching rule decides.
+
+    Files inside an excluded directory stay excluded, as in git.
+    """
+
+    def __init__(self, patterns: Iterable[str] = ()):
+        """
+        Initialize the IgnoreRules.
+
+        Args:
+            patterns (Iterable[str]): Patterns relative to the repository root
+        """
+        self._rules: List[IgnoreRule] = []
+        self._directories: Dict[str, bool] = {}
+        self.add_patterns(patterns)
+
+    def add_patterns(self, patterns: Iterable[str], base: str = "") -> None:
+        """
+        Add the lines of a ``.gitignore`` file.
+
+        Args:
+            patterns (Iterable[str]): Pattern lines
+            base (str): Directory the patterns are relative to
+        """
+        for pattern in patterns:
+            rule = compile_rule(pattern, base)
+            if rule is not None:
+                self._rules.append(rule)
+        self._directories.clear()
+
+    def __bool__(self) -> bool:
+        return bool(self._rules)
+
+    def _matches(self, path: str, is_dir: bool) -> bool:
+        ignored = False
+        for rule in self._rules:
+            if rule.directory_only and not is_dir:
+                continue
+            relative = path
+            if rule.base:
+                if not path.startswith(rule.base + "/"):
+                    continue
+                relative = path[len(rule.base) + 1:]
+            if rule.regex.match(relative):
+                ignored = not rule.negated
+        return ignored
+
+    def is_ignored(self, path: str, is_dir: bool = False) -> bool:
+        """
+        Check a repository-relative path against the rules.
+
+        Args:
+            path (str): Path relative to the repository root, ``/`` separated
+            is_dir (bool): Whether the path is a directory
+
+        Returns:
+            bool: True if the path or one of its parent directories is excluded
+        """
+        if not self._rules:
+            return False
+        parent = posixpath.dirname(path)
+        if parent and self.is_directory_ignored(parent):
+            return True
+        if is_dir:
+            return self.is_directory_ignored(path)
+        return self._matches(path, False)
+
+    def is_directory_ignored(self, path: str) -> bool:
+        """
+        Check a directory and its parents against the rules (cached per directory).
+
+        Args:
+            path (str): Directory relative to the repository root
+
+        Returns:
+            bool: True if the directory is excluded
+        """
+        cached = self._directories.get(path)
+        if cached is None:
+            parent = posixpath.dirname(path)
+            cached = bool(parent and self.is_directory_ignored(parent)) or self._matches(path, True)
+            self._directories[path] = cached
+        return cached
+
+
+def is_generated_content(path: str, head: str) -> bool:
+    """
+    Recognize generated or minified files by their first bytes.
+
+    Args:
+        path (str): Repository-relative path
+        head (str): Beginning of the file (about ``HEADER_BYTES``)
+
+    Returns:
+        bool: True if the file carries a generator marker or is minified
+    """
+    if any(marker in head for marker in GENERATED_MARKERS):
+        return True
+    if path.lower().endswith(_MINIFIABLE_EXTENSIONS) and head:
+        lines = head.splitlines() or [head]
+        return len(head) / len(lines) > MINIFIED_LINE_LENGTH
+    return False
+
+
+class FileFilter:
+    """
+    Exclusion decisions for the files of one repository scan.
+
+    ``.gitignore`` files are added as they are found, so one filter must
+    not be shared between repositories.
+    """
+
+    def __init__(self, exclude_globs: Iterable[str] = (), detect_vendored: bool = True):
+        """
+        Initialize the FileFilter.
+
+        Args:
+            exclude_globs (Iterable[str]): Extra gitignore-style patterns to exclude
+            detect_vendored (bool): Exclude vendored and generated files
+        """
+        self.ignored = IgnoreRules(exclude_globs)
+        self.detect_vendored = detect_vendored
+        self.vendored = IgnoreRules(VENDORED_PATTERNS if detect_vendored else ())
+        self.generated = IgnoreRules(GENERATED_PATTERNS if detect_vendored else ())
+
+    def add_gitignore(self, directory: str, content: str) -> None:
+        """
+        Add the rules of a ``.gitignore`` file.
+
+        Args:
+            directory (str): Directory holding the file, relative to the repository root
+            content (str): File content
+        """
+        self.ignored.add_patterns(content.splitlines(), base=directory)
+
+    def add_gitattributes(self, directory: str, content: str) -> None:
+        """
+        Add the linguist attributes of a ``.gitattributes`` file.
+
+        A set attribute (``linguist-vendored`` or ``linguist-vendored=true``)
+        excludes the matching files; an unset or false one
+        (``-linguist-vendored``, ``linguist-vendored=false``) keeps them even
+        if a built-in pattern matches.
+
+        Args:
+            directory (str): Directory holding the file, relative to the repository root
+            content (str): File content
+        """
+        if not self.detect_vendored:
+            return
+        rules = {ATTRIBUTE_VENDORED: self.vendored, ATTRIBUTE_GENERATED: self.generated}
+        for line in content.splitlines():
+            fields = line.split()
+            # Negative patterns are not allowed in .gitattributes
+            if len(fields) < 2 or fields[0].startswith(("#", "!")):
+                continue
+            pattern = fields[0]
+            for attribute in fields[1:]:
+                name, _, value = attribute.partition("=")
+                unset = name.startswith("-")
+                name = name[1:] if unset else name
+                if name not in rules:
+                    continue
+                if not unset and value.lower() not in ("false", "0"):
+                    rules[name].add_patterns([pattern], base=directory)
+                    continue
+                patterns = [f"!{pattern}"]
+                if pattern.endswith("/**"):
+                    # Unmarking a whole directory also lets the walk descend into it
+                    patterns.append(f"!/{pattern[:-3].lstrip('/')}/")
+                rules[name].add_patterns(patterns, base=directory)
+
+    def add_rule_file(self, directory: str, name: str, content: str) -> None:
+        """
+        Add the rules of a ``.gitignore`` or ``.gitattributes`` file.
+
+        Args:
+            directory (str): Directory holding the file, relative to the repository root
+            name (str): File name, one of ``RULE_FILES``
+            content (str): File content
+        """
+        if name == GITATTRIBUTES_FILE:
+            self.add_gitattributes(directory, content)
+        else:
+            self.add_gitignore(directory, content)
+
+    def directory_reason(self, path: str) -> Optional[str]:
+        """
+        Get why a whole directory is excluded.
+
+        Args:
+            path (str): Directory relative to the repository root
+
+        Returns:
+            Optional[str]: Exclusion reason, or None to descend into it
+        """
+        if self.ignored.is_directory_ignored(path):
+            return REASON_IGNORED
+        if self.vendored.is_directory_ignored(path):
+            return REASON_VENDORED
+        if self.generated.is_directory_ignored(path):
+            return REASON_GENERATED
+        return None
+
+    def path_reason(self, path: str) -> Optional[str]:
+        """
+        Get why a file is excluded based on its path alone.
+
+        Args:
+            path (str): File path relative to the repository root
+
+        Returns:
+            Optional[str]: Exclusion reason, or None to keep the file
+        """
+        if self.ignored.is_ignored(path):
+            return REASON_IGNORED
+        if self.vendored.is_ignored(path):
+            return REASON_VENDORED
+        if self.generated.is_ignored(path):
+            return REASON_GENERATED
+        return None
+
+    def content_reason(self, path: str, head: str) -> Optional[str]:
+        """
+        Get why a file is excluded based on its first bytes.
+
+        Args:
+            path (str): File path relative to the repository root
+            head (str): Beginning of the file
+
+        Returns:
+            Optional[str]: Exclusion reason, or None to keep the file
+        """
+        if self.detect_vendored and is_generated_content(path, head):
+            return REASON_GENERATED
+        return None
+
+
+def record_exclusion(exclusions: Optional[Dict[str, Dict[str, int]]], reason: str, size: int) -> None:
+    """
+    Count an excluded file in an exclusion report.
+
+    Args:
+        exclusions (Optional[Dict[str, Dict[str, int]]]): Report of excluded
+            ``files`` and ``bytes`` per reason, or None if not collected
+        reason (str): Exclusion reason
+        size (int): File size in bytes
+    """
+    if exclusions is None:
+        return
+    counts = exclusions.setdefault(reason, {"files": 0, "bytes": 0})
+    counts["files"] += 1
+    counts["bytes"] += size
@@ -0,0 +1,283 @@
+"""
+Streaming findings storage for AI Code Review System.
+
+This module implements an append-only JSONL sink for static analysis findings.
+Small scans keep their findings in a plain list, but once the number of findings
+passes a threshold the sink spills them to a (optionally gzip-compressed) file
+and hands out a lightweight FindingsStream handle instead. The handle carries
+summary counters and can be iterated lazily by downstream consumers, so peak
+memory no longer grows with the number of findings.
+"""
+
+import gzip
+import json
+import logging
+import os
+import tempfile
+from collections import Counter
+from dataclasses import dataclass
+from itertools import islice
+from typing import Any, Dict, IO, Iterable, Iterator, List, Optional, Union
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+# Number of findings kept in memory before the sink spills to disk
+DEFAULT_SPILL_THRESHOLD = 5000
+
+
+@dataclass
+class FindingsStream:
+    """
+    Read-only, re-iterable handle on a spilled findings file.
+
+    The stream behaves like a sequence for the operations used by the
+    reporting, risk and LLM stages (iteration, ``len()``, truthiness and
+    slicing), but every access reads the file lazily instead of keeping
+    findings in memory. Being a dataclass of plain fields, the handle can be
+    stored in workflow checkpoints without its findings.
+
+    Attributes:
+        path (str): Path to the JSONL spill file
+        compressed (bool): Whether the spill file is gzip-compressed
+        count (int): Number of findings stored in the file
+        severity_counts (Optional[Dict[str, int]]): Findings per severity
+        category_counts (Optional[Dict[str, int]]): Findings per category
+    """
+    path: str
+    compressed: bool = True
+    count: int = 0
+    severity_counts: Optional[Dict[str, int]] = None
+    category_counts: Optional[Dict[str, int]] = None
+
+    def __post_init__(self):
+        self.severity_counts = dict(self.severity_counts or {})
+        self.category_counts = dict(self.category_counts or {})
+
+    def _open(self) -> IO[str]:
+        """Open the spill file for reading."""
+        if self.compressed:
+            return gzip.open(self.path, 'rt', encoding='utf-8')
+        return open(self.path, 'r', encoding='utf-8')
+
+    def __iter__(self) -> Iterator[Dict[str, Any]]:
+        """Yield findings one by one from the spill file."""
+        with self._open() as f:
+            for line in f:
+                line = line.strip()
+                if line:
+                    yield json.loads(line)
+
+    def __len__(self) -> int:
+        return self.count
+
+    def __bool__(self) -> bool:
+        return self.count > 0
+
+    def __getitem__(self, index: Union[int, slice]) -> Any:
+        """
+        Support integer and slice access by reading only what is needed.
+
+        Args:
+            index (Union[int, slice]): Position or slice of findings
+
+        Returns:
+            Any: A single finding for integer indexes, a list for slices
+        """
+        if isinstance(index, slice):
+            start, stop, step = index.indices(self.count)
+            return list(islice(self, start, stop, step))
+
+        if index < 0:
+            index += self.count
+        if index < 0 or index >= self.count:
+            raise IndexError("findings index out of range")
+        return next(islice(self, index, None))
+
+    def __repr__(self) -> str:
+        return f"FindingsStream(path={self.path!r}, count={self.count})"
+
+    def summary(self) -> Dict[str, Any]:
+        """
+        Get summary counters for the stored findings.
+
+        Returns:
+            Dict[str, Any]: Total, per-severity and per-category counts
+        """
+        return {
+            "total_findings": self.count,
+            "severity_counts": dict(self.severity_counts),
+            "category_counts": dict(self.category_counts)
+        }
+
+    def to_dict(self) -> Dict[str, Any]:
+        """
+        Serialize the handle (not the findings) to a plain dictionary.
+
+        Returns:
+            Dict[str, Any]: JSON-serializable description of the stream
+        """
+        return {
+            "path": self.path,
+            "compressed": self.compressed,
+            **self.summary()
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "FindingsStream":
+        """
+        Rebuild a handle from the output of ``to_dict``.
+
+        Args:
+            data (Dict[str, Any]): Serialized stream handle
+
+        Returns:
+            FindingsStream: Handle pointing at the same spill file
+        """
+        return cls(
+            path=data["path"],
+            compressed=data.get("compressed", True),
+            count=data.get("total_findings", 0),
+            severity_counts=data.get("severity_counts"),
+            category_counts=data.get("category_counts")
+        )
+
+    def discard(self) -> None:
+        """Delete the underlying spill file."""
+        try:
+            if os.path.exists(self.path):
+                os.remove(self.path)
+        except OSError as e:
+            logger.warning(f"Failed to remove findings spill file {self.path}: {str(e)}")
+
+
+class FindingsSink:
+    """
+    Append-only collector for static analysis findings.
+
+    Findings are buffered in memory until ``spill_threshold`` is reached,
+    after which the buffer and every further finding are appended to a JSONL
+    spill file. Summary counters are maintained incrementally either way.
+    """
+
+    def __init__(
+        self,
+        spill_threshold: Optional[int] = DEFAULT_SPILL_THRESHOLD,
+        spill_dir: Optional[str] = None,
+        compress: bool = True
+    ):
+        """
+        Initialize the FindingsSink.
+
+        Args:
+            spill_threshold (Optional[int]): Findings kept in memory before spilling.
+                ``0`` spills immediately, ``None`` never spills.
+            spill_dir (Optional[str]): Directory for spill files (defaults to system temp)
+            compress (bool): Whether to gzip-compress the spill file
+        """
+        self.spill_threshold = spill_threshold
+        self.spill_dir = spill_dir
+        self.compress = compress
+
+        self.count = 0
+        self.severity_counts: Counter = Counter()
+        self.category_counts: Counter = Counter()
+
+        self._buffer: List[Dict[str, Any]] = []
+        self._file: Optional[IO[str]] = None
+        self._path: Optional[str] = None
+
+    @property
+    def spilled(self) -> bool:
+        """Whether findings have been written to a spill file."""
+        return self._path is not None
+
+    def _open_spill_file(self) -> None:
+        """Create the spill file and flush the in-memory buffer into it."""
+        if self.spill_dir:
+            os.makedirs(self.spill_dir, exist_ok=True)
+        suffix = ".jsonl.gz" if self.compress else ".jsonl"
+        fd, self._path = tempfile.mkstemp(prefix="aicode_findings_", suffix=suffix, dir=self.spill_dir)
+        os.close(fd)
+
+        if self.compress:
+            self._file = gzip.open(self._path, 'wt', encoding='utf-8')
+        else:
+            self._file = open(self._path, 'w', encoding='utf-8')
+
+        logger.info(f"Spilling findings to {self._path} after {len(self._buffer)} buffered findings")
+        for finding in self._buffer:
+            self._write(finding)
+        self._buffer = []
+
+    def _write(self, finding: Dict[str, Any]) -> None:
+        """Append a single finding to the spill file."""
+        self._file.write(json.dumps(finding, ensure_ascii=False, default=str))
+        self._file.write("\n")
+
+    def add(self, finding: Dict[str, Any]) -> None:
+        """
+        Add a finding to the sink.
+
+        Args:
+            finding (Dict[str, Any]): Static analysis finding
+        """
+        self.count += 1
+        self.severity_counts[finding.get("severity", "Unknown")] += 1
+        self.category_counts[finding.get("category", "uncategorized")] += 1
+
+        if self._file is not None:
+            self._write(finding)
+            return
+
+        self._buffer.append(finding)
+        if self.spill_threshold is not None and len(self._buffer) > self.spill_threshold:
+            self._open_spill_file()
+
+    def extend(self, findings: Iterable[Dict[str, Any]]) -> None:
+        """
+        Add several findings to the sink.
+
+        Args:
+            findings (Iterable[Dict[str, Any]]): Static analysis findings
+        """
+        for finding in findings:
+            self.add(finding)
+
+    def summary(self) -> Dict[str, Any]:
+        """
+        Get summary counters for the collected findings.
+
+        Returns:
+            Dict[str, Any]: Total, per-severity and per-category counts plus spill info
+        """
+        return {
+            "total_findings": self.count,
+            "severity_counts": dict(self.severity_counts),
+            "category_counts": dict(self.category_counts),
+            "spilled": self.spilled,
+            "spill_path": self._path
+        }
+
+    def finalize(self) -> Union[List[Dict[str, Any]], FindingsStream]:
+        """
+        Close the sink and return the collected findings.
+
+        Returns:
+            Union[List[Dict[str, Any]], FindingsStream]: The in-memory list if the
+                threshold was never reached, otherwise a handle on the spill file
+        """
+        if self._file is None:
+            findings = self._buffer
+            self._buffer = []
+            return findings
+
+        self._file.close()
+        self._file = None
+        return FindingsStream(
+            path=self._path,
+            compressed=self.compress,
+            count=self.count,
+            severity_counts=dict(self.severity_counts),
+            category_counts=dict(self.category_counts)
+        )
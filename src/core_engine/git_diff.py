@@ -0,0 +1,243 @@
+"""
+Streaming git diffs between two commits.
+
+A PR diff is produced in two passes: ``list_changes`` lists the changed
+files with their blob ids from ``git diff --raw`` so callers can decide
+which files matter before any patch text is generated, and
+``iter_file_patches`` streams the patches of the selected files from git's
+output one file at a time. Patches longer than a byte limit are cut at a
+hunk boundary while they are read, so a huge diff of a generated file is
+never held in memory.
+"""
+
+import logging
+from dataclasses import dataclass
+from typing import Iterable, Iterator, List, Optional
+
+from git import GitCommandError, Repo
+
+from .diff_model import STATUS_ADDED, STATUS_COPIED, STATUS_DELETED, STATUS_MODIFIED, STATUS_RENAMED
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+# Paths passed to one git diff process
+PATHSPEC_BATCH_SIZE = 256
+
+_STATUS_CODES = {
+    "A": STATUS_ADDED,
+    "C": STATUS_COPIED,
+    "D": STATUS_DELETED,
+    "M": STATUS_MODIFIED,
+    "R": STATUS_RENAMED,
+    "T": STATUS_MODIFIED
+}
+
+# Modes of entries without file content (symbolic links and submodules)
+_NON_FILE_MODES = ("120000", "160000")
+
+_NULL_OID = "0" * 40
+
+
+@dataclass
+class DiffEntry:
+    """
+    A file changed between two commits.
+
+    Attributes:
+        status (str): Change status (``STATUS_*`` of the diff model)
+        path (str): Path after the change (the old path for deletions)
+        old_path (Optional[str]): Path before a rename or copy
+        blob_id (str): Blob of the new version, or of the old one for deletions
+    """
+    status: str
+    path: str
+    old_path: Optional[str]
+    blob_id: str
+
+
+@dataclass
+class FilePatch:
+    """
+    The patch of one file, possibly cut short.
+
+    Attributes:
+        path (str): File path from the ``diff --git`` header
+        text (str): Patch text, ending at a hunk boundary if truncated
+        truncated (bool): Whether hunks were left out
+        omitted_bytes (int): Size of the hunks left out
+    """
+    path: str
+    text: str
+    truncated: bool = False
+    omitted_bytes: int = 0
+
+
+def merge_base(repo: Repo, first: str, second: str) -> Optional[str]:
+    """
+    Find the best common ancestor of two commits.
+
+    Args:
+        repo (Repo): Repository holding both commits
+        first (str): First revision
+        second (str): Second revision
+
+    Returns:
+        Optional[str]: Merge base SHA, or None if none is reachable
+    """
+    try:
+        return repo.git.merge_base(first, second).strip() or None
+    except GitCommandError:
+        return None
+
+
+def list_changes(repo: Repo, base: str, head: str) -> List[DiffEntry]:
+    """
+    List the files changed between two commits, without generating patches.
+
+    Symbolic links and submodules are left out.
+
+    Args:
+        repo (Repo): Repository holding both commits
+        base (str): Base commit, usually the merge base
+        head (str): Head commit
+
+    Returns:
+        List[DiffEntry]: Changed files in path order
+    """
+    records = repo.git.diff("--raw", "-z", "-M", "--no-abbrev", "--no-color", base, head).split("\0")
+    entries = []
+    i = 0
+    while i < len(records) - 1:
+        meta = records[i].lstrip(":").split()
+        i += 1
+        if len(meta) < 5:
+            continue
+        old_mode, new_mode, old_oid, new_oid, code = meta[:5]
+        old_path = None
+        if code[0] in ("R", "C"):
+            old_path, path = records[i], records[i + 1]
+            i += 2
+        else:
+            path = records[i]
+            i += 1
+
+        status = _STATUS_CODES.get(code[0])
+        deleted = status == STATUS_DELETED
+        if status is None or (old_mode if deleted else new_mode) in _NON_FILE_MODES:
+            continue
+        entries.append(DiffEntry(
+            status=status,
+            path=path,
+            old_path=old_path,
+            blob_id=old_oid if deleted or new_oid == _NULL_OID else new_oid
+        ))
+    return entries
+
+
+def _header_path(header: bytes) -> str:
+    """Get the new path of a ``diff --git a/... b/...`` header line."""
+    line = header.decode("utf-8", errors="replace").rstrip("\n")
+    _, separator, path = line.rpartition(" b/")
+    return path.strip('"') if separator else line
+
+
+def _finish_patch(header: bytes, lines: List[bytes], omitted_bytes: int) -> FilePatch:
+    return FilePatch(
+        path=_header_path(header),
+        text=b"".join(lines).decode("utf-8", errors="replace"),
+        truncated=omitted_bytes > 0,
+        omitted_bytes=omitted_bytes
+    )
+
+
+def _iter_batch_patches(
+    repo: Repo,
+    base: str,
+    head: str,
+    paths: List[str],
+    max_patch_bytes: int
+) -> Iterator[FilePatch]:
+    """Stream the patches of one batch of paths from a git diff process."""
+    pathspecs = [f":(literal){path}" for path in paths]
+    process = repo.git.diff(
+        "-M", "--no-color", "--no-ext-diff", base, head, "--", *pathspecs, as_process=True
+    )
+    finished = False
+    try:
+        header: Optional[bytes] = None
+        lines: List[bytes] = []
+        size = 0
+        hunk_start = 0
+        omitted_bytes = 0
+
+        for line in process.proc.stdout:
+            if line.startswith(b"diff --git "):
+                if header is not None:
+                    yield _finish_patch(header, lines, omitted_bytes)
+                header, lines, size, hunk_start, omitted_bytes = line, [line], len(line), 1, 0
+                continue
+            if header is None:
+                continue
+            if omitted_bytes:
+                omitted_bytes += len(line)
+                continue
+
+            if line.startswith(b"@@"):
+                hunk_start = len(lines)
+            lines.append(line)
+            size += len(line)
+
+            if max_patch_bytes and size > max_patch_bytes:
+                # Drop the hunk being read; earlier hunks stay complete
+                omitted_bytes = sum(len(dropped) for dropped in lines[hunk_start:])
+                del lines[hunk_start:]
+
+        if header is not None:
+            yield _finish_patch(header, lines, omitted_bytes)
+        finished = True
+    finally:
+        if finished:
+            process.wait()
+        elif process.proc.poll() is None:
+            # The consumer stopped early; git is not left writing into a full pipe
+            process.proc.kill()
+            process.proc.wait()
+
+
+def iter_file_patches(
+    repo: Repo,
+    base: str,
+    head: str,
+    entries: Iterable[DiffEntry],
+    max_patch_bytes: int = 0
+) -> Iterator[FilePatch]:
+    """
+    Stream the patches of selected changed files between two commits.
+
+    Paths are passed to git in batches of ``PATHSPEC_BATCH_SIZE`` files; a
+    renamed file's old and new path go into the same batch so the rename is
+    still detected.
+
+    Args:
+        repo (Repo): Repository holding both commits
+        base (str): Base commit, usually the merge base
+        head (str): Head commit
+        entries (Iterable[DiffEntry]): Changed files to diff, from ``list_changes``
+        max_patch_bytes (int): Longest patch kept per file (0 for no limit);
+            longer patches are cut at a hunk boundary
+
+    Yields:
+        FilePatch: Patch of each file, in path order within a batch
+
+    Raises:
+        GitCommandError: If git fails
+    """
+    entries = sorted(entries, key=lambda entry: entry.path)
+    for start in range(0, len(entries), PATHSPEC_BATCH_SIZE):
+        paths = []
+        for entry in entries[start:start + PATHSPEC_BATCH_SIZE]:
+            paths.append(entry.path)
+            if entry.old_path:
+                paths.append(entry.old_path)
+        yield from _iter_batch_patches(repo, base, head, paths, max_patch_bytes)
@@ -0,0 +1,306 @@
+"""
+Monorepo partitioning for AI Code Review System.
+
+This module splits a repository into partitions at package or module
+boundaries, detected from build manifests (``pyproject.toml``,
+``build.gradle``, ``package.json``, ``pubspec.yaml``). Every file belongs to
+the partition of its nearest enclosing manifest, so partitions can be scanned
+independently and a change to one package only invalidates that package's
+results. Imports between partitions are collected as dependency edges for the
+merged report.
+"""
+
+import json
+import posixpath
+import re
+from collections import defaultdict
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterable, List, Mapping, Optional, Tuple
+
+# Manifest file names that mark a package root, mapped to their ecosystem
+PACKAGE_MANIFESTS: Dict[str, str] = {
+    "pyproject.toml": "python",
+    "build.gradle": "gradle",
+    "build.gradle.kts": "gradle",
+    "package.json": "npm",
+    "pubspec.yaml": "dart"
+}
+
+# Name of the partition holding files outside of every package
+ROOT_PARTITION = "(root)"
+
+# Top-level Python names that are not importable package code
+_NON_PACKAGE_MODULES = {"src", "tests", "test", "docs", "scripts", "examples", "setup", "conftest", "__init__"}
+
+_MANIFEST_NAME_PATTERNS = {
+    "pyproject.toml": re.compile(r'^\s*name\s*=\s*["\']([^"\']+)["\']', re.MULTILINE),
+    "pubspec.yaml": re.compile(r'^name:\s*["\']?([\w.-]+)', re.MULTILINE)
+}
+
+_PYTHON_IMPORT = re.compile(r'^\s*(?:from|import)\s+([A-Za-z_]\w*)', re.MULTILINE)
+_JVM_PACKAGE = re.compile(r'^\s*package\s+([\w.]+)', re.MULTILINE)
+_JVM_IMPORT = re.compile(r'^\s*import\s+(?:static\s+)?([\w.]+)', re.MULTILINE)
+_JS_IMPORT = re.compile(r'''(?:\bfrom\s+|\brequire\(\s*|\bimport\s*\(?\s*)["']([^"'./][^"']*)["']''')
+_DART_IMPORT = re.compile(r'''\b(?:import|export)\s+["']package:(\w+)/''')
+
+_JS_EXTENSIONS = (".js", ".jsx", ".ts", ".tsx", ".mjs", ".cjs")
+_JVM_EXTENSIONS = (".java", ".kt", ".kts")
+
+
+def is_package_manifest(file_path: str) -> bool:
+    """
+    Check whether a file marks a package root.
+
+    Args:
+        file_path (str): Path relative to the repository root
+
+    Returns:
+        bool: True for the build manifests listed in PACKAGE_MANIFESTS
+    """
+    return posixpath.basename(file_path.replace("\\", "/")) in PACKAGE_MANIFESTS
+
+
+@dataclass
+class Partition:
+    """
+    An independently scannable part of a repository.
+
+    Attributes:
+        name (str): Package name from the manifest, or the root directory
+        root (str): Directory relative to the repository root ("" for the repository root)
+        ecosystem (Optional[str]): Build ecosystem of the manifest, None for the root partition
+        files (List[str]): Code files of the partition
+    """
+    name: str
+    root: str
+    ecosystem: Optional[str] = None
+    files: List[str] = field(default_factory=list)
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Describe the partition without its file list."""
+        return {"name": self.name, "root": self.root, "ecosystem": self.ecosystem, "files": len(self.files)}
+
+
+def _manifest_package_name(manifest_path: str, content: Optional[str]) -> Optional[str]:
+    """Read the declared package name from a manifest, if it has one."""
+    if not content:
+        return None
+    file_name = posixpath.basename(manifest_path)
+    if file_name == "package.json":
+        try:
+            name = json.loads(content).get("name")
+        except (ValueError, AttributeError):
+            return None
+        return name if isinstance(name, str) and name else None
+    pattern = _MANIFEST_NAME_PATTERNS.get(file_name)
+    match = pattern.search(content) if pattern else None
+    return match.group(1) if match else None
+
+
+def detect_partitions(
+    file_paths: Iterable[str],
+    manifests: Mapping[str, Optional[str]]
+) -> List[Partition]:
+    """
+    Split files into partitions at the directories holding package manifests.
+
+    Each file is assigned to its deepest enclosing package root; files
+    outside of every package form the root partition. Partitions without
+    code files are dropped.
+
+    Args:
+        file_paths (Iterable[str]): Code file paths relative to the repository root
+        manifests (Mapping[str, Optional[str]]): Manifest paths and their contents
+            (contents are only used for package names and may be None)
+
+    Returns:
+        List[Partition]: Non-empty partitions ordered by root directory
+    """
+    roots: Dict[str, Partition] = {}
+    for manifest_path in sorted(manifests):
+        normalized = manifest_path.replace("\\", "/")
+        file_name = posixpath.basename(normalized)
+        if file_name not in PACKAGE_MANIFESTS:
+            continue
+        root = posixpath.dirname(normalized)
+        name = _manifest_package_name(normalized, manifests[manifest_path])
+        partition = roots.get(root)
+        if partition is None:
+            roots[root] = Partition(name=name or root or ROOT_PARTITION, root=root, ecosystem=PACKAGE_MANIFESTS[file_name])
+        elif name and partition.name in (root, ROOT_PARTITION):
+            partition.name = name
+
+    if "" not in roots:
+        roots[""] = Partition(name=ROOT_PARTITION, root="")
+
+    # Deepest roots first, so nested packages win over their parents
+    ordered_roots = sorted(roots, key=lambda r: r.count("/") + bool(r), reverse=True)
+    for file_path in file_paths:
+        normalized = file_path.replace("\\", "/")
+        for root in ordered_roots:
+            if not root or normalized.startswith(root + "/"):
+                roots[root].files.append(file_path)
+                break
+
+    partitions = [roots[root] for root in sorted(roots) if roots[root].files]
+
+    # Package names must identify partitions in the merged report
+    seen: Dict[str, int] = defaultdict(int)
+    for partition in partitions:
+        seen[partition.name] += 1
+    for partition in partitions:
+        if seen[partition.name] > 1 and partition.root:
+            partition.name = partition.root
+    return partitions
+
+
+def _relative_path(partition: Partition, file_path: str) -> str:
+    """Path of a file relative to its partition root."""
+    normalized = file_path.replace("\\", "/")
+    return normalized[len(partition.root) + 1:] if partition.root else normalized
+
+
+def _provided_names(partition: Partition, code_files: Mapping[str, str]) -> List[Tuple[str, str]]:
+    """Import names a partition provides to others, as (kind, name) pairs."""
+    provided = set()
+    if partition.ecosystem in ("npm", "dart") and partition.name != partition.root:
+        provided.add((partition.ecosystem, partition.name))
+
+    for file_path in partition.files:
+        if file_path.endswith(".py"):
+            parts = _relative_path(partition, file_path).split("/")
+            if parts[0] == "src" and len(parts) > 1:
+                parts = parts[1:]
+            module = parts[0][:-3] if len(parts) == 1 else parts[0]
+            if module not in _NON_PACKAGE_MODULES and module.isidentifier():
+                provided.add(("python", module))
+        elif file_path.endswith(_JVM_EXTENSIONS):
+            match = _JVM_PACKAGE.search(code_files.get(file_path) or "")
+            if match:
+                provided.add(("jvm", match.group(1)))
+    return sorted(provided)
+
+
+def _imported_names(file_path: str, content: str) -> List[List[Tuple[str, str]]]:
+    """
+    Imports of a file, each as the (kind, name) pairs that may provide it.
+
+    Candidates are comparable with ``_provided_names`` and ordered from the
+    most to the least specific.
+    """
+    if file_path.endswith(".py"):
+        return [[("python", name)] for name in _PYTHON_IMPORT.findall(content)]
+    if file_path.endswith(_JVM_EXTENSIONS):
+        # Every enclosing package of the imported class may be the provider
+        return [
+            [("jvm", ".".join(parts[:i])) for i in range(len(parts) - 1, 0, -1)]
+            for parts in (name.split(".") for name in _JVM_IMPORT.findall(content))
+        ]
+    if file_path.endswith(_JS_EXTENSIONS):
+        imports = []
+        for specifier in _JS_IMPORT.findall(content):
+            parts = specifier.split("/")
+            imports.append([("npm", "/".join(parts[:2]) if specifier.startswith("@") else parts[0])])
+        return imports
+    if file_path.endswith(".dart"):
+        return [[("dart", name)] for name in _DART_IMPORT.findall(content)]
+    return []
+
+
+def dependency_edges(partitions: List[Partition], code_files: Mapping[str, str]) -> List[Dict[str, Any]]:
+    """
+    Find imports that cross partition boundaries.
+
+    Python top-level modules, JVM packages and npm / pub package names
+    provided by each partition are matched against the imports of every
+    other partition's files.
+
+    Args:
+        partitions (List[Partition]): Partitions of the repository
+        code_files (Mapping[str, str]): File contents by path
+
+    Returns:
+        List[Dict[str, Any]]: Edges with ``source`` (importing partition),
+            ``target`` (imported partition) and the number of ``imports``
+    """
+    providers: Dict[Tuple[str, str], str] = {}
+    for partition in partitions:
+        for provided in _provided_names(partition, code_files):
+            # The first (outermost) provider of a name wins
+            providers.setdefault(provided, partition.name)
+
+    counts: Dict[Tuple[str, str], int] = defaultdict(int)
+    for partition in partitions:
+        for file_path in partition.files:
+            content = code_files.get(file_path)
+            if not content:
+                continue
+            for candidates in _imported_names(file_path, content):
+                # An import counts once, for its most specific provider
+                target = next((providers[c] for c in candidates if c in providers), None)
+                if target is not None and target != partition.name:
+                    counts[(partition.name, target)] += 1
+
+    return [
+        {"source": source, "target": target, "imports": count}
+        for (source, target), count in sorted(counts.items())
+    ]
+
+
+_RISK_ORDER = {"low": 0, "medium": 1, "high": 2}
+
+
+def merge_partition_reports(
+    partitions: List[Partition],
+    reports: Mapping[str, Dict[str, Any]],
+    edges: List[Dict[str, Any]],
+    complexity_metrics: Optional[Dict[str, Any]] = None
+) -> Dict[str, Any]:
+    """
+    Merge per-partition project scan reports into one report.
+
+    Args:
+        partitions (List[Partition]): Scanned partitions
+        reports (Mapping[str, Dict[str, Any]]): ``scan_entire_project`` report per partition name
+        edges (List[Dict[str, Any]]): Cross-partition dependency edges
+        complexity_metrics (Optional[Dict[str, Any]]): Metrics of the whole repository, if calculated
+
+    Returns:
+        Dict[str, Any]: Project report with the partition reports, the
+            dependency edges and repository-wide risk and recommendations
+    """
+    risk_levels = {}
+    recommendations = []
+    analyses = []
+    for partition in partitions:
+        report = reports.get(partition.name) or {}
+        legacy = (report.get("risk_assessment") or {}).get("legacy_assessment") or {}
+        risk_levels[partition.name] = legacy.get("overall_risk_level", "unknown")
+        for recommendation in report.get("recommendations") or []:
+            recommendations.append({**recommendation, "partition": partition.name})
+        if report.get("architectural_analysis"):
+            analyses.append(f"## {partition.name}\n\n{report['architectural_analysis']}")
+
+    known_levels = [level for level in risk_levels.values() if level in _RISK_ORDER]
+    overall_risk = max(known_levels, key=_RISK_ORDER.get) if known_levels else "unknown"
+
+    if complexity_metrics is None:
+        partition_metrics = [(reports.get(p.name) or {}).get("complexity_metrics") or {} for p in partitions]
+        complexity_metrics = {
+            "total_files": sum(m.get("total_files", 0) for m in partition_metrics),
+            "total_lines": sum(m.get("total_lines", 0) for m in partition_metrics)
+        }
+
+    return {
+        "scan_type": "project",
+        "partitioned": True,
+        "complexity_metrics": complexity_metrics,
+        "architectural_analysis": "\n\n".join(analyses),
+        "risk_assessment": {"overall_risk_level": overall_risk, "partitions": risk_levels},
+        "recommendations": recommendations,
+        "partitions": {
+            partition.name: {**partition.to_dict(), "report": reports.get(partition.name)}
+            for partition in partitions
+        },
+        "partition_dependencies": edges
+    }
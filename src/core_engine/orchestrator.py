@@ -6,15 +6,92 @@ multiple agents in the code review workflow. It defines the state management,
 node functions, and graph structure for the multi-agent system.
 """
 
-from typing import Any, Dict, List, Optional, TypedDict
+from collections.abc import Collection, Iterable, Mapping, Sized
+from functools import partial
+from types import SimpleNamespace
+from typing import Annotated, Any, Callable, Dict, List, Optional, Tuple, TypedDict
 from pydantic import BaseModel, Field
 from langgraph.graph import StateGraph, END
 from langgraph.graph.graph import CompiledGraph
+from langgraph.checkpoint.base import BaseCheckpointSaver
+import inspect
 import logging
+import os
+
+from .agent_pool import AgentPool, acquire_agent
+from .cancellation import (
+    CancellationToken,
+    ScanCancelled,
+    activate,
+    budget_exhausted,
+    check_cancelled,
+    current_token,
+    is_cancelled,
+    register_token,
+    release_token,
+    resolve_token
+)
+from .content_keys import ContentKey
+from .content_store import CODEC_JSON, CODEC_TEXT, BlobMapping, ContentStore, open_content_store
+from .diff_model import STATUS_ADDED, STATUS_DELETED, ChangeSet, parse_unified_diff
+from .findings_stream import FindingsSink, DEFAULT_SPILL_THRESHOLD
+from .monorepo import Partition, dependency_edges, detect_partitions, merge_partition_reports
+from .project_files import LazyProjectFiles
+from .stage_cache import content_hash, fingerprint, get_stage_cache, source_fingerprint
+from .streaming_pipeline import PipelineStage, StreamingPipeline
+from .tracing import end_trace, get_tracer, start_trace, trace_span
 
 # Configure logging
 logger = logging.getLogger(__name__)
 
+# Independent analysis branches that fan out after parsing and join before the
+# LLM / project scanning stages
+ANALYSIS_BRANCHES = ["static_analysis", "impact_analysis", "risk_metrics", "knowledge_base", "diagram_extraction"]
+
+# Project-level branches that fan out after files were streamed through parsing,
+# static analysis and per-file LLM review
+STREAM_BRANCHES = ["impact_analysis", "risk_metrics", "knowledge_base", "diagram_extraction"]
+
+# Barrier stages replaced by the stream_files node in streaming mode
+STAGED_NODES = ["fetch_code", "parse_code", "static_analysis"]
+
+# LLM provider used for scan analysis (part of the scan result cache key)
+LLM_PROVIDER = "mock"
+
+# Version tags of the memoized stages; bump a tag when a stage's output format
+# or logic changes so its earlier outputs are no longer reused
+STAGE_VERSIONS = {
+    "parse": "1",
+    "static_analysis": "1",
+    "llm_analysis": "1",
+    "diagrams": "1",
+    "project_scanning": "1"
+}
+
+# Collections in node results whose sizes are recorded on the node's tracing span
+TRACED_RESULT_COUNTS = ["project_code", "change_set", "parsed_asts", "static_analysis_findings", "diagrams"]
+
+
+def _merge_current_step(left: Optional[str], right: Optional[str]) -> Optional[str]:
+    """
+    Reducer for ``current_step`` when parallel branches write it.
+    
+    An error reported by any branch sticks until the error handler runs.
+    """
+    if left == "error" and right != "error_handled":
+        return left
+    return right
+
+
+def _keep_first_error(left: Optional[str], right: Optional[str]) -> Optional[str]:
+    """Reducer for ``error_message`` that keeps the first reported error."""
+    return left or right
+
+
+def _merge_metadata(left: Optional[dict], right: Optional[dict]) -> dict:
+    """Reducer for ``workflow_metadata`` that merges updates from parallel branches."""
+    return {**(left or {}), **(right or {})}
+
 
 class GraphState(TypedDict):
     """
@@ -27,10 +104,27 @@ class GraphState(TypedDict):
         scan_request_data (dict): Original scan request parameters from user
         repo_url (str): Git repository URL to analyze
         pr_id (Optional[int]): Pull request ID if scanning a specific PR
-        project_code (Optional[Dict[str, str]]): Full project code files (filename -> content)
+        project_code (Optional[Mapping[str, str]]): Full project code files (filename -> content),
+            held as a BlobMapping handle into the scan content store
+        package_manifests (Optional[Dict[str, str]]): Package manifests of the project
+            (path -> content), collected when monorepo partitioning is enabled
+        content_keys (Optional[Dict[str, str]]): Git blob id of each fetched project file,
+            which keys its contents in the per-file caches instead of a hash
         pr_diff (Optional[str]): PR diff content if scanning a specific PR
-        parsed_asts (Optional[Dict[str, Any]]): Parsed ASTs for each file
+        change_set (Optional[ChangeSet]): PR diff parsed once into changed files and hunks
+        parsed_asts (Optional[Dict[str, Any]]): Per-file parse results (language, changed
+            lines or error); live syntax trees stay in the content store's tree cache
+        structural_info (Optional[Mapping[str, dict]]): Structural info per parsed file,
+            held as a BlobMapping handle into the scan content store
+        content_store_root (Optional[str]): Directory of the scan content store
+        trace_id (Optional[str]): ID of the scan's tracing spans
+        cancellation (Optional[dict]): ID, start and deadline of the scan's cancellation token
         static_analysis_findings (Optional[List[dict]]): Results from static analysis
+            (a FindingsStream handle when findings were spilled to disk)
+        static_analysis_summary (Optional[dict]): Summary counters for static analysis findings
+        impact_analysis_result (Optional[dict]): Results from ImpactAnalysisAgent
+        code_metrics (Optional[dict]): Complexity and size metrics from RiskPredictor
+        diagrams (Optional[List[dict]]): Diagrams extracted from parsed code
         llm_insights (Optional[str]): Insights generated by LLM analysis
         project_scan_result (Optional[dict]): Results from ProjectScanningAgent
         report_data (Optional[dict]): Final structured report data
@@ -43,18 +137,29 @@ class GraphState(TypedDict):
     scan_request_data: dict
     repo_url: str
     pr_id: Optional[int]
-    project_code: Optional[Dict[str, str]]
+    project_code: Optional[Mapping[str, str]]
+    package_manifests: Optional[Dict[str, str]]
+    content_keys: Optional[Dict[str, str]]
     pr_diff: Optional[str]
+    change_set: Optional[ChangeSet]
     parsed_asts: Optional[Dict[str, Any]]
+    structural_info: Optional[Mapping[str, dict]]
+    content_store_root: Optional[str]
+    trace_id: Optional[str]
+    cancellation: Optional[Dict[str, Any]]
     static_analysis_findings: Optional[List[dict]]
+    static_analysis_summary: Optional[dict]
+    impact_analysis_result: Optional[dict]
+    code_metrics: Optional[dict]
+    diagrams: Optional[List[dict]]
     llm_insights: Optional[str]
     project_scan_result: Optional[dict]
     report_data: Optional[dict]
     markdown_report: Optional[str]
     json_report: Optional[str]
-    error_message: Optional[str]
-    current_step: str
-    workflow_metadata: dict
+    error_message: Annotated[Optional[str], _keep_first_error]
+    current_step: Annotated[str, _merge_current_step]
+    workflow_metadata: Annotated[dict, _merge_metadata]
 
 
 def start_scan(state: GraphState) -> Dict[str, Any]:
@@ -94,6 +199,7 @@ def start_scan(state: GraphState) -> Dict[str, Any]:
         return {
             "repo_url": repo_url,
             "pr_id": pr_id,
+            "cancellation": _scan_cancellation(state),
             "current_step": "fetch_code",
             "workflow_metadata": {
                 "start_time": "timestamp_placeholder",
@@ -109,7 +215,130 @@ def start_scan(state: GraphState) -> Dict[str, Any]:
         }
 
 
-def fetch_code_node(state: GraphState) -> Dict[str, Any]:
+def _scan_cancellation(state: GraphState) -> Dict[str, Any]:
+    """
+    Get the cancellation token of a new scan as stored in the state.
+    
+    The token of the caller's context (e.g. the task queue's token for the
+    scan) is used when there is one; otherwise a token with the request's
+    ``timeout_seconds`` or ``settings.scan_timeout_seconds`` budget is created.
+    
+    Args:
+        state (GraphState): Current workflow state
+        
+    Returns:
+        Dict[str, Any]: Description of the registered token
+    """
+    if state.get("cancellation"):
+        return state["cancellation"]
+    
+    token = current_token()
+    if token is None:
+        from config.settings import settings
+        
+        scan_data = state.get("scan_request_data", {}) or {}
+        token = CancellationToken.with_timeout(scan_data.get("timeout_seconds") or settings.scan_timeout_seconds)
+    return register_token(token).to_dict()
+
+
+def _store_project_files(
+    store: ContentStore,
+    project_code: Mapping,
+    content_keys: Optional[Mapping[str, str]] = None
+) -> BlobMapping:
+    """
+    Copy fetched project files into the scan content store.
+    
+    Lazily fetched files are read one at a time while being stored, and their
+    temporary checkout is released afterwards.
+    
+    Args:
+        store (ContentStore): Scan content store
+        project_code (Mapping): Fetched project files
+        content_keys (Optional[Mapping[str, str]]): Blob ids of the files, which
+            spare hashing them for deduplication
+        
+    Returns:
+        BlobMapping: Handle to the stored files
+    """
+    try:
+        return store.store_files(project_code, content_keys)
+    finally:
+        if isinstance(project_code, LazyProjectFiles):
+            project_code.close()
+
+
+def _scan_content_store(state: GraphState, create: bool = False) -> Optional[ContentStore]:
+    """
+    Get the content store that holds this scan's file contents and trees.
+    
+    Args:
+        state (GraphState): Current workflow state
+        create (bool): Create a new store if the scan does not have one yet
+    
+    Returns:
+        Optional[ContentStore]: The scan content store, or None if there is none
+            and ``create`` is False
+    """
+    root = state.get("content_store_root")
+    if not root and isinstance(state.get("project_code"), BlobMapping):
+        root = state["project_code"].root
+    if root:
+        return open_content_store(root)
+    return open_content_store() if create else None
+
+
+def _attach_post_images(
+    code_fetcher: Any,
+    repo_url: str,
+    source_branch: str,
+    change_set: ChangeSet,
+    changed_files: List[str]
+) -> None:
+    """
+    Fetch full post-image contents for modified files in a change set.
+    
+    Added files are rebuilt from the diff itself and deleted files have no
+    post-image, so only the remaining supported files are fetched. Failures
+    are logged and leave those files without contents.
+    
+    Args:
+        code_fetcher (Any): CodeFetcherAgent instance
+        repo_url (str): Git repository URL
+        source_branch (str): PR source branch holding the post-image
+        change_set (ChangeSet): Parsed PR diff, updated in place
+        changed_files (List[str]): Supported changed file paths
+    """
+    wanted = set(changed_files)
+    to_fetch = [
+        file_change.path for file_change in change_set
+        if file_change.path in wanted
+        and file_change.status not in (STATUS_ADDED, STATUS_DELETED)
+        and not file_change.is_binary
+    ]
+    if not to_fetch:
+        return
+    
+    try:
+        with trace_span("git.fetch_post_images") as span:
+            contents = code_fetcher.get_files_at_revision(repo_url, to_fetch, source_branch)
+            span.set_count("files", len(contents))
+        for file_path, content in contents.items():
+            file_change = change_set.get(file_path)
+            if file_change is not None:
+                file_change.new_content = content
+    except Exception as e:
+        logger.warning(f"Could not fetch post-image contents for changed files: {str(e)}")
+
+
+def _manifest_sink() -> Optional[Dict[str, str]]:
+    """Dictionary for the package manifests of a project scan, None unless partitioning is enabled."""
+    from config.settings import settings
+    
+    return {} if settings.scan_monorepo_partitioning else None
+
+
+def fetch_code_node(state: GraphState, agent_pool: Optional[AgentPool] = None) -> Dict[str, Any]:
     """
     Node for fetching code from Git repository.
     
@@ -117,6 +346,7 @@ def fetch_code_node(state: GraphState) -> Dict[str, Any]:
     
     Args:
         state (GraphState): Current workflow state
+        agent_pool (Optional[AgentPool]): Pool of warm agents shared across scans
         
     Returns:
         Dict[str, Any]: Updated state with fetched code data
@@ -127,8 +357,8 @@ def fetch_code_node(state: GraphState) -> Dict[str, Any]:
         # Import CodeFetcherAgent
         from src.core_engine.agents.code_fetcher_agent import CodeFetcherAgent
         
-        # Initialize the agent
-        code_fetcher = CodeFetcherAgent()
+        # Reuse a pooled agent when available
+        code_fetcher = acquire_agent(agent_pool, "code_fetcher", CodeFetcherAgent)
         
         repo_url = state["repo_url"]
         pr_id = state.get("pr_id")
@@ -149,21 +379,25 @@ def fetch_code_node(state: GraphState) -> Dict[str, Any]:
             
             try:
                 # Fetch PR diff using CodeFetcherAgent
-                pr_diff = code_fetcher.get_pr_diff(
-                    repo_url=repo_url,
-                    pr_id=pr_id,
-                    target_branch=target_branch,
-                    source_branch=source_branch
-                )
+                with trace_span("git.fetch_pr_diff") as span:
+                    pr_diff = code_fetcher.get_pr_diff(
+                        repo_url=repo_url,
+                        pr_id=pr_id,
+                        target_branch=target_branch,
+                        source_branch=source_branch
+                    )
+                    span.set_count("diff_bytes", len(pr_diff or ""))
                 
-                # Also get list of changed files for context
-                changed_files = code_fetcher.get_changed_files_from_diff(pr_diff)
+                # Parse the diff once; later stages consume the ChangeSet
+                change_set = parse_unified_diff(pr_diff)
+                changed_files = code_fetcher.get_changed_files_from_diff(change_set)
+                _attach_post_images(code_fetcher, repo_url, source_branch, change_set, changed_files)
                 
                 return {
                     "pr_diff": pr_diff,
+                    "change_set": change_set,
                     "current_step": "parse_code",
                     "workflow_metadata": {
-                        **state.get("workflow_metadata", {}),
                         "changed_files": changed_files,
                         "target_branch": target_branch,
                         "source_branch": source_branch
@@ -175,13 +409,16 @@ def fetch_code_node(state: GraphState) -> Dict[str, Any]:
                 # Fallback: try to get project files from source branch
                 try:
                     logger.info("Falling back to project files from source branch")
-                    project_code = code_fetcher.get_project_files(repo_url, source_branch)
+                    with trace_span("git.fetch_project_files") as span:
+                        project_code = code_fetcher.get_project_files(repo_url, source_branch, lazy=True)
+                        span.set_count("files", len(project_code or {}))
+                    store = _scan_content_store(state, create=True)
                     
                     return {
-                        "project_code": project_code,
+                        "project_code": _store_project_files(store, project_code),
+                        "content_store_root": store.root,
                         "current_step": "parse_code",
                         "workflow_metadata": {
-                            **state.get("workflow_metadata", {}),
                             "fallback_mode": True,
                             "source_branch": source_branch
                         }
@@ -196,11 +433,25 @@ def fetch_code_node(state: GraphState) -> Dict[str, Any]:
             # Get branch information from scan request
             branch = scan_data.get("branch", "main")
             
+            # Package manifests mark the partitions of a monorepo
+            manifests = _manifest_sink()
+            fetch_options = {"manifests": manifests} if manifests is not None else {}
+            # Ignored, vendored and generated files left out of the scan
+            exclusions: Dict[str, Dict[str, int]] = {}
+            # Blob ids from git key the files' contents in the per-file caches
+            content_keys: Dict[str, str] = {}
+            
             # Fetch project files using CodeFetcherAgent
-            project_code = code_fetcher.get_project_files(
-                repo_url=repo_url,
-                branch_or_commit=branch
-            )
+            with trace_span("git.fetch_project_files") as span:
+                project_code = code_fetcher.get_project_files(
+                    repo_url=repo_url,
+                    branch_or_commit=branch,
+                    lazy=True,
+                    exclusions=exclusions,
+                    content_keys=content_keys,
+                    **fetch_options
+                )
+                span.set_count("files", len(project_code or {}))
             
             if not project_code:
                 return {
@@ -208,13 +459,20 @@ def fetch_code_node(state: GraphState) -> Dict[str, Any]:
                     "current_step": "error"
                 }
             
+            # Keep file contents in the scan content store; the state only
+            # carries a handle to them
+            store = _scan_content_store(state, create=True)
+            
             return {
-                "project_code": project_code,
+                "project_code": _store_project_files(store, project_code, content_keys),
+                "package_manifests": manifests,
+                "content_keys": content_keys,
+                "content_store_root": store.root,
                 "current_step": "parse_code",
                 "workflow_metadata": {
-                    **state.get("workflow_metadata", {}),
                     "branch": branch,
-                    "total_files": len(project_code)
+                    "total_files": len(project_code),
+                    "excluded_files": exclusions
                 }
             }
             
@@ -226,7 +484,155 @@ def fetch_code_node(state: GraphState) -> Dict[str, Any]:
         }
 
 
-def parse_code_node(state: GraphState) -> Dict[str, Any]:
+def _restore_ast_nodes(
+    state: GraphState,
+    agent_pool: Optional[AgentPool] = None,
+    branch: str = "",
+    skip: Collection[str] = ()
+) -> Dict[str, Any]:
+    """
+    Attach tree-sitter trees to the parsed AST entries for the current stage.
+    
+    Syntax trees are never part of the state. They are taken from the content
+    store's tree cache, and trees that were evicted or lost (e.g. after a scan
+    is resumed in a new process) are rebuilt from the project code or the
+    change set post-images and cached again.
+    
+    The analysis branches run concurrently and a parser is not thread-safe
+    (it switches its grammar per file), so each branch rebuilds trees with
+    its own pooled parser.
+    
+    Args:
+        state (GraphState): Current workflow state
+        agent_pool (Optional[AgentPool]): Pool of warm agents shared across scans
+        branch (str): Name of the calling graph branch
+        skip (Collection[str]): Files whose trees are not needed (e.g. memoized)
+        
+    Returns:
+        Dict[str, Any]: Parsed ASTs with ``ast_node`` attached where possible
+    """
+    parsed_asts = state.get("parsed_asts") or {}
+    wanted = [
+        file_path for file_path, ast_data in parsed_asts.items()
+        if isinstance(ast_data, dict) and ast_data.get("language")
+        and "ast_node" not in ast_data and "error" not in ast_data
+        and file_path not in skip
+    ]
+    if not wanted:
+        return parsed_asts
+    
+    store = _scan_content_store(state)
+    restored = dict(parsed_asts)
+    missing = []
+    for file_path in wanted:
+        ast_node = store.get_tree(file_path) if store else None
+        if ast_node is None:
+            missing.append(file_path)
+        else:
+            restored[file_path] = {**parsed_asts[file_path], "ast_node": ast_node}
+    if not missing:
+        return restored
+    
+    from src.core_engine.agents.ast_parsing_agent import ASTParsingAgent
+    
+    ast_parser = acquire_agent(agent_pool, "ast_parser", ASTParsingAgent, slot=branch)
+    project_code = state.get("project_code") or {}
+    change_set = state.get("change_set")
+    
+    with trace_span("ast.rebuild_trees") as span:
+        for file_path in missing:
+            check_cancelled()
+            content = project_code.get(file_path)
+            if content is None and change_set:
+                file_change = change_set.get(file_path)
+                content = file_change.post_image() if file_change else None
+            if content is None:
+                continue
+            
+            ast_node = ast_parser.parse_code_to_ast(content, parsed_asts[file_path]["language"])
+            if ast_node:
+                restored[file_path] = {**parsed_asts[file_path], "ast_node": ast_node}
+                if store:
+                    store.cache_tree(file_path, ast_node)
+        span.set_count("files", len(missing))
+    
+    logger.info(f"Rebuilt syntax trees for {len(missing)} files missing from the tree cache")
+    return restored
+
+
+def _parse_source_file(
+    ast_parser: Any,
+    filename: str,
+    content: str,
+    stage_cache: Optional[Any] = None,
+    content_key: Optional[str] = None
+) -> Optional[Dict[str, Any]]:
+    """
+    Parse a single source file with the language detected from its name.
+    
+    Parse outputs are memoized by blob hash and language; a memoized entry
+    has no ``ast_node`` and later stages rebuild the tree only if they need it.
+    
+    Args:
+        ast_parser (Any): ASTParsingAgent instance
+        filename (str): File path used for language detection
+        content (str): Full file contents
+        stage_cache (Optional[StageCache]): Stage cache for memoized parse outputs
+        content_key (Optional[str]): Git blob id of the file, if fetched from git;
+            the contents are hashed otherwise
+        
+    Returns:
+        Optional[Dict[str, Any]]: Parsed AST data, error data, or None if the
+            language is not supported
+    """
+    try:
+        # Detect language from filename
+        language = ast_parser._detect_language(filename)
+        
+        if not (language and ast_parser.is_language_supported(language)):
+            logger.debug(f"Skipping {filename} - unsupported language or type")
+            return None
+        
+        blob_hash = content_key or content_hash(content)
+        cache_key = fingerprint(blob_hash, language)
+        if stage_cache:
+            cached = stage_cache.get("parse", cache_key)
+            if cached is not None:
+                logger.debug(f"Reusing parse output for {filename} ({language})")
+                return {**cached, "content_hash": blob_hash}
+        
+        # Parse the file content
+        ast_node = ast_parser.parse_code_to_ast(content, language)
+        
+        if not ast_node:
+            logger.warning(f"Failed to parse {filename}")
+            parsed = {
+                "language": language,
+                "error": "Failed to parse AST"
+            }
+        else:
+            logger.debug(f"Successfully parsed {filename} ({language})")
+            parsed = {
+                "language": language,
+                "structural_info": ast_parser.extract_structural_info(ast_node, language)
+            }
+        
+        if stage_cache:
+            stage_cache.put("parse", cache_key, parsed)
+        
+        parsed["content_hash"] = blob_hash
+        if ast_node:
+            parsed["ast_node"] = ast_node
+        return parsed
+        
+    except Exception as e:
+        logger.error(f"Error parsing {filename}: {str(e)}")
+        return {
+            "error": str(e)
+        }
+
+
+def parse_code_node(state: GraphState, agent_pool: Optional[AgentPool] = None) -> Dict[str, Any]:
     """
     Node for parsing source code into ASTs.
     
@@ -234,6 +640,7 @@ def parse_code_node(state: GraphState) -> Dict[str, Any]:
     
     Args:
         state (GraphState): Current workflow state
+        agent_pool (Optional[AgentPool]): Pool of warm agents shared across scans
         
     Returns:
         Dict[str, Any]: Updated state with parsed AST data
@@ -244,59 +651,49 @@ def parse_code_node(state: GraphState) -> Dict[str, Any]:
         # Import and initialize ASTParsingAgent
         from src.core_engine.agents.ast_parsing_agent import ASTParsingAgent
         
-        ast_parser = ASTParsingAgent()
+        ast_parser = acquire_agent(agent_pool, "ast_parser", ASTParsingAgent)
         
         project_code = state.get("project_code", {})
         pr_diff = state.get("pr_diff")
         
         parsed_asts = {}
+        structural_info = {}
+        store = _scan_content_store(state, create=True)
+        stage_cache = get_stage_cache()
+        
+        def keep_parsed(file_path: str, parsed: Dict[str, Any]) -> None:
+            # Live trees go to the store's tree cache and structural info to the
+            # blob store; the state entry keeps only small per-file data
+            ast_node = parsed.pop("ast_node", None)
+            if ast_node is not None:
+                store.cache_tree(file_path, ast_node)
+            if "structural_info" in parsed:
+                structural_info[file_path] = parsed.pop("structural_info")
+            parsed_asts[file_path] = parsed
         
         if pr_diff:
-            # Parse PR diff content
+            # Parse the post-image of each changed file, not diff fragments
             logger.info("Parsing PR diff content")
             
-            # Extract changed files from diff and parse them
-            # For now, we'll parse the diff as text and extract file information
-            # In a real implementation, we'd parse the diff format to get individual files
-            
-            # Try to extract file content from diff
-            # This is a simplified approach - in practice, you'd want more sophisticated diff parsing
-            diff_lines = pr_diff.split('\n')
-            current_file = None
-            file_content = []
+            change_set = state.get("change_set") or parse_unified_diff(pr_diff)
             
-            for line in diff_lines:
-                if line.startswith('diff --git') or line.startswith('+++'):
-                    # New file detected
-                    if current_file and file_content:
-                        # Parse the previous file
-                        content = '\n'.join(file_content)
-                        if content.strip():
-                            ast_node = ast_parser.parse_code_to_ast(content, 'python')
-                            if ast_node:
-                                parsed_asts[current_file] = {
-                                    "ast_node": ast_node,
-                                    "structural_info": ast_parser.extract_structural_info(ast_node, 'python')
-                                }
+            with trace_span("ast.parse_files") as span:
+                for file_change in change_set:
+                    check_cancelled()
+                    if file_change.status == STATUS_DELETED:
+                        continue
                     
-                    # Extract filename
-                    if line.startswith('+++'):
-                        current_file = line.split('/')[-1] if '/' in line else line.split()[-1]
-                        file_content = []
-                elif line.startswith('+') and not line.startswith('+++'):
-                    # Added line in diff
-                    file_content.append(line[1:])  # Remove the '+' prefix
-            
-            # Handle the last file
-            if current_file and file_content:
-                content = '\n'.join(file_content)
-                if content.strip():
-                    ast_node = ast_parser.parse_code_to_ast(content, 'python')
-                    if ast_node:
-                        parsed_asts[current_file] = {
-                            "ast_node": ast_node,
-                            "structural_info": ast_parser.extract_structural_info(ast_node, 'python')
-                        }
+                    content = file_change.post_image()
+                    if not content or not content.strip():
+                        logger.debug(f"No post-image available for {file_change.path}, skipping")
+                        continue
+                    
+                    parsed = _parse_source_file(ast_parser, file_change.path, content, stage_cache)
+                    if parsed is not None:
+                        parsed["changed_lines"] = file_change.added_line_numbers()
+                        keep_parsed(file_change.path, parsed)
+                span.set_count("files", len(parsed_asts))
+                span.set_count("parsed", len(structural_info))
             
             # If no files were parsed from diff, create a summary
             if not parsed_asts:
@@ -312,40 +709,18 @@ def parse_code_node(state: GraphState) -> Dict[str, Any]:
             # Parse full project files
             logger.info(f"Parsing {len(project_code)} project files")
             
-            for filename, content in project_code.items():
-                try:
-                    # Detect language from filename
-                    language = ast_parser._detect_language(filename)
-                    
-                    if language and ast_parser.is_language_supported(language):
-                        # Parse the file content
-                        ast_node = ast_parser.parse_code_to_ast(content, language)
-                        
-                        if ast_node:
-                            # Extract structural information
-                            structural_info = ast_parser.extract_structural_info(ast_node, language)
-                            
-                            parsed_asts[filename] = {
-                                "language": language,
-                                "ast_node": ast_node,
-                                "structural_info": structural_info
-                            }
-                            
-                            logger.debug(f"Successfully parsed {filename} ({language})")
-                        else:
-                            logger.warning(f"Failed to parse {filename}")
-                            parsed_asts[filename] = {
-                                "language": language,
-                                "error": "Failed to parse AST"
-                            }
-                    else:
-                        logger.debug(f"Skipping {filename} - unsupported language or type")
-                        
-                except Exception as e:
-                    logger.error(f"Error parsing {filename}: {str(e)}")
-                    parsed_asts[filename] = {
-                        "error": str(e)
-                    }
+            content_keys = state.get("content_keys") or {}
+            
+            with trace_span("ast.parse_files") as span:
+                for filename, content in project_code.items():
+                    check_cancelled()
+                    parsed = _parse_source_file(
+                        ast_parser, filename, content, stage_cache, content_keys.get(filename)
+                    )
+                    if parsed is not None:
+                        keep_parsed(filename, parsed)
+                span.set_count("files", len(parsed_asts))
+                span.set_count("parsed", len(structural_info))
         else:
             return {
                 "error_message": "No code to parse",
@@ -353,15 +728,15 @@ def parse_code_node(state: GraphState) -> Dict[str, Any]:
             }
         
         # Log parsing summary
-        successful_parses = sum(1 for ast_data in parsed_asts.values() 
-                              if isinstance(ast_data, dict) and "ast_node" in ast_data)
+        successful_parses = len(structural_info)
         logger.info(f"Successfully parsed {successful_parses}/{len(parsed_asts)} files")
         
         return {
             "parsed_asts": parsed_asts,
+            "structural_info": store.store_documents(structural_info),
+            "content_store_root": store.root,
             "current_step": "static_analysis",
             "workflow_metadata": {
-                **state.get("workflow_metadata", {}),
                 "parsed_files_count": len(parsed_asts),
                 "successful_parses": successful_parses
             }
@@ -375,7 +750,7 @@ def parse_code_node(state: GraphState) -> Dict[str, Any]:
         }
 
 
-def static_analysis_node(state: GraphState) -> Dict[str, Any]:
+def static_analysis_node(state: GraphState, agent_pool: Optional[AgentPool] = None) -> Dict[str, Any]:
     """
     Node for performing static analysis on parsed ASTs.
     
@@ -383,6 +758,7 @@ def static_analysis_node(state: GraphState) -> Dict[str, Any]:
     
     Args:
         state (GraphState): Current workflow state
+        agent_pool (Optional[AgentPool]): Pool of warm agents shared across scans
         
     Returns:
         Dict[str, Any]: Updated state with static analysis findings
@@ -391,9 +767,26 @@ def static_analysis_node(state: GraphState) -> Dict[str, Any]:
     
     try:
         # Import StaticAnalysisAgent
+        from src.core_engine.agents import static_analysis_agent
         from src.core_engine.agents.static_analysis_agent import StaticAnalysisAgent
         
-        parsed_asts = state.get("parsed_asts", {})
+        # Findings are memoized per file by path, blob hash and rule set;
+        # trees are only restored for the files that must be analyzed again
+        stage_cache = get_stage_cache()
+        cache_keys = {}
+        cached_findings = {}
+        if stage_cache:
+            ruleset = source_fingerprint(static_analysis_agent)
+            for file_path, ast_data in (state.get("parsed_asts") or {}).items():
+                if isinstance(ast_data, dict) and ast_data.get("content_hash"):
+                    cache_keys[file_path] = fingerprint(
+                        file_path, ast_data["content_hash"], ast_data.get("language", "python"), ruleset
+                    )
+                    findings = stage_cache.get("static_analysis", cache_keys[file_path])
+                    if findings is not None:
+                        cached_findings[file_path] = findings
+        
+        parsed_asts = _restore_ast_nodes(state, agent_pool, "static_analysis", skip=cached_findings)
         
         if not parsed_asts:
             return {
@@ -402,42 +795,65 @@ def static_analysis_node(state: GraphState) -> Dict[str, Any]:
             }
         
         # Initialize the StaticAnalysisAgent
-        static_analyzer = StaticAnalysisAgent()
+        static_analyzer = acquire_agent(agent_pool, "static_analyzer", StaticAnalysisAgent)
         
         logger.info(f"Analyzing {len(parsed_asts)} parsed files")
         
-        all_findings = []
+        # Findings are collected through a sink that spills to an append-only
+        # JSONL file for very large scans instead of growing one big list; the
+        # file lives in the scan content store and is removed along with it
+        scan_data = state.get("scan_request_data", {}) or {}
+        store = _scan_content_store(state)
+        findings_sink = FindingsSink(
+            spill_threshold=scan_data.get("findings_spill_threshold", DEFAULT_SPILL_THRESHOLD),
+            spill_dir=store.root if store else None
+        )
         
         # Analyze each file's AST
-        for file_path, ast_data in parsed_asts.items():
-            try:
-                # Extract AST node and language from parsed data
-                ast_node = ast_data.get('ast_node')
-                language = ast_data.get('language', 'python')
-                
-                if ast_node is None:
-                    logger.warning(f"No AST node available for file: {file_path}")
+        with trace_span("static_analysis.run_rules") as span:
+            for file_path, ast_data in parsed_asts.items():
+                check_cancelled()
+                if file_path in cached_findings:
+                    findings_sink.extend(cached_findings[file_path])
                     continue
                 
-                # Perform static analysis on the file
-                file_findings = static_analyzer.analyze_file_ast(
-                    ast_node=ast_node,
-                    file_path=file_path,
-                    language=language
-                )
-                
-                all_findings.extend(file_findings)
-                logger.debug(f"Found {len(file_findings)} issues in {file_path}")
-                
-            except Exception as e:
-                logger.error(f"Error analyzing file {file_path}: {str(e)}")
-                # Continue with other files even if one fails
-                continue
+                try:
+                    # Extract AST node and language from parsed data
+                    ast_node = ast_data.get('ast_node')
+                    language = ast_data.get('language', 'python')
+                    
+                    if ast_node is None:
+                        logger.warning(f"No AST node available for file: {file_path}")
+                        continue
+                    
+                    # Perform static analysis on the file
+                    file_findings = static_analyzer.analyze_file_ast(
+                        ast_node=ast_node,
+                        file_path=file_path,
+                        language=language
+                    )
+                    
+                    findings_sink.extend(file_findings)
+                    if file_path in cache_keys:
+                        stage_cache.put("static_analysis", cache_keys[file_path], file_findings)
+                    logger.debug(f"Found {len(file_findings)} issues in {file_path}")
+                    
+                except Exception as e:
+                    logger.error(f"Error analyzing file {file_path}: {str(e)}")
+                    # Continue with other files even if one fails
+                    continue
+            span.set_count("files", len(parsed_asts))
+            span.set_count("cached_files", len(cached_findings))
+        
+        findings_summary = findings_sink.summary()
+        all_findings = findings_sink.finalize()
+        span.set_count("findings", findings_summary["total_findings"])
         
-        logger.info(f"Static analysis completed. Found {len(all_findings)} total issues across all files")
+        logger.info(f"Static analysis completed. Found {findings_summary['total_findings']} total issues across all files")
         
         return {
             "static_analysis_findings": all_findings,
+            "static_analysis_summary": findings_summary,
             "current_step": "impact_analysis"
         }
         
@@ -449,7 +865,7 @@ def static_analysis_node(state: GraphState) -> Dict[str, Any]:
         }
 
 
-def impact_analysis_node(state: GraphState) -> Dict[str, Any]:
+def impact_analysis_node(state: GraphState, agent_pool: Optional[AgentPool] = None) -> Dict[str, Any]:
     """
     Node thực hiện phân tích tác động thay đổi (impact analysis).
     Sử dụng ImpactAnalysisAgent để xác định các thực thể bị ảnh hưởng bởi diff và dependency graph.
@@ -460,8 +876,9 @@ def impact_analysis_node(state: GraphState) -> Dict[str, Any]:
         from src.core_engine.agents.impact_analysis.models import ImpactAnalysisInput
 
         pr_diff = state.get("pr_diff")
+        change_set = state.get("change_set")
         workflow_metadata = state.get("workflow_metadata", {})
-        changed_files = workflow_metadata.get("changed_files")
+        changed_files = change_set.paths() if change_set else workflow_metadata.get("changed_files")
         dependency_graph = workflow_metadata.get("dependency_graph", {})
         # Nếu không có dependency_graph, tạo rỗng
         if dependency_graph is None:
@@ -476,8 +893,10 @@ def impact_analysis_node(state: GraphState) -> Dict[str, Any]:
             dependency_graph=dependency_graph,
             changed_files=changed_files
         )
-        agent = ImpactAnalysisAgent()
-        result = agent.analyze_impact(input_data)
+        agent = acquire_agent(agent_pool, "impact_analyzer", ImpactAnalysisAgent)
+        with trace_span("impact_analysis.analyze_impact") as span:
+            result = agent.analyze_impact(input_data)
+            span.set_count("impacted_entities", len(result.impacted_entities))
         logger.info(f"Impact analysis found {len(result.impacted_entities)} impacted entities")
         return {
             "impact_analysis_result": result.model_dump(),
@@ -491,199 +910,892 @@ def impact_analysis_node(state: GraphState) -> Dict[str, Any]:
         }
 
 
-def llm_analysis_node(state: GraphState) -> Dict[str, Any]:
+def risk_metrics_node(state: GraphState, agent_pool: Optional[AgentPool] = None) -> Dict[str, Any]:
     """
-    Node for performing LLM-based semantic analysis.
+    Node for calculating code complexity and size metrics.
     
-    Uses LLMOrchestratorAgent to provide deeper code insights through LLM analysis.
+    Runs in parallel with static analysis since it only needs the project code.
+    The metrics are reused by project scanning instead of being recomputed.
     
     Args:
         state (GraphState): Current workflow state
+        agent_pool (Optional[AgentPool]): Pool of warm agents shared across scans
         
     Returns:
-        Dict[str, Any]: Updated state with LLM insights
+        Dict[str, Any]: Updated state with code metrics
     """
-    logger.info("Performing LLM analysis")
+    project_code = state.get("project_code") or {}
+    
+    if not project_code:
+        logger.info("No project code, skipping risk metrics")
+        return {"code_metrics": None}
     
     try:
-        # Import LLMOrchestratorAgent
-        from src.core_engine.agents.llm_orchestrator_agent import LLMOrchestratorAgent
-        
-        parsed_asts = state.get("parsed_asts", {})
-        static_findings = state.get("static_analysis_findings", [])
-        project_code = state.get("project_code", {})
-        pr_diff = state.get("pr_diff")
-        
-        if not parsed_asts and not project_code and not pr_diff:
-            return {
-                "error_message": "No code available for LLM analysis",
-                "current_step": "error"
-            }
-        
-        # Initialize LLMOrchestratorAgent with mock provider for now
-        llm_orchestrator = LLMOrchestratorAgent(llm_provider='mock')
-        
-        logger.info("Generating LLM insights for code review")
+        from src.core_engine.risk_predictor import RiskPredictor
         
-        # Determine analysis type and prepare appropriate inputs
-        if pr_diff:
-            # Analyze PR diff
-            logger.info("Analyzing PR diff with LLM")
-            llm_insights = llm_orchestrator.analyze_pr_diff(pr_diff, static_findings)
-            
-        elif project_code:
-            # Analyze full project files
-            logger.info(f"Analyzing {len(project_code)} project files with LLM")
-            llm_insights = llm_orchestrator.analyze_code_with_context(project_code, static_findings)
-            
-        else:
-            # Fallback: analyze based on parsed ASTs
-            logger.info("Analyzing parsed code with LLM")
-            
-            # Extract code content from parsed ASTs
-            code_files = {}
-            for filename, ast_data in parsed_asts.items():
-                if isinstance(ast_data, dict) and "structural_info" in ast_data:
-                    # Use structural info as a proxy for code content
-                    structural_info = ast_data["structural_info"]
-                    code_summary = f"# Structural analysis of {filename}\n"
-                    code_summary += f"Classes: {len(structural_info.get('classes', []))}\n"
-                    code_summary += f"Functions: {len(structural_info.get('functions', []))}\n"
-                    code_summary += f"Imports: {len(structural_info.get('imports', []))}\n"
-                    code_files[filename] = code_summary
-            
-            if code_files:
-                llm_insights = llm_orchestrator.analyze_code_with_context(code_files, static_findings)
-            else:
-                # Basic analysis without specific code
-                prompt = "Please provide general code review insights based on the static analysis findings."
-                llm_insights = llm_orchestrator.invoke_llm(prompt, None, static_findings)
-        
-        # Log analysis summary
-        findings_count = len(static_findings) if static_findings else 0
-        logger.info(f"LLM analysis completed. Processed {findings_count} static analysis findings")
-        
-        # Determine next step based on scan type
-        workflow_metadata = state.get("workflow_metadata", {})
-        pr_id = state.get("pr_id")
-        
-        # If this is a project scan and project scanning hasn't run yet, go to project scanning
-        if pr_id is None and not workflow_metadata.get("project_scan_completed", False):
-            next_step = "project_scanning"
-        else:
-            next_step = "reporting"
-        
-        return {
-            "llm_insights": llm_insights,
-            "current_step": next_step,
-            "workflow_metadata": {
-                **workflow_metadata,
-                "llm_provider": llm_orchestrator.llm_provider,
-                "llm_model": llm_orchestrator.model_name,
-                "static_findings_processed": findings_count
-            }
-        }
+        risk_predictor = acquire_agent(agent_pool, "risk_predictor", RiskPredictor)
+        with trace_span("risk.calculate_code_metrics") as span:
+            code_metrics = risk_predictor.calculate_code_metrics(project_code)
+            span.set_count("files", len(project_code))
+        logger.info(f"Calculated code metrics for {code_metrics.get('total_files', 0)} files")
+        return {"code_metrics": code_metrics}
         
     except Exception as e:
-        logger.error(f"Error in llm_analysis_node: {str(e)}")
-        return {
-            "error_message": f"Failed to perform LLM analysis: {str(e)}",
-            "current_step": "error"
-        }
+        # Metrics are an optimization for project scanning, which can recompute them
+        logger.warning(f"Error in risk_metrics_node: {str(e)}")
+        return {"code_metrics": None}
 
 
-def project_scanning_node(state: GraphState) -> Dict[str, Any]:
+def knowledge_base_node(state: GraphState, agent_pool: Optional[AgentPool] = None) -> Dict[str, Any]:
     """
-    Node for comprehensive project-level analysis.
+    Node for building the RAG knowledge base for project scans.
     
-    Performs hierarchical summarization and architectural analysis of the entire project.
-    Only triggered for full project scans (not PR scans).
+    Runs in parallel with static analysis. Project scanning skips its own
+    knowledge base build when this branch succeeded.
     
     Args:
         state (GraphState): Current workflow state
+        agent_pool (Optional[AgentPool]): Pool of warm agents shared across scans
         
     Returns:
-        Dict[str, Any]: Updated state with project scanning results
+        Dict[str, Any]: Updated state with knowledge base status
     """
-    logger.info("Starting comprehensive project scanning")
+    project_code = state.get("project_code") or {}
+    
+    if state.get("pr_id") is not None or not project_code:
+        logger.info("Not a project scan, skipping knowledge base build")
+        return {"workflow_metadata": {"knowledge_base_built": False}}
+    
+    if budget_exhausted():
+        logger.warning("Scan is near its time budget, skipping knowledge base build")
+        return {"workflow_metadata": {"knowledge_base_built": False, "knowledge_base_skipped": "time_budget"}}
     
     try:
-        # Import ProjectScanningAgent
         from src.core_engine.agents.project_scanning_agent import ProjectScanningAgent
         
-        # Initialize the agent
-        project_scanner = ProjectScanningAgent()
+        project_scanner = acquire_agent(agent_pool, "project_scanner", ProjectScanningAgent)
+        with trace_span("rag.build_knowledge_base") as span:
+            project_scanner.rag_agent.build_knowledge_base(project_code)
+            span.set_count("files", len(project_code))
+        logger.info(f"Built RAG knowledge base for {len(project_code)} files")
+        return {"workflow_metadata": {"knowledge_base_built": True}}
         
-        # Get project code and static findings
-        project_code = state.get("project_code", {})
-        static_findings = state.get("static_analysis_findings", [])
-        workflow_metadata = state.get("workflow_metadata", {})
+    except Exception as e:
+        logger.warning(f"Error in knowledge_base_node: {str(e)}")
+        return {"workflow_metadata": {"knowledge_base_built": False}}
+
+
+def diagram_extraction_node(state: GraphState, agent_pool: Optional[AgentPool] = None) -> Dict[str, Any]:
+    """
+    Node for extracting class and sequence diagrams from parsed code.
+    
+    Runs in parallel with static analysis since it only needs the parsed ASTs.
+    
+    Args:
+        state (GraphState): Current workflow state
+        agent_pool (Optional[AgentPool]): Pool of warm agents shared across scans
         
-        if not project_code:
-            logger.warning("No project code available for scanning")
-            return {
-                "error_message": "No project code available for scanning",
-                "current_step": "error"
+    Returns:
+        Dict[str, Any]: Updated state with extracted diagrams
+    """
+    if budget_exhausted():
+        logger.warning("Scan is near its time budget, skipping diagram extraction")
+        return {"diagrams": None}
+    
+    try:
+        # Diagrams are memoized by the blob hashes of the parsed files, which
+        # determine their structural info and the call bodies that sequence
+        # diagrams are drawn from
+        stage_cache = get_stage_cache()
+        cache_key = None
+        if stage_cache:
+            blob_hashes = {
+                file_path: ast_data.get("content_hash")
+                for file_path, ast_data in (state.get("parsed_asts") or {}).items()
+                if isinstance(ast_data, dict) and ast_data.get("language") and "error" not in ast_data
             }
+            if all(blob_hashes.values()):
+                cache_key = fingerprint(blob_hashes)
+                diagrams = stage_cache.get("diagrams", cache_key)
+                if diagrams is not None:
+                    logger.info(f"Reusing {len(diagrams)} extracted diagrams")
+                    return {"diagrams": diagrams}
         
-        # Perform comprehensive project scan
-        logger.info(f"Scanning project with {len(project_code)} files")
-        scan_result = project_scanner.scan_entire_project(
-            code_files=project_code,
-            static_findings=static_findings
-        )
+        parsed_asts = _restore_ast_nodes(state, agent_pool, "diagram_extraction")
         
-        # Add project scanning metadata
-        updated_metadata = {
-            **workflow_metadata,
-            "project_scan_completed": True,
-            "complexity_metrics": scan_result.get("complexity_metrics", {}),
-            "risk_level": scan_result.get("risk_assessment", {}).get("overall_risk_level", "unknown"),
-            "recommendations_count": len(scan_result.get("recommendations", []))
+        # The diagramming engine reads ``root_node`` from each entry
+        code_files = {
+            file_path: SimpleNamespace(root_node=ast_data["ast_node"])
+            for file_path, ast_data in parsed_asts.items()
+            if isinstance(ast_data, dict) and ast_data.get("ast_node") is not None
         }
         
-        logger.info(f"Project scanning completed successfully. Risk level: {scan_result.get('risk_assessment', {}).get('overall_risk_level', 'unknown')}")
-        logger.info(f"Generated {len(scan_result.get('recommendations', []))} recommendations")
+        if not code_files:
+            logger.info("No parsed ASTs, skipping diagram extraction")
+            return {"diagrams": None}
         
-        return {
-            "project_scan_result": scan_result,
-            "current_step": "reporting",
-            "workflow_metadata": updated_metadata
-        }
+        from src.core_engine.agents.reporting_agent import ReportingAgent
+        
+        reporting_agent = acquire_agent(agent_pool, "reporting", ReportingAgent)
+        with trace_span("diagram.extract") as span:
+            diagrams = reporting_agent._generate_diagrams(code_files, [])
+            span.set_count("files", len(code_files))
+        if cache_key:
+            stage_cache.put("diagrams", cache_key, diagrams)
+        logger.info(f"Extracted {len(diagrams)} diagrams")
+        return {"diagrams": diagrams}
         
     except Exception as e:
-        logger.error(f"Error in project_scanning_node: {str(e)}")
-        return {
-            "error_message": f"Failed to scan project: {str(e)}",
-            "current_step": "error"
-        }
+        logger.warning(f"Error in diagram_extraction_node: {str(e)}")
+        return {"diagrams": None}
 
 
-def reporting_node(state: GraphState) -> Dict[str, Any]:
+def _worker_agents(
+    agent_pool: Optional[AgentPool],
+    agent_type: str,
+    factory: Callable[..., Any],
+    **init_kwargs: Any
+) -> Callable[[int], Any]:
     """
-    Node for generating the final code review report.
+    Build a per-worker agent getter for a streaming stage.
     
-    Uses ReportingAgent to aggregate all findings into structured and formatted reports.
+    Agents are not thread-safe, so every worker of a stage gets its own
+    instance: worker 0 borrows the pooled agent, the other workers build
+    private agents that live for the duration of the scan.
     
     Args:
-        state (GraphState): Current workflow state
+        agent_pool (Optional[AgentPool]): Pool of warm agents shared across scans
+        agent_type (str): Registered agent type
+        factory (Callable[..., Any]): Agent class
+        **init_kwargs: Constructor arguments for the agent
         
     Returns:
-        Dict[str, Any]: Updated state with final report data
+        Callable[[int], Any]: Function returning the agent of a worker index
     """
-    logger.info("Generating code review report")
+    agents: Dict[int, Any] = {}
     
-    try:
-        from src.core_engine.agents.reporting_agent import ReportingAgent
-        static_findings = state.get("static_analysis_findings", [])
-        llm_insights = state.get("llm_insights", "")
-        project_scan_result = state.get("project_scan_result")
-        workflow_metadata = state.get("workflow_metadata", {})
-        impact_analysis_result = state.get("impact_analysis_result")
-        # Prepare scan details for the report
-        scan_details = {
-            "repo_url": state.get("repo_url", ""),
-            "pr_id": state.get("pr_id"),
+    def get(worker_index: int) -> Any:
+        if worker_index not in agents:
+            agents[worker_index] = acquire_agent(
+                agent_pool if worker_index == 0 else None, agent_type, factory, **init_kwargs
+            )
+        return agents[worker_index]
+    
+    return get
+
+
+def _stream_worker_counts() -> Dict[str, int]:
+    """Number of workers per streaming stage from settings."""
+    from config.settings import settings
+    
+    cpu_workers = settings.scan_stream_cpu_workers or os.cpu_count() or 1
+    return {
+        "parse": cpu_workers,
+        "static_analysis": cpu_workers,
+        "llm_review": settings.scan_stream_llm_workers
+    }
+
+
+def stream_files_node(state: GraphState, agent_pool: Optional[AgentPool] = None) -> Dict[str, Any]:
+    """
+    Node that streams files through parsing, static analysis and LLM review.
+    
+    Replaces the fetch, parse and static analysis barriers in streaming mode.
+    Project files are parsed, analyzed and reviewed while the rest of the
+    repository is still being read; PR scans stream the changed files of the
+    diff. The stages are connected by bounded queues, so only a bounded number
+    of files (and syntax trees) is held in memory at any time. Project-level
+    branches join after this node.
+    
+    Args:
+        state (GraphState): Current workflow state
+        agent_pool (Optional[AgentPool]): Pool of warm agents shared across scans
+        
+    Returns:
+        Dict[str, Any]: Updated state with project code, parsed ASTs, static
+            analysis findings and per-file LLM insights
+    """
+    logger.info("Streaming files through parsing, static analysis and LLM review")
+    
+    try:
+        from config.settings import settings
+        from src.core_engine.agents import static_analysis_agent
+        from src.core_engine.agents.ast_parsing_agent import ASTParsingAgent
+        from src.core_engine.agents.code_fetcher_agent import CodeFetcherAgent
+        from src.core_engine.agents.llm_orchestrator_agent import LLMOrchestratorAgent
+        from src.core_engine.agents.static_analysis_agent import StaticAnalysisAgent
+        
+        scan_data = state.get("scan_request_data", {}) or {}
+        update: Dict[str, Any] = {}
+        workflow_metadata: Dict[str, Any] = {"execution_mode": "streaming"}
+        file_index: Optional[Dict[str, List[int]]] = None
+        
+        if state.get("pr_id"):
+            # The PR diff is fetched in one request; its changed files are streamed
+            fetched = fetch_code_node(state, agent_pool)
+            if fetched.get("current_step") == "error":
+                return fetched
+            workflow_metadata.update(fetched.pop("workflow_metadata", {}))
+            fetched.pop("current_step", None)
+            update.update(fetched)
+            store = _scan_content_store({**state, **fetched}, create=True)
+            
+            change_set = fetched.get("change_set")
+            if change_set is not None:
+                source = (
+                    (file_change.path, file_change.post_image(), file_change.added_line_numbers())
+                    for file_change in change_set if file_change.status != STATUS_DELETED
+                )
+            else:
+                source = ((path, content, None) for path, content in fetched["project_code"].items())
+        else:
+            # Project files are read from the clone one at a time and stored as they arrive
+            branch = scan_data.get("branch", "main")
+            code_fetcher = acquire_agent(agent_pool, "code_fetcher", CodeFetcherAgent)
+            store = _scan_content_store(state, create=True)
+            file_index = {}
+            workflow_metadata["branch"] = branch
+            manifests = _manifest_sink()
+            if manifests is not None:
+                update["package_manifests"] = manifests
+            fetch_options = {"manifests": manifests} if manifests is not None else {}
+            workflow_metadata["excluded_files"] = fetch_options["exclusions"] = {}
+            update["content_keys"] = fetch_options["content_keys"] = {}
+            
+            def read_project_files():
+                for file_path, content in code_fetcher.iter_project_files(state["repo_url"], branch, **fetch_options):
+                    file_index[file_path] = list(store.put(content, update["content_keys"].get(file_path)))
+                    yield file_path, content, None
+            
+            source = read_project_files()
+        
+        stage_cache = get_stage_cache()
+        ruleset = source_fingerprint(static_analysis_agent) if stage_cache else None
+        parsers = _worker_agents(agent_pool, "ast_parser", ASTParsingAgent)
+        analyzers = _worker_agents(agent_pool, "static_analyzer", StaticAnalysisAgent)
+        reviewers = _worker_agents(agent_pool, "llm_orchestrator", LLMOrchestratorAgent, llm_provider=LLM_PROVIDER)
+        review_prompt = "Analyze changed file" if state.get("pr_id") else "Analyze code file"
+        
+        def parse(worker_index: int, item: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+            content = item["content"]
+            if content is None or (item["changed_lines"] is not None and not content.strip()):
+                return None
+            content_key = (update.get("content_keys") or {}).get(item["path"])
+            parsed = _parse_source_file(parsers(worker_index), item["path"], content, stage_cache, content_key)
+            if parsed is None:
+                return None
+            if item["changed_lines"] is not None:
+                parsed["changed_lines"] = item["changed_lines"]
+            item["parsed"] = parsed
+            return item
+        
+        def analyze(worker_index: int, item: Dict[str, Any]) -> Dict[str, Any]:
+            file_path, parsed = item["path"], item["parsed"]
+            ast_node = parsed.pop("ast_node", None)
+            item["findings"] = []
+            if ast_node is None:
+                return item
+            store.cache_tree(file_path, ast_node)
+            
+            language = parsed.get("language", "python")
+            cache_key = fingerprint(file_path, parsed["content_hash"], language, ruleset) if stage_cache else None
+            findings = stage_cache.get("static_analysis", cache_key) if stage_cache else None
+            if findings is None:
+                findings = analyzers(worker_index).analyze_file_ast(
+                    ast_node=ast_node,
+                    file_path=file_path,
+                    language=language
+                )
+                if stage_cache:
+                    stage_cache.put("static_analysis", cache_key, findings)
+            item["findings"] = findings
+            return item
+        
+        def review(worker_index: int, item: Dict[str, Any]) -> Dict[str, Any]:
+            if not item["findings"] and budget_exhausted():
+                # Files without findings are not reviewed once the budget runs low
+                item.pop("content")
+                item["review"] = None
+                return item
+            
+            llm_orchestrator = reviewers(worker_index)
+            kwargs = {
+                "prompt": f"{review_prompt}: {item['path']}",
+                "code_snippet": item.pop("content"),
+                "static_findings": item["findings"]
+            }
+            cache_key = _llm_cache_key(llm_orchestrator, "invoke_llm", kwargs) if stage_cache else None
+            insights = stage_cache.get("llm_analysis", cache_key) if stage_cache else None
+            if insights is None:
+                insights = llm_orchestrator.invoke_llm(**kwargs)
+                if stage_cache:
+                    stage_cache.put("llm_analysis", cache_key, insights)
+            item["review"] = insights
+            return item
+        
+        workers = _stream_worker_counts()
+        pipeline = StreamingPipeline(
+            [
+                PipelineStage("parse", parse, workers["parse"]),
+                PipelineStage("static_analysis", analyze, workers["static_analysis"]),
+                PipelineStage("llm_review", review, workers["llm_review"])
+            ],
+            queue_size=scan_data.get("stream_queue_size", settings.scan_stream_queue_size),
+            is_cancelled=is_cancelled
+        )
+        findings_sink = FindingsSink(
+            spill_threshold=scan_data.get("findings_spill_threshold", DEFAULT_SPILL_THRESHOLD),
+            spill_dir=store.root
+        )
+        items = (
+            {"index": index, "path": file_path, "content": content, "changed_lines": changed_lines}
+            for index, (file_path, content, changed_lines) in enumerate(source)
+        )
+        
+        # Results are collected on this thread as files leave the last stage
+        parsed_asts = {}
+        structural_index = {}
+        reviews = []
+        skipped_reviews = 0
+        first_finding_ms = None
+        with trace_span("stream.run_pipeline") as span:
+            for item in pipeline.run(items):
+                file_path, parsed = item["path"], item["parsed"]
+                if "structural_info" in parsed:
+                    structural_index[file_path] = list(store.put_document(parsed.pop("structural_info")))
+                parsed_asts[file_path] = parsed
+                findings_sink.extend(item["findings"])
+                if first_finding_ms is None and item["findings"]:
+                    first_finding_ms = round(span.elapsed_ms(), 3)
+                if item["review"] is None:
+                    skipped_reviews += 1
+                else:
+                    reviews.append((item["index"], file_path, item["review"]))
+            
+            check_cancelled()
+            stream_summary = pipeline.summary()
+            span.set_count("files", stream_summary["source_items"])
+            span.set_count("parsed", len(structural_index))
+            for stage_name, stage_stats in stream_summary["stages"].items():
+                span.set_count(f"{stage_name}_errors", stage_stats["errors"])
+            if first_finding_ms is not None:
+                span.set_attribute("time_to_first_finding_ms", first_finding_ms)
+        
+        if file_index is not None:
+            if not file_index:
+                return {
+                    "error_message": "No supported files found in the repository",
+                    "current_step": "error"
+                }
+            update["project_code"] = BlobMapping(root=store.root, index=file_index, codec=CODEC_TEXT)
+            workflow_metadata["total_files"] = len(file_index)
+        
+        pr_diff = update.get("pr_diff")
+        if pr_diff and not parsed_asts:
+            parsed_asts = {
+                "diff_summary": {
+                    "type": "diff",
+                    "content": pr_diff[:1000] + "..." if len(pr_diff) > 1000 else pr_diff,
+                    "note": "Could not extract individual files from diff for AST parsing"
+                }
+            }
+        
+        findings_summary = findings_sink.summary()
+        logger.info(
+            f"Streamed {stream_summary['source_items']} files in {stream_summary['total_ms']:.0f} ms; "
+            f"found {findings_summary['total_findings']} issues"
+        )
+        
+        reviews.sort()
+        sections = [f"# Analysis for {file_path}\n\n{insights}" for _, file_path, insights in reviews]
+        if skipped_reviews:
+            sections.append(
+                f"# Skipped files\n\nLLM review of {skipped_reviews} files without static analysis "
+                f"findings was skipped to stay within the scan's time budget."
+            )
+        llm_orchestrator = reviewers(0)
+        return {
+            **update,
+            "parsed_asts": parsed_asts,
+            "structural_info": BlobMapping(root=store.root, index=structural_index, codec=CODEC_JSON),
+            "content_store_root": store.root,
+            "static_analysis_findings": findings_sink.finalize(),
+            "static_analysis_summary": findings_summary,
+            "llm_insights": "\n\n".join(sections),
+            "current_step": "impact_analysis",
+            "workflow_metadata": {
+                **workflow_metadata,
+                "parsed_files_count": len(parsed_asts),
+                "successful_parses": len(structural_index),
+                "llm_provider": llm_orchestrator.llm_provider,
+                "llm_model": llm_orchestrator.model_name,
+                "static_findings_processed": findings_summary["total_findings"],
+                "time_to_first_finding_ms": first_finding_ms,
+                "skipped_llm_reviews": skipped_reviews,
+                "streaming": stream_summary
+            }
+        }
+        
+    except Exception as e:
+        logger.error(f"Error in stream_files_node: {str(e)}")
+        return {
+            "error_message": f"Failed to stream files: {str(e)}",
+            "current_step": "error"
+        }
+
+
+def join_analysis_node(state: GraphState) -> Dict[str, Any]:
+    """
+    Join node that waits for all parallel analysis branches.
+    
+    Routes to error handling if any branch failed, otherwise to project
+    scanning (full project scans), LLM analysis (PR scans) or straight to
+    reporting (streamed PR scans, whose files were already reviewed).
+    
+    Args:
+        state (GraphState): Current workflow state
+        
+    Returns:
+        Dict[str, Any]: Updated state with the next workflow step
+    """
+    if state.get("error_message") or state.get("current_step") == "error":
+        return {"current_step": "error"}
+    
+    if should_run_project_scanning(state) == "project_scanning":
+        return {"current_step": "project_scanning"}
+    
+    # Streaming scans already reviewed every file with the LLM
+    if state.get("llm_insights") is not None:
+        return {"current_step": "reporting"}
+    
+    return {"current_step": "llm_analysis"}
+
+
+def should_fan_out_analysis(state: GraphState) -> Any:
+    """
+    Conditional edge function that fans out into the parallel analysis branches.
+    
+    Args:
+        state (GraphState): Current workflow state
+        
+    Returns:
+        Any: List of branch node names, or "handle_error" if parsing failed
+    """
+    if state.get("current_step") == "error":
+        return "handle_error"
+    
+    return list(ANALYSIS_BRANCHES)
+
+
+def should_fan_out_streamed_analysis(state: GraphState) -> Any:
+    """
+    Conditional edge function that fans out into the project-level branches
+    after files were streamed.
+    
+    Args:
+        state (GraphState): Current workflow state
+        
+    Returns:
+        Any: List of branch node names, or "handle_error" if streaming failed
+    """
+    if state.get("current_step") == "error":
+        return "handle_error"
+    
+    return list(STREAM_BRANCHES)
+
+
+def _llm_analysis_request(state: GraphState) -> Tuple[str, Dict[str, Any]]:
+    """
+    Choose the LLMOrchestratorAgent call for the current scan.
+    
+    Args:
+        state (GraphState): Current workflow state
+        
+    Returns:
+        Tuple[str, Dict[str, Any]]: Agent method name and its keyword arguments
+    """
+    parsed_asts = state.get("parsed_asts", {}) or {}
+    static_findings = state.get("static_analysis_findings", [])
+    project_code = state.get("project_code", {})
+    pr_diff = state.get("pr_diff")
+    
+    if pr_diff:
+        # Analyze PR diff
+        logger.info("Analyzing PR diff with LLM")
+        return "analyze_pr_diff", {"pr_diff": pr_diff, "static_findings": static_findings}
+    
+    if project_code:
+        # Analyze full project files
+        logger.info(f"Analyzing {len(project_code)} project files with LLM")
+        return "analyze_code_with_context", {"code_files": project_code, "static_findings": static_findings}
+    
+    # Fallback: analyze based on parsed ASTs
+    logger.info("Analyzing parsed code with LLM")
+    
+    # Extract code content from parsed ASTs
+    code_files = {}
+    structural_index = state.get("structural_info") or {}
+    for filename in parsed_asts:
+        if filename in structural_index:
+            # Use structural info as a proxy for code content
+            structural_info = structural_index[filename]
+            code_summary = f"# Structural analysis of {filename}\n"
+            code_summary += f"Classes: {len(structural_info.get('classes', []))}\n"
+            code_summary += f"Functions: {len(structural_info.get('functions', []))}\n"
+            code_summary += f"Imports: {len(structural_info.get('imports', []))}\n"
+            code_files[filename] = code_summary
+    
+    if code_files:
+        return "analyze_code_with_context", {"code_files": code_files, "static_findings": static_findings}
+    
+    # Basic analysis without specific code
+    prompt = "Please provide general code review insights based on the static analysis findings."
+    return "invoke_llm", {"prompt": prompt, "code_snippet": None, "static_findings": static_findings}
+
+
+def _llm_cache_key(llm_orchestrator: Any, method: str, kwargs: Dict[str, Any]) -> str:
+    """
+    Fingerprint an LLM request: the prompt inputs plus the provider and model.
+    
+    Args:
+        llm_orchestrator (Any): LLMOrchestratorAgent that will run the request
+        method (str): Agent method name
+        kwargs (Dict[str, Any]): Keyword arguments of the method
+        
+    Returns:
+        str: Stage cache key for the LLM insights
+    """
+    return fingerprint(method, kwargs, llm_orchestrator.llm_provider, llm_orchestrator.model_name)
+
+
+def _llm_analysis_result(state: GraphState, llm_orchestrator: Any, llm_insights: str) -> Dict[str, Any]:
+    """
+    Build the state update for finished LLM analysis.
+    
+    Args:
+        state (GraphState): Current workflow state
+        llm_orchestrator (Any): LLMOrchestratorAgent that produced the insights
+        llm_insights (str): Generated insights
+        
+    Returns:
+        Dict[str, Any]: Updated state with LLM insights and the next step
+    """
+    static_findings = state.get("static_analysis_findings", [])
+    
+    # Log analysis summary
+    findings_count = len(static_findings) if static_findings else 0
+    logger.info(f"LLM analysis completed. Processed {findings_count} static analysis findings")
+    
+    # Determine next step based on scan type
+    workflow_metadata = state.get("workflow_metadata", {})
+    pr_id = state.get("pr_id")
+    
+    # If this is a project scan and project scanning hasn't run yet, go to project scanning
+    if pr_id is None and not workflow_metadata.get("project_scan_completed", False):
+        next_step = "project_scanning"
+    else:
+        next_step = "reporting"
+    
+    return {
+        "llm_insights": llm_insights,
+        "current_step": next_step,
+        "workflow_metadata": {
+            "llm_provider": llm_orchestrator.llm_provider,
+            "llm_model": llm_orchestrator.model_name,
+            "static_findings_processed": findings_count
+        }
+    }
+
+
+def llm_analysis_node(state: GraphState, agent_pool: Optional[AgentPool] = None) -> Dict[str, Any]:
+    """
+    Node for performing LLM-based semantic analysis.
+    
+    Uses LLMOrchestratorAgent to provide deeper code insights through LLM analysis.
+    
+    Args:
+        state (GraphState): Current workflow state
+        agent_pool (Optional[AgentPool]): Pool of warm agents shared across scans
+        
+    Returns:
+        Dict[str, Any]: Updated state with LLM insights
+    """
+    logger.info("Performing LLM analysis")
+    
+    try:
+        # Import LLMOrchestratorAgent
+        from src.core_engine.agents.llm_orchestrator_agent import LLMOrchestratorAgent
+        
+        if not state.get("parsed_asts") and not state.get("project_code") and not state.get("pr_diff"):
+            return {
+                "error_message": "No code available for LLM analysis",
+                "current_step": "error"
+            }
+        
+        # Initialize LLMOrchestratorAgent with mock provider for now
+        llm_orchestrator = acquire_agent(agent_pool, "llm_orchestrator", LLMOrchestratorAgent, llm_provider=LLM_PROVIDER)
+        
+        logger.info("Generating LLM insights for code review")
+        
+        # Determine analysis type and prepare appropriate inputs
+        method, kwargs = _llm_analysis_request(state)
+        stage_cache = get_stage_cache()
+        cache_key = _llm_cache_key(llm_orchestrator, method, kwargs) if stage_cache else None
+        llm_insights = stage_cache.get("llm_analysis", cache_key) if stage_cache else None
+        
+        if llm_insights is None:
+            with trace_span(f"llm.{method}") as span:
+                llm_insights = getattr(llm_orchestrator, method)(**kwargs)
+                span.set_count("files", len(kwargs.get("code_files") or {}))
+            if stage_cache:
+                stage_cache.put("llm_analysis", cache_key, llm_insights)
+        
+        return _llm_analysis_result(state, llm_orchestrator, llm_insights)
+        
+    except Exception as e:
+        logger.error(f"Error in llm_analysis_node: {str(e)}")
+        return {
+            "error_message": f"Failed to perform LLM analysis: {str(e)}",
+            "current_step": "error"
+        }
+
+
+def _findings_by_file(findings: Optional[Iterable[dict]]) -> Dict[str, List[dict]]:
+    """Group static analysis findings by the file they were reported for."""
+    grouped: Dict[str, List[dict]] = {}
+    for finding in findings or []:
+        grouped.setdefault(finding.get("file") or finding.get("file_path"), []).append(finding)
+    return grouped
+
+
+def _scan_partitioned_project(
+    project_scanner: Any,
+    partitions: List[Partition],
+    project_code: Mapping[str, str],
+    static_findings: Optional[List[dict]],
+    code_metrics: Optional[dict],
+    knowledge_base_ready: bool,
+    content_keys: Optional[Mapping[str, str]] = None
+) -> Tuple[Dict[str, Any], Dict[str, Any]]:
+    """
+    Scan the partitions of a monorepo as independent, parallel sub-scans.
+    
+    Sub-scan reports are memoized by the contents and findings of the
+    partition's files, so when only one package changed only that partition
+    is scanned again. The RAG knowledge base is built once for the whole
+    repository and shared by all sub-scans.
+    
+    Args:
+        project_scanner (Any): ProjectScanningAgent instance
+        partitions (List[Partition]): Partitions of the repository
+        project_code (Mapping[str, str]): Project files by path
+        static_findings (Optional[List[dict]]): Static analysis findings of the project
+        code_metrics (Optional[dict]): Metrics of the whole repository, if calculated
+        knowledge_base_ready (bool): Whether the RAG knowledge base was already built
+        content_keys (Optional[Mapping[str, str]]): Blob ids of the project files,
+            hashed from their contents where missing
+        
+    Returns:
+        Tuple[Dict[str, Any], Dict[str, Any]]: Merged project report and
+            partitioning metadata
+    """
+    from config.settings import settings
+    from src.core_engine.agents import project_scanning_agent
+    from src.core_engine.agents.project_scanning_agent import ProjectScanningAgent
+    
+    if not knowledge_base_ready:
+        with trace_span("rag.build_knowledge_base") as span:
+            project_scanner.rag_agent.build_knowledge_base(project_code)
+            span.set_count("files", len(project_code))
+    
+    stage_cache = get_stage_cache()
+    agent_version = source_fingerprint(project_scanning_agent) if stage_cache else None
+    scanners: Dict[int, Any] = {0: project_scanner}
+    reports: Dict[str, Dict[str, Any]] = {}
+    reused: List[str] = []
+    # Findings are grouped once instead of filtering all of them per partition
+    findings_by_file = _findings_by_file(static_findings)
+    
+    def scanner_for(worker_index: int) -> Any:
+        # Sub-scans run concurrently; each worker gets its own agent sharing
+        # the knowledge base built above
+        if worker_index not in scanners:
+            scanners[worker_index] = ProjectScanningAgent(rag_agent=project_scanner.rag_agent)
+        return scanners[worker_index]
+    
+    def scan_partition(worker_index: int, partition: Partition) -> Tuple[str, Dict[str, Any]]:
+        code_files = {file_path: project_code[file_path] for file_path in partition.files}
+        findings = [finding for file_path in partition.files for finding in findings_by_file.get(file_path, ())]
+        cache_key = fingerprint(
+            partition.root,
+            sorted(
+                (file_path, ContentKey.for_file(file_path, content, content_keys))
+                for file_path, content in code_files.items()
+            ),
+            findings,
+            project_scanner.llm_orchestrator.llm_provider,
+            project_scanner.llm_orchestrator.model_name,
+            agent_version
+        ) if stage_cache else None
+        
+        report = stage_cache.get("project_scanning", cache_key) if stage_cache else None
+        if report is not None:
+            reused.append(partition.name)
+            return partition.name, report
+        
+        with trace_span("project_scanning.scan_partition") as span:
+            report = scanner_for(worker_index).scan_entire_project(
+                code_files=code_files,
+                static_findings=findings,
+                knowledge_base_ready=True
+            )
+            span.set_count("files", len(code_files))
+        if stage_cache and "error" not in report:
+            stage_cache.put("project_scanning", cache_key, report)
+        return partition.name, report
+    
+    pipeline = StreamingPipeline(
+        [PipelineStage("scan_partition", scan_partition, workers=max(1, min(settings.scan_partition_workers, len(partitions))))],
+        is_cancelled=is_cancelled
+    )
+    for name, report in pipeline.run(partitions):
+        reports[name] = report
+    check_cancelled()
+    
+    edges = dependency_edges(partitions, project_code)
+    merged = merge_partition_reports(partitions, reports, edges, complexity_metrics=code_metrics)
+    logger.info(
+        f"Scanned {len(partitions)} partitions ({len(reused)} reused) with "
+        f"{len(edges)} cross-partition dependencies"
+    )
+    return merged, {
+        "partitions": [partition.to_dict() for partition in partitions],
+        "partitions_reused": sorted(reused),
+        "partition_failures": pipeline.summary()["stages"]["scan_partition"]["errors"]
+    }
+
+
+def project_scanning_node(state: GraphState, agent_pool: Optional[AgentPool] = None) -> Dict[str, Any]:
+    """
+    Node for comprehensive project-level analysis.
+    
+    Performs hierarchical summarization and architectural analysis of the entire project.
+    Only triggered for full project scans (not PR scans).
+    
+    Args:
+        state (GraphState): Current workflow state
+        agent_pool (Optional[AgentPool]): Pool of warm agents shared across scans
+        
+    Returns:
+        Dict[str, Any]: Updated state with project scanning results
+    """
+    logger.info("Starting comprehensive project scanning")
+    
+    try:
+        # Import ProjectScanningAgent
+        from src.core_engine.agents.project_scanning_agent import ProjectScanningAgent
+        
+        # Initialize the agent
+        project_scanner = acquire_agent(agent_pool, "project_scanner", ProjectScanningAgent)
+        
+        # Get project code and static findings
+        project_code = state.get("project_code", {})
+        static_findings = state.get("static_analysis_findings", [])
+        workflow_metadata = state.get("workflow_metadata", {})
+        
+        if not project_code:
+            logger.warning("No project code available for scanning")
+            return {
+                "error_message": "No project code available for scanning",
+                "current_step": "error"
+            }
+        
+        # Perform comprehensive project scan
+        logger.info(f"Scanning project with {len(project_code)} files")
+        # Reuse results of the parallel metrics and knowledge base branches
+        precomputed = {}
+        if state.get("code_metrics"):
+            precomputed["complexity_metrics"] = state["code_metrics"]
+        if workflow_metadata.get("knowledge_base_built"):
+            precomputed["knowledge_base_ready"] = True
+        
+        # Monorepos are scanned per package when their manifests were collected
+        partitions = detect_partitions(project_code, state.get("package_manifests") or {})
+        partition_metadata: Dict[str, Any] = {}
+        
+        if len(partitions) > 1:
+            logger.info(f"Scanning monorepo as {len(partitions)} partitions")
+            scan_result, partition_metadata = _scan_partitioned_project(
+                project_scanner,
+                partitions,
+                project_code,
+                static_findings,
+                state.get("code_metrics"),
+                bool(precomputed.get("knowledge_base_ready")),
+                state.get("content_keys")
+            )
+        else:
+            with trace_span("project_scanning.scan_entire_project") as span:
+                scan_result = project_scanner.scan_entire_project(
+                    code_files=project_code,
+                    static_findings=static_findings,
+                    **precomputed
+                )
+                span.set_count("files", len(project_code))
+                span.set_count("recommendations", len(scan_result.get("recommendations", [])))
+        
+        # Add project scanning metadata
+        updated_metadata = {
+            "project_scan_completed": True,
+            "complexity_metrics": scan_result.get("complexity_metrics", {}),
+            "risk_level": scan_result.get("risk_assessment", {}).get("overall_risk_level", "unknown"),
+            "recommendations_count": len(scan_result.get("recommendations", [])),
+            **partition_metadata
+        }
+        
+        logger.info(f"Project scanning completed successfully. Risk level: {scan_result.get('risk_assessment', {}).get('overall_risk_level', 'unknown')}")
+        logger.info(f"Generated {len(scan_result.get('recommendations', []))} recommendations")
+        
+        return {
+            "project_scan_result": scan_result,
+            "current_step": "reporting",
+            "workflow_metadata": updated_metadata
+        }
+        
+    except Exception as e:
+        logger.error(f"Error in project_scanning_node: {str(e)}")
+        return {
+            "error_message": f"Failed to scan project: {str(e)}",
+            "current_step": "error"
+        }
+
+
+def reporting_node(state: GraphState, agent_pool: Optional[AgentPool] = None) -> Dict[str, Any]:
+    """
+    Node for generating the final code review report.
+    
+    Uses ReportingAgent to aggregate all findings into structured and formatted reports.
+    
+    Args:
+        state (GraphState): Current workflow state
+        agent_pool (Optional[AgentPool]): Pool of warm agents shared across scans
+        
+    Returns:
+        Dict[str, Any]: Updated state with final report data
+    """
+    logger.info("Generating code review report")
+    
+    try:
+        from src.core_engine.agents.reporting_agent import ReportingAgent
+        static_findings = state.get("static_analysis_findings", [])
+        llm_insights = state.get("llm_insights", "")
+        project_scan_result = state.get("project_scan_result")
+        workflow_metadata = state.get("workflow_metadata", {})
+        impact_analysis_result = state.get("impact_analysis_result")
+        # Prepare scan details for the report
+        scan_details = {
+            "repo_url": state.get("repo_url", ""),
+            "pr_id": state.get("pr_id"),
             "branch": workflow_metadata.get("branch"),
             "scan_type": workflow_metadata.get("scan_type", "project"),
             "total_files": workflow_metadata.get("total_files", 0),
@@ -692,15 +1804,22 @@ def reporting_node(state: GraphState) -> Dict[str, Any]:
             "project_scan_result": project_scan_result,
             "impact_analysis_result": impact_analysis_result,
         }
-        reporting_agent = ReportingAgent()
+        # Timing of every stage so far; the reporting span itself is still open
+        tracer = get_tracer(state.get("trace_id"))
+        if tracer is not None:
+            scan_details["trace"] = tracer.summary()
+        reporting_agent = acquire_agent(agent_pool, "reporting", ReportingAgent)
         logger.info(f"Generating report for {len(static_findings)} findings")
-        report_data = reporting_agent.generate_report_data(
-            static_findings=static_findings,
-            llm_insights=llm_insights,
-            scan_details=scan_details
-        )
-        markdown_report = reporting_agent.format_markdown_report(report_data)
-        json_report = reporting_agent.export_json(report_data)
+        with trace_span("reporting.generate_report") as span:
+            report_data = reporting_agent.generate_report_data(
+                static_findings=static_findings,
+                llm_insights=llm_insights,
+                scan_details=scan_details,
+                diagrams=state.get("diagrams")
+            )
+            markdown_report = reporting_agent.format_markdown_report(report_data)
+            json_report = reporting_agent.export_json(report_data)
+            span.set_count("findings", len(static_findings))
         logger.info("Code review report generated successfully")
         logger.info(f"Report contains {len(static_findings)} static analysis findings")
         logger.info(f"Markdown report: {len(markdown_report)} characters")
@@ -711,7 +1830,6 @@ def reporting_node(state: GraphState) -> Dict[str, Any]:
             "json_report": json_report,
             "current_step": "completed",
             "workflow_metadata": {
-                **workflow_metadata,
                 "report_generation_time": __import__('datetime').datetime.now().isoformat(),
                 "report_formats": ["json", "markdown"],
                 "report_agent_version": reporting_agent.report_version
@@ -756,6 +1874,7 @@ def handle_error_node(state: GraphState) -> Dict[str, Any]:
         },
         "error_details": {
             "step": state.get("current_step", "unknown"),
+            "cancellation_reason": (state.get("workflow_metadata") or {}).get("cancellation_reason"),
             "timestamp": "timestamp_placeholder",
             "workflow_metadata": state.get("workflow_metadata", {})
         }
@@ -852,77 +1971,208 @@ def should_run_project_scanning(state: GraphState) -> str:
         return "llm_analysis"
 
 
-def compile_graph() -> CompiledGraph:
+def _record_result_counts(span: Any, result: Dict[str, Any]) -> None:
+    """Record the number of files, findings and diagrams a node returned as span counts."""
+    for key in TRACED_RESULT_COUNTS:
+        value = result.get(key)
+        if isinstance(value, Sized):
+            span.set_count(key, len(value))
+
+
+def _record_node_result(span: Any, result: Dict[str, Any]) -> None:
+    """Record counts and errors of a node result on the node's span."""
+    _record_result_counts(span, result)
+    if result.get("current_step") == "error":
+        span.record_error(result.get("error_message"))
+
+
+def _finish_traced_node(state: GraphState, tracer: Any, result: Dict[str, Any]) -> Dict[str, Any]:
+    """Store the trace ID in the state and end the trace when the scan is over."""
+    if state.get("trace_id") != tracer.trace_id:
+        result = {**result, "trace_id": tracer.trace_id}
+    
+    if result.get("current_step") in ("completed", "error_handled"):
+        from config.settings import settings
+        end_trace(tracer.trace_id, export_dir=settings.scan_trace_dir)
+    return result
+
+
+def _traced_node(node_name: str, node_fn: Callable[[GraphState], Any]) -> Callable[[GraphState], Any]:
     """
-    Compile the LangGraph workflow.
+    Wrap a node so that it runs inside a tracing span.
     
-    Creates and configures the complete workflow graph with all nodes,
-    edges, and conditional logic.
+    The first node starts the scan's trace and stores its ID in the state.
+    The trace is finished (and exported when ``settings.scan_trace_dir`` is
+    set) once a node completes the scan or handles its error. Coroutine
+    nodes are wrapped in a coroutine.
     
+    Args:
+        node_name (str): Graph node name
+        node_fn (Callable[[GraphState], Any]): Node function
+        
     Returns:
-        CompiledGraph: Compiled LangGraph application ready for execution
+        Callable[[GraphState], Any]: Traced node function
     """
-    logger.info("Compiling LangGraph workflow")
+    if inspect.iscoroutinefunction(node_fn):
+        async def arun(state: GraphState) -> Dict[str, Any]:
+            tracer = start_trace(state.get("trace_id"))
+            with tracer.span(f"node.{node_name}") as span:
+                result = await node_fn(state)
+                _record_node_result(span, result)
+            return _finish_traced_node(state, tracer, result)
+        
+        return arun
+    
+    def run(state: GraphState) -> Dict[str, Any]:
+        tracer = start_trace(state.get("trace_id"))
+        with tracer.span(f"node.{node_name}") as span:
+            result = node_fn(state)
+            _record_node_result(span, result)
+        return _finish_traced_node(state, tracer, result)
     
+    return run
+
+
+def _cancelled_result(error: ScanCancelled) -> Dict[str, Any]:
+    """State update for a node that stopped because the scan was cancelled."""
+    logger.warning(f"Scan stopped: {str(error)}")
+    return {
+        "error_message": str(error),
+        "current_step": "error",
+        "workflow_metadata": {"cancellation_reason": error.reason}
+    }
+
+
+def _finish_cancellable_node(token: CancellationToken, result: Dict[str, Any]) -> Dict[str, Any]:
+    """Forget the scan's token once the scan is over."""
+    if result.get("current_step") in ("completed", "error_handled"):
+        release_token(token.token_id)
+    return result
+
+
+def _cancellable_node(node_name: str, node_fn: Callable[[GraphState], Any]) -> Callable[[GraphState], Any]:
+    """
+    Wrap a node so that it observes the scan's cancellation token.
+    
+    The token described in the state is made current while the node runs, so
+    agents can check it cooperatively. A node is not started once the scan
+    was cancelled or ran out of time, and a ``ScanCancelled`` raised inside it
+    becomes a workflow error. Error handling always runs.
+    
+    Args:
+        node_name (str): Graph node name
+        node_fn (Callable[[GraphState], Any]): Node function
+        
+    Returns:
+        Callable[[GraphState], Any]: Cancellable node function
+    """
+    if inspect.iscoroutinefunction(node_fn):
+        async def arun(state: GraphState) -> Dict[str, Any]:
+            token = resolve_token(state.get("cancellation"))
+            if token is None:
+                return await node_fn(state)
+            with activate(token):
+                try:
+                    if node_name != "handle_error":
+                        token.check()
+                    result = await node_fn(state)
+                except ScanCancelled as e:
+                    result = _cancelled_result(e)
+            return _finish_cancellable_node(token, result)
+        
+        return arun
+    
+    def run(state: GraphState) -> Dict[str, Any]:
+        token = resolve_token(state.get("cancellation"))
+        if token is None:
+            return node_fn(state)
+        with activate(token):
+            try:
+                if node_name != "handle_error":
+                    token.check()
+                result = node_fn(state)
+            except ScanCancelled as e:
+                result = _cancelled_result(e)
+        return _finish_cancellable_node(token, result)
+    
+    return run
+
+
+def build_workflow(nodes: Dict[str, Callable[[GraphState], Any]]) -> StateGraph:
+    """
+    Build the workflow graph from node implementations.
+    
+    The edges and routing are the same for every set of node implementations,
+    so the sync and async graphs only differ in their node functions. A
+    ``stream_files`` node selects the streaming layout in place of the
+    fetch / parse / static analysis stages.
+    
+    Args:
+        nodes (Dict[str, Callable[[GraphState], Any]]): Node function per node name
+        
+    Returns:
+        StateGraph: Uncompiled workflow graph
+    """
     # Initialize the StateGraph with our GraphState
     workflow = StateGraph(GraphState)
     
-    # Add all nodes to the graph
-    workflow.add_node("start_scan", start_scan)
-    workflow.add_node("fetch_code", fetch_code_node)
-    workflow.add_node("parse_code", parse_code_node)
-    workflow.add_node("static_analysis", static_analysis_node)
-    workflow.add_node("impact_analysis", impact_analysis_node)
-    workflow.add_node("llm_analysis", llm_analysis_node)
-    workflow.add_node("project_scanning", project_scanning_node)
-    workflow.add_node("reporting", reporting_node)
-    workflow.add_node("handle_error", handle_error_node)
+    # Add all nodes to the graph, each running inside a tracing span and
+    # observing the scan's cancellation token
+    for node_name, node_fn in nodes.items():
+        workflow.add_node(node_name, _traced_node(node_name, _cancellable_node(node_name, node_fn)))
     
     # Set entry point
     workflow.set_entry_point("start_scan")
     
+    # Streaming graphs replace the fetch / parse / static analysis barriers
+    # with a single node that streams files through those stages
+    streaming = "stream_files" in nodes
+    
     # Add edges between nodes
     workflow.add_conditional_edges(
         "start_scan",
         should_fetch_pr_or_project,
         {
-            "fetch_code": "fetch_code",
+            "fetch_code": "stream_files" if streaming else "fetch_code",
             "handle_error": "handle_error"
         }
     )
     
-    # Add conditional edges for basic workflow steps
-    for node_name in ["fetch_code", "parse_code"]:
+    if streaming:
+        # Project-level branches fan out once every file has been streamed
         workflow.add_conditional_edges(
-            node_name,
+            "stream_files",
+            should_fan_out_streamed_analysis,
+            STREAM_BRANCHES + ["handle_error"]
+        )
+        workflow.add_edge(STREAM_BRANCHES, "join_analysis")
+    else:
+        workflow.add_conditional_edges(
+            "fetch_code",
             should_continue_or_error,
             {
-                "fetch_code": "fetch_code",
-                "parse_code": "parse_code", 
-                "static_analysis": "static_analysis",
+                "parse_code": "parse_code",
                 "handle_error": "handle_error",
                 END: END
             }
         )
+        
+        # Fan out independent analysis branches after parsing; they run in the same step
+        workflow.add_conditional_edges(
+            "parse_code",
+            should_fan_out_analysis,
+            ANALYSIS_BRANCHES + ["handle_error"]
+        )
+        
+        # Join waits until every branch has finished
+        workflow.add_edge(ANALYSIS_BRANCHES, "join_analysis")
     
-    # Add special conditional edge from static_analysis to determine if project scanning should run
-    workflow.add_conditional_edges(
-        "static_analysis",
-        should_run_project_scanning,
-        {
-            "project_scanning": "project_scanning",
-            "llm_analysis": "llm_analysis",
-            "handle_error": "handle_error"
-        }
-    )
-    
-    # Add conditional edges for analysis and reporting steps
-    for node_name in ["impact_analysis", "llm_analysis", "project_scanning", "reporting"]:
+    # Add conditional edges for steps after the join
+    for node_name in ["join_analysis", "llm_analysis", "project_scanning", "reporting"]:
         workflow.add_conditional_edges(
             node_name,
             should_continue_or_error,
             {
-                "impact_analysis": "impact_analysis",
                 "llm_analysis": "llm_analysis",
                 "project_scanning": "project_scanning",
                 "reporting": "reporting",
@@ -934,33 +2184,207 @@ def compile_graph() -> CompiledGraph:
     # Error handling node leads to END
     workflow.add_edge("handle_error", END)
     
+    return workflow
+
+
+def compile_graph(
+    agent_pool: Optional[AgentPool] = None,
+    checkpointer: Optional[BaseCheckpointSaver] = None,
+    streaming: bool = False
+) -> CompiledGraph:
+    """
+    Compile the LangGraph workflow.
+    
+    Creates and configures the complete workflow graph with all nodes,
+    edges, and conditional logic.
+    
+    Args:
+        agent_pool (Optional[AgentPool]): Pool of warm agents injected into every
+            node. Without a pool, each node constructs its agents per scan.
+        checkpointer (Optional[BaseCheckpointSaver]): Saver that persists the state
+            after every step. Invoke with ``get_scan_config(scan_id)`` to key the
+            checkpoints by scan ID so the scan can be resumed.
+        streaming (bool): Stream files through parsing, static analysis and
+            per-file LLM review instead of running those stages one after another
+    
+    Returns:
+        CompiledGraph: Compiled LangGraph application ready for execution
+    """
+    logger.info("Compiling LangGraph workflow")
+    
+    def bind(node_fn):
+        # Inject the shared agent pool into nodes that construct agents
+        return partial(node_fn, agent_pool=agent_pool) if agent_pool is not None else node_fn
+    
+    nodes = {
+        "start_scan": start_scan,
+        "fetch_code": bind(fetch_code_node),
+        "parse_code": bind(parse_code_node),
+        "static_analysis": bind(static_analysis_node),
+        "impact_analysis": bind(impact_analysis_node),
+        "risk_metrics": bind(risk_metrics_node),
+        "knowledge_base": bind(knowledge_base_node),
+        "diagram_extraction": bind(diagram_extraction_node),
+        "join_analysis": join_analysis_node,
+        "llm_analysis": bind(llm_analysis_node),
+        "project_scanning": bind(project_scanning_node),
+        "reporting": bind(reporting_node),
+        "handle_error": handle_error_node
+    }
+    if streaming:
+        for node_name in STAGED_NODES:
+            del nodes[node_name]
+        nodes["stream_files"] = bind(stream_files_node)
+    
+    workflow = build_workflow(nodes)
+    
     # Compile the graph
-    app = workflow.compile()
+    app = workflow.compile(checkpointer=checkpointer)
     
     logger.info("LangGraph workflow compiled successfully")
     return app
 
 
+def _find_resume_point(app: CompiledGraph, config: Dict[str, Any]) -> Optional[Any]:
+    """
+    Find the checkpoint a scan should resume from.
+    
+    Walks the checkpoint history from newest to oldest and returns the first
+    snapshot that does not carry an error, i.e. the state after the last
+    successfully completed step.
+    
+    Args:
+        app (CompiledGraph): Workflow compiled with a checkpointer
+        config (Dict[str, Any]): Config keyed by scan ID
+        
+    Returns:
+        Optional[Any]: StateSnapshot to resume from, or None if there are no checkpoints
+    """
+    for snapshot in app.get_state_history(config):
+        if _is_resume_point(snapshot):
+            return snapshot
+    return None
+
+
+def _is_resume_point(snapshot: Any) -> bool:
+    """Whether a checkpoint snapshot is the state after a successfully completed step."""
+    values = snapshot.values or {}
+    return not (values.get("error_message") or values.get("current_step") in ("error", "error_handled"))
+
+
+def _renew_time_budget(values: Dict[str, Any]) -> None:
+    """
+    Give a resumed scan's token a fresh time budget of the original length.
+    
+    The token already registered under the scan's ID (e.g. by the task queue
+    retrying the scan) is renewed in place, so cancelling it still stops the
+    resumed steps; a token is only registered if there is none.
+    """
+    cancellation = values.get("cancellation")
+    if cancellation and cancellation.get("deadline"):
+        resolve_token(cancellation).renew(cancellation["deadline"] - cancellation["started_at"])
+
+
+def resume_scan(
+    scan_id: str,
+    checkpointer: Optional[BaseCheckpointSaver] = None,
+    agent_pool: Optional[AgentPool] = None,
+    streaming: bool = False
+) -> Dict[str, Any]:
+    """
+    Resume a checkpointed scan from its last successfully completed step.
+    
+    Steps that already completed (e.g. cloning and parsing) are not repeated;
+    only the step that failed or was interrupted and the ones after it run.
+    The resumed steps get a fresh time budget of the scan's original length.
+    A scan that already completed returns its final state unchanged.
+    
+    Args:
+        scan_id (str): Scan ID the checkpoints are keyed by
+        checkpointer (Optional[BaseCheckpointSaver]): Saver holding the checkpoints
+            (defaults to the global SQLite checkpointer)
+        agent_pool (Optional[AgentPool]): Pool of warm agents shared across scans
+        streaming (bool): Whether the scan was started in streaming mode
+        
+    Returns:
+        Dict[str, Any]: Final workflow state
+        
+    Raises:
+        ValueError: If no checkpoint exists for the scan
+    """
+    from .checkpointing import get_checkpointer, get_scan_config
+    
+    app = compile_graph(agent_pool=agent_pool, checkpointer=checkpointer or get_checkpointer(), streaming=streaming)
+    resume_point = _find_resume_point(app, get_scan_config(scan_id))
+    
+    if resume_point is None:
+        raise ValueError(f"No checkpoint found for scan {scan_id}")
+    
+    if not resume_point.next:
+        logger.info(f"Scan {scan_id} already completed, nothing to resume")
+        return resume_point.values
+    
+    # A resumed scan gets a fresh time budget of the original length
+    _renew_time_budget(resume_point.values)
+    
+    logger.info(f"Resuming scan {scan_id} at {list(resume_point.next)}")
+    return app.invoke(None, resume_point.config)
+
+
+def discard_scan(scan_id: str, checkpointer: Optional[BaseCheckpointSaver] = None) -> None:
+    """
+    Drop a scan's checkpoints together with its content store.
+    
+    A checkpointed scan's file contents stay in its content store until the
+    scan can no longer be resumed; the checkpoints only hold handles into it.
+    
+    Args:
+        scan_id (str): Scan ID the checkpoints are keyed by
+        checkpointer (Optional[BaseCheckpointSaver]): Saver holding the checkpoints
+            (defaults to the global SQLite checkpointer)
+    """
+    from .checkpointing import get_checkpointer, get_scan_config
+    
+    checkpointer = checkpointer or get_checkpointer()
+    checkpoint_tuple = checkpointer.get_tuple(get_scan_config(scan_id))
+    if checkpoint_tuple is not None:
+        store_root = checkpoint_tuple.checkpoint["channel_values"].get("content_store_root")
+        if store_root:
+            open_content_store(store_root).cleanup()
+    checkpointer.delete_thread(scan_id)
+    logger.debug(f"Discarded checkpoints of scan {scan_id}")
+
+
 # Example usage and testing function
-def create_sample_scan_request() -> GraphState:
+def create_initial_state(scan_request_data: dict) -> GraphState:
     """
-    Create a sample scan request for testing.
+    Create the initial workflow state for a scan request.
     
+    Args:
+        scan_request_data (dict): Scan request parameters (repo_url, pr_id, branches, ...)
+        
     Returns:
-        GraphState: Sample initial state for testing
+        GraphState: Initial state for ``invoke`` / ``ainvoke``
     """
     return GraphState(
-        scan_request_data={
-            "repo_url": "https://github.com/example/test-repo",
-            "pr_id": 123,
-            "scan_type": "pr"
-        },
+        scan_request_data=scan_request_data,
         repo_url="",
         pr_id=None,
         project_code=None,
+        package_manifests=None,
+        content_keys=None,
         pr_diff=None,
+        change_set=None,
         parsed_asts=None,
+        structural_info=None,
+        content_store_root=None,
+        trace_id=None,
+        cancellation=None,
         static_analysis_findings=None,
+        static_analysis_summary=None,
+        impact_analysis_result=None,
+        code_metrics=None,
+        diagrams=None,
         llm_insights=None,
         report_data=None,
         markdown_report=None,
@@ -971,6 +2395,20 @@ def create_sample_scan_request() -> GraphState:
     )
 
 
+def create_sample_scan_request() -> GraphState:
+    """
+    Create a sample scan request for testing.
+    
+    Returns:
+        GraphState: Sample initial state for testing
+    """
+    return create_initial_state({
+        "repo_url": "https://github.com/example/test-repo",
+        "pr_id": 123,
+        "scan_type": "pr"
+    })
+
+
 if __name__ == "__main__":
     # Example usage for testing
     logging.basicConfig(level=logging.INFO)
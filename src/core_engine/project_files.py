@@ -0,0 +1,151 @@
+"""
+Lazily loaded project files.
+
+A project fetch records the path, size and (for mirrored repositories) blob
+id of every selected file up front, and reads a file's content only when it
+is accessed: from a memory-mapped working tree file, or from the mirror's
+object database. Consumers see a read-only ``Mapping`` of path to text, so
+code written against the former ``Dict[str, str]`` keeps working while a
+large repository is never held in memory at once.
+"""
+
+import logging
+import mmap
+import os
+import shutil
+import threading
+import weakref
+from collections import OrderedDict
+from collections.abc import Mapping
+from dataclasses import dataclass
+from typing import Callable, Dict, Iterator, Optional
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+# Decoded files kept in memory per mapping, for consumers reading a file twice
+DEFAULT_TEXT_CACHE_SIZE = 32
+
+
+@dataclass
+class ProjectFileEntry:
+    """
+    A project file whose content has not been read yet.
+
+    Attributes:
+        path (str): Path relative to the repository root
+        size (int): Size in bytes
+        blob_id (Optional[str]): Git blob id, if known (files are read by it from an object database)
+        location (Optional[str]): Absolute path, if read from a working tree
+    """
+    path: str
+    size: int
+    blob_id: Optional[str] = None
+    location: Optional[str] = None
+
+
+def read_mapped_text(file_path: str) -> str:
+    """
+    Decode a file straight from a read-only memory map.
+
+    Args:
+        file_path (str): Absolute file path
+
+    Returns:
+        str: File content decoded as UTF-8, undecodable bytes dropped
+    """
+    with open(file_path, "rb") as f:
+        if os.fstat(f.fileno()).st_size == 0:
+            return ""
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+            return str(mapped, "utf-8", "ignore")
+
+
+class LazyProjectFiles(Mapping):
+    """
+    Read-only mapping of project file path to content, loaded on access.
+
+    Iteration, ``len`` and membership only use the recorded entries. The
+    mapping may own a temporary checkout, which is removed by ``close`` or
+    when the mapping is garbage collected.
+    """
+
+    def __init__(
+        self,
+        entries: Dict[str, ProjectFileEntry],
+        loader: Callable[[ProjectFileEntry], str],
+        text_cache_size: int = DEFAULT_TEXT_CACHE_SIZE,
+        cleanup_dir: Optional[str] = None
+    ):
+        """
+        Initialize the LazyProjectFiles.
+
+        Args:
+            entries (Dict[str, ProjectFileEntry]): Files by repository-relative path
+            loader (Callable[[ProjectFileEntry], str]): Reads the content of an entry
+            text_cache_size (int): Decoded files kept in memory (0 disables the cache)
+            cleanup_dir (Optional[str]): Temporary directory removed with the mapping
+        """
+        self.entries = entries
+        self._loader = loader
+        self._text_cache_size = text_cache_size
+        self._texts: "OrderedDict[str, str]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._finalizer = (
+            weakref.finalize(self, shutil.rmtree, cleanup_dir, True) if cleanup_dir else None
+        )
+
+    @classmethod
+    def from_checkout(cls, entries: Dict[str, ProjectFileEntry], **kwargs) -> "LazyProjectFiles":
+        """
+        Create a mapping over working tree files read through memory maps.
+
+        Args:
+            entries (Dict[str, ProjectFileEntry]): Files with their ``location``
+            **kwargs: Passed to the constructor
+
+        Returns:
+            LazyProjectFiles: Lazy mapping
+        """
+        return cls(entries, lambda entry: read_mapped_text(entry.location), **kwargs)
+
+    def __getitem__(self, path: str) -> str:
+        entry = self.entries[path]
+        with self._lock:
+            text = self._texts.get(path)
+            if text is not None:
+                self._texts.move_to_end(path)
+                return text
+
+        text = self._loader(entry)
+
+        if self._text_cache_size > 0:
+            with self._lock:
+                self._texts[path] = text
+                while len(self._texts) > self._text_cache_size:
+                    self._texts.popitem(last=False)
+        return text
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self.entries)
+
+    def __len__(self) -> int:
+        return len(self.entries)
+
+    def __contains__(self, path: object) -> bool:
+        return path in self.entries
+
+    def __repr__(self) -> str:
+        return f"LazyProjectFiles(files={len(self.entries)}, bytes={self.total_bytes})"
+
+    @property
+    def total_bytes(self) -> int:
+        """Total size of all files in bytes."""
+        return sum(entry.size for entry in self.entries.values())
+
+    def close(self) -> None:
+        """Drop cached text and remove the temporary checkout, if any."""
+        with self._lock:
+            self._texts.clear()
+        if self._finalizer is not None:
+            self._finalizer()
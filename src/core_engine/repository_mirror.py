@@ -0,0 +1,568 @@
+"""
+Persistent bare mirrors of scanned repositories.
+
+Every repository is fetched once into a bare mirror under a local root and
+kept up to date with incremental ``git fetch``; later scans only transfer
+the new objects. Files are read straight from the object database, PR diffs
+are computed inside the mirror, and full checkouts are short-lived
+``git worktree`` directories that share the mirror's objects.
+
+Whole trees are read without a checkout: ``git ls-tree -r -l`` lists paths
+and blob sizes so files can be filtered before anything is read, and the
+selected blobs are streamed through one ``git cat-file --batch`` process.
+Single files at many revisions are read the same way, with recently read
+blobs kept in an LRU keyed by their object id.
+
+Credentials embedded in repository URLs are passed to every fetch but never
+written to the mirror's configuration.
+"""
+
+import hashlib
+import logging
+import os
+import re
+import shutil
+import tempfile
+import threading
+from collections import OrderedDict
+from contextlib import contextmanager
+from dataclasses import dataclass
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+from urllib.parse import urlsplit, urlunsplit
+
+from git import GitCommandError, Repo
+
+from .cancellation import check_cancelled, remaining_seconds
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+# Branches and tags are mirrored as-is; pruned when deleted upstream
+MIRROR_REFSPECS = ("+refs/heads/*:refs/heads/*", "+refs/tags/*:refs/tags/*")
+
+_SHA_PATTERN = re.compile(r"^[0-9a-fA-F]{40}$")
+
+# Symbolic links are listed as blobs holding the link target
+_SYMLINK_MODE = "120000"
+
+DEFAULT_BLOB_CACHE_BYTES = 64 * 1024 * 1024
+
+
+@dataclass
+class TreeEntry:
+    """A file listed in a commit's tree."""
+    path: str
+    oid: str
+    size: int
+
+
+@dataclass
+class FileVersion:
+    """A file's content at a revision."""
+    path: str
+    revision: str
+    blob_id: str
+    content: str
+
+
+class BlobCache:
+    """
+    LRU of blob contents by object id, bounded by their total size.
+
+    Object ids name contents, so entries never go stale and are shared
+    between revisions and repositories.
+    """
+
+    def __init__(self, max_bytes: int = DEFAULT_BLOB_CACHE_BYTES):
+        """
+        Initialize the BlobCache.
+
+        Args:
+            max_bytes (int): Largest total size of the cached blobs
+        """
+        self.max_bytes = max_bytes
+        self.size = 0
+        self.hits = 0
+        self.misses = 0
+        self._blobs: "OrderedDict[str, bytes]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, oid: str) -> Optional[bytes]:
+        with self._lock:
+            data = self._blobs.get(oid)
+            if data is None:
+                self.misses += 1
+                return None
+            self._blobs.move_to_end(oid)
+            self.hits += 1
+            return data
+
+    def put(self, oid: str, data: bytes) -> None:
+        if len(data) > self.max_bytes:
+            return
+        with self._lock:
+            if oid in self._blobs:
+                self._blobs.move_to_end(oid)
+                return
+            self._blobs[oid] = data
+            self.size += len(data)
+            while self.size > self.max_bytes:
+                _, evicted = self._blobs.popitem(last=False)
+                self.size -= len(evicted)
+
+
+class BlobReader:
+    """
+    Reads blobs of one mirror on demand through a persistent ``git cat-file``.
+
+    GitPython's cat-file processes are not thread-safe, so reads are
+    serialized; blobs already in the store's LRU skip the process entirely.
+    """
+
+    def __init__(self, repo: Repo, blob_cache: BlobCache):
+        """
+        Initialize the BlobReader.
+
+        Args:
+            repo (Repo): Mirror repository handle owned by the reader
+            blob_cache (BlobCache): LRU shared with the mirror store
+        """
+        self.repo = repo
+        self.blob_cache = blob_cache
+        self._lock = threading.Lock()
+
+    def read(self, oid: str) -> bytes:
+        """
+        Read a blob by object id.
+
+        Args:
+            oid (str): Blob object id
+
+        Returns:
+            bytes: Blob content
+        """
+        data = self.blob_cache.get(oid)
+        if data is None:
+            with self._lock:
+                _, _, _, data = self.repo.git.get_object_data(oid)
+            self.blob_cache.put(oid, data)
+        return data
+
+    def close(self) -> None:
+        """Stop the persistent cat-file process."""
+        self.repo.close()
+
+
+def normalize_repo_url(repo_url: str) -> str:
+    """
+    Normalize a repository URL so that equivalent URLs share a mirror.
+
+    Credentials are removed, the host is lowercased and a trailing ``.git``
+    or slash is dropped.
+
+    Args:
+        repo_url (str): Repository URL (https, ssh, file or a local path)
+
+    Returns:
+        str: Normalized URL
+    """
+    url = repo_url.strip().rstrip("/")
+    if url.endswith(".git"):
+        url = url[:-len(".git")]
+
+    parts = urlsplit(url)
+    if not parts.scheme or not parts.netloc:
+        return url
+
+    host = parts.hostname or ""
+    if parts.port:
+        host = f"{host}:{parts.port}"
+    return urlunsplit((parts.scheme.lower(), host.lower(), parts.path, parts.query, ""))
+
+
+def is_commit_sha(revision: str) -> bool:
+    """Whether a revision is a full 40 character commit SHA."""
+    return bool(_SHA_PATTERN.match(revision))
+
+
+class MirrorStore:
+    """
+    Local store of bare repository mirrors.
+
+    Mirrors are created atomically (fetched into a temporary directory and
+    renamed into place), so concurrent processes sharing a root never see a
+    partial mirror. Fetches and worktree changes of one mirror are
+    serialized within the process; object reads are not locked.
+    """
+
+    def __init__(self, root: str, blob_cache_bytes: int = DEFAULT_BLOB_CACHE_BYTES):
+        """
+        Initialize the MirrorStore.
+
+        Args:
+            root (str): Directory holding the mirrors (created if missing)
+            blob_cache_bytes (int): Memory for recently read blobs
+        """
+        self.root = os.path.abspath(root)
+        os.makedirs(self.root, exist_ok=True)
+        self.blob_cache = BlobCache(blob_cache_bytes)
+        self._locks: Dict[str, threading.Lock] = {}
+        self._locks_guard = threading.Lock()
+
+    def mirror_path(self, repo_url: str) -> str:
+        """
+        Get the directory of a repository's mirror.
+
+        Args:
+            repo_url (str): Repository URL
+
+        Returns:
+            str: Mirror directory (which may not exist yet)
+        """
+        normalized = normalize_repo_url(repo_url)
+        name = re.sub(r"[^A-Za-z0-9._-]", "_", normalized.rsplit("/", 1)[-1]) or "repo"
+        url_hash = hashlib.sha1(normalized.encode("utf-8")).hexdigest()[:16]
+        return os.path.join(self.root, f"{name}_{url_hash}.git")
+
+    def _lock(self, path: str) -> threading.Lock:
+        with self._locks_guard:
+            return self._locks.setdefault(path, threading.Lock())
+
+    def _fetch(self, repo: Repo, repo_url: str, *refspecs: str) -> None:
+        # A fetch cannot be interrupted midway; git is killed if it outlasts the budget
+        check_cancelled()
+        repo.git.fetch(
+            repo_url, *(refspecs or MIRROR_REFSPECS),
+            prune=True, kill_after_timeout=remaining_seconds()
+        )
+        check_cancelled()
+
+    def _create(self, repo_url: str, path: str) -> Repo:
+        logger.info(f"Creating mirror of {normalize_repo_url(repo_url)} in {path}")
+        staging_dir = tempfile.mkdtemp(prefix=".staging_", dir=self.root)
+        try:
+            self._fetch(Repo.init(staging_dir, bare=True), repo_url)
+            try:
+                os.rename(staging_dir, path)
+            except OSError:
+                # Another process created the mirror first
+                if not os.path.isdir(path):
+                    raise
+                logger.debug(f"Mirror {path} was created concurrently")
+        finally:
+            if os.path.exists(staging_dir):
+                shutil.rmtree(staging_dir, ignore_errors=True)
+        return Repo(path)
+
+    def has_commit(self, repo: Repo, sha: str) -> bool:
+        """
+        Check whether a commit is already in a mirror.
+
+        Args:
+            repo (Repo): Mirror repository
+            sha (str): Commit SHA
+
+        Returns:
+            bool: True if the commit object is present
+        """
+        try:
+            repo.git.cat_file("-e", f"{sha}^{{commit}}")
+            return True
+        except GitCommandError:
+            return False
+
+    def sync(self, repo_url: str, revisions: Iterable[str] = ()) -> Repo:
+        """
+        Get an up-to-date mirror of a repository.
+
+        The mirror is created on first use and updated with an incremental
+        fetch afterwards. The fetch is skipped when every requested revision
+        is a commit SHA the mirror already has, since commits never change.
+
+        Args:
+            repo_url (str): Repository URL
+            revisions (Iterable[str]): Revisions the caller is about to read
+
+        Returns:
+            Repo: Bare mirror repository
+
+        Raises:
+            GitCommandError: If the repository cannot be fetched
+        """
+        path = self.mirror_path(repo_url)
+        revisions = list(revisions)
+
+        with self._lock(path):
+            if not os.path.isdir(path):
+                return self._create(repo_url, path)
+
+            repo = Repo(path)
+            if revisions and all(is_commit_sha(rev) and self.has_commit(repo, rev) for rev in revisions):
+                logger.debug(f"Mirror {path} already has {', '.join(revisions)}")
+                return repo
+
+            logger.info(f"Updating mirror {path}")
+            self._fetch(repo, repo_url)
+
+            # Commits outside the mirrored branches (e.g. of a closed PR) are fetched by SHA
+            missing = [rev for rev in revisions if is_commit_sha(rev) and not self.has_commit(repo, rev)]
+            if missing:
+                try:
+                    self._fetch(repo, repo_url, *missing)
+                except GitCommandError as e:
+                    logger.warning(f"Could not fetch {', '.join(missing)} from {normalize_repo_url(repo_url)}: {e}")
+            return repo
+
+    def resolve(self, repo: Repo, revision: str) -> Optional[str]:
+        """
+        Resolve a branch, tag or commit to a commit SHA in a mirror.
+
+        Args:
+            repo (Repo): Mirror repository
+            revision (str): Branch name, tag, full ref or commit SHA
+
+        Returns:
+            Optional[str]: Commit SHA, or None if the revision is unknown
+        """
+        if revision.startswith("origin/"):
+            revision = revision[len("origin/"):]
+        for ref in (f"refs/heads/{revision}", f"refs/tags/{revision}", revision):
+            try:
+                return repo.git.rev_parse("--verify", "--quiet", f"{ref}^{{commit}}")
+            except GitCommandError:
+                continue
+        return None
+
+    def read_files(self, repo_url: str, file_paths: List[str], revision: str) -> Dict[str, str]:
+        """
+        Read files at a revision from the mirror's object database.
+
+        Args:
+            repo_url (str): Repository URL
+            file_paths (List[str]): Repository-relative file paths
+            revision (str): Branch name, tag or commit SHA
+
+        Returns:
+            Dict[str, str]: Mapping of file path to content for files that exist
+
+        Raises:
+            ValueError: If the revision does not exist
+        """
+        repo = self.sync(repo_url, [revision])
+        sha = self.resolve(repo, revision)
+        if sha is None:
+            raise ValueError(f"Revision {revision} not found in {normalize_repo_url(repo_url)}")
+
+        tree = repo.commit(sha).tree
+        contents = {}
+        for file_path in file_paths:
+            try:
+                blob = tree / file_path
+            except KeyError:
+                logger.debug(f"File {file_path} not found at revision {revision}")
+                continue
+            contents[file_path] = blob.data_stream.read().decode("utf-8", errors="ignore")
+        return contents
+
+    def read_versions(
+        self,
+        repo_url: str,
+        requests: Iterable[Tuple[str, str]]
+    ) -> Dict[Tuple[str, str], FileVersion]:
+        """
+        Read files at any number of revisions in one session.
+
+        The mirror is synced once for all revisions, each revision is
+        resolved once, and every file is looked up through the same
+        ``git cat-file`` processes; blobs already in the LRU are not read again.
+
+        Args:
+            repo_url (str): Repository URL
+            requests (Iterable[Tuple[str, str]]): (file path, revision) pairs
+
+        Returns:
+            Dict[Tuple[str, str], FileVersion]: Versions by (file path, revision)
+                for the files that exist
+        """
+        requests = list(dict.fromkeys(requests))
+        revisions = list(dict.fromkeys(revision for _, revision in requests))
+        versions: Dict[Tuple[str, str], FileVersion] = {}
+        if not requests:
+            return versions
+
+        repo = self.sync(repo_url, revisions)
+        try:
+            shas = {revision: self.resolve(repo, revision) for revision in revisions}
+            for revision, sha in shas.items():
+                if sha is None:
+                    logger.warning(f"Revision {revision} not found in {normalize_repo_url(repo_url)}")
+
+            for file_path, revision in requests:
+                sha = shas[revision]
+                if sha is None:
+                    continue
+                check_cancelled()
+                try:
+                    oid, type_, _ = repo.git.get_object_header(f"{sha}:{file_path}")
+                except ValueError:
+                    logger.debug(f"File {file_path} not found at revision {revision}")
+                    continue
+                if type_ != b"blob":
+                    continue
+
+                oid = oid.decode("ascii")
+                data = self.blob_cache.get(oid)
+                if data is None:
+                    _, _, _, data = repo.git.get_object_data(oid)
+                    self.blob_cache.put(oid, data)
+                versions[(file_path, revision)] = FileVersion(
+                    path=file_path,
+                    revision=revision,
+                    blob_id=oid,
+                    content=data.decode("utf-8", errors="ignore")
+                )
+        finally:
+            # Stops the persistent cat-file processes
+            repo.close()
+        return versions
+
+    def open_blob_reader(self, repo: Repo) -> BlobReader:
+        """
+        Open a reader for blobs of a synced mirror.
+
+        Args:
+            repo (Repo): Mirror repository returned by ``sync``
+
+        Returns:
+            BlobReader: Reader with its own cat-file process
+        """
+        return BlobReader(Repo(repo.git_dir), self.blob_cache)
+
+    def diff(self, repo_url: str, target: str, source: str) -> str:
+        """
+        Diff the changes of a source branch since it forked from a target branch.
+
+        Args:
+            repo_url (str): Repository URL
+            target (str): Target branch or commit
+            source (str): Source branch or commit
+
+        Returns:
+            str: Unified diff of ``target...source``
+
+        Raises:
+            ValueError: If either revision does not exist
+        """
+        repo = self.sync(repo_url, [target, source])
+        shas = []
+        for revision in (target, source):
+            sha = self.resolve(repo, revision)
+            if sha is None:
+                raise ValueError(f"Revision {revision} not found in {normalize_repo_url(repo_url)}")
+            shas.append(sha)
+        return repo.git.diff(f"{shas[0]}...{shas[1]}")
+
+    def list_tree(self, repo: Repo, sha: str) -> List[TreeEntry]:
+        """
+        List the files of a commit with their blob ids and sizes.
+
+        Submodules and symbolic links are left out.
+
+        Args:
+            repo (Repo): Mirror repository
+            sha (str): Commit SHA
+
+        Returns:
+            List[TreeEntry]: Files of the commit's tree
+        """
+        entries = []
+        for record in repo.git.ls_tree("-r", "-l", "-z", sha).split("\0"):
+            if not record:
+                continue
+            meta, _, path = record.partition("\t")
+            mode, type_, oid, size = meta.split()
+            if type_ != "blob" or mode == _SYMLINK_MODE:
+                continue
+            entries.append(TreeEntry(path=path, oid=oid, size=int(size)))
+        return entries
+
+    @contextmanager
+    def worktree(self, repo_url: str, revision: str) -> Iterator[str]:
+        """
+        Check out a revision into a temporary worktree of the mirror.
+
+        The worktree shares the mirror's objects, so only the working files
+        are written; it is removed when the context exits.
+
+        Args:
+            repo_url (str): Repository URL
+            revision (str): Branch name, tag or commit SHA
+
+        Yields:
+            str: Worktree directory
+
+        Raises:
+            ValueError: If the revision does not exist
+        """
+        repo = self.sync(repo_url, [revision])
+        sha = self.resolve(repo, revision)
+        if sha is None:
+            raise ValueError(f"Revision {revision} not found in {normalize_repo_url(repo_url)}")
+
+        path = self.mirror_path(repo_url)
+        temp_dir = tempfile.mkdtemp(prefix="aicode_worktree_")
+        worktree_dir = os.path.join(temp_dir, "tree")
+        try:
+            with self._lock(path):
+                # Forget worktrees left behind by crashed scans
+                repo.git.worktree("prune")
+                repo.git.worktree("add", "--detach", worktree_dir, sha)
+            check_cancelled()
+            yield worktree_dir
+        finally:
+            with self._lock(path):
+                try:
+                    repo.git.worktree("remove", "--force", worktree_dir)
+                except GitCommandError as e:
+                    logger.debug(f"Failed to remove worktree {worktree_dir}: {e}")
+                shutil.rmtree(temp_dir, ignore_errors=True)
+                repo.git.worktree("prune")
+
+
+_mirror_store: Optional[MirrorStore] = None
+_mirror_store_configured = False
+
+
+def get_mirror_store() -> Optional[MirrorStore]:
+    """
+    Get the process-wide mirror store.
+
+    Mirrors are kept under ``settings.repository_mirror_dir``; repositories
+    are cloned into temporary directories when it is unset.
+
+    Returns:
+        Optional[MirrorStore]: Global mirror store, or None if disabled
+    """
+    global _mirror_store, _mirror_store_configured
+    if not _mirror_store_configured:
+        from config.settings import settings
+
+        if settings.repository_mirror_dir:
+            _mirror_store = MirrorStore(
+                settings.repository_mirror_dir,
+                blob_cache_bytes=settings.repository_blob_cache_mb * 1024 * 1024
+            )
+        _mirror_store_configured = True
+    return _mirror_store
+
+
+def set_mirror_store(mirror_store: Optional[MirrorStore]) -> None:
+    """
+    Replace the process-wide mirror store.
+
+    Args:
+        mirror_store (Optional[MirrorStore]): Mirror store to use, None to clone into temporary directories
+    """
+    global _mirror_store, _mirror_store_configured
+    _mirror_store = mirror_store
+    _mirror_store_configured = True
@@ -0,0 +1,506 @@
+"""
+Pre-flight cost estimation for scans in AI Code Review System.
+
+This module predicts the wall time, CPU time and LLM tokens of a scan before
+it runs, from inputs that are cheap to collect:
+
+- file counts and bytes per language of the files the scan will analyze
+  (e.g. from a cached checkout of the repository),
+- the share of those files whose parse outputs are already memoized in the
+  content-addressed stage cache,
+- per-stage throughput measured in earlier scans' OTLP traces
+  (``settings.scan_trace_dir``), falling back to built-in rates.
+
+Estimates let the API reject or downscope scans that exceed the configured
+quotas and give the task queue a cost to schedule by.
+"""
+
+import json
+import logging
+import os
+import statistics
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Mapping, Optional, Tuple
+
+from .content_keys import worktree_blob_ids
+from .file_filters import HEADER_BYTES, RULE_FILES, FileFilter
+from .stage_cache import StageCache, content_hash, fingerprint
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+# Language per file extension, as detected by the AST parser (the parse stage
+# cache is keyed by this language)
+EXTENSION_LANGUAGES: Dict[str, str] = {
+    ".py": "python", ".pyx": "python", ".pyi": "python",
+    ".java": "java",
+    ".kt": "kotlin", ".kts": "kotlin",
+    ".xml": "xml",
+    ".js": "javascript", ".jsx": "javascript", ".ts": "javascript",
+    ".tsx": "javascript", ".mjs": "javascript", ".cjs": "javascript",
+    ".dart": "dart"
+}
+
+# Built-in per-file cost of each workflow node in milliseconds, used for
+# nodes without trace history
+DEFAULT_STAGE_COSTS: Dict[str, Dict[str, float]] = {
+    "fetch_code": {"wall_ms_per_file": 5.0, "cpu_ms_per_file": 1.0},
+    "parse_code": {"wall_ms_per_file": 8.0, "cpu_ms_per_file": 8.0},
+    "static_analysis": {"wall_ms_per_file": 4.0, "cpu_ms_per_file": 4.0},
+    "impact_analysis": {"wall_ms_per_file": 2.0, "cpu_ms_per_file": 2.0},
+    "risk_metrics": {"wall_ms_per_file": 2.0, "cpu_ms_per_file": 2.0},
+    "knowledge_base": {"wall_ms_per_file": 25.0, "cpu_ms_per_file": 20.0},
+    "diagram_extraction": {"wall_ms_per_file": 3.0, "cpu_ms_per_file": 3.0},
+    "project_scanning": {"wall_ms_per_file": 400.0, "cpu_ms_per_file": 5.0},
+    "llm_analysis": {"wall_ms_per_file": 1500.0, "cpu_ms_per_file": 5.0},
+    "reporting": {"wall_ms_per_file": 2.0, "cpu_ms_per_file": 2.0}
+}
+
+# Nodes that run concurrently after parsing (the orchestrator's ANALYSIS_BRANCHES)
+BRANCH_STAGES = ("static_analysis", "impact_analysis", "risk_metrics", "knowledge_base", "diagram_extraction")
+
+# Per-file nodes that overlap in streaming scans
+STREAMED_STAGES = ("fetch_code", "parse_code", "static_analysis", "llm_analysis")
+
+# Nodes whose per-file work is skipped for memoized files
+CACHED_STAGES = ("parse_code", "static_analysis")
+
+# Nodes that are skipped when every file is memoized (their cache key covers all files)
+WHOLE_SCAN_CACHED_STAGES = ("llm_analysis", "project_scanning")
+
+# Clone and workflow setup time independent of the number of files
+FIXED_OVERHEAD_SECONDS = 5.0
+
+# Token model for LLM review: code characters per token plus prompt and
+# completion tokens per reviewed file
+CHARS_PER_TOKEN = 4
+PROMPT_TOKENS_PER_FILE = 300
+COMPLETION_TOKENS_PER_FILE = 400
+
+# Estimates when nothing is known about the files to scan
+DEFAULT_ESTIMATED_SECONDS = {"pr": 300, "project": 900}
+
+# Number of most recent traces used for throughput history
+DEFAULT_HISTORY_TRACES = 50
+
+
+@dataclass
+class LanguageStats:
+    """
+    File count and size of one language in a repository.
+
+    Attributes:
+        files (int): Number of files
+        bytes (int): Total size of the files in bytes
+    """
+    files: int = 0
+    bytes: int = 0
+
+
+@dataclass
+class RepositoryProfile:
+    """
+    Files a scan will analyze, summarized for estimation.
+
+    Attributes:
+        languages (Dict[str, LanguageStats]): File counts and bytes per language
+        blobs (Dict[str, Tuple[str, str]]): Language and content key (git blob id)
+            per file path, used to predict stage cache hits
+    """
+    languages: Dict[str, LanguageStats] = field(default_factory=dict)
+    blobs: Dict[str, Tuple[str, str]] = field(default_factory=dict)
+
+    @property
+    def total_files(self) -> int:
+        """Number of files over all languages."""
+        return sum(stats.files for stats in self.languages.values())
+
+    @property
+    def total_bytes(self) -> int:
+        """Size of the files over all languages."""
+        return sum(stats.bytes for stats in self.languages.values())
+
+    def add_file(
+        self,
+        file_path: str,
+        content: Optional[str],
+        size: Optional[int] = None,
+        content_key: Optional[str] = None
+    ) -> bool:
+        """
+        Add a file if its language is supported.
+
+        Args:
+            file_path (str): Path relative to the repository root
+            content (Optional[str]): File contents, not needed if ``size`` and
+                ``content_key`` are given
+            size (Optional[int]): Size on disk (length of the contents if omitted)
+            content_key (Optional[str]): Git blob id of the file (hashed from the
+                contents if omitted)
+
+        Returns:
+            bool: True if the file was added
+        """
+        language = EXTENSION_LANGUAGES.get(os.path.splitext(file_path)[1].lower())
+        if language is None:
+            return False
+        stats = self.languages.setdefault(language, LanguageStats())
+        stats.files += 1
+        stats.bytes += len(content) if size is None else size
+        self.blobs[file_path] = (language, content_key or content_hash(content))
+        return True
+
+    @classmethod
+    def from_files(cls, code_files: Mapping[str, str]) -> "RepositoryProfile":
+        """
+        Profile files held in memory.
+
+        Args:
+            code_files (Mapping[str, str]): File contents by path
+
+        Returns:
+            RepositoryProfile: Profile of the supported files
+        """
+        profile = cls()
+        for file_path, content in code_files.items():
+            profile.add_file(file_path, content)
+        return profile
+
+    @classmethod
+    def from_directory(
+        cls,
+        root: str,
+        max_file_size_bytes: Optional[int] = None,
+        file_filter: Optional[FileFilter] = None
+    ) -> "RepositoryProfile":
+        """
+        Profile a checkout on disk, skipping the files the fetcher would.
+
+        Hidden directories, oversized files and, given a filter, ignored,
+        vendored and generated files are left out as in a scan. Files the
+        checkout's git index has a blob id for are not read in full; only
+        files without one (modified, or outside a git working tree) are hashed.
+
+        Args:
+            root (str): Repository checkout
+            max_file_size_bytes (Optional[int]): Files larger than this are not scanned
+            file_filter (Optional[FileFilter]): Exclusion rules of the scan; the
+                checkout's ``.gitignore`` and ``.gitattributes`` files are added to it
+
+        Returns:
+            RepositoryProfile: Profile of the supported files
+        """
+        profile = cls()
+        blob_ids = worktree_blob_ids(root)
+        for dirpath, dirs, files in os.walk(root):
+            dirs[:] = [d for d in dirs if not d.startswith(".")]
+            rel_dir = os.path.relpath(dirpath, root).replace(os.sep, "/")
+            rel_dir = "" if rel_dir == "." else rel_dir
+            if file_filter is not None:
+                for rule_file in RULE_FILES:
+                    if rule_file in files:
+                        rule_path = os.path.join(dirpath, rule_file)
+                        try:
+                            with open(rule_path, "r", encoding="utf-8", errors="ignore") as f:
+                                file_filter.add_rule_file(rel_dir, rule_file, f.read())
+                        except OSError:
+                            continue
+                dirs[:] = [
+                    d for d in dirs
+                    if file_filter.directory_reason(f"{rel_dir}/{d}" if rel_dir else d) is None
+                ]
+            for file_name in files:
+                if os.path.splitext(file_name)[1].lower() not in EXTENSION_LANGUAGES:
+                    continue
+                file_path = os.path.join(dirpath, file_name)
+                rel_path = f"{rel_dir}/{file_name}" if rel_dir else file_name
+                if file_filter is not None and file_filter.path_reason(rel_path) is not None:
+                    continue
+                try:
+                    size = os.path.getsize(file_path)
+                    if max_file_size_bytes is not None and size > max_file_size_bytes:
+                        continue
+                    content, head = None, ""
+                    if rel_path not in blob_ids:
+                        with open(file_path, "r", encoding="utf-8", errors="ignore") as f:
+                            content = f.read()
+                        head = content[:HEADER_BYTES]
+                    elif file_filter is not None:
+                        with open(file_path, "r", encoding="utf-8", errors="ignore") as f:
+                            head = f.read(HEADER_BYTES)
+                except OSError:
+                    continue
+                if file_filter is not None and file_filter.content_reason(rel_path, head) is not None:
+                    continue
+                profile.add_file(rel_path, content, size, blob_ids.get(rel_path))
+        return profile
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Summarize the profile without its per-file hashes."""
+        return {
+            "files": self.total_files,
+            "bytes": self.total_bytes,
+            "languages": {
+                language: {"files": stats.files, "bytes": stats.bytes}
+                for language, stats in sorted(self.languages.items())
+            }
+        }
+
+
+@dataclass
+class ScanEstimate:
+    """
+    Predicted cost of a scan.
+
+    Attributes:
+        wall_seconds (float): Predicted duration
+        cpu_seconds (float): Predicted CPU time over all threads
+        llm_tokens (int): Predicted prompt and completion tokens
+        files (int): Files the estimate is based on
+        bytes (int): Bytes the estimate is based on
+        cache_hit_ratio (float): Share of files with memoized parse outputs
+        stage_seconds (Dict[str, float]): Predicted wall time per workflow node
+        basis (str): "history" if trace history was used, "defaults" for
+            built-in rates, "unknown" if the files to scan were not known
+    """
+    wall_seconds: float
+    cpu_seconds: float
+    llm_tokens: int
+    files: int = 0
+    bytes: int = 0
+    cache_hit_ratio: float = 0.0
+    stage_seconds: Dict[str, float] = field(default_factory=dict)
+    basis: str = "defaults"
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Convert to a plain dictionary for API responses and task metadata."""
+        return {
+            "wall_seconds": round(self.wall_seconds, 1),
+            "cpu_seconds": round(self.cpu_seconds, 1),
+            "llm_tokens": self.llm_tokens,
+            "files": self.files,
+            "bytes": self.bytes,
+            "cache_hit_ratio": round(self.cache_hit_ratio, 3),
+            "stage_seconds": {stage: round(seconds, 2) for stage, seconds in self.stage_seconds.items()},
+            "basis": self.basis
+        }
+
+
+def predict_cache_hits(profile: RepositoryProfile, stage_cache: Optional[StageCache]) -> float:
+    """
+    Predict the share of files whose parse outputs are already memoized.
+
+    Parse outputs are keyed by content hash and language only, so the probe
+    is exact for the parse stage; static analysis is keyed by the same blobs
+    (plus path and rule set) and is assumed to hit for the same files.
+
+    Args:
+        profile (RepositoryProfile): Files to scan
+        stage_cache (Optional[StageCache]): Stage cache, None if memoization is disabled
+
+    Returns:
+        float: Hit ratio between 0.0 and 1.0
+    """
+    if stage_cache is None or not profile.blobs:
+        return 0.0
+    hits = sum(
+        1 for language, blob_hash in profile.blobs.values()
+        if stage_cache.contains("parse", fingerprint(blob_hash, language))
+    )
+    return hits / len(profile.blobs)
+
+
+def _otlp_value(attribute: Dict[str, Any]) -> Any:
+    """Decode the value of an OTLP/JSON attribute."""
+    value = attribute.get("value") or {}
+    if "intValue" in value:
+        return int(value["intValue"])
+    if "doubleValue" in value:
+        return float(value["doubleValue"])
+    return value.get("boolValue", value.get("stringValue"))
+
+
+def _trace_stage_rates(document: Dict[str, Any]) -> Dict[str, Tuple[float, float]]:
+    """Wall and CPU milliseconds per file of every node span in one OTLP trace."""
+    spans = [
+        span
+        for resource_spans in document.get("resourceSpans") or []
+        for scope_spans in resource_spans.get("scopeSpans") or []
+        for span in scope_spans.get("spans") or []
+    ]
+    attributes = {span["spanId"]: {a["key"]: _otlp_value(a) for a in span.get("attributes") or []} for span in spans}
+
+    # The scan's size is the largest file count any span recorded
+    files = max(
+        (value for attrs in attributes.values() for key, value in attrs.items()
+         if key in ("count.files", "count.project_code") and isinstance(value, int)),
+        default=0
+    )
+    if files <= 0:
+        return {}
+
+    roots = {span["spanId"] for span in spans if not span.get("parentSpanId")}
+    rates = {}
+    for span in spans:
+        name = span.get("name", "")
+        if span.get("parentSpanId") in roots and name.startswith("node."):
+            attrs = attributes[span["spanId"]]
+            rates[name[len("node."):]] = (
+                float(attrs.get("wall_ms", 0.0)) / files,
+                float(attrs.get("cpu_ms", 0.0)) / files
+            )
+    return rates
+
+
+def load_stage_throughput(trace_dir: Optional[str], max_traces: int = DEFAULT_HISTORY_TRACES) -> Dict[str, Dict[str, float]]:
+    """
+    Measure per-file throughput of every workflow node from exported scan traces.
+
+    Args:
+        trace_dir (Optional[str]): Directory of OTLP/JSON traces written by ``end_trace``
+        max_traces (int): Number of most recent traces to use
+
+    Returns:
+        Dict[str, Dict[str, float]]: Median ``wall_ms_per_file`` and
+            ``cpu_ms_per_file`` per node name (empty without history)
+    """
+    if not trace_dir or not os.path.isdir(trace_dir):
+        return {}
+
+    paths = [os.path.join(trace_dir, name) for name in os.listdir(trace_dir) if name.endswith(".json")]
+    paths.sort(key=lambda path: os.path.getmtime(path), reverse=True)
+
+    samples: Dict[str, List[Tuple[float, float]]] = {}
+    for path in paths[:max_traces]:
+        try:
+            with open(path, encoding="utf-8") as f:
+                document = json.load(f)
+        except (OSError, ValueError) as e:
+            logger.debug(f"Skipping unreadable trace {path}: {str(e)}")
+            continue
+        for stage, rate in _trace_stage_rates(document).items():
+            samples.setdefault(stage, []).append(rate)
+
+    return {
+        stage: {
+            "wall_ms_per_file": statistics.median(wall for wall, _ in rates),
+            "cpu_ms_per_file": statistics.median(cpu for _, cpu in rates)
+        }
+        for stage, rates in samples.items()
+    }
+
+
+class ScanEstimator:
+    """
+    Predicts scan cost from a repository profile, cache contents and history.
+
+    Stages run as in the workflow graph: fetching and parsing one after the
+    other, the analysis branches concurrently, then project scanning, LLM
+    review and reporting. In streaming scans the per-file stages overlap and
+    the slowest of them bounds the duration.
+    """
+
+    def __init__(
+        self,
+        stage_throughput: Optional[Dict[str, Dict[str, float]]] = None,
+        stage_cache: Optional[StageCache] = None
+    ):
+        """
+        Initialize the ScanEstimator.
+
+        Args:
+            stage_throughput (Optional[Dict[str, Dict[str, float]]]): Measured per-file
+                cost per node (see ``load_stage_throughput``)
+            stage_cache (Optional[StageCache]): Stage cache probed for memoized files
+        """
+        self.stage_throughput = dict(stage_throughput or {})
+        self.stage_cache = stage_cache
+
+    @classmethod
+    def from_settings(cls) -> "ScanEstimator":
+        """
+        Create an estimator from the configured trace directory and stage cache.
+
+        Returns:
+            ScanEstimator: Estimator using the local scan history
+        """
+        from config.settings import settings
+        from .stage_cache import get_stage_cache
+
+        return cls(load_stage_throughput(settings.scan_trace_dir), get_stage_cache())
+
+    def _stage_cost(self, stage: str) -> Dict[str, float]:
+        """Per-file cost of a node, measured if available."""
+        return self.stage_throughput.get(stage) or DEFAULT_STAGE_COSTS.get(stage) or {}
+
+    def estimate(
+        self,
+        profile: Optional[RepositoryProfile],
+        scan_type: str = "project",
+        streaming: bool = False
+    ) -> ScanEstimate:
+        """
+        Estimate the cost of scanning the profiled files.
+
+        Args:
+            profile (Optional[RepositoryProfile]): Files the scan will analyze,
+                None if they are not known before the scan
+            scan_type (str): "project" or "pr" (PR scans skip project scanning)
+            streaming (bool): Whether the scan streams files through the per-file stages
+
+        Returns:
+            ScanEstimate: Predicted wall time, CPU time and LLM tokens
+        """
+        if profile is None or profile.total_files == 0:
+            seconds = DEFAULT_ESTIMATED_SECONDS.get(scan_type, DEFAULT_ESTIMATED_SECONDS["project"])
+            return ScanEstimate(wall_seconds=float(seconds), cpu_seconds=float(seconds), llm_tokens=0, basis="unknown")
+
+        files = profile.total_files
+        hit_ratio = predict_cache_hits(profile, self.stage_cache)
+
+        stages = [stage for stage in DEFAULT_STAGE_COSTS if not (scan_type == "pr" and stage == "project_scanning")]
+
+        wall: Dict[str, float] = {}
+        cpu_seconds = 0.0
+        for stage in stages:
+            cost = self._stage_cost(stage)
+            scale = files
+            if stage in CACHED_STAGES:
+                scale = files * (1.0 - hit_ratio)
+            elif stage in WHOLE_SCAN_CACHED_STAGES and hit_ratio >= 1.0:
+                scale = 0
+            wall[stage] = cost.get("wall_ms_per_file", 0.0) * scale / 1000
+            cpu_seconds += cost.get("cpu_ms_per_file", 0.0) * scale / 1000
+
+        if streaming:
+            # Streamed scans record the overlapping stages as one stream_files node
+            streamed = self.stage_throughput.get("stream_files")
+            per_file = (
+                streamed["wall_ms_per_file"] * files / 1000 if streamed
+                else max(wall.get(stage, 0.0) for stage in STREAMED_STAGES)
+            )
+            rest = sum(seconds for stage, seconds in wall.items() if stage not in STREAMED_STAGES + BRANCH_STAGES)
+            branches = max((wall[stage] for stage in BRANCH_STAGES if stage in wall and stage not in STREAMED_STAGES), default=0.0)
+        else:
+            per_file = 0.0
+            rest = sum(seconds for stage, seconds in wall.items() if stage not in BRANCH_STAGES)
+            branches = max((wall[stage] for stage in BRANCH_STAGES if stage in wall), default=0.0)
+        wall_seconds = FIXED_OVERHEAD_SECONDS + per_file + rest + branches
+
+        llm_tokens = 0
+        if hit_ratio < 1.0:
+            llm_tokens = (
+                profile.total_bytes // CHARS_PER_TOKEN
+                + files * (PROMPT_TOKENS_PER_FILE + COMPLETION_TOKENS_PER_FILE)
+            )
+
+        return ScanEstimate(
+            wall_seconds=wall_seconds,
+            cpu_seconds=cpu_seconds,
+            llm_tokens=llm_tokens,
+            files=files,
+            bytes=profile.total_bytes,
+            cache_hit_ratio=hit_ratio,
+            stage_seconds=wall,
+            basis="history" if self.stage_throughput else "defaults"
+        )
@@ -0,0 +1,429 @@
+"""
+Per-stage memoization for the scan workflow.
+
+Workflow stages are memoized by a fingerprint of their inputs, so a scan only
+recomputes the stages whose inputs changed: changing the LLM model reuses the
+parsing and static analysis, and changing a static analysis rule reuses the
+parsing.
+
+Cached values are encoded with the checkpoint serializer and stored in a
+pluggable backend (in-process LRU or a local SQLite file). Every entry is
+tagged with the version of its stage; bumping a stage version makes its older
+entries unreachable and ``purge_stale`` removes them.
+"""
+
+import hashlib
+import inspect
+import logging
+import os
+import sqlite3
+import threading
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from collections.abc import Iterable, Mapping
+from functools import lru_cache
+from types import ModuleType
+from typing import Any, Dict, Optional, Tuple
+
+from .checkpointing import CheckpointSerializer
+from .content_keys import ContentKey
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS stage_cache (
+    stage TEXT NOT NULL,
+    key TEXT NOT NULL,
+    version TEXT NOT NULL,
+    type TEXT,
+    value BLOB,
+    PRIMARY KEY (stage, key)
+);
+"""
+
+
+def _feed(digest: Any, value: Any) -> None:
+    """Feed a value into a hash with type tags, so e.g. "1" and 1 differ."""
+    if value is None or isinstance(value, (bool, int, float)):
+        digest.update(f"{type(value).__name__}:{value!r};".encode("utf-8"))
+    elif isinstance(value, str):
+        data = value.encode("utf-8")
+        digest.update(f"str:{len(data)}:".encode("utf-8"))
+        digest.update(data)
+    elif isinstance(value, (bytes, bytearray, memoryview)):
+        data = bytes(value)
+        digest.update(f"bytes:{len(data)}:".encode("utf-8"))
+        digest.update(data)
+    elif isinstance(value, Mapping):
+        digest.update(f"map:{len(value)}:".encode("utf-8"))
+        for key in sorted(value, key=str):
+            _feed(digest, str(key))
+            _feed(digest, value[key])
+    elif isinstance(value, Iterable):
+        digest.update(b"seq:[")
+        for item in value:
+            _feed(digest, item)
+        digest.update(b"]")
+    else:
+        digest.update(f"repr:{value!r};".encode("utf-8"))
+
+
+def fingerprint(*parts: Any) -> str:
+    """
+    Hash stage inputs into a stable cache key.
+
+    Mappings (including content store handles) are hashed by their sorted
+    items and other iterables (including spilled findings streams) by their
+    items, so equal inputs give equal keys regardless of their container.
+
+    Args:
+        *parts: Stage inputs
+
+    Returns:
+        str: Hex SHA-256 digest of the inputs
+    """
+    digest = hashlib.sha256()
+    _feed(digest, parts)
+    return digest.hexdigest()
+
+
+def content_hash(content: str) -> str:
+    """
+    Hash file contents (the blob hash used to key per-file stages).
+
+    Files fetched from git already come with their key (see
+    ``content_keys``); this is only needed for contents without one.
+
+    Args:
+        content (str): File contents
+
+    Returns:
+        str: Git blob id of the UTF-8 encoded contents
+    """
+    return ContentKey.for_content(content)
+
+
+@lru_cache(maxsize=None)
+def source_fingerprint(module: ModuleType) -> str:
+    """
+    Fingerprint the source code of a module (e.g. a rule set).
+
+    Args:
+        module (ModuleType): Module whose behaviour determines a stage's output
+
+    Returns:
+        str: Hex SHA-256 digest of the module source
+    """
+    return hashlib.sha256(inspect.getsource(module).encode("utf-8")).hexdigest()
+
+
+class StageCacheBackend(ABC):
+    """Storage for encoded stage outputs, keyed by stage and input fingerprint."""
+
+    @abstractmethod
+    def get(self, stage: str, key: str, version: str) -> Optional[Tuple[str, bytes]]:
+        """
+        Get an encoded value.
+
+        Args:
+            stage (str): Stage name
+            key (str): Input fingerprint
+            version (str): Current version tag of the stage
+
+        Returns:
+            Optional[Tuple[str, bytes]]: Serializer type and payload, or None if
+                missing or stored under another version
+        """
+
+    @abstractmethod
+    def put(self, stage: str, key: str, version: str, value: Tuple[str, bytes]) -> None:
+        """
+        Store an encoded value, replacing any entry for the same stage and key.
+
+        Args:
+            stage (str): Stage name
+            key (str): Input fingerprint
+            version (str): Version tag of the stage
+            value (Tuple[str, bytes]): Serializer type and payload
+        """
+
+    @abstractmethod
+    def invalidate(self, stage: str, keep_version: Optional[str] = None) -> int:
+        """
+        Remove the entries of a stage.
+
+        Args:
+            stage (str): Stage name
+            keep_version (Optional[str]): Keep entries with this version tag
+
+        Returns:
+            int: Number of removed entries
+        """
+
+    def close(self) -> None:
+        """Release backend resources."""
+
+
+class MemoryStageCacheBackend(StageCacheBackend):
+    """In-process LRU backend, shared by all scans of one worker."""
+
+    def __init__(self, max_entries: int = 100000):
+        """
+        Initialize the in-memory backend.
+
+        Args:
+            max_entries (int): Maximum number of entries across all stages
+        """
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[Tuple[str, str], Tuple[str, Tuple[str, bytes]]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, stage: str, key: str, version: str) -> Optional[Tuple[str, bytes]]:
+        with self._lock:
+            entry = self._entries.get((stage, key))
+            if entry is None or entry[0] != version:
+                return None
+            self._entries.move_to_end((stage, key))
+            return entry[1]
+
+    def put(self, stage: str, key: str, version: str, value: Tuple[str, bytes]) -> None:
+        with self._lock:
+            self._entries[(stage, key)] = (version, value)
+            self._entries.move_to_end((stage, key))
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def invalidate(self, stage: str, keep_version: Optional[str] = None) -> int:
+        with self._lock:
+            stale = [
+                entry_key for entry_key, (version, _) in self._entries.items()
+                if entry_key[0] == stage and version != keep_version
+            ]
+            for entry_key in stale:
+                del self._entries[entry_key]
+        return len(stale)
+
+
+class SQLiteStageCacheBackend(StageCacheBackend):
+    """Local SQLite backend that keeps stage outputs across worker restarts."""
+
+    def __init__(self, db_path: str = ":memory:"):
+        """
+        Initialize the SQLite backend.
+
+        Args:
+            db_path (str): Path to the SQLite database file (":memory:" for tests)
+        """
+        self.db_path = db_path
+
+        if db_path != ":memory:":
+            os.makedirs(os.path.dirname(os.path.abspath(db_path)), exist_ok=True)
+
+        # Stages run in worker threads, so share one connection under a lock
+        self._conn = sqlite3.connect(db_path, check_same_thread=False)
+        self._conn.executescript(_SCHEMA)
+        self._lock = threading.Lock()
+
+    def get(self, stage: str, key: str, version: str) -> Optional[Tuple[str, bytes]]:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT type, value FROM stage_cache WHERE stage = ? AND key = ? AND version = ?",
+                (stage, key, version)
+            ).fetchone()
+        return (row[0], row[1]) if row else None
+
+    def put(self, stage: str, key: str, version: str, value: Tuple[str, bytes]) -> None:
+        type_, payload = value
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO stage_cache (stage, key, version, type, value) VALUES (?, ?, ?, ?, ?)",
+                (stage, key, version, type_, payload)
+            )
+
+    def invalidate(self, stage: str, keep_version: Optional[str] = None) -> int:
+        with self._lock, self._conn:
+            cursor = self._conn.execute(
+                "DELETE FROM stage_cache WHERE stage = ? AND version IS NOT ?",
+                (stage, keep_version)
+            )
+        return cursor.rowcount
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+
+class StageCache:
+    """
+    Memoizes workflow stage outputs by a fingerprint of their inputs.
+
+    Values must be serializable by the checkpoint serializer; live tree-sitter
+    trees are dropped like they are from checkpoints.
+    """
+
+    def __init__(self, backend: StageCacheBackend, versions: Optional[Dict[str, str]] = None):
+        """
+        Initialize the stage cache.
+
+        Args:
+            backend (StageCacheBackend): Storage for the encoded outputs
+            versions (Optional[Dict[str, str]]): Version tag per stage (default "1")
+        """
+        self.backend = backend
+        self.versions = dict(versions or {})
+        self.serde = CheckpointSerializer()
+        self.hits: Dict[str, int] = {}
+        self.misses: Dict[str, int] = {}
+        self._lock = threading.Lock()
+
+    def version(self, stage: str) -> str:
+        """Get the current version tag of a stage."""
+        return self.versions.get(stage, "1")
+
+    def get(self, stage: str, key: str) -> Optional[Any]:
+        """
+        Get a memoized stage output.
+
+        Args:
+            stage (str): Stage name
+            key (str): Input fingerprint
+
+        Returns:
+            Optional[Any]: The decoded output, or None on a miss
+        """
+        try:
+            encoded = self.backend.get(stage, key, self.version(stage))
+            value = self.serde.loads_typed(encoded) if encoded is not None else None
+        except Exception as e:
+            logger.warning(f"Stage cache read failed for {stage}: {str(e)}")
+            value = None
+
+        with self._lock:
+            counter = self.misses if value is None else self.hits
+            counter[stage] = counter.get(stage, 0) + 1
+        return value
+
+    def contains(self, stage: str, key: str) -> bool:
+        """
+        Check for a memoized stage output without decoding it or counting a hit.
+
+        Args:
+            stage (str): Stage name
+            key (str): Input fingerprint
+
+        Returns:
+            bool: True if an output of the current stage version is stored
+        """
+        try:
+            return self.backend.get(stage, key, self.version(stage)) is not None
+        except Exception as e:
+            logger.warning(f"Stage cache read failed for {stage}: {str(e)}")
+            return False
+
+    def put(self, stage: str, key: str, value: Any) -> None:
+        """
+        Memoize a stage output (None is not cached).
+
+        Args:
+            stage (str): Stage name
+            key (str): Input fingerprint
+            value (Any): Stage output
+        """
+        if value is None:
+            return
+        try:
+            self.backend.put(stage, key, self.version(stage), self.serde.dumps_typed(value))
+        except Exception as e:
+            # Memoization is an optimization; a failed write must not fail the scan
+            logger.warning(f"Stage cache write failed for {stage}: {str(e)}")
+
+    def set_version(self, stage: str, version: str) -> None:
+        """
+        Change the version tag of a stage, invalidating its earlier outputs.
+
+        Args:
+            stage (str): Stage name
+            version (str): New version tag
+        """
+        self.versions[stage] = version
+
+    def invalidate(self, stage: str) -> int:
+        """
+        Remove all memoized outputs of a stage.
+
+        Args:
+            stage (str): Stage name
+
+        Returns:
+            int: Number of removed entries
+        """
+        return self.backend.invalidate(stage)
+
+    def purge_stale(self) -> int:
+        """
+        Remove outputs stored under older version tags of the known stages.
+
+        Returns:
+            int: Number of removed entries
+        """
+        return sum(self.backend.invalidate(stage, keep_version=version) for stage, version in self.versions.items())
+
+    def stats(self) -> Dict[str, Dict[str, int]]:
+        """
+        Get hit and miss counts per stage.
+
+        Returns:
+            Dict[str, Dict[str, int]]: Stage name to ``{"hits": n, "misses": n}``
+        """
+        with self._lock:
+            return {
+                stage: {"hits": self.hits.get(stage, 0), "misses": self.misses.get(stage, 0)}
+                for stage in sorted(set(self.hits) | set(self.misses))
+            }
+
+    def close(self) -> None:
+        """Close the backend."""
+        self.backend.close()
+
+
+# Global stage cache instance
+_stage_cache: Optional[StageCache] = None
+_stage_cache_configured = False
+
+
+def get_stage_cache() -> Optional[StageCache]:
+    """
+    Get the process-wide stage cache.
+
+    The backend is chosen by ``settings.scan_stage_cache`` ("memory" or
+    "sqlite"); memoization is disabled when it is unset.
+
+    Returns:
+        Optional[StageCache]: Global stage cache, or None if disabled
+    """
+    global _stage_cache, _stage_cache_configured
+    if not _stage_cache_configured:
+        from config.settings import settings
+        from .orchestrator import STAGE_VERSIONS
+
+        if settings.scan_stage_cache == "memory":
+            _stage_cache = StageCache(MemoryStageCacheBackend(), STAGE_VERSIONS)
+        elif settings.scan_stage_cache == "sqlite":
+            _stage_cache = StageCache(SQLiteStageCacheBackend(settings.scan_stage_cache_path), STAGE_VERSIONS)
+        elif settings.scan_stage_cache:
+            logger.warning(f"Unknown stage cache backend {settings.scan_stage_cache!r}, memoization disabled")
+        _stage_cache_configured = True
+    return _stage_cache
+
+
+def set_stage_cache(stage_cache: Optional[StageCache]) -> None:
+    """
+    Replace the process-wide stage cache (e.g. with a custom backend).
+
+    Args:
+        stage_cache (Optional[StageCache]): Stage cache to use, None to disable memoization
+    """
+    global _stage_cache, _stage_cache_configured
+    _stage_cache = stage_cache
+    _stage_cache_configured = True
@@ -0,0 +1,294 @@
+"""
+Streaming per-file pipeline for AI Code Review System.
+
+This module implements a small staged pipeline in which items (files) flow
+through a chain of stages connected by bounded queues. Every stage has its
+own pool of worker threads, so a file can be statically analyzed while later
+files are still being fetched or parsed. A full queue blocks the stage that
+feeds it, which bounds the number of files in flight (and with it memory) by
+the queue sizes rather than by the size of the repository.
+
+The pipeline is deliberately generic; the scan-specific stages (parse, static
+analysis and per-file LLM review) are defined by ``stream_files_node`` in the
+orchestrator.
+"""
+
+import contextvars
+import logging
+import queue
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+# Items buffered between two stages before the upstream stage blocks
+DEFAULT_QUEUE_SIZE = 64
+
+# Seconds between checks for cancellation while blocked on a queue
+_POLL_INTERVAL = 0.1
+
+# End-of-stream marker passed down the queues
+_DONE = object()
+
+
+@dataclass
+class PipelineStage:
+    """
+    A stage of the streaming pipeline.
+
+    Attributes:
+        name (str): Stage name used in logs and statistics
+        process (Callable[[int, Any], Optional[Any]]): Called with the worker index
+            and an item; returns the item for the next stage, or None to drop it
+        workers (int): Number of worker threads running the stage
+    """
+    name: str
+    process: Callable[[int, Any], Optional[Any]]
+    workers: int = 1
+
+
+@dataclass
+class StageStats:
+    """
+    Counters of a single pipeline stage.
+
+    Attributes:
+        processed (int): Items passed on to the next stage
+        dropped (int): Items the stage filtered out
+        errors (int): Items dropped because the stage raised
+        busy_ms (float): Total time the stage's workers spent processing items
+    """
+    processed: int = 0
+    dropped: int = 0
+    errors: int = 0
+    busy_ms: float = 0.0
+    _lock: threading.Lock = field(default_factory=threading.Lock, repr=False)
+
+    def record(self, outcome: str, elapsed_ms: float) -> None:
+        """Count one processed item and the time it took."""
+        with self._lock:
+            setattr(self, outcome, getattr(self, outcome) + 1)
+            self.busy_ms += elapsed_ms
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Get the counters as a plain dictionary."""
+        return {
+            "processed": self.processed,
+            "dropped": self.dropped,
+            "errors": self.errors,
+            "busy_ms": round(self.busy_ms, 3)
+        }
+
+
+class StreamingPipeline:
+    """
+    Chain of stages with bounded queues and per-stage worker pools.
+
+    ``run`` feeds the source from a background thread and yields finished
+    items to the caller as soon as they leave the last stage. Items may
+    finish out of order. Worker threads run in a copy of the caller's
+    context, so tracing spans opened by stages nest under the caller's span.
+    """
+
+    def __init__(
+        self,
+        stages: List[PipelineStage],
+        queue_size: int = DEFAULT_QUEUE_SIZE,
+        is_cancelled: Optional[Callable[[], bool]] = None
+    ):
+        """
+        Initialize the StreamingPipeline.
+
+        Args:
+            stages (List[PipelineStage]): Stages in execution order
+            queue_size (int): Capacity of each queue between stages
+            is_cancelled (Optional[Callable[[], bool]]): Polled while waiting and
+                between items; the run stops early once it returns True
+        """
+        if not stages:
+            raise ValueError("A streaming pipeline needs at least one stage")
+
+        self.stages = stages
+        self.queue_size = max(1, queue_size)
+        self.is_cancelled = is_cancelled
+        self.stats: Dict[str, StageStats] = {stage.name: StageStats() for stage in stages}
+        self.source_items = 0
+        self.first_result_ms: Optional[float] = None
+        self.total_ms: Optional[float] = None
+
+    def run(self, source: Iterable[Any]) -> Iterator[Any]:
+        """
+        Stream items from the source through all stages.
+
+        Closing the returned iterator early cancels the remaining work, as
+        does ``is_cancelled`` returning True. A stage raising something other
+        than an Exception (e.g. a scan cancellation) aborts the run and the
+        error is re-raised here.
+
+        Args:
+            source (Iterable[Any]): Items to process; consumed lazily, so it can
+                be a generator that produces files while they are fetched
+
+        Yields:
+            Any: Items that passed every stage
+
+        Raises:
+            BaseException: Re-raises an error raised by the source, or an abort raised by a stage
+        """
+        queues = [queue.Queue(maxsize=self.queue_size) for _ in range(len(self.stages) + 1)]
+        stop = threading.Event()
+        errors: List[BaseException] = []
+        started = time.perf_counter()
+        threads = [self._start_thread(self._feed, source, queues[0], stop, errors, name="stream-source")]
+
+        for index, stage in enumerate(self.stages):
+            remaining = [max(1, stage.workers)]
+            remaining_lock = threading.Lock()
+            for worker_index in range(remaining[0]):
+                threads.append(self._start_thread(
+                    self._work, stage, worker_index, queues[index], queues[index + 1],
+                    stop, errors, remaining, remaining_lock,
+                    name=f"stream-{stage.name}-{worker_index}"
+                ))
+
+        try:
+            while True:
+                item = self._get(queues[-1], stop)
+                if item is _DONE:
+                    break
+                if self.first_result_ms is None:
+                    self.first_result_ms = (time.perf_counter() - started) * 1000
+                yield item
+        finally:
+            stop.set()
+            for thread in threads:
+                thread.join()
+            self.total_ms = (time.perf_counter() - started) * 1000
+
+        if errors:
+            raise errors[0]
+
+    def summary(self) -> Dict[str, Any]:
+        """
+        Get per-stage counters and timings of the last run.
+
+        Returns:
+            Dict[str, Any]: Source item count, time to the first result, total
+                time and the counters of every stage
+        """
+        return {
+            "source_items": self.source_items,
+            "first_result_ms": round(self.first_result_ms, 3) if self.first_result_ms is not None else None,
+            "total_ms": round(self.total_ms, 3) if self.total_ms is not None else None,
+            "stages": {name: stats.to_dict() for name, stats in self.stats.items()}
+        }
+
+    @staticmethod
+    def _start_thread(target: Callable[..., None], *args: Any, name: str) -> threading.Thread:
+        """Start a daemon thread running ``target`` in a copy of the current context."""
+        context = contextvars.copy_context()
+        thread = threading.Thread(target=context.run, args=(target, *args), name=name, daemon=True)
+        thread.start()
+        return thread
+
+    def _stopped(self, stop: threading.Event) -> bool:
+        """Whether the run was stopped, stopping it if the caller cancelled it."""
+        if not stop.is_set() and self.is_cancelled is not None and self.is_cancelled():
+            stop.set()
+        return stop.is_set()
+
+    def _put(self, q: "queue.Queue[Any]", item: Any, stop: threading.Event) -> bool:
+        """Put an item, blocking while the queue is full; False if cancelled."""
+        while not self._stopped(stop):
+            try:
+                q.put(item, timeout=_POLL_INTERVAL)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def _get(self, q: "queue.Queue[Any]", stop: threading.Event) -> Any:
+        """Get an item, blocking while the queue is empty; ``_DONE`` if cancelled."""
+        while not self._stopped(stop):
+            try:
+                return q.get(timeout=_POLL_INTERVAL)
+            except queue.Empty:
+                continue
+        return _DONE
+
+    def _feed(
+        self,
+        source: Iterable[Any],
+        output: "queue.Queue[Any]",
+        stop: threading.Event,
+        errors: List[BaseException]
+    ) -> None:
+        """Push source items into the first queue, then the end marker."""
+        try:
+            for item in source:
+                if not self._put(output, item, stop):
+                    return
+                self.source_items += 1
+        except Exception as e:
+            logger.error(f"Streaming pipeline source failed: {str(e)}")
+            errors.append(e)
+        except BaseException as e:
+            logger.warning(f"Streaming pipeline source aborted the pipeline: {str(e)}")
+            errors.append(e)
+            stop.set()
+            return
+        finally:
+            close = getattr(source, "close", None)
+            if stop.is_set() and callable(close):
+                close()
+        self._put(output, _DONE, stop)
+
+    def _work(
+        self,
+        stage: PipelineStage,
+        worker_index: int,
+        input_queue: "queue.Queue[Any]",
+        output_queue: "queue.Queue[Any]",
+        stop: threading.Event,
+        errors: List[BaseException],
+        remaining: List[int],
+        remaining_lock: threading.Lock
+    ) -> None:
+        """Run one worker of a stage until the end marker arrives."""
+        stats = self.stats[stage.name]
+        while True:
+            item = self._get(input_queue, stop)
+            if item is _DONE:
+                break
+
+            started = time.perf_counter()
+            try:
+                result = stage.process(worker_index, item)
+                outcome = "processed" if result is not None else "dropped"
+            except Exception as e:
+                logger.error(f"Streaming stage {stage.name} failed on an item: {str(e)}")
+                result = None
+                outcome = "errors"
+            except BaseException as e:
+                logger.warning(f"Streaming stage {stage.name} aborted the pipeline: {str(e)}")
+                errors.append(e)
+                stop.set()
+                return
+            stats.record(outcome, (time.perf_counter() - started) * 1000)
+
+            if result is not None and not self._put(output_queue, result, stop):
+                return
+
+        if stop.is_set():
+            return
+
+        # Let sibling workers see the end marker; the last one forwards it
+        self._put(input_queue, _DONE, stop)
+        with remaining_lock:
+            remaining[0] -= 1
+            last = remaining[0] == 0
+        if last:
+            self._put(output_queue, _DONE, stop)
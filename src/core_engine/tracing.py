@@ -0,0 +1,409 @@
+"""
+Lightweight tracing for scan workflows in AI Code Review System.
+
+This module records a tree of timed spans for every scan: one span per
+LangGraph node plus spans around the major agent calls (cloning, parsing,
+static rules, LLM calls, reporting). Each span records wall time, CPU time of
+the thread that ran it, the growth of the process' peak RSS while it was open
+and item counts. The span tree is attached to the report metadata and can be
+exported as OTLP-compatible JSON for offline capacity planning.
+
+Spans nest through a context variable, so agent calls made inside a node are
+children of that node's span. LangGraph copies the context into its worker
+threads, which keeps parallel branches attributed to the right parent.
+"""
+
+import contextvars
+import json
+import logging
+import os
+import secrets
+import threading
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterator, List, Optional
+
+try:
+    import resource
+except ImportError:  # pragma: no cover - not available on Windows
+    resource = None
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+# Instrumentation scope reported in OTLP exports
+INSTRUMENTATION_SCOPE = "aicode-reviewer.scan"
+
+STATUS_OK = "ok"
+STATUS_ERROR = "error"
+
+# OTLP status codes
+_OTLP_STATUS_CODES = {STATUS_OK: 1, STATUS_ERROR: 2}
+
+_current_span: contextvars.ContextVar[Optional["Span"]] = contextvars.ContextVar(
+    "aicode_current_span", default=None
+)
+
+
+def _peak_rss_bytes() -> int:
+    """Peak resident set size of this process in bytes (0 if unavailable)."""
+    if resource is None:
+        return 0
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is reported in bytes on macOS and in kilobytes elsewhere
+    return peak if os.uname().sysname == "Darwin" else peak * 1024
+
+
+@dataclass
+class Span:
+    """
+    A single timed operation in a scan.
+
+    Attributes:
+        name (str): Operation name, e.g. "node.parse_code" or "llm.analyze_pr_diff"
+        trace_id (str): 32 hex character trace ID shared by all spans of a scan
+        span_id (str): 16 hex character span ID
+        parent_id (Optional[str]): Span ID of the parent span
+        start_time_ns (int): Start time in Unix nanoseconds
+        end_time_ns (Optional[int]): End time in Unix nanoseconds, None while open
+        wall_ms (float): Elapsed wall-clock time in milliseconds
+        cpu_ms (float): CPU time of the thread that ran the span in milliseconds
+        peak_rss_delta_bytes (int): Growth of the process' peak RSS during the span
+        counts (Dict[str, int]): Item counts, e.g. files parsed or findings produced
+        attributes (Dict[str, Any]): Additional scalar attributes
+        status (str): "ok" or "error"
+        error (Optional[str]): Error message when the span failed
+    """
+    name: str
+    trace_id: str
+    span_id: str = field(default_factory=lambda: secrets.token_hex(8))
+    parent_id: Optional[str] = None
+    start_time_ns: int = field(default_factory=time.time_ns)
+    end_time_ns: Optional[int] = None
+    wall_ms: float = 0.0
+    cpu_ms: float = 0.0
+    peak_rss_delta_bytes: int = 0
+    counts: Dict[str, int] = field(default_factory=dict)
+    attributes: Dict[str, Any] = field(default_factory=dict)
+    status: str = STATUS_OK
+    error: Optional[str] = None
+
+    def __post_init__(self):
+        self._wall_start = time.perf_counter()
+        self._cpu_start = time.thread_time()
+        self._rss_start = _peak_rss_bytes()
+
+    @property
+    def is_open(self) -> bool:
+        """Whether the span has not ended yet."""
+        return self.end_time_ns is None
+
+    def set_count(self, key: str, value: int) -> None:
+        """Record an item count."""
+        self.counts[key] = int(value)
+
+    def add_count(self, key: str, value: int = 1) -> None:
+        """Increase an item count."""
+        self.counts[key] = self.counts.get(key, 0) + int(value)
+
+    def set_attribute(self, key: str, value: Any) -> None:
+        """Record a scalar attribute."""
+        self.attributes[key] = value
+
+    def record_error(self, error: Any) -> None:
+        """Mark the span as failed."""
+        self.status = STATUS_ERROR
+        self.error = str(error)
+
+    def end(self) -> None:
+        """Stop the span's clocks. Ending a span twice has no effect."""
+        if not self.is_open:
+            return
+        self.wall_ms = (time.perf_counter() - self._wall_start) * 1000
+        self.cpu_ms = (time.thread_time() - self._cpu_start) * 1000
+        self.peak_rss_delta_bytes = max(0, _peak_rss_bytes() - self._rss_start)
+        self.end_time_ns = time.time_ns()
+
+    def elapsed_ms(self) -> float:
+        """Wall time so far for open spans, total wall time for ended ones."""
+        if self.is_open:
+            return (time.perf_counter() - self._wall_start) * 1000
+        return self.wall_ms
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Convert to a plain dictionary for reports."""
+        return {
+            "name": self.name,
+            "span_id": self.span_id,
+            "wall_ms": round(self.elapsed_ms(), 3),
+            "cpu_ms": round(self.cpu_ms, 3),
+            "peak_rss_delta_bytes": self.peak_rss_delta_bytes,
+            "counts": dict(self.counts),
+            "attributes": dict(self.attributes),
+            "status": self.status,
+            "error": self.error,
+            "in_progress": self.is_open
+        }
+
+    def to_otlp(self) -> Dict[str, Any]:
+        """Convert to an OTLP/JSON span."""
+        attributes = {
+            "wall_ms": round(self.elapsed_ms(), 3),
+            "cpu_ms": round(self.cpu_ms, 3),
+            "memory.peak_rss_delta_bytes": self.peak_rss_delta_bytes,
+            **{f"count.{key}": value for key, value in self.counts.items()},
+            **self.attributes
+        }
+        otlp_span = {
+            "traceId": self.trace_id,
+            "spanId": self.span_id,
+            "name": self.name,
+            "kind": 1,
+            "startTimeUnixNano": str(self.start_time_ns),
+            "endTimeUnixNano": str(self.end_time_ns or time.time_ns()),
+            "attributes": [_otlp_attribute(key, value) for key, value in attributes.items()],
+            "status": {"code": _OTLP_STATUS_CODES[self.status]}
+        }
+        if self.parent_id:
+            otlp_span["parentSpanId"] = self.parent_id
+        if self.error:
+            otlp_span["status"]["message"] = self.error
+        return otlp_span
+
+
+def _otlp_attribute(key: str, value: Any) -> Dict[str, Any]:
+    """Encode one attribute as an OTLP/JSON key-value pair."""
+    if isinstance(value, bool):
+        encoded = {"boolValue": value}
+    elif isinstance(value, int):
+        encoded = {"intValue": str(value)}
+    elif isinstance(value, float):
+        encoded = {"doubleValue": value}
+    else:
+        encoded = {"stringValue": str(value)}
+    return {"key": key, "value": encoded}
+
+
+class ScanTracer:
+    """
+    Collects the spans of one scan.
+
+    The tracer owns a root span for the whole scan; spans opened without an
+    active parent become its children.
+    """
+
+    def __init__(self, trace_id: Optional[str] = None, service_name: str = "aicode-reviewer"):
+        """
+        Initialize the ScanTracer.
+
+        Args:
+            trace_id (Optional[str]): 32 hex character trace ID; generated if omitted
+            service_name (str): Service name reported in OTLP exports
+        """
+        self.trace_id = trace_id or secrets.token_hex(16)
+        self.service_name = service_name
+        self._lock = threading.Lock()
+        self.root = Span(name="scan", trace_id=self.trace_id)
+        self._spans: List[Span] = [self.root]
+
+    @property
+    def spans(self) -> List[Span]:
+        """All spans recorded so far, in start order."""
+        with self._lock:
+            return list(self._spans)
+
+    @contextmanager
+    def span(self, name: str, **attributes: Any) -> Iterator[Span]:
+        """
+        Record a span around a block of code.
+
+        Args:
+            name (str): Operation name
+            **attributes: Scalar attributes to attach
+
+        Yields:
+            Span: The open span, for recording counts and attributes
+        """
+        parent = _current_span.get()
+        if parent is None or parent.trace_id != self.trace_id:
+            parent = self.root
+
+        span = Span(name=name, trace_id=self.trace_id, parent_id=parent.span_id, attributes=attributes)
+        with self._lock:
+            self._spans.append(span)
+
+        token = _current_span.set(span)
+        try:
+            yield span
+        except BaseException as e:
+            span.record_error(e)
+            raise
+        finally:
+            span.end()
+            _current_span.reset(token)
+
+    def finish(self) -> None:
+        """End the root span."""
+        self.root.end()
+
+    def span_tree(self) -> Dict[str, Any]:
+        """
+        Build the nested span tree rooted at the scan span.
+
+        Returns:
+            Dict[str, Any]: Root span dictionary with nested ``children``
+        """
+        spans = self.spans
+        nodes = {span.span_id: {**span.to_dict(), "children": []} for span in spans}
+        for span in spans:
+            if span.parent_id in nodes:
+                nodes[span.parent_id]["children"].append(nodes[span.span_id])
+        return nodes[self.root.span_id]
+
+    def timing_breakdown(self) -> Dict[str, float]:
+        """
+        Total wall time per direct child of the scan span (i.e. per workflow node).
+
+        Returns:
+            Dict[str, float]: Milliseconds per span name
+        """
+        breakdown: Dict[str, float] = {}
+        for span in self.spans:
+            if span.parent_id == self.root.span_id:
+                breakdown[span.name] = round(breakdown.get(span.name, 0.0) + span.elapsed_ms(), 3)
+        return breakdown
+
+    def summary(self) -> Dict[str, Any]:
+        """
+        Summarize the trace for report metadata.
+
+        Returns:
+            Dict[str, Any]: Trace ID, total time, per-node breakdown and span tree
+        """
+        return {
+            "trace_id": self.trace_id,
+            "total_wall_ms": round(self.root.elapsed_ms(), 3),
+            "timing_breakdown": self.timing_breakdown(),
+            "spans": self.span_tree()
+        }
+
+    def to_otlp(self) -> Dict[str, Any]:
+        """
+        Export all spans as an OTLP/JSON ``ExportTraceServiceRequest``.
+
+        Returns:
+            Dict[str, Any]: OTLP/JSON document
+        """
+        return {
+            "resourceSpans": [{
+                "resource": {"attributes": [_otlp_attribute("service.name", self.service_name)]},
+                "scopeSpans": [{
+                    "scope": {"name": INSTRUMENTATION_SCOPE},
+                    "spans": [span.to_otlp() for span in self.spans]
+                }]
+            }]
+        }
+
+    def export_otlp_json(self, directory: str) -> str:
+        """
+        Write the trace to ``<directory>/<trace_id>.json``.
+
+        Args:
+            directory (str): Output directory, created if missing
+
+        Returns:
+            str: Path of the written file
+        """
+        os.makedirs(directory, exist_ok=True)
+        path = os.path.join(directory, f"{self.trace_id}.json")
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(self.to_otlp(), f, indent=2)
+        logger.info(f"Exported scan trace to {path}")
+        return path
+
+
+# Active tracers by trace ID, shared by all nodes of a scan in this process
+_tracers: Dict[str, ScanTracer] = {}
+_tracers_lock = threading.Lock()
+
+
+def start_trace(trace_id: Optional[str] = None) -> ScanTracer:
+    """
+    Get the tracer for a scan, creating it if needed.
+
+    Args:
+        trace_id (Optional[str]): Trace ID stored in the scan state; a new trace is
+            started if omitted
+
+    Returns:
+        ScanTracer: The tracer for the scan
+    """
+    with _tracers_lock:
+        if trace_id is not None and trace_id in _tracers:
+            return _tracers[trace_id]
+        tracer = ScanTracer(trace_id)
+        _tracers[tracer.trace_id] = tracer
+        return tracer
+
+
+def get_tracer(trace_id: Optional[str]) -> Optional[ScanTracer]:
+    """Get the active tracer for a trace ID, if any."""
+    if trace_id is None:
+        return None
+    with _tracers_lock:
+        return _tracers.get(trace_id)
+
+
+def end_trace(trace_id: str, export_dir: Optional[str] = None) -> Optional[ScanTracer]:
+    """
+    Finish a scan's trace, optionally export it, and release the tracer.
+
+    Args:
+        trace_id (str): Trace ID of the scan
+        export_dir (Optional[str]): Directory for the OTLP/JSON export
+
+    Returns:
+        Optional[ScanTracer]: The finished tracer, or None if it was not active
+    """
+    with _tracers_lock:
+        tracer = _tracers.pop(trace_id, None)
+    if tracer is None:
+        return None
+
+    tracer.finish()
+    if export_dir:
+        try:
+            tracer.export_otlp_json(export_dir)
+        except OSError as e:
+            logger.warning(f"Could not export scan trace {trace_id}: {str(e)}")
+    return tracer
+
+
+@contextmanager
+def trace_span(name: str, **attributes: Any) -> Iterator[Span]:
+    """
+    Record a span under the currently active span.
+
+    Outside a traced scan the span is still timed but not recorded anywhere,
+    so agent code can be instrumented unconditionally.
+
+    Args:
+        name (str): Operation name
+        **attributes: Scalar attributes to attach
+
+    Yields:
+        Span: The open span
+    """
+    parent = _current_span.get()
+    tracer = get_tracer(parent.trace_id) if parent is not None else None
+    if tracer is None:
+        span = Span(name=name, trace_id="0" * 32, attributes=attributes)
+        try:
+            yield span
+        finally:
+            span.end()
+        return
+
+    with tracer.span(name, **attributes) as span:
+        yield span
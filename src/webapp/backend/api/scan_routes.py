@@ -9,12 +9,15 @@ and retrieving detailed scan reports.
 import logging
 from typing import Optional
 from fastapi import APIRouter, HTTPException, Depends, status
+from fastapi.encoders import jsonable_encoder
 from fastapi.responses import JSONResponse
 
 from ..models.scan_models import (
-    ReportDetail, ScanRequest, ScanResponse, ScanListItem, ScanStatus, ScanInitiateResponse
+    ReportDetail, ScanRequest, ScanResponse, ScanListItem, ScanStatus, ScanInitiateResponse,
+    BatchScanRequest, BatchScanResponse
 )
-from ..services.scan_service import ScanService
+from ..services.batch_scan_service import BatchScanService, get_batch_scan_service
+from ..services.scan_service import ScanQuotaExceeded, ScanService
 
 # Configure logging
 logger = logging.getLogger(__name__)
@@ -111,7 +114,8 @@ async def initiate_scan(
         ScanInitiateResponse: Response with scan ID, job ID, and initial status
         
     Raises:
-        HTTPException: 400 for validation errors, 500 for internal errors
+        HTTPException: 400 for validation errors, 422 if the scan's estimated
+            cost exceeds the quotas, 500 for internal errors
     """
     logger.info(f"POST /scans/initiate - Initiating scan for {scan_request.repo_url}")
     
@@ -143,6 +147,11 @@ async def initiate_scan(
     except HTTPException:
         # Re-raise HTTP exceptions as-is
         raise
+    except ScanQuotaExceeded as e:
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            detail={"message": str(e), "estimate": e.estimate.to_dict()}
+        )
     except Exception as e:
         logger.error(f"Error initiating scan for {scan_request.repo_url}: {str(e)}")
         raise HTTPException(
@@ -266,6 +275,170 @@ async def get_job_status(
         )
 
 
+@router.post("/jobs/{job_id}/retry")
+async def retry_job(
+    job_id: str,
+    scan_service: ScanService = Depends(get_scan_service)
+) -> JSONResponse:
+    """
+    Retry a failed or cancelled scan job.
+    
+    The scan resumes from its last completed stage, so stages that already
+    succeeded (e.g. cloning and parsing) are not run again.
+    
+    Args:
+        job_id (str): Unique identifier for the background job
+        scan_service (ScanService): Injected scan service dependency
+        
+    Returns:
+        JSONResponse: Confirmation that the job was restarted
+    """
+    logger.info(f"POST /scans/jobs/{job_id}/retry - Retrying job")
+    
+    try:
+        if not await scan_service.retry_task(job_id):
+            raise HTTPException(
+                status_code=status.HTTP_409_CONFLICT,
+                detail=f"Job {job_id} does not exist or has not failed"
+            )
+        
+        return JSONResponse(content={
+            "message": f"Job {job_id} restarted",
+            "job_id": job_id
+        })
+        
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Error retrying job {job_id}: {str(e)}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Internal server error while retrying job"
+        )
+
+
+@router.post("/batch", response_model=BatchScanResponse)
+async def initiate_batch_scan(
+    batch_request: BatchScanRequest,
+    batch_service: BatchScanService = Depends(get_batch_scan_service)
+) -> BatchScanResponse:
+    """
+    Initiate scans of many repositories as one batch.
+    
+    The repositories are scheduled over a shared pool of warm workers with a
+    concurrency limit. Progress, per-repository reports and the batch summary
+    are available from ``GET /scans/batch/{batch_id}``.
+    
+    Args:
+        batch_request (BatchScanRequest): Repositories to scan and batch options
+        batch_service (BatchScanService): Injected batch scan service dependency
+        
+    Returns:
+        BatchScanResponse: Response with the batch ID
+        
+    Raises:
+        HTTPException: 400 for validation errors, 500 for internal errors
+    """
+    logger.info(f"POST /scans/batch - Initiating batch scan of {len(batch_request.repositories)} repositories")
+    
+    try:
+        for scan_request in batch_request.repositories:
+            if scan_request.scan_type.value == "pr" and not scan_request.pr_id:
+                raise HTTPException(
+                    status_code=status.HTTP_400_BAD_REQUEST,
+                    detail=f"PR ID is required for PR scans ({scan_request.repo_url})"
+                )
+        
+        return await batch_service.initiate_batch_scan(batch_request)
+        
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Error initiating batch scan: {str(e)}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Internal server error while initiating batch scan"
+        )
+
+
+@router.get("/batch/{batch_id}")
+async def get_batch_scan_status(
+    batch_id: str,
+    batch_service: BatchScanService = Depends(get_batch_scan_service)
+) -> JSONResponse:
+    """
+    Get the progress, per-repository results and summary of a batch scan.
+    
+    Args:
+        batch_id (str): Unique identifier for the batch
+        batch_service (BatchScanService): Injected batch scan service dependency
+        
+    Returns:
+        JSONResponse: Batch status with results of finished repositories and,
+            once the batch is done, its summary including throughput
+    """
+    logger.info(f"GET /scans/batch/{batch_id} - Checking batch status")
+    
+    batch_status = batch_service.get_batch_status(batch_id)
+    if batch_status is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Batch not found for batch ID: {batch_id}"
+        )
+    return JSONResponse(content=jsonable_encoder(batch_status))
+
+
+@router.delete("/batch/{batch_id}")
+async def cancel_batch_scan(
+    batch_id: str,
+    batch_service: BatchScanService = Depends(get_batch_scan_service)
+) -> JSONResponse:
+    """
+    Cancel a running batch scan.
+    
+    Running scans stop at their next cancellation check and repositories not
+    started yet are skipped; results of finished repositories are kept.
+    
+    Args:
+        batch_id (str): Unique identifier for the batch
+        batch_service (BatchScanService): Injected batch scan service dependency
+        
+    Returns:
+        JSONResponse: Confirmation of the cancellation
+        
+    Raises:
+        HTTPException: 404 if the batch does not exist, 409 if it is not running,
+            500 for internal errors
+    """
+    logger.info(f"DELETE /scans/batch/{batch_id} - Cancelling batch scan")
+    
+    try:
+        if batch_service.get_batch_status(batch_id) is None:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail=f"Batch not found for batch ID: {batch_id}"
+            )
+        if not await batch_service.cancel_batch(batch_id):
+            raise HTTPException(
+                status_code=status.HTTP_409_CONFLICT,
+                detail=f"Batch {batch_id} is not running"
+            )
+        
+        return JSONResponse(content={
+            "message": f"Batch {batch_id} cancelled",
+            "batch_id": batch_id
+        })
+        
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Error cancelling batch {batch_id}: {str(e)}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Internal server error while cancelling batch"
+        )
+
+
 @router.post("/", response_model=ScanResponse)
 async def create_scan(
     scan_request: ScanRequest,
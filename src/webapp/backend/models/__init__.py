@@ -15,6 +15,8 @@ from .scan_models import (
     ScanListItem,
     ScanResponse,
     ScanInitiateResponse,
+    BatchScanRequest,
+    BatchScanResponse,
 )
 
 from .feedback_models import (
@@ -67,6 +69,8 @@ __all__ = [
     "ScanListItem", 
     "ScanResponse",
     "ScanInitiateResponse",
+    "BatchScanRequest",
+    "BatchScanResponse",
     
     # Feedback models
     "FeedbackType",
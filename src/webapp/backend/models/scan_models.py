@@ -118,6 +118,8 @@ class ScanRequest(BaseModel):
     branch: Optional[str] = Field(default="main", description="Branch to scan for project scans")
     target_branch: Optional[str] = Field(default="main", description="Target branch for PR scans")
     source_branch: Optional[str] = Field(default=None, description="Source branch for PR scans")
+    force_refresh: bool = Field(default=False, description="Run a new scan even if the same commits were already scanned")
+    timeout_seconds: Optional[int] = Field(default=None, gt=0, description="Time budget for the scan (server default if unset)")
 
 
 class ScanListItem(BaseModel):
@@ -147,5 +149,21 @@ class ScanInitiateResponse(BaseModel):
     status: ScanStatus = Field(..., description="Initial scan status")
     message: str = Field(..., description="Response message")
     estimated_duration: Optional[int] = Field(default=None, description="Estimated duration in seconds")
+    estimate: Optional[Dict[str, Any]] = Field(default=None, description="Estimated wall time, CPU time and LLM tokens of the scan")
     repository: str = Field(..., description="Repository URL being scanned")
-    scan_type: ScanType = Field(..., description="Type of scan being performed") 
\ No newline at end of file
+    scan_type: ScanType = Field(..., description="Type of scan being performed") 
+
+
+class BatchScanRequest(BaseModel):
+    """Model for requesting scans of many repositories in one batch."""
+    repositories: List[ScanRequest] = Field(..., min_length=1, description="Repositories (and refs) to scan")
+    max_concurrency: Optional[int] = Field(default=None, gt=0, description="Repositories scanned at a time, at most the server limit (the limit if unset)")
+    streaming: bool = Field(default=False, description="Stream files through the analysis stages of every scan")
+
+
+class BatchScanResponse(BaseModel):
+    """Model for response when initiating a batch scan."""
+    batch_id: str = Field(..., description="Unique identifier for the batch")
+    status: ScanStatus = Field(..., description="Initial batch status")
+    message: str = Field(..., description="Response message")
+    total_repositories: int = Field(..., description="Number of repositories in the batch")
@@ -5,8 +5,11 @@ Handles cleanup, auto-sync, and maintenance tasks.
 
 import logging
 import asyncio
+import random
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timezone, timedelta
-from typing import List
+from typing import Any, Dict, List, Optional
+from urllib.parse import urlsplit
 from sqlalchemy.orm import Session
 from sqlalchemy import func
 
@@ -14,6 +17,7 @@ from ..database import get_db_session
 from ..models.project_models import Project
 from .token_manager import TokenManager
 from .repository_cache_service import RepositoryCacheService
+from .scan_cache_service import get_scan_demand
 
 logger = logging.getLogger(__name__)
 
@@ -65,79 +69,179 @@ class RepositoryMaintenanceJobs:
                     "status": "failed"
                 }
     
-    async def auto_sync_repositories_job(self, batch_size: int = 10) -> dict:
+    async def auto_sync_repositories_job(self, batch_size: Optional[int] = None) -> dict:
         """
         Background job to auto-sync repositories that need updates.
         
+        Candidates are ranked by staleness weighted by recent scan demand,
+        so the most requested repositories that have waited longest are
+        synced first. Syncs run in a thread pool of
+        ``settings.repository_sync_concurrency`` workers, at most
+        ``settings.repository_sync_per_host`` at a time per git host, and each
+        starts after a random delay of up to
+        ``settings.repository_sync_jitter_seconds`` so a host does not get
+        its requests in bursts. The event loop is never blocked by git.
+        
         Args:
-            batch_size: Number of repositories to sync per batch
+            batch_size: Maximum number of repositories to sync
+                (``settings.repository_sync_batch_size`` if unset)
             
         Returns:
             dict: Sync statistics
         """
+        from config.settings import settings
+        
+        batch_size = batch_size or settings.repository_sync_batch_size
         logger.info(f"🔄 Starting auto-sync job (batch size: {batch_size})")
         
-        with next(get_db_session()) as db:
-            try:
+        try:
+            with next(get_db_session()) as db:
                 # Get repositories that need sync
-                candidates = db.query(Project).filter(
+                candidates = db.query(Project).with_entities(
+                    Project.id, Project.name, Project.url, Project.last_synced_at
+                ).filter(
                     Project.auto_sync_enabled == True,
                     Project.cached_path.isnot(None),
                     # Sync repositories that haven't been synced in the last hour
                     Project.last_synced_at < datetime.now(timezone.utc) - timedelta(hours=1)
-                ).order_by(Project.last_synced_at.asc()).limit(batch_size).all()
-                
-                synced_count = 0
-                failed_count = 0
-                sync_results = []
-                
-                for project in candidates:
-                    try:
-                        logger.info(f"🔄 Auto-syncing repository: {project.name}")
-                        
-                        # Use cache service to sync
-                        repo_path = self.cache_service.get_or_clone_repository(project, db)
-                        
-                        sync_results.append({
-                            "repository": project.name,
-                            "status": "synced",
-                            "path": repo_path,
-                            "commit_hash": project.last_commit_hash[:8] if project.last_commit_hash else None
-                        })
-                        synced_count += 1
-                        
-                        # Small delay to avoid overwhelming Git servers
-                        await asyncio.sleep(1)
-                        
-                    except Exception as e:
-                        logger.error(f"❌ Failed to sync repository {project.name}: {e}")
-                        sync_results.append({
-                            "repository": project.name,
-                            "status": "failed",
-                            "error": str(e)
-                        })
-                        failed_count += 1
-                
-                result = {
-                    "timestamp": datetime.now(timezone.utc).isoformat(),
-                    "total_candidates": len(candidates),
-                    "synced_count": synced_count,
-                    "failed_count": failed_count,
-                    "sync_results": sync_results,
-                    "status": "completed"
-                }
-                
-                logger.info(f"✅ Auto-sync job completed: {synced_count} synced, {failed_count} failed")
-                return result
-                
+                ).all()
+            
+            candidates = self._prioritize_sync_candidates(candidates)[:batch_size]
+            
+            host_limits: Dict[str, asyncio.Semaphore] = {}
+            executor = ThreadPoolExecutor(
+                max_workers=max(1, settings.repository_sync_concurrency),
+                thread_name_prefix="repository-sync"
+            )
+            try:
+                sync_results = await asyncio.gather(*(
+                    self._sync_candidate(
+                        candidate, executor, host_limits,
+                        settings.repository_sync_per_host, settings.repository_sync_jitter_seconds
+                    )
+                    for candidate in candidates
+                ))
+            finally:
+                executor.shutdown(wait=False)
+            
+            synced_count = sum(1 for sync_result in sync_results if sync_result["status"] == "synced")
+            failed_count = len(sync_results) - synced_count
+            
+            result = {
+                "timestamp": datetime.now(timezone.utc).isoformat(),
+                "total_candidates": len(candidates),
+                "synced_count": synced_count,
+                "failed_count": failed_count,
+                "sync_results": list(sync_results),
+                "status": "completed"
+            }
+            
+            logger.info(f"✅ Auto-sync job completed: {synced_count} synced, {failed_count} failed")
+            return result
+            
+        except Exception as e:
+            logger.error(f"❌ Auto-sync job failed: {e}")
+            return {
+                "timestamp": datetime.now(timezone.utc).isoformat(),
+                "error": str(e),
+                "status": "failed"
+            }
+    
+    def _prioritize_sync_candidates(self, candidates: List[Any]) -> List[Any]:
+        """
+        Order sync candidates by hours since their last sync times their scan demand.
+        
+        Args:
+            candidates: Rows with ``url`` and ``last_synced_at``
+            
+        Returns:
+            List: Candidates, most urgent first
+        """
+        demand = get_scan_demand()
+        now = datetime.now(timezone.utc)
+        
+        def priority(candidate) -> float:
+            last_synced_at = candidate.last_synced_at
+            if last_synced_at.tzinfo is None:
+                last_synced_at = last_synced_at.replace(tzinfo=timezone.utc)
+            staleness_hours = (now - last_synced_at).total_seconds() / 3600
+            return staleness_hours * (1 + demand.score(candidate.url))
+        
+        return sorted(candidates, key=priority, reverse=True)
+    
+    async def _sync_candidate(
+        self,
+        candidate: Any,
+        executor: ThreadPoolExecutor,
+        host_limits: Dict[str, asyncio.Semaphore],
+        per_host: int,
+        jitter_seconds: float
+    ) -> dict:
+        """
+        Sync one candidate in the executor once its host has a free slot.
+        
+        The random delay is taken before waiting for the host's slot, so
+        jittered syncs never hold a slot while idle.
+        
+        Args:
+            candidate: Row with ``id``, ``name`` and ``url``
+            executor: Thread pool running the syncs
+            host_limits: Semaphores of the hosts seen so far in this run
+            per_host: Syncs of one host at a time
+            jitter_seconds: Longest random delay before waiting for a host slot
+            
+        Returns:
+            dict: Sync result of the repository
+        """
+        host = urlsplit(candidate.url).hostname or ""
+        if host not in host_limits:
+            host_limits[host] = asyncio.Semaphore(max(1, per_host))
+        
+        if jitter_seconds:
+            await asyncio.sleep(random.uniform(0, jitter_seconds))
+        
+        async with host_limits[host]:
+            try:
+                loop = asyncio.get_running_loop()
+                return await loop.run_in_executor(executor, self._sync_project, candidate.id, candidate.name)
             except Exception as e:
-                logger.error(f"❌ Auto-sync job failed: {e}")
+                logger.error(f"❌ Failed to sync repository {candidate.name}: {e}")
                 return {
-                    "timestamp": datetime.now(timezone.utc).isoformat(),
-                    "error": str(e),
-                    "status": "failed"
+                    "repository": candidate.name,
+                    "status": "failed",
+                    "error": str(e)
                 }
     
+    def _sync_project(self, project_id: int, name: str) -> dict:
+        """
+        Sync a project's cached repository in a worker thread, with its own database session.
+        
+        Args:
+            project_id: Project ID
+            name: Project name, for the result
+            
+        Returns:
+            dict: Sync result of the repository
+            
+        Raises:
+            RuntimeError: If the project no longer exists or the sync fails
+        """
+        logger.info(f"🔄 Auto-syncing repository: {name}")
+        with next(get_db_session()) as db:
+            project = db.get(Project, project_id)
+            if project is None:
+                raise RuntimeError("Project no longer exists")
+            
+            # Use cache service to sync
+            repo_path = self.cache_service.get_or_clone_repository(project, db)
+            
+            return {
+                "repository": project.name,
+                "status": "synced",
+                "path": repo_path,
+                "commit_hash": project.last_commit_hash[:8] if project.last_commit_hash else None
+            }
+    
     async def cache_health_check_job(self) -> dict:
         """
         Background job to check cache health and generate statistics.
@@ -0,0 +1,214 @@
+"""
+Batch scan service for scanning many repositories at once.
+
+This module runs multi-repository batches on the core engine's BatchScanner
+in a background thread and keeps their per-repository results and summary
+available for status requests.
+"""
+
+import asyncio
+import logging
+import uuid
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+
+from ..models.scan_models import BatchScanRequest, BatchScanResponse, ScanStatus, ScanType
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+
+class BatchInfo:
+    """Information about a running or finished batch scan."""
+
+    def __init__(self, batch_id: str, batch_request: BatchScanRequest):
+        """
+        Initialize batch info.
+
+        Args:
+            batch_id (str): Unique batch identifier
+            batch_request (BatchScanRequest): Original batch request
+        """
+        self.batch_id = batch_id
+        self.batch_request = batch_request
+        self.status = ScanStatus.PENDING
+        self.created_at = datetime.now()
+        self.completed_at: Optional[datetime] = None
+        self.results: List[Dict[str, Any]] = []
+        self.summary: Optional[Dict[str, Any]] = None
+        self.error_message: Optional[str] = None
+        self.scanner: Optional[Any] = None
+
+
+def _scan_target(scan_request: Any) -> Dict[str, Any]:
+    """Convert a ScanRequest into the scan request data used by the orchestrator."""
+    target = {
+        "repo_url": scan_request.repo_url,
+        "scan_type": scan_request.scan_type.value,
+        "timeout_seconds": scan_request.timeout_seconds
+    }
+    if scan_request.scan_type == ScanType.PR:
+        target.update(
+            pr_id=scan_request.pr_id,
+            target_branch=scan_request.target_branch,
+            source_branch=scan_request.source_branch
+        )
+    else:
+        target["branch"] = scan_request.branch
+    return target
+
+
+class BatchScanService:
+    """
+    Service for managing multi-repository batch scans.
+
+    Each batch runs on its own BatchScanner, whose warm workers are kept for
+    the whole batch; results become visible as soon as each repository
+    finishes.
+    """
+
+    def __init__(self):
+        """Initialize the batch scan service."""
+        logger.info("Initializing BatchScanService")
+        self._batches: Dict[str, BatchInfo] = {}
+        self._running_batches: Dict[str, asyncio.Task] = {}
+
+    async def initiate_batch_scan(self, batch_request: BatchScanRequest) -> BatchScanResponse:
+        """
+        Start a batch scan in the background.
+
+        Args:
+            batch_request (BatchScanRequest): Repositories and batch options
+
+        Returns:
+            BatchScanResponse: Response with the batch ID
+        """
+        batch_id = f"batch_{uuid.uuid4().hex[:8]}"
+        batch_info = BatchInfo(batch_id, batch_request)
+        self._batches[batch_id] = batch_info
+        self._running_batches[batch_id] = asyncio.create_task(self._execute_batch(batch_info))
+
+        logger.info(f"Started batch scan {batch_id} of {len(batch_request.repositories)} repositories")
+        return BatchScanResponse(
+            batch_id=batch_id,
+            status=ScanStatus.PENDING,
+            message=f"Batch scan initiated successfully. Batch ID: {batch_id}",
+            total_repositories=len(batch_request.repositories)
+        )
+
+    async def _execute_batch(self, batch_info: BatchInfo) -> None:
+        """
+        Run a batch on a worker thread so the event loop stays responsive.
+
+        Every worker holds its own warm agents (embedding model, parsers and
+        compiled graph), so a request can lower the concurrency but not raise
+        it above ``settings.batch_scan_concurrency``.
+
+        Args:
+            batch_info (BatchInfo): Batch to run
+        """
+        from config.settings import settings
+        from src.core_engine.batch_scanner import BatchScanner
+
+        batch_request = batch_info.batch_request
+        max_concurrency = min(
+            batch_request.max_concurrency or settings.batch_scan_concurrency,
+            settings.batch_scan_concurrency
+        )
+        batch_info.scanner = BatchScanner(
+            max_concurrency=max_concurrency,
+            streaming=batch_request.streaming
+        )
+        batch_info.status = ScanStatus.IN_PROGRESS
+
+        try:
+            batch = await asyncio.to_thread(
+                batch_info.scanner.run,
+                [_scan_target(scan_request) for scan_request in batch_request.repositories],
+                batch_info.results.append
+            )
+            batch_info.results = batch["results"]
+            batch_info.summary = batch["summary"]
+            batch_info.status = ScanStatus.COMPLETED
+            logger.info(f"Batch scan {batch_info.batch_id} completed")
+
+        except asyncio.CancelledError:
+            batch_info.scanner.cancel()
+            batch_info.status = ScanStatus.CANCELLED
+            logger.info(f"Batch scan {batch_info.batch_id} was cancelled")
+
+        except Exception as e:
+            batch_info.status = ScanStatus.ERROR
+            batch_info.error_message = str(e)
+            logger.error(f"Batch scan {batch_info.batch_id} failed: {str(e)}")
+
+        finally:
+            batch_info.completed_at = datetime.now()
+            self._running_batches.pop(batch_info.batch_id, None)
+
+    def get_batch_status(self, batch_id: str) -> Optional[Dict[str, Any]]:
+        """
+        Get the progress, per-repository results and summary of a batch.
+
+        Args:
+            batch_id (str): Batch identifier
+
+        Returns:
+            Optional[Dict[str, Any]]: Batch status, None if the batch is unknown
+        """
+        batch_info = self._batches.get(batch_id)
+        if not batch_info:
+            return None
+
+        return {
+            "batch_id": batch_id,
+            "status": batch_info.status.value,
+            "total_repositories": len(batch_info.batch_request.repositories),
+            "finished_repositories": len(batch_info.results),
+            "created_at": batch_info.created_at.isoformat(),
+            "completed_at": batch_info.completed_at.isoformat() if batch_info.completed_at else None,
+            "error_message": batch_info.error_message,
+            "results": list(batch_info.results),
+            "summary": batch_info.summary
+        }
+
+    async def cancel_batch(self, batch_id: str) -> bool:
+        """
+        Cancel a running batch.
+
+        Running scans stop at their next cancellation check and repositories
+        not started yet are skipped.
+
+        Args:
+            batch_id (str): Batch identifier
+
+        Returns:
+            bool: True if the batch was cancelled, False if not found or not running
+        """
+        batch_info = self._batches.get(batch_id)
+        task = self._running_batches.get(batch_id)
+        if not batch_info or not task:
+            return False
+
+        if batch_info.scanner is not None:
+            batch_info.scanner.cancel()
+        task.cancel()
+        logger.info(f"Cancelled batch scan: {batch_id}")
+        return True
+
+
+# Global batch scan service instance
+_batch_scan_service: Optional[BatchScanService] = None
+
+
+def get_batch_scan_service() -> BatchScanService:
+    """
+    Get the global batch scan service instance.
+
+    Returns:
+        BatchScanService: Global batch scan service
+    """
+    global _batch_scan_service
+    if _batch_scan_service is None:
+        _batch_scan_service = BatchScanService()
+    return _batch_scan_service
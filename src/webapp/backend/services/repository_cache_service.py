@@ -1,22 +1,54 @@
 """
 Smart Repository Cache Service
 Manages local caching of repository source code with intelligent sync.
+
+Clones and syncs of one cache directory are single-flight: within a process
+concurrent requesters wait for the clone or sync in flight and share its
+result, and across processes sharing a cache root a file lock serializes
+them.
 """
 
 import os
 import shutil
 import logging
 import hashlib
+import threading
+from contextlib import contextmanager
 from datetime import datetime, timezone, timedelta
-from typing import Optional, Tuple
+from typing import Dict, Iterator, Optional, Tuple
 from pathlib import Path
 from git import Repo, GitCommandError
 from sqlalchemy.orm import Session
 from ..models.project_models import Project
 from .token_manager import TokenManager
 
+try:
+    import fcntl
+except ImportError:  # pragma: no cover - not available on Windows
+    fcntl = None
+
 logger = logging.getLogger(__name__)
 
+DEFAULT_CACHE_ROOT = "/app/cache/repositories"
+
+# Directory of the cache root holding the per-repository lock files
+LOCK_DIR_NAME = ".locks"
+
+
+class _Flight:
+    """A clone or sync of one cache directory, shared by concurrent requesters."""
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.path: Optional[str] = None
+        self.error: Optional[BaseException] = None
+
+
+# In-flight clones and syncs by cache directory, shared by all service instances
+_flights: Dict[str, _Flight] = {}
+_flights_guard = threading.Lock()
+
+
 class RepositoryCacheService:
     """
     Intelligent caching service for repository source code.
@@ -27,7 +59,7 @@ class RepositoryCacheService:
     - Token-based authentication for private repos
     """
     
-    def __init__(self, cache_root: str = "/app/cache/repositories"):
+    def __init__(self, cache_root: str = DEFAULT_CACHE_ROOT):
         """
         Initialize cache service.
         
@@ -50,6 +82,12 @@ class RepositoryCacheService:
         """
         Get repository path from cache or clone if needed.
         
+        A requester arriving while the same repository is being cloned or
+        synced in this process waits for that clone or sync and gets its
+        result instead of starting another one. Across processes the work is
+        serialized by a file lock, and a process that had to wait reloads the
+        project before deciding whether anything is left to do.
+        
         Args:
             project: Project instance
             db: Database session for updates
@@ -62,6 +100,74 @@ class RepositoryCacheService:
         """
         cache_path = self._get_cache_path(project)
         
+        with _flights_guard:
+            flight = _flights.get(cache_path)
+            leader = flight is None
+            if leader:
+                flight = _flights[cache_path] = _Flight()
+        
+        if not leader:
+            logger.info(f"⏳ Waiting for in-flight clone/sync of {project.name}")
+            flight.done.wait()
+            self._reload_project(project, db)
+            if flight.error is not None:
+                raise RuntimeError(str(flight.error)) from flight.error
+            return flight.path
+        
+        try:
+            with self._repository_lock(cache_path) as contended:
+                if contended:
+                    # Another process held the lock and may have done the work
+                    self._reload_project(project, db)
+                flight.path = self._get_or_clone_locked(project, cache_path, db)
+            return flight.path
+        except BaseException as e:
+            flight.error = e
+            raise
+        finally:
+            with _flights_guard:
+                del _flights[cache_path]
+            flight.done.set()
+    
+    @contextmanager
+    def _repository_lock(self, cache_path: str) -> Iterator[bool]:
+        """
+        Hold the file lock of a cache directory, shared with other processes.
+        
+        Args:
+            cache_path: Cache directory being cloned or synced
+            
+        Yields:
+            bool: Whether another process held the lock when it was requested
+        """
+        if fcntl is None:
+            yield False
+            return
+        
+        lock_dir = self.cache_root / LOCK_DIR_NAME
+        lock_dir.mkdir(parents=True, exist_ok=True)
+        with open(lock_dir / f"{Path(cache_path).name}.lock", "a") as lock_file:
+            contended = False
+            try:
+                fcntl.flock(lock_file, fcntl.LOCK_EX | fcntl.LOCK_NB)
+            except BlockingIOError:
+                contended = True
+                logger.info(f"⏳ Waiting for another process to clone/sync {cache_path}")
+                fcntl.flock(lock_file, fcntl.LOCK_EX)
+            try:
+                yield contended
+            finally:
+                fcntl.flock(lock_file, fcntl.LOCK_UN)
+    
+    def _reload_project(self, project: Project, db: Session) -> None:
+        """Reload cache metadata committed by another requester."""
+        try:
+            db.refresh(project)
+        except Exception as e:
+            logger.debug(f"Could not reload project {project.name}: {e}")
+    
+    def _get_or_clone_locked(self, project: Project, cache_path: str, db: Session) -> str:
+        """Get repository path from cache or clone if needed, holding the repository's lock."""
         try:
             # Check if cache is valid and exists
             if project.is_cache_valid and os.path.exists(cache_path):
@@ -95,6 +201,27 @@ class RepositoryCacheService:
         cache_dir_name = f"{project.id}_{project.name}_{url_hash}"
         return str(self.cache_root / cache_dir_name)
     
+    @staticmethod
+    def find_cached_checkout(repo_url: str, cache_root: str = DEFAULT_CACHE_ROOT) -> Optional[str]:
+        """
+        Find an existing cached checkout of a repository by URL.
+        
+        Args:
+            repo_url: Repository URL as stored on the project
+            cache_root: Root directory for cache storage
+            
+        Returns:
+            Optional[str]: Path to a cached checkout, None if the repository is not cached
+        """
+        url_hash = hashlib.md5(repo_url.encode()).hexdigest()[:8]
+        root = Path(cache_root)
+        if not root.is_dir():
+            return None
+        for path in root.glob(f"*_{url_hash}"):
+            if path.is_dir():
+                return str(path)
+        return None
+    
     def _needs_sync(self, project: Project) -> bool:
         """
         Check if repository needs sync with remote.
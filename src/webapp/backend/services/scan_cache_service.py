@@ -0,0 +1,286 @@
+"""
+Scan result cache for handling repeated scans of the same commits.
+
+This module provides the ScanCacheService class which remembers the scan
+started for a given repository, commit pair, scan type and analysis
+configuration, so identical scan requests reuse the existing scan instead of
+cloning and analyzing the repository again. It also provides ScanDemand,
+which counts recent scan requests per repository so background syncs can
+keep the most requested repositories fresh first.
+"""
+
+import hashlib
+import logging
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Optional
+from urllib.parse import urlsplit, urlunsplit
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+
+def normalize_repo_url(repo_url: str) -> str:
+    """
+    Normalize a repository URL so equivalent spellings share cache entries.
+
+    Args:
+        repo_url (str): Repository URL as given in the scan request
+
+    Returns:
+        str: URL with lower-case scheme and host, without credentials,
+            trailing slash or ``.git`` suffix
+    """
+    url = repo_url.strip()
+    parts = urlsplit(url)
+    if parts.scheme and parts.hostname:
+        netloc = parts.hostname.lower()
+        if parts.port:
+            netloc = f"{netloc}:{parts.port}"
+        url = urlunsplit((parts.scheme.lower(), netloc, parts.path, "", ""))
+    url = url.rstrip("/")
+    if url.endswith(".git"):
+        url = url[:-4]
+    return url
+
+
+@lru_cache(maxsize=1)
+def compute_config_fingerprint() -> str:
+    """
+    Fingerprint the configuration that determines scan results.
+
+    Covers the static analysis rules, the LLM configuration and the execution
+    mode (streaming scans review every file with the LLM, partitioned scans
+    report per package); a change to any of them produces a new fingerprint,
+    so earlier results are not reused.
+
+    Returns:
+        str: Hex digest of the analysis configuration
+    """
+    from config.settings import settings
+    from src.core_engine.agents import static_analysis_agent
+    from src.core_engine.orchestrator import LLM_PROVIDER
+    from src.core_engine.stage_cache import source_fingerprint
+
+    digest = hashlib.sha256()
+    digest.update(source_fingerprint(static_analysis_agent).encode("utf-8"))
+    for value in (
+        LLM_PROVIDER,
+        settings.llm_provider,
+        settings.local_llm_model_path,
+        settings.max_file_size_mb,
+        ",".join(settings.supported_languages),
+        settings.scan_streaming,
+        settings.scan_monorepo_partitioning
+    ):
+        digest.update(b"\0" + str(value).encode("utf-8"))
+    return digest.hexdigest()
+
+
+@dataclass(frozen=True)
+class ScanCacheKey:
+    """Identity of a scan: what was scanned, at which commits, with which configuration."""
+    repo_url: str
+    head_sha: str
+    base_sha: Optional[str]
+    scan_type: str
+    config_fingerprint: str
+
+    @property
+    def digest(self) -> str:
+        """Stable hex digest of the key (for logging and external stores)."""
+        raw = "\0".join(str(part) for part in (
+            self.repo_url, self.head_sha, self.base_sha, self.scan_type, self.config_fingerprint
+        ))
+        return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+
+@dataclass(frozen=True)
+class ScanCacheEntry:
+    """Scan started for a cache key."""
+    scan_id: str
+    job_id: str
+    created_at: float
+
+
+class ScanCacheService:
+    """
+    Service for reusing scans of identical commits and configuration.
+
+    Entries expire after ``ttl_seconds`` and the least recently used entries
+    are evicted once ``max_entries`` is reached.
+    """
+
+    def __init__(self, ttl_seconds: int = 86400, max_entries: int = 1024):
+        """
+        Initialize the scan cache.
+
+        Args:
+            ttl_seconds (int): Lifetime of a cache entry
+            max_entries (int): Maximum number of cached scans
+        """
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[ScanCacheKey, ScanCacheEntry]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: ScanCacheKey) -> Optional[ScanCacheEntry]:
+        """
+        Look up the scan for a key.
+
+        Args:
+            key (ScanCacheKey): Cache key
+
+        Returns:
+            Optional[ScanCacheEntry]: Cached scan if present and not expired
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            if time.time() - entry.created_at > self.ttl_seconds:
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return entry
+
+    def put(self, key: ScanCacheKey, scan_id: str, job_id: str) -> ScanCacheEntry:
+        """
+        Remember the scan started for a key, replacing any previous entry.
+
+        Args:
+            key (ScanCacheKey): Cache key
+            scan_id (str): Scan identifier
+            job_id (str): Background job identifier
+
+        Returns:
+            ScanCacheEntry: The stored entry
+        """
+        entry = ScanCacheEntry(scan_id=scan_id, job_id=job_id, created_at=time.time())
+        with self._lock:
+            self._entries[key] = entry
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        logger.debug(f"Cached scan {scan_id} for key {key.digest[:12]}")
+        return entry
+
+    def invalidate(self, key: ScanCacheKey) -> bool:
+        """
+        Forget the scan for a key.
+
+        Args:
+            key (ScanCacheKey): Cache key
+
+        Returns:
+            bool: True if an entry was removed
+        """
+        with self._lock:
+            return self._entries.pop(key, None) is not None
+
+    def clear(self) -> None:
+        """Remove all cache entries."""
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._entries)
+
+
+class ScanDemand:
+    """
+    Recent scan requests per repository, decaying exponentially over time.
+
+    A request counts 1 when it is made and half as much every
+    ``half_life_seconds`` after that. Once ``max_repositories`` are tracked,
+    the repository requested least recently is forgotten.
+    """
+
+    def __init__(self, half_life_seconds: float = 86400, max_repositories: int = 100000):
+        """
+        Initialize the demand counters.
+
+        Args:
+            half_life_seconds (float): Time for a request's weight to halve
+            max_repositories (int): Maximum number of repositories tracked
+        """
+        self.half_life_seconds = half_life_seconds
+        self.max_repositories = max_repositories
+        self._scores: "OrderedDict[str, tuple[float, float]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def _decayed(self, score: float, since: float, now: float) -> float:
+        return score * 0.5 ** ((now - since) / self.half_life_seconds)
+
+    def record(self, repo_url: str) -> None:
+        """
+        Count a scan request for a repository.
+
+        Args:
+            repo_url (str): Repository URL as given in the scan request
+        """
+        key = normalize_repo_url(repo_url)
+        now = time.time()
+        with self._lock:
+            score, since = self._scores.pop(key, (0.0, now))
+            self._scores[key] = (self._decayed(score, since, now) + 1, now)
+            while len(self._scores) > self.max_repositories:
+                self._scores.popitem(last=False)
+
+    def score(self, repo_url: str) -> float:
+        """
+        Get the decayed number of recent scan requests for a repository.
+
+        Args:
+            repo_url (str): Repository URL
+
+        Returns:
+            float: Demand score, 0 if the repository was not scanned recently
+        """
+        with self._lock:
+            entry = self._scores.get(normalize_repo_url(repo_url))
+        if entry is None:
+            return 0.0
+        return self._decayed(entry[0], entry[1], time.time())
+
+
+# Global scan cache service instance
+_scan_cache_service: Optional[ScanCacheService] = None
+
+# Global scan demand counters
+_scan_demand: Optional[ScanDemand] = None
+
+
+def get_scan_cache_service() -> ScanCacheService:
+    """
+    Get the global scan cache service instance.
+
+    Returns:
+        ScanCacheService: Global scan cache service
+    """
+    global _scan_cache_service
+    if _scan_cache_service is None:
+        from config.settings import settings
+
+        _scan_cache_service = ScanCacheService(
+            ttl_seconds=settings.scan_cache_ttl_seconds,
+            max_entries=settings.scan_cache_max_entries
+        )
+    return _scan_cache_service
+
+
+def get_scan_demand() -> ScanDemand:
+    """
+    Get the global scan demand counters.
+
+    Returns:
+        ScanDemand: Global scan demand counters
+    """
+    global _scan_demand
+    if _scan_demand is None:
+        _scan_demand = ScanDemand()
+    return _scan_demand
@@ -6,8 +6,10 @@ for scan operations including initiating scans, retrieving scan results,
 and managing scan reports.
 """
 
+import asyncio
 import logging
-from typing import Dict, List, Optional
+import math
+from typing import Any, Dict, List, Optional
 from datetime import datetime
 from uuid import uuid4
 
@@ -16,12 +18,30 @@ from ..models.scan_models import (
     LLMReview, DiagramData, ScanMetadata, ScanType, ScanStatus, SeverityLevel,
     ScanRequest, ScanInitiateResponse
 )
+from .scan_cache_service import (
+    ScanCacheKey, compute_config_fingerprint, get_scan_cache_service, get_scan_demand, normalize_repo_url
+)
 from .task_queue_service import get_task_queue_service
 
 # Configure logging
 logger = logging.getLogger(__name__)
 
 
+class ScanQuotaExceeded(ValueError):
+    """Raised when a scan's estimated cost exceeds the configured quotas."""
+    
+    def __init__(self, message: str, estimate: Any):
+        """
+        Initialize the error.
+        
+        Args:
+            message (str): Which quotas were exceeded
+            estimate (ScanEstimate): Estimated cost of the rejected scan
+        """
+        super().__init__(message)
+        self.estimate = estimate
+
+
 class ScanService:
     """
     Service class for handling scan-related operations.
@@ -34,6 +54,7 @@ class ScanService:
         """Initialize the scan service."""
         logger.info("Initializing ScanService")
         self._task_queue = get_task_queue_service()
+        self._scan_cache = get_scan_cache_service()
         # TODO: Add database connection or storage backend
         # TODO: Add configuration for scan timeouts and limits
         
@@ -71,30 +92,64 @@ class ScanService:
         """
         Initiate a new scan asynchronously.
         
+        Scans are cached by repository, resolved commits, scan type and
+        analysis configuration: if the same commits were already scanned (or
+        are being scanned) with the same configuration, the existing scan ID
+        is returned immediately unless ``force_refresh`` is set.
+        
+        New scans are estimated before they are queued (see
+        ``_estimate_scan``). Scans whose estimate exceeds the configured
+        quotas are rejected, or run with a time budget capped at the quota
+        when ``settings.scan_quota_policy`` is "downscope".
+        
         Args:
             scan_request (ScanRequest): Scan configuration and parameters
             
         Returns:
             ScanInitiateResponse: Response with scan ID and job ID
+            
+        Raises:
+            ScanQuotaExceeded: If the estimated cost exceeds the quotas and
+                scans over quota are rejected
         """
         logger.info(f"Initiating scan for repository: {scan_request.repo_url}")
+        # Background syncs keep the most requested repositories fresh first
+        get_scan_demand().record(scan_request.repo_url)
         
         try:
+            cache_key = await self._get_cache_key(scan_request)
+            
+            if cache_key and not scan_request.force_refresh:
+                cached_response = self._get_cached_scan(cache_key, scan_request)
+                if cached_response:
+                    return cached_response
+            
+            estimate = await self._estimate_scan(scan_request)
+            scan_request, downscoped = self._apply_quotas(scan_request, estimate)
+            
             # Start the scan task asynchronously
             scan_id, job_id = await self._task_queue.initiate_scan(
                 scan_request, 
-                orchestrator_callback=self._execute_scan_with_orchestrator
+                orchestrator_callback=self._execute_scan_with_orchestrator,
+                estimate=estimate.to_dict()
             )
             
-            # Calculate estimated duration based on scan type
-            estimated_duration = 300 if scan_request.scan_type == ScanType.PR else 900  # 5 min for PR, 15 min for project
+            if cache_key:
+                self._scan_cache.put(cache_key, scan_id, job_id)
+            
+            message = f"Scan initiated successfully. Scan ID: {scan_id}"
+            estimated_duration = math.ceil(estimate.wall_seconds)
+            if downscoped:
+                message += f" (downscoped to a {scan_request.timeout_seconds}s budget to stay within quota)"
+                estimated_duration = min(estimated_duration, scan_request.timeout_seconds)
             
             response = ScanInitiateResponse(
                 scan_id=scan_id,
                 job_id=job_id,
                 status=ScanStatus.PENDING,
-                message=f"Scan initiated successfully. Scan ID: {scan_id}",
+                message=message,
                 estimated_duration=estimated_duration,
+                estimate=estimate.to_dict(),
                 repository=scan_request.repo_url,
                 scan_type=scan_request.scan_type
             )
@@ -106,32 +161,263 @@ class ScanService:
             logger.error(f"Error initiating scan for {scan_request.repo_url}: {str(e)}")
             raise
     
-    async def _execute_scan_with_orchestrator(self, scan_request: ScanRequest) -> Dict:
+    async def _estimate_scan(self, scan_request: ScanRequest) -> Any:
+        """
+        Estimate the cost of a scan before it is queued.
+        
+        Project scans are profiled from a cached checkout of the repository,
+        if one exists; PR scans and uncached repositories fall back to the
+        estimator's defaults.
+        
+        Args:
+            scan_request (ScanRequest): Scan configuration
+            
+        Returns:
+            ScanEstimate: Predicted wall time, CPU time and LLM tokens
+        """
+        from config.settings import settings
+        from src.core_engine.file_filters import FileFilter
+        from src.core_engine.scan_estimator import RepositoryProfile, ScanEstimator
+        from .repository_cache_service import RepositoryCacheService
+        
+        profile = None
+        if scan_request.scan_type == ScanType.PROJECT:
+            checkout = RepositoryCacheService.find_cached_checkout(scan_request.repo_url)
+            if checkout:
+                # The profile leaves out the files the fetcher would exclude
+                file_filter = FileFilter(
+                    exclude_globs=settings.scan_exclude_globs or (),
+                    detect_vendored=settings.scan_exclude_vendored
+                )
+                # Walking the checkout is blocking file I/O
+                profile = await asyncio.to_thread(
+                    RepositoryProfile.from_directory, checkout, settings.max_file_size_mb * 1024 * 1024, file_filter
+                )
+        
+        estimator = await asyncio.to_thread(ScanEstimator.from_settings)
+        estimate = estimator.estimate(profile, scan_request.scan_type.value, streaming=settings.scan_streaming)
+        logger.info(
+            f"Estimated scan of {scan_request.repo_url}: {estimate.wall_seconds:.0f}s wall, "
+            f"{estimate.cpu_seconds:.0f}s CPU, {estimate.llm_tokens} LLM tokens ({estimate.basis})"
+        )
+        return estimate
+    
+    def _apply_quotas(self, scan_request: ScanRequest, estimate: Any) -> tuple[ScanRequest, bool]:
+        """
+        Check a scan's estimate against the configured quotas.
+        
+        A downscoped scan runs with its time budget capped so that it ends
+        within the quota; LLM review of files without findings is the first
+        work skipped as the budget runs out. A token quota caps the budget in
+        proportion to the share of the estimated tokens it allows.
+        
+        Args:
+            scan_request (ScanRequest): Scan configuration
+            estimate (ScanEstimate): Estimated cost of the scan
+            
+        Returns:
+            tuple[ScanRequest, bool]: Scan request to run and whether it was downscoped
+            
+        Raises:
+            ScanQuotaExceeded: If the estimate exceeds a quota and the policy is "reject"
+        """
+        from config.settings import settings
+        
+        exceeded = []
+        budgets = []
+        if settings.scan_quota_max_seconds and estimate.wall_seconds > settings.scan_quota_max_seconds:
+            exceeded.append(f"estimated duration {estimate.wall_seconds:.0f}s > {settings.scan_quota_max_seconds}s")
+            budgets.append(settings.scan_quota_max_seconds)
+        if settings.scan_quota_max_llm_tokens and estimate.llm_tokens > settings.scan_quota_max_llm_tokens:
+            exceeded.append(f"estimated LLM tokens {estimate.llm_tokens} > {settings.scan_quota_max_llm_tokens}")
+            budgets.append(estimate.wall_seconds * settings.scan_quota_max_llm_tokens / estimate.llm_tokens)
+        
+        if not exceeded:
+            return scan_request, False
+        
+        message = f"Scan exceeds quota: {', '.join(exceeded)}"
+        if settings.scan_quota_policy != "downscope":
+            logger.warning(f"Rejecting scan of {scan_request.repo_url}. {message}")
+            raise ScanQuotaExceeded(message, estimate)
+        
+        budget = max(1, int(min(budgets)))
+        if scan_request.timeout_seconds:
+            budget = min(budget, scan_request.timeout_seconds)
+        logger.warning(f"Downscoping scan of {scan_request.repo_url} to a {budget}s budget. {message}")
+        return scan_request.model_copy(update={"timeout_seconds": budget}), True
+    
+    async def _get_cache_key(self, scan_request: ScanRequest) -> Optional[ScanCacheKey]:
+        """
+        Build the scan cache key by resolving the scanned refs to commits.
+        
+        Args:
+            scan_request (ScanRequest): Scan configuration
+            
+        Returns:
+            Optional[ScanCacheKey]: Cache key, or None if the refs cannot be resolved
+        """
+        from src.core_engine.agents.code_fetcher_agent import CodeFetcherAgent
+        
+        if scan_request.scan_type == ScanType.PR:
+            head_ref, base_ref = scan_request.source_branch, scan_request.target_branch
+        else:
+            head_ref, base_ref = scan_request.branch, None
+        if not head_ref:
+            return None
+        
+        fetcher = CodeFetcherAgent()
+        try:
+            # ls-remote is blocking network I/O
+            head_sha = await asyncio.to_thread(fetcher.resolve_revision, scan_request.repo_url, head_ref)
+            base_sha = await asyncio.to_thread(
+                fetcher.resolve_revision, scan_request.repo_url, base_ref
+            ) if base_ref else None
+        except Exception as e:
+            logger.warning(f"Could not resolve revisions for {scan_request.repo_url}, scanning without cache: {str(e)}")
+            return None
+        
+        return ScanCacheKey(
+            repo_url=normalize_repo_url(scan_request.repo_url),
+            head_sha=head_sha,
+            base_sha=base_sha,
+            scan_type=scan_request.scan_type.value,
+            config_fingerprint=compute_config_fingerprint()
+        )
+    
+    def _get_cached_scan(self, cache_key: ScanCacheKey, scan_request: ScanRequest) -> Optional[ScanInitiateResponse]:
+        """
+        Get the response for an existing scan of the same commits and configuration.
+        
+        Failed, cancelled and no longer tracked scans are not reused.
+        
+        Args:
+            cache_key (ScanCacheKey): Cache key of the request
+            scan_request (ScanRequest): Scan configuration
+            
+        Returns:
+            Optional[ScanInitiateResponse]: Response for the cached scan, None on a miss
+        """
+        entry = self._scan_cache.get(cache_key)
+        if not entry:
+            return None
+        
+        task_status = self._task_queue.get_task_status(entry.job_id)
+        status = {
+            "pending": ScanStatus.PENDING,
+            "running": ScanStatus.IN_PROGRESS,
+            "completed": ScanStatus.COMPLETED
+        }.get(task_status["status"]) if task_status else None
+        if status is None:
+            self._scan_cache.invalidate(cache_key)
+            return None
+        
+        logger.info(f"Reusing scan {entry.scan_id} for {scan_request.repo_url} at {cache_key.head_sha[:12]}")
+        return ScanInitiateResponse(
+            scan_id=entry.scan_id,
+            job_id=entry.job_id,
+            status=status,
+            message=f"Reusing existing scan of the same commits. Scan ID: {entry.scan_id}",
+            estimated_duration=0 if status == ScanStatus.COMPLETED else None,
+            repository=scan_request.repo_url,
+            scan_type=scan_request.scan_type
+        )
+    
+    async def _execute_scan_with_orchestrator(
+        self,
+        scan_request: ScanRequest,
+        agent_pool: Optional[Any] = None,
+        scan_id: Optional[str] = None,
+        resume: bool = False
+    ) -> Dict:
         """
         Execute scan using the LangGraph orchestrator.
         
+        The async workflow runs on the API event loop: LLM calls are awaited
+        and blocking git / CPU-bound stages run on the orchestrator's thread
+        pools, so request handling is never blocked by a running scan.
+        
+        Scans with a scan ID are checkpointed after every step. A failed
+        scan keeps its checkpoints and file contents, so a retry (``resume``)
+        only runs the failed stage and the ones after it; both are dropped
+        once the scan completes.
+        
         Args:
             scan_request (ScanRequest): Scan configuration
+            agent_pool (Optional[AgentPool]): Warm agents checked out for this scan by the task queue
+            scan_id (Optional[str]): Scan ID keying the checkpoints (not checkpointed if unset)
+            resume (bool): Resume the checkpointed scan instead of starting it again
             
         Returns:
             Dict: Scan results
+            
+        Raises:
+            RuntimeError: If the scan workflow ended in an error
         """
-        # TODO: Integrate with actual LangGraph orchestrator
-        logger.info(f"Executing scan with orchestrator for {scan_request.repo_url}")
+        from config.settings import settings
+        from src.core_engine.async_orchestrator import resume_scan_async, run_scan_async
+        from src.core_engine.checkpointing import get_checkpointer
+        from src.core_engine.content_store import open_content_store
+        from src.core_engine.orchestrator import discard_scan
+        
+        checkpointer = get_checkpointer() if scan_id else None
+        
+        final_state = None
+        if resume:
+            logger.info(f"Resuming scan {scan_id} of {scan_request.repo_url}")
+            try:
+                final_state = await resume_scan_async(
+                    scan_id, checkpointer, agent_pool=agent_pool, streaming=settings.scan_streaming
+                )
+            except ValueError:
+                # Stopped before its first checkpoint
+                logger.info(f"No checkpoint of scan {scan_id}, starting it again")
+        
+        if final_state is None:
+            logger.info(f"Executing scan with orchestrator for {scan_request.repo_url}")
+            final_state = await run_scan_async({
+                "repo_url": scan_request.repo_url,
+                "pr_id": scan_request.pr_id,
+                "scan_type": scan_request.scan_type.value,
+                "branch": scan_request.branch,
+                "target_branch": scan_request.target_branch,
+                "source_branch": scan_request.source_branch
+            }, agent_pool=agent_pool, checkpointer=checkpointer, scan_id=scan_id,
+                streaming=settings.scan_streaming)
+        
+        if final_state.get("current_step") != "completed":
+            # Surfaces as a failed task in the task queue; the checkpoints
+            # and file contents are kept for a retry
+            raise RuntimeError(final_state.get("error_message") or "Scan workflow did not complete")
         
-        # For now, return mock results
-        # In the future, this would call the LangGraph orchestrator
-        import asyncio
-        await asyncio.sleep(5)  # Simulate processing time
+        # File contents are only needed while the scan can still be resumed
+        if scan_id:
+            discard_scan(scan_id, checkpointer)
+        elif final_state.get("content_store_root"):
+            open_content_store(final_state["content_store_root"]).cleanup()
         
+        summary = final_state.get("static_analysis_summary") or {}
         return {
             "scan_completed": True,
             "repository": scan_request.repo_url,
             "scan_type": scan_request.scan_type.value,
-            "findings_count": 3,
-            "status": "completed"
+            "findings_count": summary.get("total_findings", 0),
+            "status": "completed",
+            "report": final_state.get("report_data")
         }
     
+    async def retry_task(self, job_id: str) -> bool:
+        """
+        Retry a failed or cancelled scan from its last completed stage.
+        
+        Args:
+            job_id (str): Job identifier
+            
+        Returns:
+            bool: True if the scan was restarted, False if the job is unknown,
+                still running or completed
+        """
+        return await self._task_queue.retry_task(job_id)
+    
     def get_scan_status_by_scan_id(self, scan_id: str) -> Optional[Dict]:
         """
         Get scan status by scan ID.
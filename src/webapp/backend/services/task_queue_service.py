@@ -49,6 +49,10 @@ class TaskInfo:
         self.error_message: Optional[str] = None
         self.progress: int = 0
         self.result: Optional[Any] = None
+        self.cancel_token: Optional[Any] = None
+        self.estimate: Optional[Dict[str, Any]] = None
+        self.orchestrator_callback: Optional[Callable] = None
+        self.attempts: int = 0
 
 
 class TaskQueueService:
@@ -61,21 +65,29 @@ class TaskQueueService:
     
     def __init__(self):
         """Initialize the task queue service."""
+        from src.core_engine.agent_pool import AgentPoolSet
+        
         logger.info("Initializing TaskQueueService")
         self._tasks: Dict[str, TaskInfo] = {}
         self._running_tasks: Dict[str, asyncio.Task] = {}
+        # Warm agents for the scans; concurrent scans never share a pool
+        self._agent_pools = AgentPoolSet()
         
     async def initiate_scan(
         self, 
         scan_request: ScanRequest, 
-        orchestrator_callback: Optional[Callable] = None
+        orchestrator_callback: Optional[Callable] = None,
+        estimate: Optional[Dict[str, Any]] = None
     ) -> tuple[str, str]:
         """
         Initiate a new scan task.
         
         Args:
             scan_request (ScanRequest): Scan configuration
-            orchestrator_callback (Optional[Callable]): Callback to actual orchestrator
+            orchestrator_callback (Optional[Callable]): Callback to actual orchestrator,
+                called with the scan request, an ``agent_pool`` checked out for the
+                scan, the ``scan_id`` and whether to ``resume`` a failed attempt
+            estimate (Optional[Dict[str, Any]]): Pre-flight cost estimate of the scan
             
         Returns:
             tuple[str, str]: (scan_id, job_id)
@@ -88,6 +100,8 @@ class TaskQueueService:
         
         # Create task info
         task_info = TaskInfo(job_id, scan_id, scan_request)
+        task_info.estimate = estimate
+        task_info.orchestrator_callback = orchestrator_callback
         self._tasks[job_id] = task_info
         
         # Create and start the background task
@@ -99,20 +113,60 @@ class TaskQueueService:
         logger.info(f"Started background task for scan_id={scan_id}")
         return scan_id, job_id
     
+    async def retry_task(self, job_id: str) -> bool:
+        """
+        Run a failed or cancelled task again, resuming its scan from the last completed stage.
+        
+        Args:
+            job_id (str): Task job identifier
+            
+        Returns:
+            bool: True if the task was restarted, False if not found, still
+                running or completed
+        """
+        task_info = self._tasks.get(job_id)
+        if task_info is None or task_info.status not in (TaskStatus.FAILED, TaskStatus.CANCELLED):
+            return False
+        
+        logger.info(f"Retrying task {job_id} (scan_id={task_info.scan_id})")
+        task_info.status = TaskStatus.PENDING
+        task_info.error_message = None
+        task_info.completed_at = None
+        self._running_tasks[job_id] = asyncio.create_task(
+            self._execute_scan_task(task_info, task_info.orchestrator_callback, resume=True)
+        )
+        return True
+    
     async def _execute_scan_task(
         self, 
         task_info: TaskInfo, 
-        orchestrator_callback: Optional[Callable] = None
+        orchestrator_callback: Optional[Callable] = None,
+        resume: bool = False
     ) -> None:
         """
         Execute a scan task in the background.
         
+        The scan's cancellation token (with the request's or the configured
+        time budget) is current while the orchestrator runs, so cancelling the
+        task also stops work running in worker threads at their next check.
+        The orchestrator gets an agent pool used by no other running scan,
+        returned for later scans when it finishes.
+        
         Args:
             task_info (TaskInfo): Task information
             orchestrator_callback (Optional[Callable]): Callback to orchestrator
+            resume (bool): Resume the scan of a failed attempt
         """
+        from config.settings import settings
+        from src.core_engine.cancellation import CancellationToken, activate, register_token, release_token
+        
         task_info.status = TaskStatus.RUNNING
         task_info.started_at = datetime.now()
+        task_info.attempts += 1
+        task_info.cancel_token = register_token(CancellationToken.with_timeout(
+            task_info.scan_request.timeout_seconds or settings.scan_timeout_seconds,
+            token_id=task_info.scan_id
+        ))
         
         try:
             logger.info(f"Executing scan task: {task_info.task_id}")
@@ -125,7 +179,13 @@ class TaskQueueService:
             
             # TODO: Call actual LangGraph orchestrator
             if orchestrator_callback:
-                result = await orchestrator_callback(task_info.scan_request)
+                with self._agent_pools.checkout() as agent_pool, activate(task_info.cancel_token):
+                    result = await orchestrator_callback(
+                        task_info.scan_request,
+                        agent_pool=agent_pool,
+                        scan_id=task_info.scan_id,
+                        resume=resume
+                    )
                 task_info.result = result
             else:
                 # Mock result for now
@@ -153,6 +213,7 @@ class TaskQueueService:
             # Clean up running task reference
             if task_info.task_id in self._running_tasks:
                 del self._running_tasks[task_info.task_id]
+            release_token(task_info.cancel_token.token_id)
     
     def get_task_status(self, job_id: str) -> Optional[Dict[str, Any]]:
         """
@@ -184,7 +245,8 @@ class TaskQueueService:
             "duration_seconds": duration,
             "error_message": task_info.error_message,
             "repository": task_info.scan_request.repo_url,
-            "scan_type": task_info.scan_request.scan_type.value
+            "scan_type": task_info.scan_request.scan_type.value,
+            "estimate": task_info.estimate
         }
     
     def get_scan_status_by_scan_id(self, scan_id: str) -> Optional[Dict[str, Any]]:
@@ -206,6 +268,9 @@ class TaskQueueService:
         """
         Cancel a running task.
         
+        Cancels the scan's token as well as the asyncio task, so blocking
+        stages running in worker threads stop at their next check.
+        
         Args:
             job_id (str): Task job identifier
             
@@ -214,6 +279,9 @@ class TaskQueueService:
         """
         if job_id in self._running_tasks:
             task = self._running_tasks[job_id]
+            task_info = self._tasks.get(job_id)
+            if task_info and task_info.cancel_token is not None:
+                task_info.cancel_token.cancel()
             task.cancel()
             logger.info(f"Cancelled task: {job_id}")
             return True
@@ -223,6 +291,9 @@ class TaskQueueService:
         """
         Clean up old completed/failed tasks.
         
+        Failed and cancelled scans cannot be retried afterwards, so the
+        checkpoints and file contents kept for their retry are dropped.
+        
         Args:
             max_age_hours (int): Maximum age in hours for keeping tasks
             
@@ -238,10 +309,22 @@ class TaskQueueService:
                 tasks_to_remove.append(job_id)
         
         for job_id in tasks_to_remove:
-            del self._tasks[job_id]
+            task_info = self._tasks.pop(job_id)
+            if task_info.status != TaskStatus.COMPLETED and task_info.orchestrator_callback:
+                # The scan can no longer be retried
+                self._discard_scan(task_info.scan_id)
         
         logger.info(f"Cleaned up {len(tasks_to_remove)} old tasks")
         return len(tasks_to_remove)
+    
+    def _discard_scan(self, scan_id: str) -> None:
+        """Drop the checkpoints and file contents kept for retrying a scan."""
+        from src.core_engine.orchestrator import discard_scan
+        
+        try:
+            discard_scan(scan_id)
+        except Exception as e:
+            logger.warning(f"Could not discard checkpoints of scan {scan_id}: {str(e)}")
 
 
 # Global task queue service instance
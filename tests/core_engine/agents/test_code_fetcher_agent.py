@@ -9,6 +9,7 @@ import pytest
 import tempfile
 import os
 import shutil
+from pathlib import Path
 from unittest.mock import patch, MagicMock, mock_open
 from git import Repo, GitCommandError
 
@@ -114,19 +115,26 @@ class TestCodeFetcherAgent:
     @patch('tempfile.mkdtemp')
     @patch('shutil.rmtree')
     @patch('os.path.exists')
-    @patch.object(CodeFetcherAgent, '_clone_repository')
-    @patch.object(CodeFetcherAgent, '_checkout_branch')
-    def test_get_pr_diff_success(self, mock_checkout, mock_clone, mock_exists, mock_rmtree, mock_mkdtemp):
+    @patch('src.core_engine.agents.code_fetcher_agent.iter_file_patches')
+    @patch('src.core_engine.agents.code_fetcher_agent.list_changes')
+    @patch.object(CodeFetcherAgent, '_fetch_pr_refs')
+    def test_get_pr_diff_success(self, mock_fetch, mock_list_changes, mock_patches, mock_exists, mock_rmtree, mock_mkdtemp):
         """Test successful PR diff retrieval."""
+        from src.core_engine.git_diff import DiffEntry, FilePatch
+        
         # Setup mocks
         mock_mkdtemp.return_value = "/tmp/test_dir"
         mock_exists.return_value = True
         mock_repo = MagicMock()
-        mock_clone.return_value = mock_repo
-        
-        # Mock git diff output
-        mock_repo.remotes.origin.fetch.return_value = None
-        mock_repo.git.diff.return_value = "diff --git a/file.py b/file.py\n+new line"
+        mock_repo.git.get_object_header.return_value = (b"oid", b"blob", 20)
+        mock_fetch.return_value = (mock_repo, "base", "head")
+        mock_list_changes.return_value = [
+            DiffEntry(status="modified", path="file.py", old_path=None, blob_id="oid"),
+            DiffEntry(status="modified", path="README.md", old_path=None, blob_id="oid")
+        ]
+        mock_patches.return_value = iter([
+            FilePatch(path="file.py", text="diff --git a/file.py b/file.py\n+new line")
+        ])
         
         # Test
         result = self.agent.get_pr_diff(
@@ -139,8 +147,8 @@ class TestCodeFetcherAgent:
         # Assertions
         assert "diff --git a/file.py b/file.py" in result
         assert "+new line" in result
-        mock_clone.assert_called_once()
-        mock_checkout.assert_called_once_with(mock_repo, "main")
+        mock_fetch.assert_called_once_with("https://github.com/test/repo.git", "/tmp/test_dir", "main", "feature")
+        assert [entry.path for entry in mock_patches.call_args[0][3]] == ["file.py"]
         mock_rmtree.assert_called_once_with("/tmp/test_dir")
     
     @patch('tempfile.mkdtemp')
@@ -371,6 +379,393 @@ index 0000000..1234567
         assert result is None
         mock_rmtree.assert_called_once_with("/tmp/test_dir")
 
+    def test_resolve_revision_branch_and_tag(self, tmp_path):
+        """Test resolving branches and annotated tags to commit SHAs."""
+        repo = Repo.init(tmp_path, initial_branch="main")
+        with repo.config_writer() as config:
+            config.set_value("user", "name", "Test")
+            config.set_value("user", "email", "test@example.com")
+        (tmp_path / "main.py").write_text("x = 1\n")
+        repo.index.add(["main.py"])
+        commit = repo.index.commit("initial")
+        repo.create_tag("v1.0", message="release")
+        
+        assert self.agent.resolve_revision(str(tmp_path), "main") == commit.hexsha
+        assert self.agent.resolve_revision(str(tmp_path), "v1.0") == commit.hexsha
+        assert self.agent.resolve_revision(str(tmp_path), commit.hexsha.upper()) == commit.hexsha
+    
+    def test_resolve_revision_unknown(self, tmp_path):
+        """Test resolving a revision that does not exist."""
+        repo = Repo.init(tmp_path, initial_branch="main")
+        (tmp_path / "main.py").write_text("x = 1\n")
+        repo.index.add(["main.py"])
+        repo.index.commit("initial")
+        
+        with pytest.raises(ValueError):
+            self.agent.resolve_revision(str(tmp_path), "missing-branch")
+
+
+class TestCodeFetcherAgentMirror:
+    """Test cases for CodeFetcherAgent backed by a persistent mirror store."""
+    
+    @pytest.fixture
+    def origin_url(self, tmp_path):
+        """Create an upstream repository with a main and a feature branch."""
+        repo = Repo.init(tmp_path / "origin", initial_branch="main")
+        with repo.config_writer() as config:
+            config.set_value("user", "name", "Test")
+            config.set_value("user", "email", "test@example.com")
+        (tmp_path / "origin" / "main.py").write_text("x = 1\n")
+        (tmp_path / "origin" / "pyproject.toml").write_text("[project]\n")
+        repo.index.add(["main.py", "pyproject.toml"])
+        repo.index.commit("initial")
+        repo.create_head("feature").checkout()
+        (tmp_path / "origin" / "main.py").write_text("x = 2\n")
+        repo.index.add(["main.py"])
+        repo.index.commit("feature work")
+        repo.heads.main.checkout()
+        return (tmp_path / "origin").as_uri()
+    
+    @pytest.fixture
+    def agent(self, tmp_path):
+        """Create an agent whose repositories are mirrored under tmp_path."""
+        from src.core_engine.repository_mirror import MirrorStore
+        
+        agent = CodeFetcherAgent()
+        with patch.object(agent, '_mirror_store', return_value=MirrorStore(str(tmp_path / "mirrors"))):
+            yield agent
+    
+    @patch('src.core_engine.agents.code_fetcher_agent.Repo.clone_from')
+    def test_project_files_from_object_database(self, mock_clone_from, agent, origin_url):
+        """Project files are read from the mirror's objects without cloning or checkout."""
+        manifests = {}
+        
+        with patch.object(agent, '_walk_checkout') as mock_walk:
+            files = agent.get_project_files(origin_url, "feature", manifests=manifests)
+        
+        assert files == {"main.py": "x = 2\n"}
+        assert manifests == {"pyproject.toml": "[project]\n"}
+        mock_clone_from.assert_not_called()
+        mock_walk.assert_not_called()
+    
+    def test_project_files_from_worktree(self, agent, origin_url):
+        """Project files are walked in a mirror worktree in checkout mode."""
+        with patch('src.core_engine.agents.code_fetcher_agent.settings') as mock_settings:
+            mock_settings.repository_mirror_checkout = True
+            mock_settings.max_file_size_mb = 10
+            
+            files = agent.get_project_files(origin_url, "feature")
+        
+        assert files == {"main.py": "x = 2\n"}
+    
+    def test_pr_diff_and_file_reads(self, agent, origin_url):
+        """Diffs and file contents come from the same mirror."""
+        diff = agent.get_pr_diff(origin_url, 1, target_branch="main", source_branch="feature")
+        
+        assert "+x = 2" in diff
+        assert agent.get_file_content_at_commit(origin_url, "main.py", "main") == "x = 1\n"
+        assert agent.get_file_content_at_commit(origin_url, "missing.py", "main") is None
+        assert agent.get_files_at_revision(origin_url, ["main.py"], "feature") == {"main.py": "x = 2\n"}
+    
+    def test_files_at_commits(self, agent, origin_url):
+        """File versions at several revisions come with their blob ids."""
+        versions = agent.get_files_at_commits(origin_url, [("main.py", "main"), ("main.py", "feature")])
+        
+        assert versions[("main.py", "main")].content == "x = 1\n"
+        assert versions[("main.py", "feature")].content == "x = 2\n"
+        assert versions[("main.py", "main")].blob_id != versions[("main.py", "feature")].blob_id
+    
+    def test_files_at_commits_without_mirror_store(self, origin_url):
+        """Without a mirror store the batch is read from a temporary mirror."""
+        agent = CodeFetcherAgent()
+        
+        with patch.object(agent, '_mirror_store', return_value=None):
+            versions = agent.get_files_at_commits(origin_url, [("main.py", "feature"), ("missing.py", "main")])
+        
+        assert list(versions) == [("main.py", "feature")]
+    
+    def test_lazy_project_files_from_object_database(self, agent, origin_url):
+        """Lazy project files are listed from the tree and read as blobs on access."""
+        from src.core_engine.project_files import LazyProjectFiles
+        
+        manifests = {}
+        
+        files = agent.get_project_files(origin_url, "feature", manifests=manifests, lazy=True)
+        
+        assert isinstance(files, LazyProjectFiles)
+        assert files.entries["main.py"].blob_id is not None
+        assert manifests == {"pyproject.toml": "[project]\n"}
+        assert dict(files) == {"main.py": "x = 2\n"}
+    
+    def test_lazy_project_files_from_temporary_clone(self, origin_url):
+        """Without a mirror store the clone lives until the mapping is closed."""
+        agent = CodeFetcherAgent()
+        
+        with patch.object(agent, '_mirror_store', return_value=None):
+            files = agent.get_project_files(origin_url, "feature", lazy=True)
+        
+        location = files.entries["main.py"].location
+        assert files["main.py"] == "x = 2\n"
+        files.close()
+        assert not os.path.exists(location)
+    
+    @pytest.mark.parametrize("mirrored,lazy", [(True, False), (True, True), (False, False), (False, True)])
+    def test_content_keys_are_tree_blob_ids(self, tmp_path, origin_url, mirrored, lazy):
+        """Every fetch mode reports the git blob ids of the files it returns."""
+        from src.core_engine.repository_mirror import MirrorStore
+        
+        agent = CodeFetcherAgent()
+        mirror_store = MirrorStore(str(tmp_path / "mirrors")) if mirrored else None
+        content_keys = {}
+        
+        with patch.object(agent, '_mirror_store', return_value=mirror_store):
+            files = agent.get_project_files(origin_url, "feature", lazy=lazy, content_keys=content_keys)
+        
+        feature_tree = Repo(tmp_path / "origin").heads.feature.commit.tree
+        assert content_keys == {"main.py": feature_tree["main.py"].hexsha}
+        if lazy:
+            files.close()
+    
+    def test_pr_diff_without_changes(self, agent, origin_url):
+        diff = agent.get_pr_diff(origin_url, 1, target_branch="main", source_branch="main")
+        
+        assert diff.startswith("# No differences found")
+
+
+class TestCodeFetcherAgentPartialClone:
+    """Test cases for blobless, sparse temporary clones."""
+    
+    @pytest.fixture
+    def origin_url(self, tmp_path):
+        """Create an upstream repository with a binary asset that allows object filters."""
+        repo = Repo.init(tmp_path / "origin", initial_branch="main")
+        with repo.config_writer() as config:
+            config.set_value("user", "name", "Test")
+            config.set_value("user", "email", "test@example.com")
+            config.set_value("uploadpack", "allowFilter", "true")
+        (tmp_path / "origin" / "app").mkdir()
+        (tmp_path / "origin" / "app" / "main.py").write_text("x = 1\n")
+        (tmp_path / "origin" / "package.json").write_text("{}\n")
+        (tmp_path / "origin" / "logo.png").write_bytes(os.urandom(1024))
+        repo.index.add(["app/main.py", "package.json", "logo.png"])
+        repo.index.commit("initial")
+        return (tmp_path / "origin").as_uri()
+    
+    def test_sparse_checkout_patterns(self):
+        """Patterns cover the supported extensions and the package manifests."""
+        patterns = CodeFetcherAgent()._sparse_checkout_patterns()
+        
+        assert "*.py" in patterns and "*.kt" in patterns
+        assert "pyproject.toml" in patterns
+        assert ".gitignore" in patterns and ".gitattributes" in patterns
+    
+    def test_partial_clone_checks_out_supported_files_only(self, tmp_path, origin_url):
+        """Binary assets are neither checked out nor downloaded."""
+        agent = CodeFetcherAgent()
+        
+        repo = agent._clone_repository(origin_url, str(tmp_path / "clone"), partial=True)
+        agent._checkout_branch(repo, "main")
+        
+        assert sorted(os.listdir(tmp_path / "clone")) == [".git", "app", "package.json"]
+        logo_oid = repo.commit("HEAD").tree["logo.png"].hexsha
+        missing = repo.git.rev_list("--objects", "--missing=print", "HEAD")
+        assert f"?{logo_oid}" in missing.splitlines()
+
+
+class TestCodeFetcherAgentExclusions:
+    """Test cases for leaving ignored, vendored and generated files out of project scans."""
+    
+    @pytest.fixture
+    def origin_url(self, tmp_path):
+        """Create an upstream repository with vendored, ignored and generated files."""
+        files = {
+            "app/main.py": "x = 1\n",
+            "app/api_pb2.py": "DESCRIPTOR = None\n",
+            "gen/client.py": "# Code generated by openapi-generator. DO NOT EDIT.\nclass Client: pass\n",
+            "node_modules/lib/setup.py": "setup()\n",
+            "local/settings.py": "DEBUG = True\n",
+            "lib/copied.py": "y = 2\n",
+            ".gitignore": "local/\n",
+            ".gitattributes": "lib/*.py linguist-vendored\n"
+        }
+        repo = Repo.init(tmp_path / "origin", initial_branch="main")
+        with repo.config_writer() as config:
+            config.set_value("user", "name", "Test")
+            config.set_value("user", "email", "test@example.com")
+            config.set_value("uploadpack", "allowFilter", "true")
+        for path, content in files.items():
+            full_path = tmp_path / "origin" / path
+            full_path.parent.mkdir(parents=True, exist_ok=True)
+            full_path.write_text(content)
+        repo.index.add(list(files))
+        repo.index.commit("initial")
+        return (tmp_path / "origin").as_uri()
+    
+    @pytest.mark.parametrize("source", ["clone", "partial_clone", "mirror"])
+    def test_project_files_exclusions(self, tmp_path, origin_url, source):
+        """Excluded files are counted per reason with their sizes."""
+        from src.core_engine.repository_mirror import MirrorStore
+        
+        agent = CodeFetcherAgent()
+        mirror_store = MirrorStore(str(tmp_path / "mirrors")) if source == "mirror" else None
+        exclusions = {}
+        
+        with patch.object(agent, '_mirror_store', return_value=mirror_store), \
+                patch('src.core_engine.agents.code_fetcher_agent.settings.repository_partial_clone', source == "partial_clone"):
+            files = agent.get_project_files(origin_url, "main", exclusions=exclusions)
+        
+        assert files == {"app/main.py": "x = 1\n"}
+        assert exclusions == {
+            "ignored": {"files": 1, "bytes": len("DEBUG = True\n")},
+            "vendored": {"files": 2, "bytes": len("setup()\n") + len("y = 2\n")},
+            "generated": {"files": 2, "bytes": len("DESCRIPTOR = None\n") + 71}
+        }
+    
+    def test_lazy_project_files_from_object_database_use_paths_only(self, tmp_path, origin_url):
+        """Lazy mirror listings do not read blobs to look for generator markers."""
+        from src.core_engine.repository_mirror import MirrorStore
+        
+        agent = CodeFetcherAgent()
+        exclusions = {}
+        
+        with patch.object(agent, '_mirror_store', return_value=MirrorStore(str(tmp_path / "mirrors"))):
+            files = agent.get_project_files(origin_url, "main", lazy=True, exclusions=exclusions)
+        
+        assert sorted(files) == ["app/main.py", "gen/client.py"]
+        assert exclusions["generated"]["files"] == 1
+    
+    def test_lazy_project_files_from_temporary_clone(self, origin_url):
+        agent = CodeFetcherAgent()
+        
+        with patch.object(agent, '_mirror_store', return_value=None):
+            files = agent.get_project_files(origin_url, "main", lazy=True)
+        
+        assert list(files) == ["app/main.py"]
+        files.close()
+    
+    def test_configured_exclude_globs(self, tmp_path, origin_url):
+        """Exclude globs apply on top of the repository's .gitignore files."""
+        agent = CodeFetcherAgent()
+        
+        with patch('src.core_engine.agents.code_fetcher_agent.settings') as mock_settings, \
+                patch.object(agent, '_mirror_store', return_value=None):
+            mock_settings.scan_exclude_globs = ["app/"]
+            mock_settings.scan_exclude_vendored = False
+            mock_settings.scan_read_workers = 2
+            mock_settings.max_file_size_mb = 10
+            mock_settings.repository_partial_clone = False
+            
+            files = agent.get_project_files(origin_url, "main")
+        
+        assert sorted(files) == ["gen/client.py", "lib/copied.py", "node_modules/lib/setup.py"]
+
+
+    def test_excluded_directory_count_is_capped(self, tmp_path):
+        """Counting an excluded directory stops after the configured number of files."""
+        for i in range(5):
+            package_dir = tmp_path / "node_modules" / f"pkg{i}"
+            package_dir.mkdir(parents=True)
+            (package_dir / "index.py").write_text("x = 1\n")
+            (package_dir / "README.md").write_text("docs\n")
+        exclusions = {}
+        
+        with patch('src.core_engine.agents.code_fetcher_agent.settings.scan_exclusion_count_limit', 4):
+            CodeFetcherAgent()._excluded_directory(
+                str(tmp_path / "node_modules"), "node_modules", "vendored", exclusions
+            )
+        
+        assert exclusions == {"vendored": {"files": 2, "bytes": 2 * len("x = 1\n")}}
+    
+    def test_excluded_directory_count_stops_when_cancelled(self, tmp_path):
+        """Counting an excluded directory checks for cancellation."""
+        from src.core_engine.cancellation import CancellationToken, ScanCancelled, activate
+        
+        (tmp_path / "vendor").mkdir()
+        (tmp_path / "vendor" / "lib.py").write_text("x = 1\n")
+        token = CancellationToken()
+        token.cancel()
+        exclusions = {}
+        
+        with activate(token), pytest.raises(ScanCancelled):
+            CodeFetcherAgent()._excluded_directory(str(tmp_path / "vendor"), "vendor", "vendored", exclusions)
+        
+        assert exclusions == {}
+
+
+class TestCodeFetcherAgentPullRequest:
+    """Test cases for PR diffs fetched down to the merge base."""
+    
+    @pytest.fixture
+    def origin(self, tmp_path):
+        """Create an upstream repository whose main branch moved far past a feature branch's fork point."""
+        repo = Repo.init(tmp_path / "origin", initial_branch="main")
+        with repo.config_writer() as config:
+            config.set_value("user", "name", "Test")
+            config.set_value("user", "email", "test@example.com")
+        
+        def commit(files, message):
+            for path, content in files.items():
+                full_path = tmp_path / "origin" / path
+                full_path.parent.mkdir(parents=True, exist_ok=True)
+                full_path.write_text(content)
+            repo.index.add(list(files))
+            return repo.index.commit(message)
+        
+        for i in range(100):
+            commit({"old.py": f"n = {i}\n"}, f"old work {i}")
+        fork = commit({"app.py": "x = 1\n", "README.md": "# Readme\n"}, "fork point")
+        repo.create_head("feature").checkout()
+        commit({"app.py": "x = 2\n", "README.md": "# Changed\n"}, "feature work")
+        commit({"node_modules/pkg/setup.py": "setup()\n"}, "vendored dependency")
+        repo.heads.main.checkout()
+        for i in range(120):
+            commit({"main.py": f"n = {i}\n"}, f"main work {i}")
+        return repo, fork.hexsha
+    
+    def test_only_the_pr_refs_are_fetched_down_to_the_merge_base(self, tmp_path, origin):
+        """The shallow history is deepened until the merge base is reachable."""
+        repo, fork_sha = origin
+        agent = CodeFetcherAgent()
+        
+        pr_repo, base, head = agent._fetch_pr_refs(
+            Path(repo.working_tree_dir).as_uri(), str(tmp_path / "pr"), "main", "feature"
+        )
+        
+        assert base == fork_sha
+        assert head == repo.heads.feature.commit.hexsha
+        assert os.path.exists(os.path.join(pr_repo.git_dir, "shallow"))
+        assert pr_repo.git.for_each_ref("--format=%(refname)").splitlines() == ["refs/pr/source", "refs/pr/target"]
+        assert int(pr_repo.git.rev_list("--count", "--all")) < 223
+    
+    def test_pr_diff_leaves_out_unsupported_and_vendored_files(self, origin):
+        repo, _ = origin
+        agent = CodeFetcherAgent()
+        exclusions = {}
+        
+        with patch.object(agent, '_mirror_store', return_value=None):
+            diff = agent.get_pr_diff(
+                Path(repo.working_tree_dir).as_uri(), 7, "main", "feature", exclusions=exclusions
+            )
+        
+        assert diff.startswith("diff --git a/app.py b/app.py")
+        assert "+x = 2" in diff
+        assert "README.md" not in diff and "main.py" not in diff and "old.py" not in diff
+        assert exclusions == {"vendored": {"files": 1, "bytes": len("setup()\n")}}
+    
+    def test_pr_diff_stream_can_be_closed_early(self, tmp_path, origin):
+        """Closing the per-file stream removes the temporary repository."""
+        repo, _ = origin
+        agent = CodeFetcherAgent()
+        
+        with patch.object(agent, '_mirror_store', return_value=None), \
+                patch('tempfile.mkdtemp', return_value=str(tmp_path / "pr")):
+            patches = agent.iter_pr_diff(Path(repo.working_tree_dir).as_uri(), 7, "main", "feature")
+            first = next(patches)
+            patches.close()
+        
+        assert first.startswith("diff --git a/app.py")
+        assert not os.path.exists(tmp_path / "pr")
+
 
 class TestCodeFetcherAgentIntegration:
     """Integration test scenarios for CodeFetcherAgent."""
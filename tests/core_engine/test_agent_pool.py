@@ -0,0 +1,187 @@
+"""
+Unit tests for AgentPool.
+
+Tests lazy agent creation, reuse across requests, lifecycle management and
+injection of the pool into orchestrator nodes.
+"""
+
+import pytest
+from unittest.mock import MagicMock
+
+from src.core_engine.agent_pool import AgentPool, AgentPoolSet, acquire_agent
+from src.core_engine.orchestrator import compile_graph, impact_analysis_node
+
+
+class DummyAgent:
+    """Simple agent used to observe pool behaviour."""
+
+    instances = 0
+
+    def __init__(self, flavor: str = "plain"):
+        DummyAgent.instances += 1
+        self.flavor = flavor
+        self.closed = False
+
+    def close(self):
+        self.closed = True
+
+
+@pytest.fixture(autouse=True)
+def reset_dummy_counter():
+    DummyAgent.instances = 0
+
+
+class TestAgentPool:
+    """Test cases for AgentPool."""
+
+    def test_agent_is_created_once_and_reused(self):
+        """Repeated requests return the same warm instance."""
+        pool = AgentPool(factories={"dummy": DummyAgent})
+
+        first = pool.get("dummy")
+        second = pool.get("dummy")
+
+        assert first is second
+        assert DummyAgent.instances == 1
+        assert pool.stats == {"created": 1, "reused": 1}
+
+    def test_constructor_arguments_are_part_of_the_key(self):
+        """Agents built with different arguments are pooled separately."""
+        pool = AgentPool(factories={"dummy": DummyAgent})
+
+        plain = pool.get("dummy")
+        spicy = pool.get("dummy", flavor="spicy")
+
+        assert plain is not spicy
+        assert spicy.flavor == "spicy"
+        assert len(pool) == 2
+
+    def test_slots_are_pooled_separately(self):
+        """Concurrent users of one agent type get their own warm instances."""
+        pool = AgentPool(factories={"dummy": DummyAgent})
+
+        default = pool.get("dummy")
+        branch = pool.get("dummy", slot="diagram_extraction")
+
+        assert branch is not default
+        assert acquire_agent(pool, "dummy", DummyAgent, slot="diagram_extraction") is branch
+        assert DummyAgent.instances == 2
+
+    def test_import_path_factories(self):
+        """Factories can be given as lazy "module:Class" import paths."""
+        pool = AgentPool()
+
+        agent = pool.get("impact_analyzer")
+
+        assert type(agent).__name__ == "ImpactAnalysisAgent"
+
+    def test_unknown_agent_type(self):
+        """Requesting an unregistered agent type raises KeyError."""
+        with pytest.raises(KeyError):
+            AgentPool().get("does_not_exist")
+
+    def test_close_calls_agent_hooks(self):
+        """Closing the pool releases agents and rejects further requests."""
+        pool = AgentPool(factories={"dummy": DummyAgent})
+        agent = pool.get("dummy")
+
+        pool.close()
+
+        assert agent.closed is True
+        assert len(pool) == 0
+        with pytest.raises(RuntimeError):
+            pool.get("dummy")
+
+    def test_context_manager_closes_pool(self):
+        """The pool can be scoped with a with-statement."""
+        with AgentPool(factories={"dummy": DummyAgent}) as pool:
+            agent = pool.get("dummy")
+
+        assert agent.closed is True
+
+    def test_warm_up_ignores_failing_agents(self):
+        """Warm-up creates agents eagerly and tolerates broken factories."""
+        broken = MagicMock(side_effect=RuntimeError("boom"))
+        pool = AgentPool(factories={"dummy": DummyAgent, "broken": broken})
+
+        pool.warm_up("dummy", "broken")
+
+        assert DummyAgent.instances == 1
+
+    def test_acquire_agent_without_pool(self):
+        """Without a pool a fresh agent is built every time."""
+        first = acquire_agent(None, "dummy", DummyAgent)
+        second = acquire_agent(None, "dummy", DummyAgent)
+
+        assert first is not second
+
+
+
+class TestAgentPoolSet:
+    """Test cases for AgentPoolSet."""
+
+    def test_concurrent_scans_get_separate_pools(self):
+        pools = AgentPoolSet()
+
+        with pools.checkout() as first, pools.checkout() as second:
+            assert first is not second
+
+        assert pools.stats == {"created": 2, "reused": 0}
+
+    def test_returned_pools_are_reused_warm(self):
+        pools = AgentPoolSet()
+
+        with pools.checkout() as first:
+            first.register("dummy", DummyAgent)
+            agent = first.get("dummy")
+        with pools.checkout() as second:
+            assert second is first
+            assert second.get("dummy") is agent
+
+    def test_pools_beyond_max_idle_are_closed(self):
+        pools = AgentPoolSet(max_idle=1)
+
+        with pools.checkout() as first:
+            first.register("dummy", DummyAgent)
+            agent = first.get("dummy")
+            with pools.checkout() as second:
+                pass
+
+        assert agent.closed
+        with pools.checkout() as reused:
+            assert reused is second
+
+    def test_close(self):
+        pools = AgentPoolSet()
+        with pools.checkout() as agent_pool:
+            pass
+
+        pools.close()
+
+        assert agent_pool._closed
+        with pytest.raises(RuntimeError):
+            with pools.checkout():
+                pass
+
+
+class TestAgentPoolInjection:
+    """Test cases for injecting the pool into the workflow."""
+
+    def test_node_uses_pooled_agent(self):
+        """Nodes take their agents from the injected pool."""
+        pool = AgentPool()
+        state = {
+            "pr_diff": "diff --git a/foo.py b/foo.py",
+            "workflow_metadata": {"changed_files": ["foo.py"], "dependency_graph": {}}
+        }
+
+        impact_analysis_node(state, agent_pool=pool)
+        impact_analysis_node(state, agent_pool=pool)
+
+        assert pool.stats == {"created": 1, "reused": 1}
+
+    def test_compile_graph_with_pool(self):
+        """The workflow compiles with an injected pool."""
+        app = compile_graph(agent_pool=AgentPool())
+
+        assert hasattr(app, "invoke")
@@ -0,0 +1,174 @@
+"""
+Unit tests for multi-repository batch scanning.
+
+Tests target parsing, scheduling over warm workers with a concurrency limit,
+per-repository failure isolation, cancellation and the batch summary.
+"""
+
+import threading
+import time
+
+import pytest
+from unittest.mock import MagicMock, patch
+
+from src.core_engine.batch_scanner import BatchScanner, main, parse_target
+
+
+def completed_state(findings=2):
+    return {
+        "current_step": "completed",
+        "static_analysis_summary": {"total_findings": findings},
+        "report_data": {"summary": "ok"},
+        "content_store_root": None
+    }
+
+
+class TestParseTarget:
+    """Test cases for parse_target."""
+
+    def test_project_scan(self):
+        """A bare URL requests a project scan of the default branch."""
+        assert parse_target("https://github.com/example/repo") == {
+            "repo_url": "https://github.com/example/repo", "scan_type": "project"
+        }
+
+    def test_project_scan_of_branch(self):
+        """A ref after "@" selects the branch."""
+        target = parse_target("https://github.com/example/repo@release/1.2")
+
+        assert target == {"repo_url": "https://github.com/example/repo", "scan_type": "project", "branch": "release/1.2"}
+        assert parse_target("https://user@github.com/example/repo")["repo_url"] == "https://user@github.com/example/repo"
+
+    def test_ssh_url(self):
+        """The user part of an scp-like URL is not mistaken for a branch."""
+        assert parse_target("git@github.com:example/repo.git")["repo_url"] == "git@github.com:example/repo.git"
+        assert parse_target("git@github.com:example/repo.git@dev")["branch"] == "dev"
+
+    def test_pull_request(self):
+        """A number after "#" requests a PR scan."""
+        assert parse_target("https://github.com/example/repo#42") == {
+            "repo_url": "https://github.com/example/repo", "pr_id": 42, "scan_type": "pr"
+        }
+
+    def test_invalid_pull_request(self):
+        """Non-numeric PR IDs are rejected."""
+        with pytest.raises(ValueError):
+            parse_target("https://github.com/example/repo#abc")
+
+
+class TestBatchScanner:
+    """Test cases for BatchScanner."""
+
+    def make_scanner(self, **kwargs):
+        kwargs.setdefault("max_concurrency", 2)
+        return BatchScanner(timeout_seconds=60, warm_agent_types=(), **kwargs)
+
+    @patch('src.core_engine.orchestrator.compile_graph')
+    def test_results_and_summary(self, mock_compile):
+        """Every repository gets a result in input order plus a batch summary."""
+        mock_compile.return_value.invoke.return_value = completed_state()
+        targets = [{"repo_url": f"https://github.com/example/repo{i}"} for i in range(5)]
+
+        batch = self.make_scanner().run(targets)
+
+        assert [r["repo_url"] for r in batch["results"]] == [t["repo_url"] for t in targets]
+        assert all(r["status"] == "completed" for r in batch["results"])
+        assert batch["results"][0]["report"] == {"summary": "ok"}
+        summary = batch["summary"]
+        assert summary["completed"] == 5
+        assert summary["total_findings"] == 10
+        assert summary["workers"] == 2
+        assert summary["repos_per_hour"] > 0
+
+    @patch('src.core_engine.orchestrator.compile_graph')
+    def test_workflow_compiled_once_per_worker(self, mock_compile):
+        """Workers reuse their compiled workflow and agent pool across repositories."""
+        mock_compile.return_value.invoke.return_value = completed_state()
+
+        self.make_scanner(max_concurrency=3).run([{"repo_url": f"r{i}"} for i in range(9)])
+
+        assert mock_compile.call_count == 3
+        assert mock_compile.return_value.invoke.call_count == 9
+
+    @patch('src.core_engine.orchestrator.compile_graph')
+    def test_concurrency_limit(self, mock_compile):
+        """No more than max_concurrency repositories are scanned at a time."""
+        running, peak = [0], [0]
+        lock = threading.Lock()
+
+        def invoke(state):
+            with lock:
+                running[0] += 1
+                peak[0] = max(peak[0], running[0])
+            time.sleep(0.05)
+            with lock:
+                running[0] -= 1
+            return completed_state()
+
+        mock_compile.return_value.invoke.side_effect = invoke
+
+        self.make_scanner(max_concurrency=2).run([{"repo_url": f"r{i}"} for i in range(6)])
+
+        assert peak[0] == 2
+
+    @patch('src.core_engine.orchestrator.compile_graph')
+    def test_failures_are_isolated(self, mock_compile):
+        """A failing repository is reported without stopping the batch."""
+        def invoke(state):
+            repo_url = state["scan_request_data"]["repo_url"]
+            if repo_url == "broken":
+                raise RuntimeError("clone failed")
+            if repo_url == "empty":
+                return {"current_step": "error_handled", "error_message": "No supported files found"}
+            return completed_state()
+
+        mock_compile.return_value.invoke.side_effect = invoke
+        on_result = MagicMock()
+
+        batch = self.make_scanner().run(
+            [{"repo_url": "ok"}, {"repo_url": "broken"}, {"repo_url": "empty"}], on_result=on_result
+        )
+
+        statuses = {r["repo_url"]: (r["status"], r["error_message"]) for r in batch["results"]}
+        assert statuses["ok"] == ("completed", None)
+        assert statuses["broken"] == ("failed", "clone failed")
+        assert statuses["empty"] == ("failed", "No supported files found")
+        assert batch["summary"]["failed"] == 2
+        assert on_result.call_count == 3
+
+    @patch('src.core_engine.orchestrator.compile_graph')
+    def test_cancel_skips_queued_repositories(self, mock_compile):
+        """Cancelling the batch cancels running scans and skips the rest."""
+        from src.core_engine.cancellation import is_cancelled
+
+        scanner = self.make_scanner(max_concurrency=1)
+        cancelled = []
+
+        def invoke(state):
+            scanner.cancel()
+            cancelled.append(is_cancelled())
+            return {"current_step": "error_handled", "error_message": "Scan was cancelled"}
+
+        mock_compile.return_value.invoke.side_effect = invoke
+
+        batch = scanner.run([{"repo_url": f"r{i}"} for i in range(4)])
+
+        assert cancelled == [True]
+        assert batch["summary"]["failed"] == 1
+        assert batch["summary"]["skipped"] == 3
+
+    @patch('src.core_engine.orchestrator.compile_graph')
+    def test_command_line(self, mock_compile, tmp_path, capsys):
+        """The CLI reads targets from a file and writes the batch as JSON."""
+        mock_compile.return_value.invoke.return_value = completed_state()
+        targets = tmp_path / "repos.txt"
+        targets.write_text("# nightly\nhttps://github.com/example/a@dev\n\nhttps://github.com/example/b#7\n")
+        output = tmp_path / "batch.json"
+
+        with patch('src.core_engine.batch_scanner.BatchScanner', wraps=BatchScanner) as mock_scanner:
+            exit_code = main([str(targets), "-c", "2", "--timeout", "60", "-o", str(output)])
+
+        assert exit_code == 0
+        assert mock_scanner.call_args.kwargs["max_concurrency"] == 2
+        assert '"completed": 2' in output.read_text()
+        assert "repos_per_hour" in capsys.readouterr().out
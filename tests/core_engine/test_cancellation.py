@@ -0,0 +1,256 @@
+"""
+Unit tests for cooperative scan cancellation and time budgets.
+
+Tests the cancellation token, its registry and context activation, the
+cancellable node wrapper of the orchestrator and graceful degradation of
+LLM review once most of the time budget is used.
+"""
+
+import threading
+import time
+
+import pytest
+from unittest.mock import MagicMock, patch
+
+from src.core_engine.cancellation import (
+    REASON_CANCELLED,
+    REASON_DEADLINE,
+    CancellationToken,
+    ScanCancelled,
+    activate,
+    budget_exhausted,
+    check_cancelled,
+    current_token,
+    register_token,
+    release_token,
+    resolve_token
+)
+from src.core_engine.streaming_pipeline import PipelineStage, StreamingPipeline
+
+
+class TestCancellationToken:
+    """Test cases for CancellationToken."""
+
+    def test_explicit_cancel(self):
+        """A cancelled token stops the scan at the next check."""
+        token = CancellationToken()
+        token.check()
+
+        token.cancel()
+
+        assert token.is_cancelled
+        with pytest.raises(ScanCancelled) as exc_info:
+            token.check()
+        assert exc_info.value.reason == REASON_CANCELLED
+
+    def test_deadline(self):
+        """A token whose deadline passed behaves like a cancelled one."""
+        token = CancellationToken(started_at=time.time() - 10, deadline=time.time() - 1)
+
+        assert token.reason == REASON_DEADLINE
+        assert token.remaining() == 0.0
+        assert token.budget_used() == 1.0
+        with pytest.raises(ScanCancelled, match="time budget"):
+            token.check()
+
+    def test_without_deadline(self):
+        """Tokens without a deadline never run out of budget."""
+        token = CancellationToken.with_timeout(None)
+
+        assert token.deadline is None
+        assert token.remaining() is None
+        assert token.budget_used() == 0.0
+        assert not token.is_cancelled
+
+    def test_budget_used(self):
+        """The used budget is the elapsed fraction of the time between start and deadline."""
+        now = time.time()
+        token = CancellationToken(started_at=now - 90, deadline=now + 10)
+
+        assert 0.89 < token.budget_used() < 0.92
+
+    def test_not_swallowed_by_exception_handlers(self):
+        """Handlers that skip failing files or rules do not catch cancellation."""
+        def analyze():
+            try:
+                raise ScanCancelled()
+            except Exception:
+                return "skipped"
+
+        with pytest.raises(ScanCancelled):
+            analyze()
+
+    def test_round_trip(self):
+        """The state description rebuilds a token with the same deadline."""
+        token = CancellationToken.with_timeout(60)
+
+        rebuilt = CancellationToken.from_dict(token.to_dict())
+
+        assert rebuilt.token_id == token.token_id
+        assert rebuilt.deadline == token.deadline
+        assert rebuilt.started_at == token.started_at
+
+
+class TestTokenRegistryAndContext:
+    """Test cases for the token registry and the current token."""
+
+    def test_resolve_registered_token(self):
+        """The live token is found by the ID stored in the state."""
+        token = register_token(CancellationToken())
+        try:
+            assert resolve_token(token.to_dict()) is token
+        finally:
+            release_token(token.token_id)
+
+    def test_resolve_rebuilds_missing_token(self):
+        """A token from another process is rebuilt from its description."""
+        description = CancellationToken.with_timeout(30).to_dict()
+
+        token = resolve_token(description)
+        try:
+            assert token.deadline == description["deadline"]
+        finally:
+            release_token(token.token_id)
+
+    def test_resolve_without_token(self):
+        """Scans without a token resolve to None."""
+        assert resolve_token(None) is None
+
+    def test_activate_sets_current_token(self):
+        """Checks inside the block see the activated token."""
+        token = CancellationToken()
+        check_cancelled()
+
+        with activate(token):
+            assert current_token() is token
+            token.cancel()
+            with pytest.raises(ScanCancelled):
+                check_cancelled()
+
+        assert current_token() is None
+        check_cancelled()
+
+    def test_budget_exhausted(self):
+        """Optional work is skipped once the threshold of the budget is used."""
+        now = time.time()
+        assert not budget_exhausted()
+
+        with activate(CancellationToken(started_at=now - 85, deadline=now + 15)):
+            assert budget_exhausted()
+            assert not budget_exhausted(threshold=0.9)
+
+        with activate(CancellationToken.with_timeout(None)):
+            assert not budget_exhausted()
+
+
+class TestPipelineCancellation:
+    """Test cases for cancelling a streaming pipeline."""
+
+    def test_cancelled_token_stops_the_pipeline(self):
+        """Stage workers stop taking items once the scan is cancelled."""
+        token = CancellationToken()
+        seen = []
+
+        def record(worker_index, item):
+            seen.append(item)
+            if item == 2:
+                token.cancel()
+            return item
+
+        pipeline = StreamingPipeline(
+            [PipelineStage("record", record)], queue_size=1, is_cancelled=lambda: token.is_cancelled
+        )
+        list(pipeline.run(range(1000)))
+
+        assert len(seen) < 10
+        assert not [t for t in threading.enumerate() if t.name.startswith("stream-")]
+
+    def test_stage_cancellation_is_raised(self):
+        """A stage raising ScanCancelled aborts the run instead of dropping the item."""
+        def cancel(worker_index, item):
+            raise ScanCancelled(REASON_DEADLINE)
+
+        pipeline = StreamingPipeline([PipelineStage("cancel", cancel, workers=2)])
+
+        with pytest.raises(ScanCancelled):
+            list(pipeline.run(range(10)))
+
+
+class TestCancellableNodes:
+    """Test cases for the cancellable node wrapper and degradation in the workflow."""
+
+    def test_cancelled_scan_does_not_start_nodes(self):
+        """Nodes are not run once the token was cancelled."""
+        from src.core_engine.orchestrator import _cancellable_node
+
+        token = register_token(CancellationToken())
+        token.cancel()
+        node_fn = MagicMock(return_value={"current_step": "parse_code"})
+
+        result = _cancellable_node("fetch_code", node_fn)({"cancellation": token.to_dict()})
+
+        node_fn.assert_not_called()
+        assert result["current_step"] == "error"
+        assert result["workflow_metadata"]["cancellation_reason"] == REASON_CANCELLED
+
+    def test_cancellation_inside_node_becomes_error(self):
+        """ScanCancelled raised by an agent ends the node with a workflow error."""
+        from src.core_engine.orchestrator import _cancellable_node
+
+        token = register_token(CancellationToken())
+
+        def node_fn(state):
+            token.cancel()
+            check_cancelled()
+
+        result = _cancellable_node("parse_code", node_fn)({"cancellation": token.to_dict()})
+
+        assert result["current_step"] == "error"
+        assert result["error_message"] == "Scan was cancelled"
+
+    def test_error_handler_runs_after_cancellation(self):
+        """Error handling still runs and releases the token."""
+        from src.core_engine.orchestrator import _cancellable_node, handle_error_node
+
+        token = register_token(CancellationToken())
+        token.cancel()
+
+        result = _cancellable_node("handle_error", handle_error_node)({
+            "cancellation": token.to_dict(),
+            "error_message": "Scan was cancelled",
+            "current_step": "error",
+            "workflow_metadata": {"cancellation_reason": REASON_CANCELLED}
+        })
+
+        assert result["current_step"] == "error_handled"
+        assert result["report_data"]["error_details"]["cancellation_reason"] == REASON_CANCELLED
+
+    def test_start_scan_creates_token_with_budget(self):
+        """A scan started without a token gets one with the requested budget."""
+        from src.core_engine.orchestrator import create_initial_state, start_scan
+
+        state = create_initial_state({"repo_url": "https://github.com/example/repo", "timeout_seconds": 120})
+
+        cancellation = start_scan(state)["cancellation"]
+
+        assert cancellation["deadline"] - cancellation["started_at"] == pytest.approx(120)
+        release_token(cancellation["token_id"])
+
+    def test_llm_review_skips_files_without_findings_near_deadline(self):
+        """Files with findings are still reviewed once the budget runs low."""
+        from src.core_engine.agents.llm_orchestrator_agent import LLMOrchestratorAgent
+
+        agent = LLMOrchestratorAgent(llm_provider="mock")
+        now = time.time()
+        code_files = {"clean.py": "x = 1\n", "risky.py": "print('debug')\n"}
+        findings = [{"file": "risky.py", "rule_id": "PRINT_STATEMENT"}]
+
+        with patch.object(agent, "invoke_llm", return_value="reviewed") as mock_invoke:
+            with activate(CancellationToken(started_at=now - 90, deadline=now + 10)):
+                insights = agent.analyze_code_with_context(code_files, findings)
+
+        mock_invoke.assert_called_once()
+        assert mock_invoke.call_args.kwargs["code_snippet"] == "print('debug')\n"
+        assert "# Analysis for risky.py" in insights
+        assert "# Analysis for clean.py" not in insights
+        assert "Skipped files" in insights
@@ -0,0 +1,173 @@
+"""
+Unit tests for scan workflow checkpointing.
+
+Tests the SQLite checkpointer, exclusion of tree-sitter trees from
+checkpoints and resuming a failed scan from its last completed step.
+"""
+
+import os
+from typing import TypedDict
+from unittest.mock import patch
+
+import pytest
+from langgraph.graph import StateGraph, END
+
+from src.core_engine.checkpointing import (
+    SQLiteCheckpointSaver,
+    get_scan_config,
+    strip_non_serializable
+)
+from src.core_engine.diff_model import parse_unified_diff
+from src.core_engine.orchestrator import (
+    _restore_ast_nodes,
+    compile_graph,
+    create_sample_scan_request,
+    discard_scan,
+    resume_scan
+)
+
+
+NEW_FILE_DIFF = """diff --git a/shapes.py b/shapes.py
+new file mode 100644
+--- /dev/null
++++ b/shapes.py
+@@ -0,0 +1,3 @@
++class Square:
++    def area(self, side):
++        return side * side
+"""
+
+
+class CounterState(TypedDict):
+    count: int
+
+
+def build_counter_graph(checkpointer):
+    """Build a tiny two-step graph for checkpointer tests."""
+    workflow = StateGraph(CounterState)
+    workflow.add_node("first", lambda state: {"count": state["count"] + 1})
+    workflow.add_node("second", lambda state: {"count": state["count"] * 10})
+    workflow.set_entry_point("first")
+    workflow.add_edge("first", "second")
+    workflow.add_edge("second", END)
+    return workflow.compile(checkpointer=checkpointer)
+
+
+class TestSQLiteCheckpointSaver:
+    """Test cases for SQLiteCheckpointSaver."""
+
+    def test_checkpoints_every_step(self):
+        """A checkpoint is stored after every step, newest first."""
+        app = build_counter_graph(SQLiteCheckpointSaver())
+
+        result = app.invoke({"count": 1}, get_scan_config("scan-1"))
+        history = list(app.get_state_history(get_scan_config("scan-1")))
+
+        assert result == {"count": 20}
+        assert [snapshot.values.get("count") for snapshot in history] == [20, 2, 1, None]
+        assert history[1].next == ("second",)
+
+    def test_checkpoints_persist_across_instances(self, tmp_path):
+        """Checkpoints written by one saver are visible to a new one."""
+        db_path = str(tmp_path / "checkpoints" / "scans.sqlite")
+        build_counter_graph(SQLiteCheckpointSaver(db_path)).invoke({"count": 1}, get_scan_config("scan-1"))
+
+        reopened = build_counter_graph(SQLiteCheckpointSaver(db_path))
+
+        assert reopened.get_state(get_scan_config("scan-1")).values == {"count": 20}
+        assert reopened.get_state(get_scan_config("scan-2")).values == {}
+
+    def test_delete_thread(self):
+        """Deleting a scan removes all of its checkpoints."""
+        saver = SQLiteCheckpointSaver()
+        build_counter_graph(saver).invoke({"count": 1}, get_scan_config("scan-1"))
+
+        saver.delete_thread("scan-1")
+
+        assert saver.get_tuple(get_scan_config("scan-1")) is None
+        assert list(saver.list(get_scan_config("scan-1"))) == []
+
+
+class TestSyntaxTreeExclusion:
+    """Test cases for keeping tree-sitter trees out of checkpoints."""
+
+    def test_strip_non_serializable(self):
+        """ast_node entries are removed at any nesting depth."""
+        value = {"a.py": {"ast_node": object(), "language": "python"}, "items": [{"ast_node": 1}]}
+
+        assert strip_non_serializable(value) == {"a.py": {"language": "python"}, "items": [{}]}
+
+    def test_restore_ast_nodes_from_change_set(self):
+        """Missing trees are re-derived from post-images in the state."""
+        state = create_sample_scan_request()
+        state.update(
+            change_set=parse_unified_diff(NEW_FILE_DIFF),
+            parsed_asts={"shapes.py": {"language": "python", "structural_info": {}}}
+        )
+
+        restored = _restore_ast_nodes(state)
+
+        assert restored["shapes.py"]["ast_node"] is not None
+        assert "ast_node" not in state["parsed_asts"]["shapes.py"]
+
+
+class TestResumeScan:
+    """Test cases for resuming checkpointed scans."""
+
+    @patch('src.core_engine.agents.llm_orchestrator_agent.LLMOrchestratorAgent')
+    @patch('src.core_engine.agents.code_fetcher_agent.CodeFetcherAgent')
+    def run_failing_scan(self, saver, mock_fetcher_class, mock_llm_class):
+        """Run a PR scan whose LLM stage fails."""
+        mock_fetcher_class.return_value.get_pr_diff.return_value = NEW_FILE_DIFF
+        mock_fetcher_class.return_value.get_changed_files_from_diff.return_value = ["shapes.py"]
+        mock_llm_class.side_effect = RuntimeError("LLM provider unavailable")
+
+        return compile_graph(checkpointer=saver).invoke(
+            create_sample_scan_request(), get_scan_config("scan-42")
+        )
+
+    def test_resume_reruns_only_failed_stage(self, tmp_path):
+        """Resuming skips fetching and parsing and completes the scan."""
+        db_path = str(tmp_path / "scans.sqlite")
+        failed = self.run_failing_scan(SQLiteCheckpointSaver(db_path))
+        assert failed["current_step"] == "error_handled"
+
+        with patch('src.core_engine.agents.code_fetcher_agent.CodeFetcherAgent') as mock_fetcher_class, \
+             patch('src.core_engine.orchestrator.parse_code_node') as mock_parse:
+            result = resume_scan("scan-42", checkpointer=SQLiteCheckpointSaver(db_path))
+
+        assert result["current_step"] == "completed"
+        assert result["llm_insights"]
+        assert result["report_data"] is not None
+        mock_fetcher_class.assert_not_called()
+        mock_parse.assert_not_called()
+
+    def test_resume_completed_scan_is_noop(self):
+        """A completed scan returns its final state without running nodes."""
+        saver = SQLiteCheckpointSaver()
+        self.run_failing_scan(saver)
+        first = resume_scan("scan-42", checkpointer=saver)
+
+        with patch('src.core_engine.orchestrator.reporting_node') as mock_reporting:
+            second = resume_scan("scan-42", checkpointer=saver)
+
+        mock_reporting.assert_not_called()
+        assert second["current_step"] == "completed"
+        assert second["llm_insights"] == first["llm_insights"]
+
+    def test_discard_scan_removes_checkpoints_and_contents(self):
+        saver = SQLiteCheckpointSaver()
+        failed = self.run_failing_scan(saver)
+        store_root = failed["content_store_root"]
+        assert os.path.isdir(store_root)
+
+        discard_scan("scan-42", checkpointer=saver)
+
+        assert not os.path.exists(store_root)
+        with pytest.raises(ValueError):
+            resume_scan("scan-42", checkpointer=saver)
+
+    def test_resume_unknown_scan(self):
+        """Resuming a scan without checkpoints is an error."""
+        with pytest.raises(ValueError):
+            resume_scan("missing-scan", checkpointer=SQLiteCheckpointSaver())
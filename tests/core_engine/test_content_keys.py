@@ -0,0 +1,77 @@
+"""
+Unit tests for the content keys shared by the scan caches.
+
+Tests that hashed contents match git's blob ids, key validation, lookups of
+known blob ids and reading blob ids from a checkout's index.
+"""
+
+import os
+from pathlib import Path
+
+import pytest
+from git import Repo
+
+from src.core_engine.content_keys import ContentKey, git_blob_id, worktree_blob_ids
+from src.core_engine.stage_cache import content_hash
+
+
+@pytest.fixture
+def checkout(tmp_path):
+    """Create a committed working tree with a symbolic link."""
+    repo = Repo.init(tmp_path / "repo", initial_branch="main")
+    with repo.config_writer() as config:
+        config.set_value("user", "name", "Test")
+        config.set_value("user", "email", "test@example.com")
+    (tmp_path / "repo" / "app").mkdir()
+    (tmp_path / "repo" / "app" / "main.py").write_text("x = 1\n")
+    (tmp_path / "repo" / "util.py").write_text("y = 1\n")
+    os.symlink("util.py", tmp_path / "repo" / "link.py")
+    repo.index.add(["app/main.py", "util.py", "link.py"])
+    repo.index.commit("initial")
+    return repo
+
+
+class TestContentKey:
+    """Test cases for ContentKey."""
+
+    def test_hashed_contents_match_git_blob_ids(self, checkout):
+        tree = checkout.head.commit.tree
+
+        assert git_blob_id("x = 1\n") == tree["app/main.py"].hexsha
+        assert git_blob_id(b"y = 1\n") == tree["util.py"].hexsha
+        assert content_hash("x = 1\n") == tree["app/main.py"].hexsha
+
+    def test_keys_are_plain_strings(self):
+        key = ContentKey.for_content("")
+
+        assert key == "e69de29bb2d1d6434b8b29ae775ad8c2e48c5391"
+        assert isinstance(key, str)
+
+    def test_for_blob_validates_ids(self):
+        assert ContentKey.for_blob("a" * 40) == "a" * 40
+        with pytest.raises(ValueError):
+            ContentKey.for_blob("main")
+
+    def test_for_file_uses_known_blob_ids(self):
+        """Contents are only hashed for files without a known blob id."""
+        known = {"a.py": "b" * 40}
+
+        assert ContentKey.for_file("a.py", "ignored", known) == "b" * 40
+        assert ContentKey.for_file("c.py", "x = 1\n", known) == git_blob_id("x = 1\n")
+        assert ContentKey.for_file("c.py", "x = 1\n") == git_blob_id("x = 1\n")
+
+
+class TestWorktreeBlobIds:
+    """Test cases for worktree_blob_ids."""
+
+    def test_unmodified_files_from_the_index(self, checkout):
+        """Modified files and symbolic links get no blob id."""
+        tree = checkout.head.commit.tree
+        Path(checkout.working_tree_dir, "util.py").write_text("y = 2\n")
+
+        blob_ids = worktree_blob_ids(checkout.working_tree_dir)
+
+        assert blob_ids == {"app/main.py": tree["app/main.py"].hexsha}
+
+    def test_directory_outside_git(self, tmp_path):
+        assert worktree_blob_ids(str(tmp_path)) == {}
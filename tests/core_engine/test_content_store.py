@@ -0,0 +1,228 @@
+"""
+Unit tests for the scan content store.
+
+Tests blob storage and deduplication, the BlobMapping handles kept in the
+workflow state and how the orchestrator keeps file contents, structural info
+and syntax trees out of the state.
+"""
+
+import pickle
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from src.core_engine.checkpointing import CheckpointSerializer
+from src.core_engine.content_store import BlobMapping, ContentStore, open_content_store
+from src.core_engine.orchestrator import (
+    _restore_ast_nodes,
+    create_sample_scan_request,
+    fetch_code_node,
+    parse_code_node
+)
+from src.core_engine.stage_cache import content_hash
+
+
+PROJECT_FILES = {
+    "main.py": "def main():\n    return 1\n",
+    "utils.py": "def helper():\n    pass\n",
+    "copy_of_main.py": "def main():\n    return 1\n"
+}
+
+
+@pytest.fixture
+def store(tmp_path):
+    store = open_content_store(str(tmp_path / "scan"))
+    yield store
+    store.cleanup()
+
+
+class TestContentStore:
+    """Test cases for ContentStore."""
+
+    def test_put_and_get(self, store):
+        """Blobs are appended and read back by reference."""
+        first = store.put("alpha")
+        second = store.put(b"beta")
+
+        assert store.get_text(first) == "alpha"
+        assert store.get(second) == b"beta"
+        assert store.size == 9
+
+    def test_identical_blobs_are_stored_once(self, store):
+        """Identical contents share a single blob."""
+        assert store.put("same text") == store.put("same text")
+        assert store.size == len("same text")
+
+    def test_reads_after_growth(self, store):
+        """Blobs written after the file was mapped are still readable."""
+        first = store.put("x" * 10)
+        store.get(first)
+        second = store.put("y" * 100000)
+
+        assert store.get_text(second) == "y" * 100000
+
+    def test_tree_cache_is_bounded(self, tmp_path):
+        """The least recently used trees are evicted first."""
+        store = ContentStore(str(tmp_path / "trees"), max_cached_trees=2)
+        store.cache_tree("a.py", "tree-a")
+        store.cache_tree("b.py", "tree-b")
+        store.get_tree("a.py")
+        store.cache_tree("c.py", "tree-c")
+
+        assert store.get_tree("b.py") is None
+        assert store.get_tree("a.py") == "tree-a"
+        store.close()
+
+    def test_cleanup_removes_directory(self, tmp_path):
+        """Cleaning up deletes the blob file."""
+        store = open_content_store(str(tmp_path / "scan"))
+        store.put("data")
+
+        store.cleanup()
+
+        assert not (tmp_path / "scan").exists()
+
+
+class TestBlobMapping:
+    """Test cases for BlobMapping handles."""
+
+    def test_files_mapping(self, store):
+        """File mappings behave like read-only dictionaries."""
+        mapping = store.store_files(PROJECT_FILES)
+
+        assert mapping == PROJECT_FILES
+        assert len(mapping) == 3
+        assert "main.py" in mapping
+        assert mapping.get("missing.py") is None
+        assert mapping.index["main.py"] == mapping.index["copy_of_main.py"]
+
+    def test_documents_mapping(self, store):
+        """Documents are stored as compact JSON and decoded on access."""
+        mapping = store.store_documents({"main.py": {"functions": [{"name": "main"}]}})
+
+        assert mapping["main.py"] == {"functions": [{"name": "main"}]}
+
+    def test_handles_are_small(self, store):
+        """A handle serializes to its index, not to the file contents."""
+        mapping = store.store_files({"big.py": "x = 1\n" * 100000})
+
+        assert len(pickle.dumps(mapping)) < 1000
+        assert mapping.total_bytes == 600000
+
+    def test_checkpoint_round_trip(self, store):
+        """Handles survive the checkpoint serializer."""
+        serializer = CheckpointSerializer()
+        mapping = store.store_files(PROJECT_FILES)
+
+        restored = serializer.loads_typed(serializer.dumps_typed({"project_code": mapping}))
+
+        assert isinstance(restored["project_code"], BlobMapping)
+        assert restored["project_code"] == PROJECT_FILES
+
+
+class TestOrchestratorContentStore:
+    """Test cases for content store handles in the workflow state."""
+
+    @patch('src.core_engine.agents.code_fetcher_agent.CodeFetcherAgent')
+    def test_fetch_code_stores_project_files(self, mock_fetcher_class):
+        """Project files are kept in the store and referenced by a handle."""
+        mock_fetcher_class.return_value.get_project_files.return_value = dict(PROJECT_FILES)
+        state = create_sample_scan_request()
+        state.update(pr_id=None)
+
+        result = fetch_code_node(state)
+
+        project_code = result["project_code"]
+        assert isinstance(project_code, BlobMapping)
+        assert project_code.root == result["content_store_root"]
+        assert project_code == PROJECT_FILES
+        assert result["workflow_metadata"] == {"branch": "main", "total_files": 3, "excluded_files": {}}
+        open_content_store(result["content_store_root"]).cleanup()
+
+    def test_parse_code_keeps_trees_out_of_state(self, store):
+        """Trees go to the tree cache and structural info to the blob store."""
+        state = create_sample_scan_request()
+        state.update(pr_id=None, project_code=store.store_files(PROJECT_FILES), content_store_root=store.root)
+
+        result = parse_code_node(state)
+
+        assert result["parsed_asts"]["main.py"] == {
+            "language": "python",
+            "content_hash": content_hash(PROJECT_FILES["main.py"])
+        }
+        assert isinstance(result["structural_info"], BlobMapping)
+        assert set(result["structural_info"]) == set(PROJECT_FILES)
+        assert store.get_tree("main.py") is not None
+        assert result["workflow_metadata"]["successful_parses"] == 3
+
+    def test_parse_code_uses_fetched_content_keys(self, store):
+        """Blob ids from the fetcher key the files instead of hashing them."""
+        blob_id = "a" * 40
+        state = create_sample_scan_request()
+        state.update(
+            pr_id=None,
+            project_code=store.store_files(PROJECT_FILES),
+            content_store_root=store.root,
+            content_keys={"main.py": blob_id}
+        )
+
+        with patch('src.core_engine.orchestrator.content_hash', wraps=content_hash) as mock_hash:
+            result = parse_code_node(state)
+
+        assert result["parsed_asts"]["main.py"]["content_hash"] == blob_id
+        assert mock_hash.call_count == len(PROJECT_FILES) - 1
+
+    def test_store_deduplicates_by_content_key(self, store):
+        first = store.put("x = 1\n", key="b" * 40)
+
+        assert store.put("x = 1\n", key="b" * 40) == first
+        assert store.put("x = 1\n") != first
+
+    def test_restore_uses_tree_cache(self, store):
+        """Cached trees are reused without parsing again."""
+        state = create_sample_scan_request()
+        state.update(
+            pr_id=None,
+            project_code=store.store_files(PROJECT_FILES),
+            content_store_root=store.root,
+            parsed_asts={"main.py": {"language": "python"}}
+        )
+        store.cache_tree("main.py", "cached-tree")
+
+        with patch('src.core_engine.agents.ast_parsing_agent.ASTParsingAgent') as mock_parser_class:
+            restored = _restore_ast_nodes(state)
+
+        assert restored["main.py"]["ast_node"] == "cached-tree"
+        mock_parser_class.assert_not_called()
+
+    def test_restore_rebuilds_evicted_trees(self, store):
+        """Trees missing from the cache are parsed from the stored contents and cached."""
+        state = create_sample_scan_request()
+        state.update(
+            pr_id=None,
+            project_code=store.store_files(PROJECT_FILES),
+            parsed_asts={"utils.py": {"language": "python"}}
+        )
+
+        restored = _restore_ast_nodes(state)
+
+        assert restored["utils.py"]["ast_node"] is not None
+        assert store.get_tree("utils.py") is restored["utils.py"]["ast_node"]
+
+    def test_branches_rebuild_trees_with_their_own_parsers(self, store):
+        """The concurrent analysis branches never share a parser."""
+        state = create_sample_scan_request()
+        state.update(
+            pr_id=None,
+            project_code=store.store_files(PROJECT_FILES),
+            parsed_asts={"utils.py": {"language": "python"}}
+        )
+        pool = MagicMock()
+        # Nothing is cached, so both branches rebuild the tree
+        pool.get.return_value.parse_code_to_ast.return_value = None
+
+        _restore_ast_nodes(state, pool, "static_analysis")
+        _restore_ast_nodes(state, pool, "diagram_extraction")
+
+        slots = [call.kwargs["slot"] for call in pool.get.call_args_list]
+        assert slots == ["static_analysis", "diagram_extraction"]
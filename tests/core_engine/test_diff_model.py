@@ -0,0 +1,199 @@
+"""
+Unit tests for the unified diff model.
+
+Tests parsing of git and plain unified diffs into a ChangeSet, post-image
+reconstruction and how the fetcher, parser node and impact analysis share it.
+"""
+
+import io
+
+import pytest
+
+from src.core_engine.diff_model import (
+    STATUS_ADDED,
+    STATUS_DELETED,
+    STATUS_MODIFIED,
+    STATUS_RENAMED,
+    ChangeSet,
+    parse_unified_diff
+)
+
+
+GIT_DIFF = """diff --git a/src/app.py b/src/app.py
+index 1234567..89abcde 100644
+--- a/src/app.py
++++ b/src/app.py
+@@ -1,4 +1,5 @@ def main():
+ import os
+-import sys
++import json
++import logging
+
+ def main():
+@@ -10,2 +11,2 @@ def main():
+---- not a header, a removed line
++++++ not a header, an added line
+diff --git a/src/new_module.py b/src/new_module.py
+new file mode 100644
+index 0000000..1111111
+--- /dev/null
++++ b/src/new_module.py
+@@ -0,0 +1,3 @@
++class Square:
++    def area(self, side):
++        return side * side
+diff --git a/src/old.py b/src/old.py
+deleted file mode 100644
+index 2222222..0000000
+--- a/src/old.py
++++ /dev/null
+@@ -1,2 +0,0 @@
+-x = 1
+-y = 2
+diff --git a/src/name.py b/src/renamed.py
+similarity index 90%
+rename from src/name.py
+rename to src/renamed.py
+diff --git a/logo.png b/logo.png
+index 3333333..4444444 100644
+Binary files a/logo.png and b/logo.png differ
+"""
+
+
+class TestParseUnifiedDiff:
+    """Test cases for parse_unified_diff."""
+
+    @pytest.fixture
+    def change_set(self):
+        return parse_unified_diff(GIT_DIFF)
+
+    def test_files_and_statuses(self, change_set):
+        """Every file header becomes one FileChange with the right status."""
+        statuses = {f.path: f.status for f in change_set}
+
+        assert statuses == {
+            "src/app.py": STATUS_MODIFIED,
+            "src/new_module.py": STATUS_ADDED,
+            "src/old.py": STATUS_DELETED,
+            "src/renamed.py": STATUS_RENAMED,
+            "logo.png": STATUS_MODIFIED
+        }
+        assert change_set.get("src/name.py").new_path == "src/renamed.py"
+        assert change_set.get("src/old.py").new_path is None
+        assert change_set.get("logo.png").is_binary is True
+
+    def test_hunk_ranges(self, change_set):
+        """Hunk headers are parsed into line ranges."""
+        hunks = change_set.get("src/app.py").hunks
+
+        assert len(hunks) == 2
+        assert (hunks[0].old_start, hunks[0].old_count, hunks[0].new_start, hunks[0].new_count) == (1, 4, 1, 5)
+        assert hunks[0].section == "def main():"
+        assert hunks[0].new_end == 5
+        assert hunks[0].added_line_numbers() == [2, 3]
+
+    def test_hunk_lines_that_look_like_headers(self, change_set):
+        """Lines inside a hunk are never mistaken for file headers."""
+        app = change_set.get("src/app.py")
+
+        assert app.old_path == "src/app.py"
+        assert app.hunks[1].lines == ["---- not a header, a removed line", "+++++ not a header, an added line"]
+        assert (app.additions, app.deletions) == (3, 2)
+
+    def test_paths_and_summary(self, change_set):
+        """Paths are unique and ordered; the summary counts statuses and lines."""
+        assert change_set.paths(include_deleted=False) == [
+            "src/app.py", "src/new_module.py", "src/renamed.py", "logo.png"
+        ]
+        summary = change_set.summary()
+        assert summary["files_changed"] == 5
+        assert summary["status_counts"][STATUS_ADDED] == 1
+        assert summary["additions"] == 6
+
+    def test_plain_unified_diff(self):
+        """Diffs without "diff --git" lines are split on ---/+++ headers."""
+        diff = "--- a/one.py\n+++ b/one.py\n@@ -1 +1 @@\n-a\n+b\n--- a/two.py\n+++ b/two.py\n@@ -1 +1 @@\n-c\n+d\n"
+
+        assert parse_unified_diff(diff).paths() == ["one.py", "two.py"]
+
+    def test_accepts_line_iterables(self):
+        """The parser streams from any iterable of lines."""
+        change_set = parse_unified_diff(io.StringIO(GIT_DIFF))
+
+        assert len(change_set) == 5
+
+    def test_empty_and_invalid_diffs(self):
+        """Empty or non-diff input yields an empty change set."""
+        assert len(parse_unified_diff("")) == 0
+        assert not parse_unified_diff("invalid diff content")
+
+
+class TestPostImage:
+    """Test cases for FileChange.post_image."""
+
+    def test_added_file_is_rebuilt_from_diff(self):
+        """Added files are fully described by their diff."""
+        change_set = parse_unified_diff(GIT_DIFF)
+
+        content = change_set.get("src/new_module.py").post_image()
+
+        assert content == "class Square:\n    def area(self, side):\n        return side * side\n"
+
+    def test_no_newline_marker(self):
+        """A missing trailing newline is preserved."""
+        diff = ("diff --git a/a.py b/a.py\nnew file mode 100644\n--- /dev/null\n+++ b/a.py\n"
+                "@@ -0,0 +1 @@\n+x = 1\n\\ No newline at end of file\n")
+
+        assert parse_unified_diff(diff).get("a.py").post_image() == "x = 1"
+
+    def test_modified_file_needs_fetched_content(self):
+        """Modified files have no post-image until their content is fetched."""
+        app = parse_unified_diff(GIT_DIFF).get("src/app.py")
+
+        assert app.post_image() is None
+        app.new_content = "import json\n"
+        assert app.post_image() == "import json\n"
+
+    def test_round_trip(self):
+        """Change sets serialize to plain dictionaries and back."""
+        change_set = parse_unified_diff(GIT_DIFF)
+
+        restored = ChangeSet.from_dict(change_set.to_dict())
+
+        assert restored == change_set
+
+
+class TestChangeSetConsumers:
+    """Test cases for stages that consume the shared ChangeSet."""
+
+    def test_code_fetcher_accepts_change_set(self):
+        """CodeFetcherAgent filters supported files from a parsed ChangeSet."""
+        from src.core_engine.agents.code_fetcher_agent import CodeFetcherAgent
+
+        changed = CodeFetcherAgent().get_changed_files_from_diff(parse_unified_diff(GIT_DIFF))
+
+        assert changed == ["src/app.py", "src/new_module.py", "src/old.py", "src/renamed.py"]
+
+    def test_impact_analysis_uses_shared_parser(self):
+        """ImpactAnalysisAgent derives changed files with the same parser."""
+        from src.core_engine.agents.impact_analysis.impact_analysis_agent import ImpactAnalysisAgent
+
+        changed = ImpactAnalysisAgent()._parse_changed_files_from_diff(GIT_DIFF)
+
+        assert changed == {"src/app.py", "src/new_module.py", "src/old.py", "src/renamed.py", "logo.png"}
+
+    def test_parse_code_node_parses_post_images(self):
+        """The parse node parses full post-images under their repository paths."""
+        from src.core_engine.orchestrator import create_sample_scan_request, parse_code_node
+
+        change_set = parse_unified_diff(GIT_DIFF)
+        change_set.get("src/app.py").new_content = "import json\n\ndef main():\n    pass\n"
+        state = create_sample_scan_request()
+        state.update(pr_id=1, pr_diff=GIT_DIFF, change_set=change_set)
+
+        result = parse_code_node(state)
+
+        parsed = result["parsed_asts"]
+        assert set(parsed) == {"src/app.py", "src/new_module.py"}
+        assert parsed["src/app.py"]["language"] == "python"
+        assert parsed["src/app.py"]["changed_lines"] == [2, 3, 11]
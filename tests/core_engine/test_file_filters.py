@@ -0,0 +1,153 @@
+"""
+Unit tests for project scan file exclusion rules.
+
+Tests gitignore pattern semantics, vendored and generated path detection,
+generator markers, minified file detection and exclusion reports.
+"""
+
+from src.core_engine.file_filters import (
+    REASON_GENERATED,
+    REASON_IGNORED,
+    REASON_VENDORED,
+    FileFilter,
+    IgnoreRules,
+    compile_rule,
+    is_generated_content,
+    record_exclusion
+)
+
+
+class TestIgnoreRules:
+    """Test cases for gitignore pattern matching."""
+
+    def test_unanchored_patterns_match_at_any_depth(self):
+        rules = IgnoreRules(["*.log", "tmp"])
+
+        assert rules.is_ignored("debug.log")
+        assert rules.is_ignored("a/b/debug.log")
+        assert rules.is_ignored("a/tmp/file.py")
+        assert not rules.is_ignored("a/logs.py")
+
+    def test_anchored_patterns(self):
+        """Patterns with a leading or inner slash only match from their directory."""
+        rules = IgnoreRules(["/build", "docs/*.py"])
+
+        assert rules.is_ignored("build/out.py")
+        assert not rules.is_ignored("src/build/out.py")
+        assert rules.is_ignored("docs/conf.py")
+        assert not rules.is_ignored("docs/api/conf.py")
+
+    def test_double_star(self):
+        rules = IgnoreRules(["**/fixtures/**/*.json", "logs/**"])
+
+        assert rules.is_ignored("fixtures/a.json")
+        assert rules.is_ignored("tests/fixtures/deep/b.json")
+        assert rules.is_ignored("logs/2024/app.py")
+
+    def test_directory_only_patterns(self):
+        rules = IgnoreRules(["cache/"])
+
+        assert rules.is_ignored("cache", is_dir=True)
+        assert rules.is_ignored("cache/data.py")
+        assert not rules.is_ignored("cache")
+
+    def test_negation_re_includes_files(self):
+        """The last matching rule decides."""
+        rules = IgnoreRules(["*.py", "!keep.py"])
+
+        assert rules.is_ignored("drop.py")
+        assert not rules.is_ignored("src/keep.py")
+
+    def test_files_in_excluded_directories_stay_excluded(self):
+        """As in git, a negated file below an excluded directory is not re-included."""
+        rules = IgnoreRules(["out/", "!out/keep.py"])
+
+        assert rules.is_ignored("out/keep.py")
+
+    def test_nested_gitignore_is_relative_to_its_directory(self):
+        rules = IgnoreRules()
+        rules.add_patterns(["/local.py"], base="app")
+
+        assert rules.is_ignored("app/local.py")
+        assert not rules.is_ignored("local.py")
+        assert not rules.is_ignored("app/sub/local.py")
+
+    def test_comments_and_blank_lines(self):
+        assert compile_rule("# comment") is None
+        assert compile_rule("   ") is None
+        assert compile_rule("\\#literal").regex.match("#literal")
+
+
+class TestFileFilter:
+    """Test cases for FileFilter."""
+
+    def test_path_reasons(self):
+        file_filter = FileFilter(exclude_globs=["*.snap.py"])
+        file_filter.add_gitignore("", "secrets/\n")
+
+        assert file_filter.path_reason("secrets/keys.py") == REASON_IGNORED
+        assert file_filter.path_reason("tests/a.snap.py") == REASON_IGNORED
+        assert file_filter.path_reason("web/node_modules/react/index.js") == REASON_VENDORED
+        assert file_filter.path_reason("third_party/zlib/zlib.h") == REASON_VENDORED
+        assert file_filter.path_reason("static/app.min.js") == REASON_VENDORED
+        assert file_filter.path_reason("proto/user_pb2.py") == REASON_GENERATED
+        assert file_filter.path_reason("lib/model.g.dart") == REASON_GENERATED
+        assert file_filter.path_reason("dist/app.py") == REASON_GENERATED
+        assert file_filter.path_reason("src/app.py") is None
+
+    def test_directory_reasons(self):
+        file_filter = FileFilter()
+
+        assert file_filter.directory_reason("vendor") == REASON_VENDORED
+        assert file_filter.directory_reason("app/build") == REASON_GENERATED
+        assert file_filter.directory_reason("app") is None
+
+    def test_vendored_detection_can_be_disabled(self):
+        file_filter = FileFilter(detect_vendored=False)
+
+        assert file_filter.path_reason("vendor/lib.py") is None
+        assert file_filter.content_reason("gen.py", "# @generated\n") is None
+
+    def test_gitattributes_mark_vendored_and_generated(self):
+        file_filter = FileFilter()
+        file_filter.add_gitattributes("", "*.py text eol=lf\nlib/*.py linguist-vendored\n")
+        file_filter.add_gitattributes("app", "schema.py linguist-generated=true\nbuild/** -linguist-generated\n")
+
+        assert file_filter.path_reason("lib/copied.py") == REASON_VENDORED
+        assert file_filter.path_reason("app/api/schema.py") == REASON_GENERATED
+        assert file_filter.path_reason("schema.py") is None
+        assert file_filter.directory_reason("app/build") is None
+        assert file_filter.path_reason("app/build/tool.py") is None
+        assert file_filter.path_reason("src/app.py") is None
+
+    def test_content_reason(self):
+        file_filter = FileFilter()
+
+        assert file_filter.content_reason("api.go", "// Code generated by protoc-gen-go. DO NOT EDIT.\n") == REASON_GENERATED
+        assert file_filter.content_reason("app.py", "import os\n") is None
+
+
+class TestGeneratedContent:
+    """Test cases for is_generated_content."""
+
+    def test_markers(self):
+        assert is_generated_content("Types.cs", "// <auto-generated>\n")
+        assert is_generated_content("schema.py", "# @generated by tool\n")
+
+    def test_minified_scripts(self):
+        """Long average lines mark minified JavaScript and CSS only."""
+        minified = "var a=1;" * 200
+
+        assert is_generated_content("lib/app.js", minified)
+        assert not is_generated_content("lib/app.py", minified)
+        assert not is_generated_content("lib/app.js", "const a = 1;\nconst b = 2;\n")
+
+
+def test_record_exclusion():
+    exclusions = {}
+
+    record_exclusion(exclusions, REASON_VENDORED, 10)
+    record_exclusion(exclusions, REASON_VENDORED, 5)
+    record_exclusion(None, REASON_VENDORED, 5)
+
+    assert exclusions == {REASON_VENDORED: {"files": 2, "bytes": 15}}
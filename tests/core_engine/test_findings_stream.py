@@ -0,0 +1,183 @@
+"""
+Unit tests for the streaming findings sink.
+
+Tests in-memory buffering, spilling to JSONL files and lazy consumption of
+spilled findings by downstream agents.
+"""
+
+import json
+import os
+from unittest.mock import MagicMock
+
+import pytest
+
+from src.core_engine.content_store import open_content_store
+from src.core_engine.findings_stream import FindingsSink, FindingsStream
+from src.core_engine.agents.reporting_agent import ReportingAgent
+from src.core_engine.orchestrator import create_sample_scan_request, parse_code_node, static_analysis_node
+from src.core_engine.risk_predictor import RiskPredictor
+
+
+def make_findings(count):
+    """Create simple findings for testing."""
+    return [
+        {
+            "rule_id": f"RULE_{i}",
+            "message": f"finding {i}",
+            "file": f"file_{i % 3}.py",
+            "line": i,
+            "severity": "Warning" if i % 2 else "Info",
+            "category": "complexity" if i % 2 else "logging"
+        }
+        for i in range(count)
+    ]
+
+
+class TestFindingsSink:
+    """Test cases for FindingsSink."""
+
+    def test_small_scan_stays_in_memory(self):
+        """Findings under the threshold are returned as a plain list."""
+        sink = FindingsSink(spill_threshold=10)
+        sink.extend(make_findings(5))
+
+        findings = sink.finalize()
+
+        assert isinstance(findings, list)
+        assert len(findings) == 5
+        assert sink.spilled is False
+
+    def test_spills_after_threshold(self, tmp_path):
+        """Findings past the threshold are written to a compressed spill file."""
+        sink = FindingsSink(spill_threshold=3, spill_dir=str(tmp_path))
+        sink.extend(make_findings(10))
+
+        summary = sink.summary()
+        stream = sink.finalize()
+
+        assert isinstance(stream, FindingsStream)
+        assert summary["spilled"] is True
+        assert summary["total_findings"] == 10
+        assert summary["severity_counts"] == {"Info": 5, "Warning": 5}
+        assert os.path.dirname(stream.path) == str(tmp_path)
+        assert stream.path.endswith(".jsonl.gz")
+        assert [f["rule_id"] for f in stream] == [f"RULE_{i}" for i in range(10)]
+
+    def test_uncompressed_spill_is_jsonl(self, tmp_path):
+        """Uncompressed spill files contain one JSON finding per line."""
+        sink = FindingsSink(spill_threshold=0, spill_dir=str(tmp_path), compress=False)
+        sink.extend(make_findings(4))
+        stream = sink.finalize()
+
+        with open(stream.path, encoding="utf-8") as f:
+            lines = f.read().splitlines()
+
+        assert len(lines) == 4
+        assert json.loads(lines[2])["rule_id"] == "RULE_2"
+
+    def test_never_spills_without_threshold(self):
+        """A threshold of None keeps every finding in memory."""
+        sink = FindingsSink(spill_threshold=None)
+        sink.extend(make_findings(50))
+
+        assert isinstance(sink.finalize(), list)
+
+
+class TestFindingsStream:
+    """Test cases for FindingsStream."""
+
+    @pytest.fixture
+    def stream(self, tmp_path):
+        sink = FindingsSink(spill_threshold=0, spill_dir=str(tmp_path))
+        sink.extend(make_findings(6))
+        return sink.finalize()
+
+    def test_sequence_behaviour(self, stream):
+        """The stream supports len, truthiness, indexing and slicing."""
+        assert len(stream) == 6
+        assert bool(stream) is True
+        assert stream[0]["rule_id"] == "RULE_0"
+        assert stream[-1]["rule_id"] == "RULE_5"
+        assert [f["line"] for f in stream[:3]] == [0, 1, 2]
+
+        with pytest.raises(IndexError):
+            stream[6]
+
+    def test_stream_is_reiterable(self, stream):
+        """Each iteration re-reads the spill file from the start."""
+        assert list(stream) == list(stream)
+
+    def test_handle_round_trip(self, stream):
+        """Handles can be serialized and rebuilt without the findings."""
+        data = stream.to_dict()
+        restored = FindingsStream.from_dict(data)
+
+        assert json.loads(json.dumps(data)) == data
+        assert len(restored) == 6
+        assert list(restored) == list(stream)
+
+    def test_discard_removes_file(self, stream):
+        """Discarding the stream deletes the spill file."""
+        stream.discard()
+
+        assert not os.path.exists(stream.path)
+
+    def test_reporting_agent_consumes_stream(self, stream):
+        """ReportingAgent summarizes and exports a spilled stream."""
+        agent = ReportingAgent()
+        report_data = agent.generate_report_data(
+            static_findings=stream,
+            llm_insights="",
+            scan_details={"repo_url": "https://github.com/test/repo"}
+        )
+
+        assert report_data["summary"]["total_findings"] == 6
+        assert report_data["summary"]["severity_breakdown"]["Warning"] == 3
+
+        exported = json.loads(agent.export_json(report_data))
+        assert len(exported["static_analysis_findings"]) == 6
+
+    def test_json_export_streams_findings(self, stream):
+        """The JSON export reads a spilled stream lazily and matches json.dumps."""
+        agent = ReportingAgent()
+        report_data = agent.generate_report_data(
+            static_findings=stream,
+            llm_insights="",
+            scan_details={"repo_url": "https://github.com/test/repo"}
+        )
+        expected = json.dumps(
+            {**report_data, "static_analysis_findings": list(stream)}, indent=2, ensure_ascii=False
+        )
+
+        chunks = agent.iter_json(report_data)
+        assert "RULE_5" not in "".join(next(chunks) for _ in range(3))
+        assert agent.export_json(report_data) == expected
+
+    def test_scan_spills_into_its_content_store(self, tmp_path):
+        """Spill files live in the scan content store and are removed with it."""
+        store = open_content_store(str(tmp_path / "scan"))
+        state = create_sample_scan_request()
+        state["scan_request_data"]["findings_spill_threshold"] = 0
+        state.update(
+            pr_id=None,
+            project_code=store.store_files({"main.py": "def main():\n    return 1\n"}),
+            content_store_root=store.root
+        )
+        state.update(parse_code_node(state))
+        pool = MagicMock()
+        pool.get.return_value.analyze_file_ast.return_value = make_findings(2)
+
+        findings = static_analysis_node(state, pool)["static_analysis_findings"]
+
+        assert isinstance(findings, FindingsStream)
+        assert os.path.dirname(findings.path) == store.root
+        store.cleanup()
+        assert not os.path.exists(findings.path)
+
+    def test_risk_predictor_consumes_stream(self, stream):
+        """RiskPredictor iterates the stream like a list of findings."""
+        predictor = RiskPredictor()
+        analysis = predictor._analyze_static_findings(stream)
+
+        assert analysis["density_score"] > 0
+        assert analysis["code_smell_score"] > 0
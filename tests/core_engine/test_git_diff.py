@@ -0,0 +1,131 @@
+"""
+Unit tests for streaming git diffs.
+
+Tests change listing with renames and deletions, per-file patch streaming,
+truncation at hunk boundaries and stopping a stream early.
+"""
+
+from pathlib import Path
+
+import pytest
+from git import Repo
+
+from src.core_engine.diff_model import STATUS_ADDED, STATUS_DELETED, STATUS_MODIFIED, STATUS_RENAMED, parse_unified_diff
+from src.core_engine.git_diff import iter_file_patches, list_changes, merge_base
+
+
+def commit_files(repo, files, message, removed=()):
+    """Write files into a working tree, remove others and commit."""
+    for path, content in files.items():
+        full_path = Path(repo.working_tree_dir) / path
+        full_path.parent.mkdir(parents=True, exist_ok=True)
+        full_path.write_text(content)
+    if files:
+        repo.index.add(list(files))
+    if removed:
+        repo.index.remove(list(removed), working_tree=True)
+    return repo.index.commit(message)
+
+
+@pytest.fixture
+def repo(tmp_path):
+    repo = Repo.init(tmp_path / "repo", initial_branch="main")
+    with repo.config_writer() as config:
+        config.set_value("user", "name", "Test")
+        config.set_value("user", "email", "test@example.com")
+    return repo
+
+
+def numbered_lines(count, prefix="line"):
+    return "".join(f"{prefix} {i}\n" for i in range(count))
+
+
+class TestListChanges:
+    """Test cases for list_changes."""
+
+    def test_statuses_and_blob_ids(self, repo):
+        base = commit_files(repo, {
+            "keep.py": "x = 1\n",
+            "old_name.py": numbered_lines(20),
+            "gone.py": "y = 1\n"
+        }, "base")
+        head = commit_files(repo, {
+            "keep.py": "x = 2\n",
+            "new_name.py": numbered_lines(20),
+            "added.py": "z = 1\n"
+        }, "head", removed=["old_name.py", "gone.py"])
+
+        changes = {entry.path: entry for entry in list_changes(repo, base.hexsha, head.hexsha)}
+
+        assert changes["keep.py"].status == STATUS_MODIFIED
+        assert changes["keep.py"].blob_id == head.tree["keep.py"].hexsha
+        assert changes["added.py"].status == STATUS_ADDED
+        assert changes["gone.py"].status == STATUS_DELETED
+        assert changes["gone.py"].blob_id == base.tree["gone.py"].hexsha
+        assert changes["new_name.py"].status == STATUS_RENAMED
+        assert changes["new_name.py"].old_path == "old_name.py"
+        assert "old_name.py" not in changes
+
+    def test_merge_base(self, repo):
+        fork = commit_files(repo, {"a.py": "1\n"}, "fork")
+        repo.create_head("feature")
+        commit_files(repo, {"a.py": "2\n"}, "main work")
+
+        assert merge_base(repo, "main", "feature") == fork.hexsha
+
+
+class TestIterFilePatches:
+    """Test cases for iter_file_patches."""
+
+    def test_patches_are_streamed_per_file(self, repo):
+        base = commit_files(repo, {"a.py": "1\n", "b.py": "1\n", "c.py": "1\n"}, "base")
+        head = commit_files(repo, {"a.py": "2\n", "b.py": "2\n", "c.py": "2\n"}, "head")
+        entries = [entry for entry in list_changes(repo, base.hexsha, head.hexsha) if entry.path != "b.py"]
+
+        patches = list(iter_file_patches(repo, base.hexsha, head.hexsha, entries))
+
+        assert [patch.path for patch in patches] == ["a.py", "c.py"]
+        assert patches[0].text.startswith("diff --git a/a.py b/a.py\n")
+        assert "+2\n" in patches[0].text
+        assert not patches[0].truncated
+
+    def test_long_patches_are_cut_at_a_hunk_boundary(self, repo):
+        """Kept hunks stay complete, so the truncated patch still parses."""
+        original = numbered_lines(400)
+        base = commit_files(repo, {"big.py": original}, "base")
+        changed = original.replace("line 10\n", "changed 10\n").replace("line 390\n", "changed 390\n")
+        head = commit_files(repo, {"big.py": changed + numbered_lines(2000, "added")}, "head")
+        entries = list_changes(repo, base.hexsha, head.hexsha)
+
+        patch, = iter_file_patches(repo, base.hexsha, head.hexsha, entries, max_patch_bytes=1024)
+
+        assert patch.truncated and patch.omitted_bytes > 10000
+        assert len(patch.text) <= 1024
+        change, = parse_unified_diff(patch.text)
+        assert [hunk.new_start for hunk in change.hunks] == [8, 388]
+        assert change.hunks[-1].new_count == len([
+            line for line in change.hunks[-1].lines if not line.startswith("-")
+        ])
+
+    def test_renames_are_detected_across_batches(self, repo, monkeypatch):
+        monkeypatch.setattr("src.core_engine.git_diff.PATHSPEC_BATCH_SIZE", 1)
+        base = commit_files(repo, {"z_old.py": numbered_lines(20), "a.py": "1\n"}, "base")
+        head = commit_files(repo, {"b_new.py": numbered_lines(20), "a.py": "2\n"}, "head", removed=["z_old.py"])
+        entries = list_changes(repo, base.hexsha, head.hexsha)
+
+        patches = list(iter_file_patches(repo, base.hexsha, head.hexsha, entries))
+
+        assert [patch.path for patch in patches] == ["a.py", "b_new.py"]
+        assert "rename from z_old.py" in patches[1].text
+
+    def test_closing_the_stream_stops_git(self, repo):
+        files = {f"f{i}.py": "1\n" for i in range(50)}
+        base = commit_files(repo, files, "base")
+        head = commit_files(repo, {path: "2\n" * 2000 for path in files}, "head")
+        entries = list_changes(repo, base.hexsha, head.hexsha)
+
+        patches = iter_file_patches(repo, base.hexsha, head.hexsha, entries)
+        first = next(patches)
+        patches.close()
+
+        assert first.path == "f0.py"
@@ -0,0 +1,259 @@
+"""
+Unit tests for monorepo partitioning.
+
+Tests partition detection from package manifests, cross-partition dependency
+edges, report merging, and the partitioned project scanning node including
+reuse of unchanged partitions.
+"""
+
+import pytest
+from unittest.mock import patch
+
+from src.core_engine.monorepo import (
+    ROOT_PARTITION,
+    dependency_edges,
+    detect_partitions,
+    is_package_manifest,
+    merge_partition_reports
+)
+
+
+MONOREPO_FILES = {
+    "libs/core/src/core/api.py": "import json\n\ndef fetch():\n    return json.dumps({})\n",
+    "services/web/app.py": "from core.api import fetch\nimport core\n",
+    "apps/ui/src/index.ts": "import { a } from '@acme/shared/util';\nimport './local';\n",
+    "packages/shared/index.ts": "export const a = 1;\n",
+    "android/app/src/Main.kt": "package com.acme.app\n\nimport com.acme.lib.Foo\n",
+    "android/lib/src/Foo.kt": "package com.acme.lib\n\nclass Foo\n",
+    "mobile/lib/main.dart": "import 'package:acme_models/user.dart';\n",
+    "models/lib/user.dart": "class User {}\n",
+    "tools/release.py": "print('release')\n"
+}
+
+MONOREPO_MANIFESTS = {
+    "libs/core/pyproject.toml": '[project]\nname = "acme-core"\nversion = "1.0"\n',
+    "services/web/pyproject.toml": "[tool.poetry]\n",
+    "apps/ui/package.json": '{"name": "ui", "dependencies": {"@acme/shared": "*"}}',
+    "packages/shared/package.json": '{"name": "@acme/shared"}',
+    "android/app/build.gradle": "apply plugin: 'com.android.application'\n",
+    "android/lib/build.gradle.kts": "plugins { kotlin(\"jvm\") }\n",
+    "mobile/pubspec.yaml": "name: acme_mobile\n",
+    "models/pubspec.yaml": "name: acme_models\n"
+}
+
+
+def partition_names(partitions):
+    return {partition.root: partition.name for partition in partitions}
+
+
+class TestDetectPartitions:
+    """Test cases for detect_partitions."""
+
+    def test_manifest_directories_become_partitions(self):
+        """Each manifest directory is a partition named after its package."""
+        partitions = detect_partitions(MONOREPO_FILES, MONOREPO_MANIFESTS)
+
+        assert partition_names(partitions) == {
+            "": ROOT_PARTITION,
+            "android/app": "android/app",
+            "android/lib": "android/lib",
+            "apps/ui": "ui",
+            "libs/core": "acme-core",
+            "mobile": "acme_mobile",
+            "models": "acme_models",
+            "packages/shared": "@acme/shared",
+            "services/web": "services/web"
+        }
+        by_root = {partition.root: partition for partition in partitions}
+        assert by_root["libs/core"].files == ["libs/core/src/core/api.py"]
+        assert by_root["libs/core"].ecosystem == "python"
+        assert by_root[""].files == ["tools/release.py"]
+
+    def test_nested_packages_win_over_parents(self):
+        """Files belong to their deepest enclosing package."""
+        partitions = detect_partitions(
+            ["app.py", "plugins/a/plugin.py", "plugins/readme.py"],
+            {"pyproject.toml": 'name = "host"', "plugins/a/pyproject.toml": 'name = "plugin-a"'}
+        )
+
+        assert {p.name: p.files for p in partitions} == {
+            "host": ["app.py", "plugins/readme.py"],
+            "plugin-a": ["plugins/a/plugin.py"]
+        }
+
+    def test_single_package_repository(self):
+        """A repository without nested packages is a single partition."""
+        partitions = detect_partitions(["main.py", "pkg/util.py"], {"pyproject.toml": None})
+
+        assert len(partitions) == 1
+
+    def test_duplicate_package_names_use_roots(self):
+        """Partitions are identified by root when package names collide."""
+        partitions = detect_partitions(
+            ["a/index.js", "b/index.js"],
+            {"a/package.json": '{"name": "app"}', "b/package.json": '{"name": "app"}'}
+        )
+
+        assert sorted(p.name for p in partitions) == ["a", "b"]
+
+    def test_is_package_manifest(self):
+        """Only the known build manifests mark package roots."""
+        assert is_package_manifest("libs/core/pyproject.toml")
+        assert is_package_manifest("build.gradle.kts")
+        assert not is_package_manifest("config/settings.json")
+
+
+class TestDependencyEdges:
+    """Test cases for dependency_edges."""
+
+    def test_cross_partition_imports(self):
+        """Imports between packages of every supported ecosystem become edges."""
+        partitions = detect_partitions(MONOREPO_FILES, MONOREPO_MANIFESTS)
+
+        edges = dependency_edges(partitions, MONOREPO_FILES)
+
+        assert edges == [
+            {"source": "acme_mobile", "target": "acme_models", "imports": 1},
+            {"source": "android/app", "target": "android/lib", "imports": 1},
+            {"source": "services/web", "target": "acme-core", "imports": 2},
+            {"source": "ui", "target": "@acme/shared", "imports": 1}
+        ]
+
+    def test_imports_within_a_partition_are_ignored(self):
+        """Standard library and intra-package imports are not edges."""
+        files = {"a/x.py": "import os\nfrom y import z\n", "a/y.py": ""}
+        partitions = detect_partitions(files, {"a/pyproject.toml": None, "b/pyproject.toml": None})
+
+        assert dependency_edges(partitions, files) == []
+
+
+class TestMergePartitionReports:
+    """Test cases for merge_partition_reports."""
+
+    def test_merged_report(self):
+        """Risk is the worst partition risk and recommendations keep their partition."""
+        partitions = detect_partitions(["a/x.py", "b/y.py"], {"a/pyproject.toml": None, "b/pyproject.toml": None})
+        reports = {
+            "a": {
+                "complexity_metrics": {"total_files": 1, "total_lines": 10},
+                "risk_assessment": {"legacy_assessment": {"overall_risk_level": "medium"}},
+                "recommendations": [{"title": "Split module"}],
+                "architectural_analysis": "Layered"
+            },
+            "b": {
+                "complexity_metrics": {"total_files": 1, "total_lines": 5},
+                "risk_assessment": {"legacy_assessment": {"overall_risk_level": "low"}},
+                "recommendations": []
+            }
+        }
+        edges = [{"source": "b", "target": "a", "imports": 3}]
+
+        merged = merge_partition_reports(partitions, reports, edges)
+
+        assert merged["partitioned"] is True
+        assert merged["risk_assessment"]["overall_risk_level"] == "medium"
+        assert merged["recommendations"] == [{"title": "Split module", "partition": "a"}]
+        assert merged["complexity_metrics"] == {"total_files": 2, "total_lines": 15}
+        assert merged["partitions"]["b"]["report"] is reports["b"]
+        assert merged["partition_dependencies"] == edges
+        assert "## a" in merged["architectural_analysis"]
+
+
+class TestPartitionedProjectScanning:
+    """Test cases for the partitioned project scanning node."""
+
+    @pytest.fixture(autouse=True)
+    def mock_agents(self):
+        """Keep real LLM and RAG agents out of the scans, including at import time."""
+        with patch('src.core_engine.agents.rag_context_agent.RAGContextAgent'), \
+                patch('src.core_engine.agents.llm_orchestrator_agent.LLMOrchestratorAgent'):
+            yield
+
+    @pytest.fixture
+    def stage_cache(self):
+        from src.core_engine.orchestrator import STAGE_VERSIONS
+        from src.core_engine.stage_cache import MemoryStageCacheBackend, StageCache, set_stage_cache
+
+        cache = StageCache(MemoryStageCacheBackend(), STAGE_VERSIONS)
+        set_stage_cache(cache)
+        yield cache
+        set_stage_cache(None)
+
+    def make_state(self, project_code):
+        from src.core_engine.orchestrator import create_initial_state
+
+        state = create_initial_state({"repo_url": "https://github.com/example/monorepo"})
+        state.update(
+            repo_url="https://github.com/example/monorepo",
+            project_code=project_code,
+            package_manifests={"a/pyproject.toml": 'name = "a"', "b/pyproject.toml": 'name = "b"'},
+            static_analysis_findings=[{"file": "a/x.py", "rule_id": "PRINT_STATEMENT"}],
+            workflow_metadata={"knowledge_base_built": True}
+        )
+        return state
+
+    def scan_result(self, code_files, static_findings, knowledge_base_ready):
+        return {
+            "scan_type": "project",
+            "complexity_metrics": {"total_files": len(code_files), "total_lines": 1},
+            "risk_assessment": {"legacy_assessment": {"overall_risk_level": "low"}},
+            "recommendations": [{"title": f"Review {sorted(code_files)[0]}"}]
+        }
+
+    @patch('src.core_engine.agents.project_scanning_agent.ProjectScanningAgent')
+    def test_partitions_are_scanned_separately(self, mock_agent_class):
+        """Every partition is scanned with only its own files and findings."""
+        from src.core_engine.orchestrator import project_scanning_node
+
+        mock_agent_class.return_value.scan_entire_project.side_effect = self.scan_result
+
+        result = project_scanning_node(self.make_state({"a/x.py": "print(1)\nimport b\n", "b/b.py": "y = 2\n"}))
+
+        assert result["current_step"] == "reporting"
+        calls = {
+            tuple(call.kwargs["code_files"]): call.kwargs["static_findings"]
+            for call in mock_agent_class.return_value.scan_entire_project.call_args_list
+        }
+        assert calls == {("a/x.py",): [{"file": "a/x.py", "rule_id": "PRINT_STATEMENT"}], ("b/b.py",): []}
+        scan_result = result["project_scan_result"]
+        assert set(scan_result["partitions"]) == {"a", "b"}
+        assert scan_result["partition_dependencies"] == [{"source": "a", "target": "b", "imports": 1}]
+        assert result["workflow_metadata"]["recommendations_count"] == 2
+        assert len(result["workflow_metadata"]["partitions"]) == 2
+
+    @patch('src.core_engine.agents.project_scanning_agent.ProjectScanningAgent')
+    def test_only_changed_partition_is_rescanned(self, mock_agent_class, stage_cache):
+        """Unchanged partitions reuse their memoized sub-scan report."""
+        from src.core_engine.orchestrator import project_scanning_node
+
+        scan = mock_agent_class.return_value.scan_entire_project
+        scan.side_effect = self.scan_result
+        mock_agent_class.return_value.llm_orchestrator.llm_provider = "mock"
+        mock_agent_class.return_value.llm_orchestrator.model_name = "mock-model"
+
+        project_scanning_node(self.make_state({"a/x.py": "print(1)\n", "b/b.py": "y = 2\n"}))
+        scan.reset_mock()
+        result = project_scanning_node(self.make_state({"a/x.py": "print(1)\n", "b/b.py": "y = 3\n"}))
+
+        assert [tuple(call.kwargs["code_files"]) for call in scan.call_args_list] == [("b/b.py",)]
+        assert result["workflow_metadata"]["partitions_reused"] == ["a"]
+
+    @patch('src.core_engine.agents.project_scanning_agent.ProjectScanningAgent')
+    def test_partitions_are_rescanned_with_another_model(self, mock_agent_class, stage_cache):
+        """Memoized sub-scan reports are specific to the LLM model."""
+        from src.core_engine.orchestrator import project_scanning_node
+
+        scan = mock_agent_class.return_value.scan_entire_project
+        scan.side_effect = self.scan_result
+        llm_orchestrator = mock_agent_class.return_value.llm_orchestrator
+        llm_orchestrator.llm_provider = "mock"
+        llm_orchestrator.model_name = "model-a"
+        project_code = {"a/x.py": "print(1)\n", "b/b.py": "y = 2\n"}
+
+        project_scanning_node(self.make_state(project_code))
+        scan.reset_mock()
+        llm_orchestrator.model_name = "model-b"
+        result = project_scanning_node(self.make_state(project_code))
+
+        assert scan.call_count == 2
+        assert result["workflow_metadata"]["partitions_reused"] == []
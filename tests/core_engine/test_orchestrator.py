@@ -5,6 +5,8 @@ This module contains comprehensive tests for the orchestrator functionality,
 including state management, node functions, and graph compilation.
 """
 
+from collections.abc import Mapping
+
 import pytest
 from unittest.mock import patch, MagicMock, Mock
 from typing import Dict, Any
@@ -178,7 +180,7 @@ class TestNodeFunctions:
         
         assert "project_code" in result
         assert result["current_step"] == "parse_code"
-        assert isinstance(result["project_code"], dict)
+        assert isinstance(result["project_code"], Mapping)
         assert "main.py" in result["project_code"]
         assert "utils.py" in result["project_code"]
         assert result["workflow_metadata"]["total_files"] == 2
@@ -187,7 +189,10 @@ class TestNodeFunctions:
         # Verify agent was called correctly
         mock_agent.get_project_files.assert_called_once_with(
             repo_url="https://github.com/test/repo",
-            branch_or_commit="develop"
+            branch_or_commit="develop",
+            lazy=True,
+            exclusions={},
+            content_keys={}
         )
     
     @patch('src.core_engine.agents.code_fetcher_agent.CodeFetcherAgent')
@@ -231,7 +236,8 @@ class TestNodeFunctions:
         mock_agent.get_pr_diff.assert_called_once()
         mock_agent.get_project_files.assert_called_once_with(
             "https://github.com/test/repo", 
-            "feature"
+            "feature",
+            lazy=True
         )
     
     @patch('src.core_engine.agents.code_fetcher_agent.CodeFetcherAgent')
@@ -0,0 +1,192 @@
+"""
+Unit tests for the parallel analysis fan-out in the LangGraph orchestrator.
+
+Tests the state reducers used by concurrent branches, the fan-out and join
+routing, and end-to-end execution of a compiled graph with all branches.
+"""
+
+import pytest
+from unittest.mock import patch
+
+from src.core_engine.orchestrator import (
+    ANALYSIS_BRANCHES,
+    _keep_first_error,
+    _merge_current_step,
+    _merge_metadata,
+    compile_graph,
+    create_sample_scan_request,
+    diagram_extraction_node,
+    join_analysis_node,
+    knowledge_base_node,
+    project_scanning_node,
+    risk_metrics_node,
+    should_fan_out_analysis
+)
+
+
+SAMPLE_PR_DIFF = """diff --git a/shapes.py b/shapes.py
+new file mode 100644
+--- /dev/null
++++ b/shapes.py
+@@ -0,0 +1,4 @@
++class Square:
++    def area(self, side):
++        print("computing area")
++        return side * side
+"""
+
+
+def make_state(**overrides):
+    """Create a GraphState for a PR scan with optional overrides."""
+    state = create_sample_scan_request()
+    state.update(pr_id=1, workflow_metadata={})
+    state.update(overrides)
+    return state
+
+
+class TestStateReducers:
+    """Test cases for reducers that merge parallel branch updates."""
+
+    def test_current_step_error_sticks(self):
+        """An error from one branch is not overwritten by another branch."""
+        assert _merge_current_step("error", "llm_analysis") == "error"
+        assert _merge_current_step("static_analysis", "error") == "error"
+        assert _merge_current_step("error", "error_handled") == "error_handled"
+        assert _merge_current_step("impact_analysis", "reporting") == "reporting"
+
+    def test_first_error_message_is_kept(self):
+        """The first reported error message wins."""
+        assert _keep_first_error(None, "boom") == "boom"
+        assert _keep_first_error("first", "second") == "first"
+
+    def test_metadata_is_merged(self):
+        """Metadata updates from branches are merged key by key."""
+        merged = _merge_metadata({"a": 1}, {"b": 2})
+
+        assert merged == {"a": 1, "b": 2}
+        assert _merge_metadata(None, {"b": 2}) == {"b": 2}
+
+
+class TestFanOutAndJoin:
+    """Test cases for fan-out and join routing."""
+
+    def test_fan_out_returns_all_branches(self):
+        """Parsing success fans out into every analysis branch."""
+        assert should_fan_out_analysis(make_state(current_step="static_analysis")) == ANALYSIS_BRANCHES
+
+    def test_fan_out_on_error(self):
+        """Parsing errors skip the branches."""
+        assert should_fan_out_analysis(make_state(current_step="error")) == "handle_error"
+
+    def test_join_routes_pr_scan_to_llm(self):
+        """PR scans continue with LLM analysis after the join."""
+        result = join_analysis_node(make_state(current_step="impact_analysis"))
+
+        assert result["current_step"] == "llm_analysis"
+
+    def test_join_routes_project_scan_to_project_scanning(self):
+        """Project scans continue with project scanning after the join."""
+        state = make_state(pr_id=None, project_code={"main.py": "x = 1"}, current_step="llm_analysis")
+
+        assert join_analysis_node(state)["current_step"] == "project_scanning"
+
+    def test_join_routes_branch_error(self):
+        """An error from any branch routes to error handling."""
+        state = make_state(current_step="llm_analysis", error_message="impact failed")
+
+        assert join_analysis_node(state)["current_step"] == "error"
+
+
+class TestBranchNodes:
+    """Test cases for the new analysis branch nodes."""
+
+    def test_risk_metrics_node(self):
+        """Metrics are computed from project code."""
+        state = make_state(pr_id=None, project_code={"main.py": "def main():\n    return 1\n"})
+
+        result = risk_metrics_node(state)
+
+        assert result["code_metrics"]["total_files"] == 1
+
+    def test_risk_metrics_node_without_code(self):
+        """Scans without project code produce no metrics."""
+        assert risk_metrics_node(make_state())["code_metrics"] is None
+
+    def test_knowledge_base_node_skips_pr_scans(self):
+        """The knowledge base is only built for project scans."""
+        result = knowledge_base_node(make_state(project_code={"main.py": "x = 1"}))
+
+        assert result["workflow_metadata"]["knowledge_base_built"] is False
+
+    @patch('src.core_engine.agents.project_scanning_agent.ProjectScanningAgent')
+    def test_knowledge_base_node_builds_for_project_scan(self, mock_agent_class):
+        """Project scans build the knowledge base once in the branch."""
+        project_code = {"main.py": "x = 1"}
+        state = make_state(pr_id=None, project_code=project_code)
+
+        result = knowledge_base_node(state)
+
+        mock_agent_class.return_value.rag_agent.build_knowledge_base.assert_called_once_with(project_code)
+        assert result["workflow_metadata"]["knowledge_base_built"] is True
+
+    def test_diagram_extraction_node_without_asts(self):
+        """No ASTs means no diagrams and no error."""
+        assert diagram_extraction_node(make_state(parsed_asts={})) == {"diagrams": None}
+
+    @patch('src.core_engine.agents.project_scanning_agent.ProjectScanningAgent')
+    def test_project_scanning_reuses_branch_results(self, mock_agent_class):
+        """Project scanning skips work already done by the parallel branches."""
+        mock_agent_class.return_value.scan_entire_project.return_value = {"risk_assessment": {}}
+        metrics = {"total_files": 1, "total_lines": 1}
+        state = make_state(
+            pr_id=None,
+            project_code={"main.py": "x = 1"},
+            static_analysis_findings=[],
+            code_metrics=metrics,
+            workflow_metadata={"knowledge_base_built": True}
+        )
+
+        project_scanning_node(state)
+
+        mock_agent_class.return_value.scan_entire_project.assert_called_once_with(
+            code_files={"main.py": "x = 1"},
+            static_findings=[],
+            complexity_metrics=metrics,
+            knowledge_base_ready=True
+        )
+
+
+class TestParallelWorkflow:
+    """End-to-end tests for the compiled graph with parallel branches."""
+
+    @pytest.fixture
+    def pr_scan_state(self):
+        return create_sample_scan_request()
+
+    @patch('src.core_engine.agents.code_fetcher_agent.CodeFetcherAgent')
+    def test_pr_scan_runs_all_branches(self, mock_fetcher_class, pr_scan_state):
+        """All branch results are merged into the final state."""
+        mock_fetcher_class.return_value.get_pr_diff.return_value = SAMPLE_PR_DIFF
+
+        result = compile_graph().invoke(pr_scan_state)
+
+        assert result["current_step"] == "completed"
+        assert result["error_message"] is None
+        assert result["static_analysis_summary"] is not None
+        assert result["impact_analysis_result"] is not None
+        assert isinstance(result["diagrams"], list)
+        assert result["llm_insights"]
+        assert result["report_data"]["diagrams"] == result["diagrams"]
+
+    @patch('src.core_engine.agents.impact_analysis.impact_analysis_agent.ImpactAnalysisAgent')
+    @patch('src.core_engine.agents.code_fetcher_agent.CodeFetcherAgent')
+    def test_branch_failure_is_handled_after_join(self, mock_fetcher_class, mock_impact_class, pr_scan_state):
+        """A failing branch routes the whole workflow to error handling."""
+        mock_fetcher_class.return_value.get_pr_diff.return_value = SAMPLE_PR_DIFF
+        mock_impact_class.return_value.analyze_impact.side_effect = RuntimeError("graph unavailable")
+
+        result = compile_graph().invoke(pr_scan_state)
+
+        assert result["current_step"] == "error_handled"
+        assert "graph unavailable" in result["error_message"]
+        assert result.get("llm_insights") is None
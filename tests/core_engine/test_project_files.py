@@ -0,0 +1,73 @@
+"""
+Unit tests for lazily loaded project files.
+
+Tests the read-only mapping interface, loading on access, the decoded text
+cache and removal of the temporary checkout.
+"""
+
+from src.core_engine.project_files import LazyProjectFiles, ProjectFileEntry, read_mapped_text
+
+
+def counting_loader(contents, reads):
+    def load(entry):
+        reads.append(entry.path)
+        return contents[entry.path]
+    return load
+
+
+class TestLazyProjectFiles:
+    """Test cases for LazyProjectFiles."""
+
+    def test_dict_interface_without_reading(self):
+        """Keys, length and membership come from the recorded entries."""
+        reads = []
+        files = LazyProjectFiles(
+            {"a.py": ProjectFileEntry("a.py", 6), "b.py": ProjectFileEntry("b.py", 4)},
+            counting_loader({"a.py": "x = 1\n", "b.py": "y\n"}, reads)
+        )
+
+        assert list(files) == ["a.py", "b.py"]
+        assert len(files) == 2
+        assert "a.py" in files and "c.py" not in files
+        assert files.total_bytes == 10
+        assert reads == []
+
+        assert files == {"a.py": "x = 1\n", "b.py": "y\n"}
+        assert files.get("c.py") is None
+
+    def test_text_cache(self):
+        """Recently read files are not loaded again; the cache is bounded."""
+        reads = []
+        contents = {"a.py": "a", "b.py": "b", "c.py": "c"}
+        files = LazyProjectFiles(
+            {path: ProjectFileEntry(path, 1) for path in contents},
+            counting_loader(contents, reads),
+            text_cache_size=2
+        )
+
+        files["a.py"], files["a.py"], files["b.py"], files["c.py"], files["a.py"]
+
+        assert reads == ["a.py", "b.py", "c.py", "a.py"]
+
+    def test_from_checkout(self, tmp_path):
+        """Working tree files are read through memory maps; close removes the checkout."""
+        checkout = tmp_path / "checkout"
+        checkout.mkdir()
+        (checkout / "main.py").write_bytes("print('héllo')\n".encode("utf-8") + b"\xff")
+        (checkout / "empty.py").write_text("")
+        entries = {
+            name: ProjectFileEntry(name, (checkout / name).stat().st_size, location=str(checkout / name))
+            for name in ("main.py", "empty.py")
+        }
+
+        files = LazyProjectFiles.from_checkout(entries, cleanup_dir=str(checkout))
+
+        assert files["main.py"] == "print('héllo')\n"
+        assert files["empty.py"] == ""
+        files.close()
+        assert not checkout.exists()
+
+    def test_read_mapped_text(self, tmp_path):
+        (tmp_path / "a.kt").write_text("fun main() {}\n")
+
+        assert read_mapped_text(str(tmp_path / "a.kt")) == "fun main() {}\n"
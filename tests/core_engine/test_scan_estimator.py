@@ -0,0 +1,230 @@
+"""
+Unit tests for pre-flight scan cost estimation.
+
+Tests repository profiling, cache hit prediction from the stage cache,
+throughput history from exported traces, and the wall time, CPU time and
+LLM token estimates.
+"""
+
+import json
+
+import pytest
+
+from src.core_engine.file_filters import FileFilter
+from src.core_engine.scan_estimator import (
+    DEFAULT_ESTIMATED_SECONDS,
+    FIXED_OVERHEAD_SECONDS,
+    RepositoryProfile,
+    ScanEstimator,
+    load_stage_throughput,
+    predict_cache_hits
+)
+from src.core_engine.stage_cache import MemoryStageCacheBackend, StageCache, content_hash, fingerprint
+from src.core_engine.tracing import ScanTracer
+
+
+CODE_FILES = {
+    "app/main.py": "def main():\n    return 1\n",
+    "app/util.py": "import os\n",
+    "android/Main.kt": "fun main() {}\n",
+    "web/index.ts": "export const a = 1;\n",
+    "README.md": "# Readme\n"
+}
+
+
+def write_trace(directory, files, stage_wall_ms):
+    """Export a trace whose node spans took the given wall times."""
+    tracer = ScanTracer()
+    for stage, wall_ms in stage_wall_ms.items():
+        with tracer.span(f"node.{stage}") as span:
+            span.set_count("files", files)
+        span.wall_ms = wall_ms
+        span.cpu_ms = wall_ms / 2
+    tracer.finish()
+    return tracer.export_otlp_json(str(directory))
+
+
+class TestRepositoryProfile:
+    """Test cases for RepositoryProfile."""
+
+    def test_from_files(self):
+        """Supported files are counted per language; others are ignored."""
+        profile = RepositoryProfile.from_files(CODE_FILES)
+
+        assert profile.to_dict()["languages"] == {
+            "javascript": {"files": 1, "bytes": len(CODE_FILES["web/index.ts"])},
+            "kotlin": {"files": 1, "bytes": len(CODE_FILES["android/Main.kt"])},
+            "python": {"files": 2, "bytes": len(CODE_FILES["app/main.py"]) + len(CODE_FILES["app/util.py"])}
+        }
+        assert profile.total_files == 4
+        assert profile.blobs["app/util.py"] == ("python", content_hash("import os\n"))
+
+    def test_from_directory(self, tmp_path):
+        """Checkouts are walked without hidden directories and oversized files."""
+        (tmp_path / "pkg").mkdir()
+        (tmp_path / "pkg" / "a.py").write_text("x = 1\n")
+        (tmp_path / "pkg" / "big.py").write_text("y = 2\n" * 100)
+        (tmp_path / ".git").mkdir()
+        (tmp_path / ".git" / "hook.py").write_text("z = 3\n")
+
+        profile = RepositoryProfile.from_directory(str(tmp_path), max_file_size_bytes=100)
+
+        assert list(profile.blobs) == ["pkg/a.py"]
+        assert profile.total_bytes == 6
+
+    def test_from_directory_applies_file_filter(self, tmp_path):
+        """Ignored, vendored and generated files are left out like in a scan."""
+        files = {
+            "app/main.py": "x = 1\n",
+            "app/api_pb2.py": "DESCRIPTOR = None\n",
+            "gen/client.py": "# Code generated by openapi-generator. DO NOT EDIT.\n",
+            "node_modules/lib/setup.py": "setup()\n",
+            "local/settings.py": "DEBUG = True\n",
+            "lib/copied.py": "y = 2\n",
+            ".gitignore": "local/\n",
+            ".gitattributes": "lib/*.py linguist-vendored\n"
+        }
+        for path, content in files.items():
+            (tmp_path / path).parent.mkdir(parents=True, exist_ok=True)
+            (tmp_path / path).write_text(content)
+
+        profile = RepositoryProfile.from_directory(str(tmp_path), file_filter=FileFilter())
+
+        assert list(profile.blobs) == ["app/main.py"]
+
+    def test_from_directory_uses_index_blob_ids(self, tmp_path):
+        """Unmodified files of a git checkout are keyed by their blob id without being read."""
+        from unittest.mock import patch
+
+        from git import Repo
+
+        repo = Repo.init(tmp_path, initial_branch="main")
+        (tmp_path / "a.py").write_text("x = 1\n")
+        (tmp_path / "b.py").write_text("y = 1\n")
+        repo.index.add(["a.py", "b.py"])
+        commit = repo.index.commit("initial")
+        (tmp_path / "b.py").write_text("y = 2\n")
+
+        real_open = open
+        opened = []
+
+        def tracking_open(file, *args, **kwargs):
+            opened.append(str(file))
+            return real_open(file, *args, **kwargs)
+
+        with patch("builtins.open", side_effect=tracking_open):
+            profile = RepositoryProfile.from_directory(str(tmp_path))
+
+        assert profile.blobs["a.py"] == ("python", commit.tree["a.py"].hexsha)
+        assert profile.blobs["b.py"] == ("python", content_hash("y = 2\n"))
+        assert [path for path in opened if path.endswith(".py")] == [str(tmp_path / "b.py")]
+
+
+class TestCacheHitPrediction:
+    """Test cases for predict_cache_hits."""
+
+    def test_memoized_parse_outputs_are_hits(self):
+        """Files whose parse output is memoized count as hits without touching the counters."""
+        stage_cache = StageCache(MemoryStageCacheBackend())
+        stage_cache.put("parse", fingerprint(content_hash(CODE_FILES["app/main.py"]), "python"), {"language": "python"})
+        profile = RepositoryProfile.from_files(CODE_FILES)
+
+        assert predict_cache_hits(profile, stage_cache) == pytest.approx(0.25)
+        assert stage_cache.stats() == {}
+
+    def test_without_stage_cache(self):
+        """Nothing is predicted to hit when memoization is disabled."""
+        assert predict_cache_hits(RepositoryProfile.from_files(CODE_FILES), None) == 0.0
+
+
+class TestStageThroughput:
+    """Test cases for load_stage_throughput."""
+
+    def test_median_per_file_rates(self, tmp_path):
+        """Node wall and CPU time are normalized per file and the median is used."""
+        write_trace(tmp_path, 10, {"parse_code": 100.0, "llm_analysis": 5000.0})
+        write_trace(tmp_path, 20, {"parse_code": 400.0, "llm_analysis": 20000.0})
+        write_trace(tmp_path, 10, {"parse_code": 300.0})
+        (tmp_path / "broken.json").write_text("{not json")
+
+        throughput = load_stage_throughput(str(tmp_path))
+
+        assert throughput["parse_code"] == {"wall_ms_per_file": 20.0, "cpu_ms_per_file": 10.0}
+        assert throughput["llm_analysis"]["wall_ms_per_file"] == pytest.approx(750.0)
+
+    def test_no_history(self, tmp_path):
+        """Missing or empty trace directories give no history."""
+        assert load_stage_throughput(None) == {}
+        assert load_stage_throughput(str(tmp_path / "missing")) == {}
+
+
+class TestScanEstimator:
+    """Test cases for ScanEstimator."""
+
+    def test_unknown_files_fall_back_to_defaults(self):
+        """Without a profile the estimate is the per scan type default."""
+        estimate = ScanEstimator().estimate(None, "pr")
+
+        assert estimate.wall_seconds == DEFAULT_ESTIMATED_SECONDS["pr"]
+        assert estimate.basis == "unknown"
+
+    def test_estimate_from_history(self):
+        """Measured rates scale with the number of files; branches run concurrently."""
+        throughput = {
+            "fetch_code": {"wall_ms_per_file": 10.0, "cpu_ms_per_file": 1.0},
+            "parse_code": {"wall_ms_per_file": 20.0, "cpu_ms_per_file": 20.0},
+            "static_analysis": {"wall_ms_per_file": 10.0, "cpu_ms_per_file": 10.0},
+            "knowledge_base": {"wall_ms_per_file": 50.0, "cpu_ms_per_file": 40.0},
+            "llm_analysis": {"wall_ms_per_file": 1000.0, "cpu_ms_per_file": 0.0},
+            "project_scanning": {"wall_ms_per_file": 0.0, "cpu_ms_per_file": 0.0},
+            "reporting": {"wall_ms_per_file": 0.0, "cpu_ms_per_file": 0.0}
+        }
+        profile = RepositoryProfile.from_files(CODE_FILES)
+
+        estimate = ScanEstimator(throughput).estimate(profile, "project")
+
+        assert estimate.basis == "history"
+        assert estimate.stage_seconds["knowledge_base"] == pytest.approx(0.2)
+        # Only the slowest branch (knowledge_base, not static_analysis) adds to the duration
+        assert estimate.wall_seconds == pytest.approx(FIXED_OVERHEAD_SECONDS + 4 * (0.01 + 0.02 + 0.05 + 1.0))
+        assert estimate.llm_tokens == profile.total_bytes // 4 + 4 * 700
+
+    def test_memoized_files_are_cheaper(self):
+        """Parse and static analysis are only estimated for files not in the stage cache."""
+        stage_cache = StageCache(MemoryStageCacheBackend())
+        profile = RepositoryProfile.from_files(CODE_FILES)
+        cold = ScanEstimator(stage_cache=stage_cache).estimate(profile)
+        for language, blob_hash in profile.blobs.values():
+            stage_cache.put("parse", fingerprint(blob_hash, language), {"language": language})
+
+        warm = ScanEstimator(stage_cache=stage_cache).estimate(profile)
+
+        assert warm.cache_hit_ratio == 1.0
+        assert warm.stage_seconds["parse_code"] == 0.0
+        assert warm.llm_tokens == 0
+        assert warm.wall_seconds < cold.wall_seconds
+
+    def test_pr_scans_skip_project_scanning(self):
+        """PR scans are estimated without the project scanning node."""
+        estimate = ScanEstimator().estimate(RepositoryProfile.from_files(CODE_FILES), "pr")
+
+        assert "project_scanning" not in estimate.stage_seconds
+
+    def test_streaming_overlaps_per_file_stages(self):
+        """Streaming scans are bounded by their slowest per-file stage."""
+        profile = RepositoryProfile.from_files(CODE_FILES)
+
+        staged = ScanEstimator().estimate(profile, streaming=False)
+        streamed = ScanEstimator().estimate(profile, streaming=True)
+
+        assert streamed.wall_seconds < staged.wall_seconds
+        assert streamed.cpu_seconds == staged.cpu_seconds
+
+    def test_to_dict(self):
+        """Estimates serialize to plain JSON."""
+        estimate = ScanEstimator().estimate(RepositoryProfile.from_files(CODE_FILES))
+
+        data = json.loads(json.dumps(estimate.to_dict()))
+
+        assert data["files"] == 4
+        assert data["basis"] == "defaults"
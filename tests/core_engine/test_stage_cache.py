@@ -0,0 +1,193 @@
+"""
+Unit tests for per-stage memoization.
+
+Tests the input fingerprints, the local backends and version tags, and which
+workflow stages are reused when a scan runs again with the same or partly
+changed inputs.
+"""
+
+from types import SimpleNamespace
+from unittest.mock import patch
+
+import pytest
+
+from src.core_engine.agents.ast_parsing_agent import ASTParsingAgent
+from src.core_engine.agents.llm_orchestrator_agent import LLMOrchestratorAgent
+from src.core_engine.agents.reporting_agent import ReportingAgent
+from src.core_engine.agents.static_analysis_agent import StaticAnalysisAgent
+from src.core_engine.orchestrator import (
+    STAGE_VERSIONS,
+    _llm_cache_key,
+    compile_graph,
+    create_sample_scan_request
+)
+from src.core_engine.stage_cache import (
+    MemoryStageCacheBackend,
+    SQLiteStageCacheBackend,
+    StageCache,
+    fingerprint,
+    set_stage_cache
+)
+
+
+NEW_FILE_DIFF = """diff --git a/shapes.py b/shapes.py
+new file mode 100644
+--- /dev/null
++++ b/shapes.py
+@@ -0,0 +1,3 @@
++class Square:
++    def area(self, side):
++        return side * side
+"""
+
+
+@pytest.fixture(params=["memory", "sqlite"])
+def backend(request):
+    backend = MemoryStageCacheBackend() if request.param == "memory" else SQLiteStageCacheBackend()
+    yield backend
+    backend.close()
+
+
+@pytest.fixture
+def stage_cache():
+    cache = StageCache(MemoryStageCacheBackend(), STAGE_VERSIONS)
+    set_stage_cache(cache)
+    yield cache
+    set_stage_cache(None)
+
+
+@pytest.fixture
+def mock_fetcher():
+    with patch('src.core_engine.agents.code_fetcher_agent.CodeFetcherAgent') as mock_fetcher_class:
+        mock_fetcher_class.return_value.get_pr_diff.return_value = NEW_FILE_DIFF
+        mock_fetcher_class.return_value.get_changed_files_from_diff.return_value = ["shapes.py"]
+        yield mock_fetcher_class.return_value
+
+
+def spy(cls, method_name):
+    """Patch a method with a spy that still runs the original."""
+    return patch.object(cls, method_name, autospec=True, side_effect=getattr(cls, method_name))
+
+
+class TestFingerprint:
+    """Test cases for stage input fingerprints."""
+
+    def test_mappings_hash_by_items(self):
+        """Mappings with the same items hash equally regardless of order."""
+        assert fingerprint({"a.py": "x", "b.py": "y"}) == fingerprint({"b.py": "y", "a.py": "x"})
+
+    def test_types_are_distinguished(self):
+        """Values that print alike but differ in type get different keys."""
+        assert fingerprint("1") != fingerprint(1)
+        assert fingerprint(["ab", "c"]) != fingerprint(["a", "bc"])
+
+    def test_iterables_hash_by_items(self):
+        """Lists, tuples and generators of the same items hash equally."""
+        findings = [{"rule_id": "print", "line": 3}]
+
+        assert fingerprint(findings) == fingerprint(tuple(findings)) == fingerprint(iter(findings))
+
+
+class TestStageCacheBackends:
+    """Test cases for the local backends."""
+
+    def test_put_and_get(self, backend):
+        """Values are stored per stage and key."""
+        backend.put("parse", "key", "1", ("json", b"{}"))
+
+        assert backend.get("parse", "key", "1") == ("json", b"{}")
+        assert backend.get("static_analysis", "key", "1") is None
+
+    def test_version_mismatch_is_a_miss(self, backend):
+        """Entries stored under another version tag are not returned."""
+        backend.put("parse", "key", "1", ("json", b"{}"))
+
+        assert backend.get("parse", "key", "2") is None
+
+    def test_invalidate_keeps_current_version(self, backend):
+        """Invalidation can keep the entries of the current version."""
+        backend.put("parse", "old", "1", ("json", b"{}"))
+        backend.put("parse", "new", "2", ("json", b"{}"))
+
+        assert backend.invalidate("parse", keep_version="2") == 1
+        assert backend.get("parse", "new", "2") is not None
+        assert backend.invalidate("parse") == 1
+
+
+class TestStageCache:
+    """Test cases for StageCache."""
+
+    def test_round_trip_and_stats(self):
+        """Outputs are decoded on read and hits and misses are counted."""
+        cache = StageCache(MemoryStageCacheBackend())
+        cache.put("static_analysis", "key", [{"rule_id": "print", "line": 3}])
+
+        assert cache.get("static_analysis", "key") == [{"rule_id": "print", "line": 3}]
+        assert cache.get("static_analysis", "other") is None
+        assert cache.stats() == {"static_analysis": {"hits": 1, "misses": 1}}
+
+    def test_version_bump_invalidates(self):
+        """Changing a stage's version tag hides and purges its earlier outputs."""
+        cache = StageCache(SQLiteStageCacheBackend(), {"parse": "1"})
+        cache.put("parse", "key", {"language": "python"})
+
+        cache.set_version("parse", "2")
+
+        assert cache.get("parse", "key") is None
+        assert cache.purge_stale() == 1
+
+    def test_llm_key_includes_model(self):
+        """The same prompt for another model is a different LLM request."""
+        kwargs = {"pr_diff": NEW_FILE_DIFF, "static_findings": []}
+        first = SimpleNamespace(llm_provider="openai", model_name="gpt-4")
+        second = SimpleNamespace(llm_provider="openai", model_name="gpt-4o")
+
+        assert _llm_cache_key(first, "analyze_pr_diff", kwargs) != _llm_cache_key(second, "analyze_pr_diff", kwargs)
+
+
+class TestWorkflowMemoization:
+    """Test cases for memoized stages in the compiled workflow."""
+
+    def test_rescan_reuses_all_stages(self, stage_cache, mock_fetcher):
+        """A second scan of the same code reuses every memoized stage."""
+        first = compile_graph().invoke(create_sample_scan_request())
+
+        with spy(ASTParsingAgent, "parse_code_to_ast") as parse, \
+                spy(StaticAnalysisAgent, "analyze_file_ast") as analyze, \
+                spy(LLMOrchestratorAgent, "analyze_pr_diff") as llm, \
+                spy(ReportingAgent, "_generate_diagrams") as diagrams:
+            second = compile_graph().invoke(create_sample_scan_request())
+
+        assert second["current_step"] == "completed"
+        parse.assert_not_called()
+        analyze.assert_not_called()
+        llm.assert_not_called()
+        diagrams.assert_not_called()
+        assert second["llm_insights"] == first["llm_insights"]
+        assert second["parsed_asts"] == first["parsed_asts"]
+        assert second["diagrams"] == first["diagrams"]
+
+    def test_rule_change_reuses_parsing(self, stage_cache, mock_fetcher):
+        """Changing the rule set re-runs static analysis but not parsing."""
+        compile_graph().invoke(create_sample_scan_request())
+
+        with patch('src.core_engine.orchestrator.source_fingerprint', return_value="changed-rules"), \
+                spy(ASTParsingAgent, "parse_code_to_ast") as parse, \
+                spy(StaticAnalysisAgent, "analyze_file_ast") as analyze:
+            result = compile_graph().invoke(create_sample_scan_request())
+
+        assert result["current_step"] == "completed"
+        assert analyze.call_count == 1
+        # The tree is rebuilt once for the rules, not by the parse stage
+        assert parse.call_count == 1
+        assert stage_cache.stats()["parse"]["hits"] == 1
+
+    def test_changed_file_is_parsed_again(self, stage_cache, mock_fetcher):
+        """Only new blob contents miss the parse cache."""
+        compile_graph().invoke(create_sample_scan_request())
+        mock_fetcher.get_pr_diff.return_value = NEW_FILE_DIFF.replace("side * side", "side ** 2")
+
+        result = compile_graph().invoke(create_sample_scan_request())
+
+        assert result["current_step"] == "completed"
+        assert stage_cache.stats()["parse"] == {"hits": 0, "misses": 2}
@@ -0,0 +1,194 @@
+"""
+Unit tests for the streaming per-file pipeline.
+
+Tests ordering-independent delivery, backpressure through bounded queues,
+error handling inside stages and in the source, and the streaming layout of
+the LangGraph workflow.
+"""
+
+import threading
+import time
+
+import pytest
+from unittest.mock import patch
+
+from src.core_engine.streaming_pipeline import PipelineStage, StreamingPipeline
+
+
+SAMPLE_PR_DIFF = """diff --git a/shapes.py b/shapes.py
+new file mode 100644
+--- /dev/null
++++ b/shapes.py
+@@ -0,0 +1,4 @@
++class Square:
++    def area(self, side):
++        print("computing area")
++        return side * side
+"""
+
+
+def double(worker_index, item):
+    return item * 2
+
+
+class TestStreamingPipeline:
+    """Test cases for StreamingPipeline."""
+
+    def test_items_flow_through_all_stages(self):
+        """Every item passes every stage; results may arrive in any order."""
+        pipeline = StreamingPipeline([
+            PipelineStage("double", double, workers=3),
+            PipelineStage("increment", lambda worker_index, item: item + 1, workers=2)
+        ], queue_size=2)
+
+        results = list(pipeline.run(range(20)))
+
+        assert sorted(results) == [i * 2 + 1 for i in range(20)]
+        summary = pipeline.summary()
+        assert summary["source_items"] == 20
+        assert summary["stages"]["double"]["processed"] == 20
+        assert summary["stages"]["increment"]["processed"] == 20
+        assert summary["first_result_ms"] is not None
+
+    def test_stage_can_drop_items(self):
+        """Returning None filters an item out of the stream."""
+        pipeline = StreamingPipeline([
+            PipelineStage("even", lambda worker_index, item: item if item % 2 == 0 else None)
+        ])
+
+        assert sorted(pipeline.run(range(10))) == [0, 2, 4, 6, 8]
+        assert pipeline.summary()["stages"]["even"]["dropped"] == 5
+
+    def test_stage_errors_drop_only_the_failing_item(self):
+        """An exception in a stage is counted and the remaining items continue."""
+        def fail_on_three(worker_index, item):
+            if item == 3:
+                raise ValueError("bad file")
+            return item
+
+        pipeline = StreamingPipeline([PipelineStage("check", fail_on_three, workers=2)])
+
+        assert sorted(pipeline.run(range(5))) == [0, 1, 2, 4]
+        assert pipeline.summary()["stages"]["check"]["errors"] == 1
+
+    def test_source_errors_are_raised(self):
+        """A failing source surfaces to the caller after the stream drains."""
+        def source():
+            yield 1
+            raise RuntimeError("clone failed")
+
+        pipeline = StreamingPipeline([PipelineStage("double", double)])
+
+        with pytest.raises(RuntimeError, match="clone failed"):
+            list(pipeline.run(source()))
+
+    def test_bounded_queues_apply_backpressure(self):
+        """A slow stage limits how far ahead the source can read."""
+        produced = []
+        release = threading.Event()
+
+        def source():
+            for i in range(50):
+                produced.append(i)
+                yield i
+
+        def slow(worker_index, item):
+            release.wait()
+            return item
+
+        pipeline = StreamingPipeline([PipelineStage("slow", slow)], queue_size=2)
+        results = pipeline.run(source())
+        consumer = threading.Thread(target=lambda: list(results))
+        consumer.start()
+        time.sleep(0.3)
+
+        # One item in the worker, two in the input queue, one blocked in put
+        assert len(produced) <= 5
+        release.set()
+        consumer.join(timeout=5)
+        assert len(produced) == 50
+
+    def test_closing_the_stream_cancels_work(self):
+        """Stopping consumption early stops the source and the workers."""
+        produced = []
+
+        def source():
+            for i in range(1000):
+                produced.append(i)
+                yield i
+
+        pipeline = StreamingPipeline([PipelineStage("double", double, workers=2)], queue_size=2)
+        results = pipeline.run(source())
+        assert next(results) is not None
+        results.close()
+
+        assert len(produced) < 1000
+        assert not [t for t in threading.enumerate() if t.name.startswith("stream-")]
+
+    def test_requires_stages(self):
+        """A pipeline without stages is rejected."""
+        with pytest.raises(ValueError):
+            StreamingPipeline([])
+
+
+class TestStreamingWorkflow:
+    """End-to-end tests for the compiled graph in streaming mode."""
+
+    @patch('src.core_engine.agents.code_fetcher_agent.CodeFetcherAgent')
+    def test_pr_scan_streams_changed_files(self, mock_fetcher_class):
+        """A streamed PR scan reviews each changed file and skips the LLM stage."""
+        from src.core_engine.orchestrator import compile_graph, create_sample_scan_request
+
+        mock_fetcher_class.return_value.get_pr_diff.return_value = SAMPLE_PR_DIFF
+        mock_fetcher_class.return_value.get_changed_files_from_diff.return_value = ["shapes.py"]
+
+        with patch('src.core_engine.orchestrator.llm_analysis_node') as mock_llm_node:
+            result = compile_graph(streaming=True).invoke(create_sample_scan_request())
+
+        assert result["current_step"] == "completed"
+        assert result["error_message"] is None
+        assert "shapes.py" in result["parsed_asts"]
+        assert "# Analysis for shapes.py" in result["llm_insights"]
+        assert result["static_analysis_summary"] is not None
+        assert result["impact_analysis_result"] is not None
+        assert result["workflow_metadata"]["execution_mode"] == "streaming"
+        assert result["workflow_metadata"]["streaming"]["stages"]["parse"]["processed"] == 1
+        mock_llm_node.assert_not_called()
+
+    @patch('src.core_engine.agents.code_fetcher_agent.CodeFetcherAgent')
+    def test_project_scan_streams_files_from_the_clone(self, mock_fetcher_class):
+        """Project files are stored, parsed and analyzed while they are read."""
+        from src.core_engine.orchestrator import create_initial_state, stream_files_node
+
+        mock_fetcher_class.return_value.iter_project_files.return_value = iter([
+            ("app.py", "def main():\n    print('hello')\n"),
+            ("README.txt", "not code")
+        ])
+        state = create_initial_state({"repo_url": "https://github.com/example/repo", "branch": "dev"})
+        state.update(repo_url="https://github.com/example/repo")
+
+        result = stream_files_node(state)
+
+        assert result["current_step"] == "impact_analysis"
+        assert set(result["project_code"]) == {"app.py", "README.txt"}
+        assert result["project_code"]["app.py"].startswith("def main")
+        assert list(result["parsed_asts"]) == ["app.py"]
+        assert "app.py" in result["structural_info"]
+        assert result["workflow_metadata"]["total_files"] == 2
+        mock_fetcher_class.return_value.iter_project_files.assert_called_once_with(
+            "https://github.com/example/repo", "dev", exclusions={}, content_keys={}
+        )
+
+    @patch('src.core_engine.agents.code_fetcher_agent.CodeFetcherAgent')
+    def test_project_scan_without_files_fails(self, mock_fetcher_class):
+        """An empty repository is reported like in the staged workflow."""
+        from src.core_engine.orchestrator import create_initial_state, stream_files_node
+
+        mock_fetcher_class.return_value.iter_project_files.return_value = iter([])
+        state = create_initial_state({"repo_url": "https://github.com/example/repo"})
+        state.update(repo_url="https://github.com/example/repo")
+
+        result = stream_files_node(state)
+
+        assert result["current_step"] == "error"
+        assert "No supported files" in result["error_message"]
@@ -0,0 +1,172 @@
+"""
+Unit tests for scan tracing.
+
+Tests span timing and nesting, the OTLP JSON export and the per-node spans
+recorded by the compiled workflow.
+"""
+
+import json
+import threading
+from unittest.mock import patch
+
+import pytest
+
+from src.core_engine.orchestrator import compile_graph, create_sample_scan_request
+from src.core_engine.tracing import (
+    STATUS_ERROR,
+    ScanTracer,
+    end_trace,
+    get_tracer,
+    start_trace,
+    trace_span
+)
+
+
+NEW_FILE_DIFF = """diff --git a/shapes.py b/shapes.py
+new file mode 100644
+--- /dev/null
++++ b/shapes.py
+@@ -0,0 +1,3 @@
++class Square:
++    def area(self, side):
++        return side * side
+"""
+
+
+def find_span(tree, name):
+    """Find a span by name in a span tree."""
+    if tree["name"] == name:
+        return tree
+    for child in tree["children"]:
+        found = find_span(child, name)
+        if found:
+            return found
+    return None
+
+
+class TestScanTracer:
+    """Test cases for ScanTracer."""
+
+    def test_span_records_timing_and_counts(self):
+        """Spans record wall time, CPU time and item counts."""
+        tracer = ScanTracer()
+
+        with tracer.span("node.parse_code", language="python") as span:
+            sum(range(100000))
+            span.set_count("files", 3)
+            span.add_count("files")
+
+        result = tracer.span_tree()["children"][0]
+        assert result["name"] == "node.parse_code"
+        assert result["wall_ms"] > 0
+        assert result["cpu_ms"] > 0
+        assert result["counts"] == {"files": 4}
+        assert result["attributes"] == {"language": "python"}
+        assert result["peak_rss_delta_bytes"] >= 0
+        assert result["in_progress"] is False
+
+    def test_nested_spans(self):
+        """Spans opened inside a span become its children."""
+        tracer = start_trace()
+        try:
+            with tracer.span("node.llm_analysis"):
+                with trace_span("llm.analyze_pr_diff"):
+                    pass
+
+            node = tracer.span_tree()["children"][0]
+            assert [child["name"] for child in node["children"]] == ["llm.analyze_pr_diff"]
+        finally:
+            end_trace(tracer.trace_id)
+
+    def test_spans_in_other_threads_attach_to_root(self):
+        """Spans started without an active parent hang off the scan span."""
+        tracer = ScanTracer()
+
+        def work():
+            with tracer.span("node.risk_metrics"):
+                pass
+
+        thread = threading.Thread(target=work)
+        thread.start()
+        thread.join()
+
+        assert tracer.timing_breakdown().keys() == {"node.risk_metrics"}
+
+    def test_errors_are_recorded(self):
+        """An exception marks the span as failed and is re-raised."""
+        tracer = ScanTracer()
+
+        with pytest.raises(ValueError):
+            with tracer.span("node.fetch_code"):
+                raise ValueError("clone failed")
+
+        span = tracer.span_tree()["children"][0]
+        assert span["status"] == STATUS_ERROR
+        assert span["error"] == "clone failed"
+
+    def test_trace_span_without_active_trace(self):
+        """Agent spans outside a traced scan are timed but not recorded."""
+        with trace_span("git.clone") as span:
+            span.set_count("files", 1)
+
+        assert span.wall_ms >= 0
+        assert get_tracer(span.trace_id) is None
+
+
+class TestOTLPExport:
+    """Test cases for the OTLP JSON export."""
+
+    def test_export_format(self, tmp_path):
+        """The export follows the OTLP/JSON ExportTraceServiceRequest layout."""
+        tracer = ScanTracer()
+        with tracer.span("node.static_analysis") as span:
+            span.set_count("findings", 2)
+        tracer.finish()
+
+        path = tracer.export_otlp_json(str(tmp_path))
+
+        with open(path) as f:
+            document = json.load(f)
+        spans = document["resourceSpans"][0]["scopeSpans"][0]["spans"]
+        root, child = spans
+        assert len(root["traceId"]) == 32 and len(root["spanId"]) == 16
+        assert "parentSpanId" not in root
+        assert child["parentSpanId"] == root["spanId"]
+        assert int(child["endTimeUnixNano"]) >= int(child["startTimeUnixNano"])
+        attributes = {item["key"]: item["value"] for item in child["attributes"]}
+        assert attributes["count.findings"] == {"intValue": "2"}
+        assert "doubleValue" in attributes["cpu_ms"]
+
+    def test_end_trace_exports_and_releases(self, tmp_path):
+        """Ending a trace writes the export and forgets the tracer."""
+        tracer = start_trace()
+
+        end_trace(tracer.trace_id, export_dir=str(tmp_path))
+
+        assert (tmp_path / f"{tracer.trace_id}.json").exists()
+        assert get_tracer(tracer.trace_id) is None
+
+
+class TestWorkflowTracing:
+    """Test cases for spans recorded by the compiled workflow."""
+
+    @patch('src.core_engine.agents.code_fetcher_agent.CodeFetcherAgent')
+    def test_scan_report_contains_span_tree(self, mock_fetcher_class, tmp_path):
+        """Every node gets a span; the report carries the tree and a timing breakdown."""
+        mock_fetcher_class.return_value.get_pr_diff.return_value = NEW_FILE_DIFF
+        mock_fetcher_class.return_value.get_changed_files_from_diff.return_value = ["shapes.py"]
+
+        with patch('config.settings.settings.scan_trace_dir', str(tmp_path)):
+            result = compile_graph().invoke(create_sample_scan_request())
+
+        trace = result["report_data"]["metadata"]["trace"]
+        assert trace["trace_id"] == result["trace_id"]
+        assert {"node.fetch_code", "node.parse_code", "node.static_analysis", "node.llm_analysis"} <= set(
+            trace["timing_breakdown"]
+        )
+        parse_span = find_span(trace["spans"], "node.parse_code")
+        assert parse_span["counts"]["parsed_asts"] == 1
+        assert find_span(parse_span, "ast.parse_files")["counts"] == {"files": 1, "parsed": 1}
+        assert find_span(trace["spans"], "git.fetch_pr_diff") is not None
+        assert (tmp_path / f"{result['trace_id']}.json").exists()
+        assert get_tracer(result["trace_id"]) is None
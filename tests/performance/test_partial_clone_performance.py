@@ -0,0 +1,98 @@
+"""
+Performance tests for partial clones.
+
+This module compares full and blobless, sparse temporary clones of a local
+repository with large binary assets and a long history, measuring the bytes
+transferred and the clone plus checkout time.
+"""
+
+import os
+import time
+from pathlib import Path
+from typing import Tuple
+
+import pytest
+from git import Repo
+
+from src.core_engine.agents.code_fetcher_agent import CodeFetcherAgent
+
+
+ASSET_COUNT = 8
+ASSET_SIZE = 512 * 1024
+HISTORY_LENGTH = 5
+
+
+def object_bytes(repo: Repo) -> int:
+    """Size of a clone's object database, i.e. the bytes it received."""
+    objects_dir = Path(repo.git_dir) / "objects"
+    return sum(path.stat().st_size for path in objects_dir.rglob("*") if path.is_file())
+
+
+@pytest.fixture(scope="module")
+def asset_heavy_origin(tmp_path_factory) -> str:
+    """
+    Create a repository whose binary assets are rewritten in every commit.
+    
+    Returns:
+        str: file:// URL of the repository
+    """
+    root = tmp_path_factory.mktemp("origin")
+    repo = Repo.init(root, initial_branch="main")
+    with repo.config_writer() as config:
+        config.set_value("user", "name", "Test")
+        config.set_value("user", "email", "test@example.com")
+        config.set_value("uploadpack", "allowFilter", "true")
+    
+    (root / "assets").mkdir()
+    (root / "app").mkdir()
+    for version in range(HISTORY_LENGTH):
+        paths = []
+        for index in range(ASSET_COUNT):
+            (root / "assets" / f"image_{index}.png").write_bytes(os.urandom(ASSET_SIZE))
+            paths.append(f"assets/image_{index}.png")
+        for index in range(20):
+            (root / "app" / f"module_{index}.py").write_text(f"VERSION = {version}\n\ndef handler_{index}():\n    return VERSION\n")
+            paths.append(f"app/module_{index}.py")
+        repo.index.add(paths)
+        repo.index.commit(f"version {version}")
+    
+    return root.as_uri()
+
+
+def clone_and_checkout(repo_url: str, target_dir: str, partial: bool) -> Tuple[Repo, float]:
+    """
+    Clone a repository and check out main like a project scan does.
+    
+    Returns:
+        Tuple[Repo, float]: Clone and elapsed seconds
+    """
+    agent = CodeFetcherAgent()
+    start_time = time.time()
+    repo = agent._clone_repository(repo_url, target_dir, partial=partial)
+    agent._checkout_branch(repo, "main")
+    return repo, time.time() - start_time
+
+
+class TestPartialClonePerformance:
+    """Benchmarks for blobless, sparse temporary clones."""
+    
+    def test_partial_clone_comparison(self, asset_heavy_origin, tmp_path):
+        """Compare bytes transferred and time of full and partial clones."""
+        full_repo, full_time = clone_and_checkout(asset_heavy_origin, str(tmp_path / "full"), partial=False)
+        partial_repo, partial_time = clone_and_checkout(asset_heavy_origin, str(tmp_path / "partial"), partial=True)
+        
+        full_bytes = object_bytes(full_repo)
+        partial_bytes = object_bytes(partial_repo)
+        
+        print(f"\nClone of {ASSET_COUNT} x {ASSET_SIZE // 1024} KiB assets over {HISTORY_LENGTH} commits:")
+        print(f"Full clone: {full_bytes / 1024:.0f} KiB in {full_time:.3f}s")
+        print(f"Partial clone: {partial_bytes / 1024:.0f} KiB in {partial_time:.3f}s")
+        print(f"Transfer reduction: {full_bytes / max(partial_bytes, 1):.1f}x")
+        
+        # Both checkouts hold the same source files
+        assert (tmp_path / "partial" / "app" / "module_0.py").read_text() == \
+            (tmp_path / "full" / "app" / "module_0.py").read_text()
+        assert not (tmp_path / "partial" / "assets").exists()
+        
+        # Only the current source blobs are downloaded, none of the assets
+        assert partial_bytes * 20 < full_bytes
@@ -6,17 +6,18 @@ including the main GET /scans/{scan_id}/report endpoint.
 """
 
 import pytest
-from unittest.mock import Mock, patch
+from unittest.mock import AsyncMock, Mock, patch
 from datetime import datetime
 from fastapi.testclient import TestClient
 from fastapi import FastAPI, status
 
-from src.webapp.backend.api.scan_routes import router, get_scan_service
+from src.webapp.backend.api.scan_routes import router, get_scan_service, get_batch_scan_service
 from src.webapp.backend.models.scan_models import (
     ReportDetail, ScanInfo, ScanSummary, StaticAnalysisFinding,
     LLMReview, DiagramData, ScanMetadata, ScanType, ScanStatus, SeverityLevel,
-    ScanRequest, ScanInitiateResponse
+    ScanRequest, ScanInitiateResponse, BatchScanResponse
 )
+from src.webapp.backend.services.batch_scan_service import BatchScanService
 from src.webapp.backend.services.scan_service import ScanService
 
 
@@ -41,6 +42,12 @@ def mock_scan_service():
     return Mock(spec=ScanService)
 
 
+@pytest.fixture
+def mock_batch_service():
+    """Create mock batch scan service."""
+    return Mock(spec=BatchScanService)
+
+
 @pytest.fixture
 def sample_scan_request():
     """Create sample ScanRequest for testing."""
@@ -469,6 +476,148 @@ class TestGetJobStatus:
         test_client.app.dependency_overrides.clear()
 
 
+class TestRetryJob:
+    """Test cases for POST /scans/jobs/{job_id}/retry endpoint."""
+    
+    def test_retry_job_success(self, test_client, mock_scan_service):
+        """Test restarting a failed job."""
+        mock_scan_service.retry_task = AsyncMock(return_value=True)
+        test_client.app.dependency_overrides[get_scan_service] = lambda: mock_scan_service
+        
+        response = test_client.post("/scans/jobs/job_abc123/retry")
+        
+        assert response.status_code == status.HTTP_200_OK
+        assert response.json()["job_id"] == "job_abc123"
+        mock_scan_service.retry_task.assert_awaited_once_with("job_abc123")
+        
+        test_client.app.dependency_overrides.clear()
+    
+    def test_retry_job_not_failed(self, test_client, mock_scan_service):
+        """Test retrying a job that is unknown, running or completed."""
+        mock_scan_service.retry_task = AsyncMock(return_value=False)
+        test_client.app.dependency_overrides[get_scan_service] = lambda: mock_scan_service
+        
+        response = test_client.post("/scans/jobs/job_abc123/retry")
+        
+        assert response.status_code == status.HTTP_409_CONFLICT
+        
+        test_client.app.dependency_overrides.clear()
+
+
+class TestBatchScan:
+    """Test cases for the /scans/batch endpoints."""
+    
+    def test_initiate_batch_scan(self, test_client, mock_batch_service):
+        """Test starting a batch scan."""
+        mock_batch_service.initiate_batch_scan = AsyncMock(return_value=BatchScanResponse(
+            batch_id="batch_abc123",
+            status=ScanStatus.PENDING,
+            message="Batch scan initiated successfully. Batch ID: batch_abc123",
+            total_repositories=2
+        ))
+        test_client.app.dependency_overrides[get_batch_scan_service] = lambda: mock_batch_service
+        
+        response = test_client.post("/scans/batch", json={
+            "repositories": [
+                {"repo_url": "https://github.com/test/one", "scan_type": "project", "branch": "main"},
+                {"repo_url": "https://github.com/test/two", "scan_type": "project", "branch": "main"}
+            ],
+            "max_concurrency": 2
+        })
+        
+        assert response.status_code == status.HTTP_200_OK
+        assert response.json()["batch_id"] == "batch_abc123"
+        batch_request = mock_batch_service.initiate_batch_scan.call_args.args[0]
+        assert len(batch_request.repositories) == 2
+        assert batch_request.max_concurrency == 2
+        
+        test_client.app.dependency_overrides.clear()
+    
+    def test_initiate_batch_scan_pr_without_id(self, test_client, mock_batch_service):
+        """Test that PR scans in a batch need a PR ID."""
+        mock_batch_service.initiate_batch_scan = AsyncMock()
+        test_client.app.dependency_overrides[get_batch_scan_service] = lambda: mock_batch_service
+        
+        response = test_client.post("/scans/batch", json={
+            "repositories": [{"repo_url": "https://github.com/test/one", "scan_type": "pr"}]
+        })
+        
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+        mock_batch_service.initiate_batch_scan.assert_not_called()
+        
+        test_client.app.dependency_overrides.clear()
+    
+    def test_get_batch_status(self, test_client, mock_batch_service):
+        """Test polling the status of a batch."""
+        mock_batch_service.get_batch_status.return_value = {
+            "batch_id": "batch_abc123",
+            "status": "in_progress",
+            "total_repositories": 2,
+            "finished_repositories": 1,
+            "results": [{"repo_url": "https://github.com/test/one", "status": "completed"}],
+            "summary": None
+        }
+        test_client.app.dependency_overrides[get_batch_scan_service] = lambda: mock_batch_service
+        
+        response = test_client.get("/scans/batch/batch_abc123")
+        
+        assert response.status_code == status.HTTP_200_OK
+        assert response.json()["finished_repositories"] == 1
+        mock_batch_service.get_batch_status.assert_called_once_with("batch_abc123")
+        
+        test_client.app.dependency_overrides.clear()
+    
+    def test_get_batch_status_not_found(self, test_client, mock_batch_service):
+        """Test polling a batch that does not exist."""
+        mock_batch_service.get_batch_status.return_value = None
+        test_client.app.dependency_overrides[get_batch_scan_service] = lambda: mock_batch_service
+        
+        response = test_client.get("/scans/batch/batch_missing")
+        
+        assert response.status_code == status.HTTP_404_NOT_FOUND
+        
+        test_client.app.dependency_overrides.clear()
+    
+    def test_cancel_batch(self, test_client, mock_batch_service):
+        """Test cancelling a running batch."""
+        mock_batch_service.get_batch_status.return_value = {"batch_id": "batch_abc123", "status": "in_progress"}
+        mock_batch_service.cancel_batch = AsyncMock(return_value=True)
+        test_client.app.dependency_overrides[get_batch_scan_service] = lambda: mock_batch_service
+        
+        response = test_client.delete("/scans/batch/batch_abc123")
+        
+        assert response.status_code == status.HTTP_200_OK
+        assert response.json()["batch_id"] == "batch_abc123"
+        mock_batch_service.cancel_batch.assert_awaited_once_with("batch_abc123")
+        
+        test_client.app.dependency_overrides.clear()
+    
+    def test_cancel_batch_not_found(self, test_client, mock_batch_service):
+        """Test cancelling a batch that does not exist."""
+        mock_batch_service.get_batch_status.return_value = None
+        mock_batch_service.cancel_batch = AsyncMock()
+        test_client.app.dependency_overrides[get_batch_scan_service] = lambda: mock_batch_service
+        
+        response = test_client.delete("/scans/batch/batch_missing")
+        
+        assert response.status_code == status.HTTP_404_NOT_FOUND
+        mock_batch_service.cancel_batch.assert_not_awaited()
+        
+        test_client.app.dependency_overrides.clear()
+    
+    def test_cancel_batch_not_running(self, test_client, mock_batch_service):
+        """Test cancelling a batch that has already finished."""
+        mock_batch_service.get_batch_status.return_value = {"batch_id": "batch_abc123", "status": "completed"}
+        mock_batch_service.cancel_batch = AsyncMock(return_value=False)
+        test_client.app.dependency_overrides[get_batch_scan_service] = lambda: mock_batch_service
+        
+        response = test_client.delete("/scans/batch/batch_abc123")
+        
+        assert response.status_code == status.HTTP_409_CONFLICT
+        
+        test_client.app.dependency_overrides.clear()
+
+
 class TestGetScanStatus:
     """Test cases for GET /scans/{scan_id}/status endpoint."""
     
@@ -0,0 +1,164 @@
+"""
+Unit tests for RepositoryMaintenanceJobs.
+
+This module contains tests for the auto-sync job: concurrent syncs within
+the global and per-host limits, prioritization by staleness and scan demand,
+and failure reporting.
+"""
+
+import threading
+import time
+from collections import Counter
+from datetime import datetime, timedelta, timezone
+from types import SimpleNamespace
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from src.webapp.backend.services.background_jobs import RepositoryMaintenanceJobs
+from src.webapp.backend.services.scan_cache_service import ScanDemand
+
+
+def make_candidates(urls, hours_since_sync=None):
+    """Create project rows last synced the given number of hours ago."""
+    now = datetime.now(timezone.utc)
+    hours_since_sync = hours_since_sync or [2] * len(urls)
+    return [
+        SimpleNamespace(
+            id=index, name=url.rsplit("/", 1)[-1], url=url,
+            last_synced_at=now - timedelta(hours=hours), last_commit_hash="a" * 40
+        )
+        for index, (url, hours) in enumerate(zip(urls, hours_since_sync))
+    ]
+
+
+@pytest.fixture
+def jobs():
+    """Create maintenance jobs with a mocked cache service."""
+    jobs = RepositoryMaintenanceJobs()
+    jobs.cache_service = MagicMock()
+    return jobs
+
+
+@pytest.fixture
+def sync_settings():
+    """Patch the sync settings."""
+    with patch("config.settings.settings") as mock_settings:
+        mock_settings.repository_sync_batch_size = 1000
+        mock_settings.repository_sync_concurrency = 4
+        mock_settings.repository_sync_per_host = 3
+        mock_settings.repository_sync_jitter_seconds = 0
+        yield mock_settings
+
+
+@pytest.fixture
+def database():
+    """Patch the database sessions to serve a list of candidate rows."""
+    session = MagicMock()
+    session.__enter__.return_value = session
+    query = session.query.return_value.with_entities.return_value.filter.return_value
+
+    def serve(candidates):
+        query.all.return_value = candidates
+        session.get.side_effect = lambda model, project_id: candidates[project_id]
+
+    with patch(
+        "src.webapp.backend.services.background_jobs.get_db_session",
+        side_effect=lambda: iter([session])
+    ):
+        yield serve
+
+
+class TestAutoSyncRepositoriesJob:
+    """Test cases for the auto-sync job."""
+
+    @pytest.mark.asyncio
+    async def test_syncs_run_concurrently_within_limits(self, jobs, sync_settings, database):
+        urls = [f"https://{host}/team/repo{i}" for host in ("github.com", "gitlab.com") for i in range(6)]
+        database(make_candidates(urls))
+        lock = threading.Lock()
+        running = Counter()
+        peaks = Counter()
+
+        def sync(project, db):
+            host = project.url.split("/")[2]
+            with lock:
+                running[host] += 1
+                running["total"] += 1
+                peaks[host] = max(peaks[host], running[host])
+                peaks["total"] = max(peaks["total"], running["total"])
+            time.sleep(0.1)
+            with lock:
+                running[host] -= 1
+                running["total"] -= 1
+            return f"/cache/{project.name}"
+
+        jobs.cache_service.get_or_clone_repository.side_effect = sync
+
+        started = time.monotonic()
+        result = await jobs.auto_sync_repositories_job()
+        elapsed = time.monotonic() - started
+
+        assert result["synced_count"] == 12
+        assert peaks["total"] == 4
+        assert peaks["github.com"] <= 3 and peaks["gitlab.com"] <= 3
+        assert elapsed < 12 * 0.1 / 2
+
+    @pytest.mark.asyncio
+    async def test_candidates_are_prioritized_by_staleness_and_demand(self, jobs, sync_settings, database):
+        sync_settings.repository_sync_concurrency = 1
+        database(make_candidates(
+            ["https://github.com/team/fresh", "https://github.com/team/stale", "https://github.com/team/popular"],
+            hours_since_sync=[2, 10, 4]
+        ))
+        demand = ScanDemand()
+        for _ in range(3):
+            demand.record("https://github.com/team/popular.git")
+        jobs.cache_service.get_or_clone_repository.side_effect = lambda project, db: f"/cache/{project.name}"
+
+        with patch("src.webapp.backend.services.background_jobs.get_scan_demand", return_value=demand):
+            result = await jobs.auto_sync_repositories_job(batch_size=2)
+
+        assert [sync["repository"] for sync in result["sync_results"]] == ["popular", "stale"]
+
+    @pytest.mark.asyncio
+    async def test_jitter_does_not_hold_a_host_slot(self, jobs, sync_settings, database):
+        sync_settings.repository_sync_per_host = 1
+        sync_settings.repository_sync_jitter_seconds = 0.3
+        database(make_candidates([f"https://github.com/team/repo{i}" for i in range(3)]))
+        jobs.cache_service.get_or_clone_repository.side_effect = lambda project, db: f"/cache/{project.name}"
+
+        started = time.monotonic()
+        with patch("src.webapp.backend.services.background_jobs.random.uniform", side_effect=lambda low, high: high):
+            result = await jobs.auto_sync_repositories_job()
+        elapsed = time.monotonic() - started
+
+        assert result["synced_count"] == 3
+        # The three delays overlap instead of running one after the other
+        assert elapsed < 2 * 0.3
+
+    @pytest.mark.asyncio
+    async def test_failures_are_reported_per_repository(self, jobs, sync_settings, database):
+        database(make_candidates(["https://github.com/team/ok", "https://github.com/team/broken"]))
+
+        def sync(project, db):
+            if project.name == "broken":
+                raise RuntimeError("Failed to get repository: clone failed")
+            return f"/cache/{project.name}"
+
+        jobs.cache_service.get_or_clone_repository.side_effect = sync
+
+        result = await jobs.auto_sync_repositories_job()
+
+        assert result["status"] == "completed"
+        assert (result["synced_count"], result["failed_count"]) == (1, 1)
+        assert result["sync_results"][1]["error"] == "Failed to get repository: clone failed"
+
+
+def test_scan_demand_decays():
+    demand = ScanDemand(half_life_seconds=60)
+    demand.record("https://GitHub.com/team/repo/")
+
+    with patch("src.webapp.backend.services.scan_cache_service.time.time", return_value=time.time() + 60):
+        assert demand.score("https://github.com/team/repo.git") == pytest.approx(0.5, rel=0.01)
+    assert demand.score("https://github.com/team/other") == 0
@@ -0,0 +1,137 @@
+"""
+Unit tests for BatchScanService.
+
+This module tests starting batch scans, polling their status, cancelling
+them and the server-side limit on batch concurrency.
+"""
+
+import asyncio
+import threading
+from unittest.mock import patch
+
+import pytest
+
+from config.settings import settings
+from src.webapp.backend.models.scan_models import (
+    BatchScanRequest, ScanRequest, ScanStatus, ScanType
+)
+from src.webapp.backend.services.batch_scan_service import BatchScanService
+
+
+class FakeBatchScanner:
+    """BatchScanner stand-in that reports every target as completed."""
+
+    instances = []
+
+    def __init__(self, max_concurrency=None, streaming=False):
+        self.max_concurrency = max_concurrency
+        self.streaming = streaming
+        self.cancelled = threading.Event()
+        self.release = threading.Event()
+        self.release.set()
+        FakeBatchScanner.instances.append(self)
+
+    def cancel(self):
+        self.cancelled.set()
+        self.release.set()
+
+    def run(self, targets, on_result=None):
+        self.release.wait(5)
+        results = []
+        for target in targets:
+            if self.cancelled.is_set():
+                break
+            result = {"repo_url": target["repo_url"], "status": "completed"}
+            results.append(result)
+            if on_result:
+                on_result(result)
+        return {"results": results, "summary": {"total": len(targets), "completed": len(results)}}
+
+
+class BlockingBatchScanner(FakeBatchScanner):
+    """BatchScanner stand-in that runs until it is cancelled."""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.release.clear()
+
+
+@pytest.fixture
+def batch_service():
+    """Create a BatchScanService instance for testing."""
+    FakeBatchScanner.instances = []
+    return BatchScanService()
+
+
+def _batch_request(max_concurrency=None):
+    """Create a batch request for two repositories."""
+    return BatchScanRequest(
+        repositories=[
+            ScanRequest(repo_url="https://github.com/test/one", scan_type=ScanType.PROJECT, branch="main"),
+            ScanRequest(repo_url="https://github.com/test/two", scan_type=ScanType.PROJECT, branch="main")
+        ],
+        max_concurrency=max_concurrency
+    )
+
+
+async def _wait_until_done(batch_service, batch_id):
+    """Wait for the background batch task to finish."""
+    task = batch_service._running_batches.get(batch_id)
+    if task is not None:
+        await asyncio.wait_for(asyncio.shield(task), timeout=5)
+
+
+class TestBatchScanService:
+    """Test cases for BatchScanService."""
+
+    @pytest.mark.asyncio
+    async def test_initiate_and_poll_batch(self, batch_service):
+        """Test that a batch runs in the background and reports its results."""
+        with patch("src.core_engine.batch_scanner.BatchScanner", FakeBatchScanner):
+            response = await batch_service.initiate_batch_scan(_batch_request())
+            assert response.status == ScanStatus.PENDING
+            assert response.total_repositories == 2
+
+            await _wait_until_done(batch_service, response.batch_id)
+
+        batch_status = batch_service.get_batch_status(response.batch_id)
+        assert batch_status["status"] == ScanStatus.COMPLETED.value
+        assert batch_status["finished_repositories"] == 2
+        assert batch_status["summary"] == {"total": 2, "completed": 2}
+        assert batch_status["completed_at"] is not None
+        assert response.batch_id not in batch_service._running_batches
+
+    def test_unknown_batch_status(self, batch_service):
+        """Test polling a batch that does not exist."""
+        assert batch_service.get_batch_status("batch_missing") is None
+
+    @pytest.mark.asyncio
+    async def test_cancel_running_batch(self, batch_service):
+        """Test that cancelling a batch stops its scanner."""
+        with patch("src.core_engine.batch_scanner.BatchScanner", BlockingBatchScanner):
+            response = await batch_service.initiate_batch_scan(_batch_request())
+            await asyncio.sleep(0.05)
+
+            assert await batch_service.cancel_batch(response.batch_id) is True
+            await _wait_until_done(batch_service, response.batch_id)
+
+        scanner = FakeBatchScanner.instances[0]
+        assert scanner.cancelled.is_set()
+        assert batch_service.get_batch_status(response.batch_id)["status"] == ScanStatus.CANCELLED.value
+        assert await batch_service.cancel_batch(response.batch_id) is False
+
+    @pytest.mark.asyncio
+    async def test_cancel_unknown_batch(self, batch_service):
+        """Test cancelling a batch that does not exist."""
+        assert await batch_service.cancel_batch("batch_missing") is False
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("requested, expected", [(None, 3), (2, 2), (50, 3)])
+    async def test_concurrency_capped_by_settings(self, batch_service, requested, expected):
+        """Test that a batch cannot run more workers than the server allows."""
+        with patch("src.core_engine.batch_scanner.BatchScanner", FakeBatchScanner), \
+                patch.object(settings, "batch_scan_concurrency", 3):
+            response = await batch_service.initiate_batch_scan(_batch_request(requested))
+            await _wait_until_done(batch_service, response.batch_id)
+
+        assert FakeBatchScanner.instances[0].max_concurrency == expected
@@ -0,0 +1,162 @@
+"""
+Unit tests for RepositoryCacheService.
+
+This module contains concurrency tests for single-flight clones and syncs of
+a local bare repository: concurrent requesters of one repository must share
+a single clone or sync, whether they wait in this process or on the file
+lock of another one.
+"""
+
+import fcntl
+import threading
+import time
+from pathlib import Path
+from unittest.mock import MagicMock
+
+import pytest
+from git import Repo
+
+from src.webapp.backend.models.project_models import Project
+from src.webapp.backend.services.repository_cache_service import LOCK_DIR_NAME, RepositoryCacheService
+
+
+REQUESTERS = 8
+
+
+def commit_file(repo: Repo, content: str) -> str:
+    """Commit a file to a working tree and push it to the bare origin."""
+    Path(repo.working_tree_dir, "app.py").write_text(content)
+    repo.index.add(["app.py"])
+    commit = repo.index.commit(content)
+    repo.remotes.origin.push("main")
+    return commit.hexsha
+
+
+@pytest.fixture
+def origin(tmp_path):
+    """
+    Create a bare repository and a working tree pushing to it.
+
+    Returns:
+        Tuple[str, Repo]: file:// URL of the bare repository and the working tree
+    """
+    bare = Repo.init(tmp_path / "origin.git", bare=True, initial_branch="main")
+    work = Repo.init(tmp_path / "work", initial_branch="main")
+    with work.config_writer() as config:
+        config.set_value("user", "name", "Test")
+        config.set_value("user", "email", "test@example.com")
+    work.create_remote("origin", bare.git_dir)
+    commit_file(work, "VERSION = 1\n")
+    return Path(bare.git_dir).as_uri(), work
+
+
+@pytest.fixture
+def cache_service(tmp_path):
+    """Create a cache service counting the clones and syncs it performs."""
+    service = RepositoryCacheService(cache_root=str(tmp_path / "cache"))
+    service.calls = {"clone": 0, "sync": 0}
+    clone_fresh, sync_repository = service._clone_fresh, service._sync_repository
+
+    def counting_clone(*args):
+        service.calls["clone"] += 1
+        time.sleep(0.2)  # Keep the clone in flight while the others arrive
+        return clone_fresh(*args)
+
+    def counting_sync(*args):
+        service.calls["sync"] += 1
+        time.sleep(0.2)
+        return sync_repository(*args)
+
+    service._clone_fresh = counting_clone
+    service._sync_repository = counting_sync
+    return service
+
+
+def make_project(url: str, **cache_fields) -> Project:
+    """Create a detached project row as loaded by one request's session."""
+    return Project(id=1, name="repo", url=url, default_branch="main", **cache_fields)
+
+
+def request_concurrently(service, projects):
+    """Request every project's repository at once from its own thread."""
+    barrier = threading.Barrier(len(projects))
+    results = [None] * len(projects)
+
+    def request(index):
+        barrier.wait()
+        try:
+            results[index] = service.get_or_clone_repository(projects[index], MagicMock())
+        except RuntimeError as e:
+            results[index] = e
+
+    threads = [threading.Thread(target=request, args=(i,)) for i in range(len(projects))]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join(timeout=60)
+    return results
+
+
+class TestSingleFlight:
+    """Test cases for single-flight clones and syncs."""
+
+    def test_concurrent_requesters_share_one_clone(self, cache_service, origin):
+        url, work = origin
+
+        results = request_concurrently(cache_service, [make_project(url) for _ in range(REQUESTERS)])
+
+        duplicate_clones = cache_service.calls["clone"] - 1
+        assert duplicate_clones == 0
+        assert len(set(results)) == 1
+        assert Repo(results[0]).head.commit.hexsha == work.head.commit.hexsha
+
+    def test_concurrent_requesters_share_one_sync(self, cache_service, origin):
+        url, work = origin
+        first = make_project(url)
+        cache_path = cache_service.get_or_clone_repository(first, MagicMock())
+        new_head = commit_file(work, "VERSION = 2\n")
+
+        projects = [
+            make_project(
+                url,
+                cached_path=first.cached_path,
+                cache_expires_at=first.cache_expires_at,
+                last_commit_hash=first.last_commit_hash
+            )
+            for _ in range(REQUESTERS)
+        ]
+        results = request_concurrently(cache_service, projects)
+
+        assert cache_service.calls == {"clone": 1, "sync": 1}
+        assert results == [cache_path] * REQUESTERS
+        assert Repo(cache_path).head.commit.hexsha == new_head
+
+    def test_waiters_share_the_failure(self, cache_service, tmp_path):
+        url = (tmp_path / "missing.git").as_uri()
+
+        results = request_concurrently(cache_service, [make_project(url) for _ in range(REQUESTERS)])
+
+        assert cache_service.calls["clone"] == 1
+        assert all(isinstance(result, RuntimeError) for result in results)
+
+    def test_waits_for_the_lock_of_another_process(self, cache_service, origin):
+        """A process that waited on the file lock reloads the project first."""
+        url, _ = origin
+        project = make_project(url)
+        lock_dir = cache_service.cache_root / LOCK_DIR_NAME
+        lock_dir.mkdir()
+        lock_path = lock_dir / f"{Path(cache_service._get_cache_path(project)).name}.lock"
+        db = MagicMock()
+
+        with open(lock_path, "a") as lock_file:
+            # A separate open file description conflicts like another process
+            fcntl.flock(lock_file, fcntl.LOCK_EX)
+            thread = threading.Thread(target=cache_service.get_or_clone_repository, args=(project, db))
+            thread.start()
+            time.sleep(0.3)
+            assert cache_service.calls["clone"] == 0
+            fcntl.flock(lock_file, fcntl.LOCK_UN)
+        thread.join(timeout=60)
+
+        assert cache_service.calls["clone"] == 1
+        db.refresh.assert_called_once_with(project)
@@ -0,0 +1,120 @@
+"""
+Unit tests for ScanService.
+
+This module contains tests for the pre-flight estimate of new scans and
+for rejecting or downscoping scans that exceed the configured quotas.
+"""
+
+import pytest
+from unittest.mock import AsyncMock, MagicMock, patch
+
+from src.core_engine.scan_estimator import ScanEstimate
+from src.webapp.backend.services.scan_cache_service import ScanCacheService
+from src.webapp.backend.services.scan_service import ScanQuotaExceeded, ScanService
+from src.webapp.backend.models.scan_models import ScanRequest, ScanType
+
+
+class TestScanServiceQuotas:
+    """Test cases for estimates and quotas in ScanService.initiate_scan."""
+
+    @pytest.fixture
+    def scan_service(self):
+        """Create a ScanService with a mocked task queue and a fixed estimate."""
+        service = ScanService()
+        service._scan_cache = ScanCacheService()
+        service._task_queue = MagicMock()
+        service._task_queue.initiate_scan = AsyncMock(return_value=("project_1234", "job_1234"))
+        service._get_cache_key = AsyncMock(return_value=None)
+        service._estimate_scan = AsyncMock(return_value=ScanEstimate(
+            wall_seconds=1200.4, cpu_seconds=300.0, llm_tokens=50000, files=800, bytes=4000000
+        ))
+        return service
+
+    @pytest.fixture
+    def scan_request(self):
+        """Create a sample project ScanRequest."""
+        return ScanRequest(repo_url="https://github.com/test/repo", scan_type=ScanType.PROJECT, branch="main")
+
+    @pytest.fixture
+    def quotas(self):
+        """Patch the quota settings."""
+        with patch("config.settings.settings") as mock_settings:
+            mock_settings.scan_quota_max_seconds = None
+            mock_settings.scan_quota_max_llm_tokens = None
+            mock_settings.scan_quota_policy = "reject"
+            yield mock_settings
+
+    @pytest.mark.asyncio
+    async def test_estimate_is_returned(self, scan_service, scan_request, quotas):
+        """The response and the queued task carry the pre-flight estimate."""
+        response = await scan_service.initiate_scan(scan_request)
+
+        assert response.estimated_duration == 1201
+        assert response.estimate["llm_tokens"] == 50000
+        assert scan_service._task_queue.initiate_scan.call_args.kwargs["estimate"]["files"] == 800
+
+    @pytest.mark.asyncio
+    async def test_scan_over_quota_is_rejected(self, scan_service, scan_request, quotas):
+        """Scans estimated over a quota are not queued."""
+        quotas.scan_quota_max_llm_tokens = 10000
+
+        with pytest.raises(ScanQuotaExceeded) as exc_info:
+            await scan_service.initiate_scan(scan_request)
+
+        assert "LLM tokens" in str(exc_info.value)
+        assert exc_info.value.estimate.llm_tokens == 50000
+        scan_service._task_queue.initiate_scan.assert_not_awaited()
+
+    @pytest.mark.asyncio
+    async def test_scan_over_quota_is_downscoped(self, scan_service, scan_request, quotas):
+        """Downscoped scans run with their time budget capped at the quota."""
+        quotas.scan_quota_max_seconds = 600
+        quotas.scan_quota_policy = "downscope"
+
+        response = await scan_service.initiate_scan(scan_request)
+
+        queued_request = scan_service._task_queue.initiate_scan.call_args.args[0]
+        assert queued_request.timeout_seconds == 600
+        assert response.estimated_duration == 600
+        assert "downscoped" in response.message
+
+
+class TestScanServiceExecution:
+    """Test cases for running scans with checkpoints in ScanService."""
+
+    @pytest.fixture
+    def scan_request(self):
+        return ScanRequest(repo_url="https://github.com/test/repo", scan_type=ScanType.PROJECT, branch="main")
+
+    @pytest.fixture
+    def orchestrator(self):
+        """Patch the scan runners and checkpoint disposal."""
+        with patch("src.core_engine.async_orchestrator.run_scan_async", new_callable=AsyncMock) as run, \
+             patch("src.core_engine.async_orchestrator.resume_scan_async", new_callable=AsyncMock) as resume, \
+             patch("src.core_engine.checkpointing.get_checkpointer") as get_checkpointer, \
+             patch("src.core_engine.orchestrator.discard_scan") as discard:
+            yield run, resume, get_checkpointer.return_value, discard
+
+    @pytest.mark.asyncio
+    async def test_failed_scan_keeps_checkpoints(self, scan_request, orchestrator):
+        run, _, checkpointer, discard = orchestrator
+        run.return_value = {"current_step": "error_handled", "error_message": "LLM provider unavailable"}
+
+        with pytest.raises(RuntimeError, match="LLM provider unavailable"):
+            await ScanService()._execute_scan_with_orchestrator(scan_request, scan_id="project_1234")
+
+        assert run.call_args.kwargs["checkpointer"] is checkpointer
+        assert run.call_args.kwargs["scan_id"] == "project_1234"
+        discard.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_resumed_scan_is_discarded_once_completed(self, scan_request, orchestrator):
+        run, resume, checkpointer, discard = orchestrator
+        resume.return_value = {"current_step": "completed", "static_analysis_summary": {"total_findings": 3}}
+
+        result = await ScanService()._execute_scan_with_orchestrator(scan_request, scan_id="project_1234", resume=True)
+
+        assert result["findings_count"] == 3
+        assert resume.call_args.args == ("project_1234", checkpointer)
+        run.assert_not_called()
+        discard.assert_called_once_with("project_1234", checkpointer)
@@ -7,9 +7,10 @@ including task creation, execution, status tracking, and error handling.
 
 import pytest
 import asyncio
-from unittest.mock import AsyncMock, MagicMock, patch
+from unittest.mock import ANY, AsyncMock, MagicMock, patch
 from datetime import datetime, timedelta
 
+from src.core_engine.agent_pool import AgentPool
 from src.webapp.backend.services.task_queue_service import (
     TaskQueueService, TaskInfo, TaskStatus, get_task_queue_service
 )
@@ -78,7 +79,8 @@ class TestTaskQueueService:
         await asyncio.sleep(7)  # Give enough time for the task to complete
         
         # Check callback was called
-        mock_callback.assert_called_once_with(sample_scan_request)
+        mock_callback.assert_called_once_with(sample_scan_request, agent_pool=ANY, scan_id=scan_id, resume=False)
+        assert isinstance(mock_callback.call_args.kwargs["agent_pool"], AgentPool)
         
         # Check task completed
         task_info = task_queue_service._tasks[job_id]
@@ -180,7 +182,7 @@ class TestTaskQueueService:
     @pytest.mark.asyncio
     async def test_execute_scan_task_failure(self, task_queue_service, sample_scan_request):
         """Test scan task execution with failure."""
-        def failing_callback(request):
+        def failing_callback(request, **kwargs):
             raise Exception("Test failure")
         
         scan_id, job_id = await task_queue_service.initiate_scan(
@@ -196,6 +198,94 @@ class TestTaskQueueService:
         assert task_info.status == TaskStatus.FAILED
         assert task_info.error_message == "Test failure"
     
+    @pytest.mark.asyncio
+    async def test_retry_task_resumes_failed_scan(self, task_queue_service, sample_scan_request):
+        """A retried task resumes the scan of its failed attempt."""
+        callback = AsyncMock(side_effect=[RuntimeError("LLM provider unavailable"), {"status": "completed"}])
+        task_info = TaskInfo("job_retry", "scan_retry", sample_scan_request)
+        task_info.orchestrator_callback = callback
+        task_queue_service._tasks["job_retry"] = task_info
+        
+        with patch("src.webapp.backend.services.task_queue_service.asyncio.sleep", AsyncMock()):
+            await task_queue_service._execute_scan_task(task_info, callback)
+            assert task_info.status == TaskStatus.FAILED
+            
+            assert await task_queue_service.retry_task("job_retry")
+            await task_queue_service._running_tasks["job_retry"]
+        
+        assert task_info.status == TaskStatus.COMPLETED
+        assert task_info.attempts == 2
+        callback.assert_called_with(sample_scan_request, agent_pool=ANY, scan_id="scan_retry", resume=True)
+        assert not await task_queue_service.retry_task("job_retry")
+    
+    @pytest.mark.asyncio
+    async def test_retried_scan_can_be_cancelled(self, task_queue_service, sample_scan_request):
+        """Cancelling a retried task stops the resumed stages through the task's token."""
+        from src.core_engine.async_orchestrator import resume_scan_async, run_scan_async
+        from src.core_engine.cancellation import current_token
+        from src.core_engine.checkpointing import SQLiteCheckpointSaver
+        
+        saver = SQLiteCheckpointSaver()
+        real_sleep = asyncio.sleep
+        resumed_tokens = []
+        
+        async def review(**kwargs):
+            resumed_tokens.append(current_token())
+            await real_sleep(60)
+        
+        async def orchestrate(scan_request, agent_pool=None, scan_id=None, resume=False):
+            if resume:
+                return await resume_scan_async(scan_id, checkpointer=saver, agent_pool=agent_pool)
+            result = await run_scan_async(
+                {"repo_url": scan_request.repo_url, "pr_id": scan_request.pr_id, "scan_type": "pr"},
+                agent_pool=agent_pool, checkpointer=saver, scan_id=scan_id
+            )
+            if result["current_step"] != "completed":
+                raise RuntimeError(result["error_message"])
+            return result
+        
+        task_info = TaskInfo("job_cancel", "scan_cancel", sample_scan_request)
+        task_info.orchestrator_callback = orchestrate
+        task_queue_service._tasks["job_cancel"] = task_info
+        
+        with patch("src.webapp.backend.services.task_queue_service.asyncio.sleep", AsyncMock()), \
+                patch("src.core_engine.agents.code_fetcher_agent.CodeFetcherAgent") as mock_fetcher_class, \
+                patch("src.core_engine.agents.llm_orchestrator_agent.LLMOrchestratorAgent") as mock_llm_class:
+            mock_fetcher_class.return_value.get_pr_diff.return_value = (
+                "diff --git a/app.py b/app.py\nnew file mode 100644\n--- /dev/null\n+++ b/app.py\n"
+                "@@ -0,0 +1 @@\n+x = 1\n"
+            )
+            mock_fetcher_class.return_value.get_changed_files_from_diff.return_value = ["app.py"]
+            mock_llm_class.side_effect = RuntimeError("LLM provider unavailable")
+            await task_queue_service._execute_scan_task(task_info, orchestrate)
+            assert task_info.status == TaskStatus.FAILED
+            
+            mock_llm_class.side_effect = None
+            mock_llm_class.return_value.aanalyze_pr_diff = review
+            assert await task_queue_service.retry_task("job_cancel")
+            retried = task_queue_service._running_tasks["job_cancel"]
+            while not resumed_tokens:
+                await real_sleep(0.01)
+            assert await task_queue_service.cancel_task("job_cancel")
+            await retried
+        
+        assert task_info.status == TaskStatus.CANCELLED
+        assert resumed_tokens == [task_info.cancel_token]
+        assert resumed_tokens[0].is_cancelled
+    
+    def test_cleanup_discards_scans_that_can_no_longer_be_retried(self, task_queue_service, sample_scan_request):
+        for job_id, status in (("failed_job", TaskStatus.FAILED), ("completed_job", TaskStatus.COMPLETED)):
+            task_info = TaskInfo(job_id, f"{job_id}_scan", sample_scan_request)
+            task_info.status = status
+            task_info.orchestrator_callback = AsyncMock()
+            task_info.created_at = datetime.now() - timedelta(hours=25)
+            task_queue_service._tasks[job_id] = task_info
+        
+        with patch("src.core_engine.orchestrator.discard_scan") as mock_discard:
+            assert task_queue_service.cleanup_old_tasks(max_age_hours=24) == 2
+        
+        mock_discard.assert_called_once_with("failed_job_scan")
+    
     def test_task_info_initialization(self, sample_scan_request):
         """Test TaskInfo initialization."""
         task_id = "test_task_123"
@@ -284,4 +374,4 @@ async def test_integration_full_scan_workflow():
     assert scan_status["status"] == "completed"
     
     # Verify callback was called
-    mock_callback.assert_called_once_with(scan_request) 
\ No newline at end of file
+    mock_callback.assert_called_once_with(scan_request, agent_pool=ANY, scan_id=scan_id, resume=False) 
\ No newline at end of file